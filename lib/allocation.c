@@ -255,28 +255,66 @@ hw_alloc_assoc_unused(const unsigned technology,
  * =======================================
  */
 
+/**
+ * @brief Reads PQR_ASSOC of all cores in one batch
+ *
+ * Values are kept in the MSR shadow table, so later association queries
+ * and writes are served from memory.
+ *
+ * @param [in] cpu CPU information structure
+ * @param [in] cap platform QoS capabilities structure
+ */
+static void
+hw_alloc_assoc_prefetch(const struct pqos_cpuinfo *cpu,
+                        const struct pqos_cap *cap)
+{
+        const enum pqos_cap_type types[] = {
+            PQOS_CAP_TYPE_MON, PQOS_CAP_TYPE_L3CA, PQOS_CAP_TYPE_L2CA,
+            PQOS_CAP_TYPE_MBA};
+        const struct pqos_capability *item = NULL;
+        struct msr_op *ops;
+        unsigned i;
+
+        /* PQR_ASSOC is present only with RDT */
+        for (i = 0; i < DIM(types); i++)
+                if (pqos_cap_get_type(cap, types[i], &item) == PQOS_RETVAL_OK)
+                        break;
+        if (i == DIM(types) || cpu->num_cores == 0)
+                return;
+
+        ops = calloc(cpu->num_cores, sizeof(ops[0]));
+        if (ops == NULL)
+                return;
+
+        for (i = 0; i < cpu->num_cores; i++) {
+                ops[i].lcore = cpu->cores[i].lcore;
+                ops[i].reg = PQOS_MSR_ASSOC;
+        }
+
+        if (msr_read_batch(ops, cpu->num_cores) != MACHINE_RETVAL_OK)
+                LOG_DEBUG("Failed to prefetch core associations\n");
+
+        free(ops);
+}
+
 int
 pqos_alloc_init(const struct pqos_cpuinfo *cpu,
                 const struct pqos_cap *cap,
                 const struct pqos_config *cfg)
 {
         int ret = PQOS_RETVAL_OK;
-#ifdef __linux__
         enum pqos_interface interface = _pqos_get_inter();
-#endif
-
-#ifndef __linux__
-        UNUSED_PARAM(cpu);
-        UNUSED_PARAM(cap);
-#endif
 
         UNUSED_PARAM(cfg);
 
+        if (interface == PQOS_INTER_MSR)
+                hw_alloc_assoc_prefetch(cpu, cap);
 #ifdef __linux__
         if (interface == PQOS_INTER_OS ||
             interface == PQOS_INTER_OS_RESCTRL_MON)
                 ret = os_alloc_init(cpu, cap);
 #endif
+
         return ret;
 }
 
@@ -1634,16 +1672,28 @@ hw_alloc_reset_cos(const unsigned msr_start,
                    const unsigned coreid,
                    const uint64_t msr_val)
 {
+        struct msr_op *ops;
         int ret = PQOS_RETVAL_OK;
         unsigned i;
 
-        for (i = 0; i < msr_num; i++) {
-                int retval = msr_write(coreid, msr_start + i, msr_val);
+        if (msr_num == 0)
+                return PQOS_RETVAL_OK;
 
-                if (retval != MACHINE_RETVAL_OK)
-                        ret = PQOS_RETVAL_ERROR;
+        ops = calloc(msr_num, sizeof(ops[0]));
+        if (ops == NULL)
+                return PQOS_RETVAL_RESOURCE;
+
+        for (i = 0; i < msr_num; i++) {
+                ops[i].lcore = coreid;
+                ops[i].reg = msr_start + i;
+                ops[i].value = msr_val;
         }
 
+        if (msr_write_batch(ops, msr_num) != MACHINE_RETVAL_OK)
+                ret = PQOS_RETVAL_ERROR;
+
+        free(ops);
+
         return ret;
 }
 
@@ -1669,12 +1719,41 @@ hw_alloc_reset_assoc_cores(void)
 {
         int ret = PQOS_RETVAL_OK;
         const struct pqos_cpuinfo *cpu = _pqos_get_cpu();
+        struct msr_op *ops;
+        unsigned num_ops = 0;
         unsigned i;
 
-        for (i = 0; i < cpu->num_cores; i++)
-                if (hw_alloc_assoc_write(cpu->cores[i].lcore, 0) !=
-                    PQOS_RETVAL_OK)
-                        ret = PQOS_RETVAL_ERROR;
+        if (cpu->num_cores == 0)
+                return PQOS_RETVAL_OK;
+
+        ops = calloc(cpu->num_cores, sizeof(ops[0]));
+        if (ops == NULL)
+                return PQOS_RETVAL_RESOURCE;
+
+        /* read PQR_ASSOC of all cores, then clear COS on all of them */
+        for (i = 0; i < cpu->num_cores; i++) {
+                ops[i].lcore = cpu->cores[i].lcore;
+                ops[i].reg = PQOS_MSR_ASSOC;
+        }
+
+        if (msr_read_batch(ops, cpu->num_cores) != MACHINE_RETVAL_OK)
+                ret = PQOS_RETVAL_ERROR;
+
+        for (i = 0; i < cpu->num_cores; i++) {
+                if (ops[i].retval != MACHINE_RETVAL_OK)
+                        continue;
+
+                ops[num_ops].lcore = ops[i].lcore;
+                ops[num_ops].reg = PQOS_MSR_ASSOC;
+                ops[num_ops].value =
+                    ops[i].value & ~PQOS_MSR_ASSOC_QECOS_MASK;
+                num_ops++;
+        }
+
+        if (msr_write_batch(ops, num_ops) != MACHINE_RETVAL_OK)
+                ret = PQOS_RETVAL_ERROR;
+
+        free(ops);
 
         return ret;
 }
@@ -1752,6 +1831,9 @@ hw_alloc_reset(const struct pqos_alloc_config *cfg)
 
         ASSERT(cfg != NULL);
 
+        /* reset has to reach hardware even if shadow registers match */
+        msr_shadow_invalidate();
+
         ret = alloc_reset(cfg);
         if (ret != PQOS_RETVAL_OK) {
                 LOG_ERROR("Failed to reset allocation configuration\n");
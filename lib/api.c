@@ -83,6 +83,11 @@ static struct pqos_api {
                               const enum pqos_mon_event event,
                               void *context,
                               struct pqos_mon_data *group);
+        /** Starts resource monitoring of multiple core groups */
+        int (*mon_start_groups)(const unsigned num_specs,
+                                const struct pqos_mon_group_spec *specs,
+                                const struct pqos_mon_options *opts,
+                                struct pqos_mon_data **groups);
         /** Starts resource monitoring on selected channels */
         int (*mon_start_channels)(const unsigned num_channels,
                                   const pqos_channel_t *channels,
@@ -211,6 +216,7 @@ api_init(int interface, enum pqos_vendor vendor)
                 api.mon_assoc_get = hw_mon_assoc_get_core;
                 api.mon_assoc_get_channel = hw_mon_assoc_get_channel;
                 api.mon_start_cores = hw_mon_start_cores;
+                api.mon_start_groups = hw_mon_start_groups;
                 api.mon_start_channels = hw_mon_start_channels;
                 api.mon_stop = hw_mon_stop;
                 api.mon_reset = hw_mon_reset;
@@ -896,6 +902,37 @@ pqos_mon_assoc_get_dev(const uint16_t segment,
         return ret;
 }
 
+/**
+ * @brief Validates core/pid monitoring event selection
+ *
+ * - only combinations of events allowed
+ * - do not allow non-PQoS events to be monitored on its own
+ *
+ * @param [in] event combination of monitoring events
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK event selection is valid
+ */
+static int
+mon_event_check(const enum pqos_mon_event event)
+{
+        if (event & (~(PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
+                       PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW |
+                       PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
+                       PQOS_PERF_EVENT_LLC_REF)))
+                return PQOS_RETVAL_PARAM;
+
+        if ((event & (PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
+                      PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW)) == 0 &&
+            (event & (PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
+                      PQOS_PERF_EVENT_LLC_REF)) != 0) {
+                LOG_ERROR("Only PMU events selected for monitoring\n");
+                return PQOS_RETVAL_PARAM;
+        }
+
+        return PQOS_RETVAL_OK;
+}
+
 int
 pqos_mon_start(const unsigned num_cores,
                const unsigned *cores,
@@ -912,24 +949,9 @@ pqos_mon_start(const unsigned num_cores,
         if (group->valid == GROUP_VALID_MARKER)
                 return PQOS_RETVAL_PARAM;
 
-        /**
-         * Validate event parameter
-         * - only combinations of events allowed
-         * - do not allow non-PQoS events to be monitored on its own
-         */
-        if (event & (~(PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                       PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW |
-                       PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                       PQOS_PERF_EVENT_LLC_REF)))
-                return PQOS_RETVAL_PARAM;
-
-        if ((event & (PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                      PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW)) == 0 &&
-            (event & (PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                      PQOS_PERF_EVENT_LLC_REF)) != 0) {
-                LOG_ERROR("Only PMU events selected for monitoring\n");
-                return PQOS_RETVAL_PARAM;
-        }
+        ret = mon_event_check(event);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
 
         struct pqos_mon_data_internal *mem = malloc(sizeof(*group->intl));
 
@@ -1000,24 +1022,9 @@ pqos_mon_start_cores_ext(const unsigned num_cores,
             opt == NULL)
                 return PQOS_RETVAL_PARAM;
 
-        /**
-         * Validate event parameter
-         * - only combinations of events allowed
-         * - do not allow non-PQoS events to be monitored on its own
-         */
-        if (event & (~(PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                       PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW |
-                       PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                       PQOS_PERF_EVENT_LLC_REF)))
-                return PQOS_RETVAL_PARAM;
-
-        if ((event & (PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                      PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW)) == 0 &&
-            (event & (PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                      PQOS_PERF_EVENT_LLC_REF)) != 0) {
-                LOG_ERROR("Only PMU events selected for monitoring\n");
-                return PQOS_RETVAL_PARAM;
-        }
+        ret = mon_event_check(event);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
 
         data = calloc(1, sizeof(*data) + sizeof(struct pqos_mon_data_internal));
         if (data == NULL)
@@ -1057,7 +1064,21 @@ pqos_mon_stop(struct pqos_mon_data *group)
                 return ret;
         }
 
-        if (api.mon_stop != NULL)
+        if (group->intl->rollup.num_parent > 0) {
+                LOG_ERROR("Monitoring group is used by %u rollup group(s)\n",
+                          group->intl->rollup.num_parent);
+                lock_release();
+                return PQOS_RETVAL_PARAM;
+        }
+
+        if (group->intl->rollup.num_child > 0) {
+                unsigned i;
+
+                for (i = 0; i < group->intl->rollup.num_child; i++)
+                        group->intl->rollup.child[i]->intl->rollup.num_parent--;
+                free(group->intl->rollup.child);
+                ret = PQOS_RETVAL_OK;
+        } else if (api.mon_stop != NULL)
                 ret = api.mon_stop(group);
         else {
                 LOG_INFO(UNSUPPORTED_INTERFACE);
@@ -1081,6 +1102,8 @@ pqos_mon_poll(struct pqos_mon_data **groups, const unsigned num_groups)
 {
         int ret;
         unsigned i;
+        struct pqos_mon_data **all = NULL;
+        unsigned num_all = 0;
 
         if (groups == NULL || num_groups == 0 || *groups == NULL)
                 return PQOS_RETVAL_PARAM;
@@ -1102,17 +1125,41 @@ pqos_mon_poll(struct pqos_mon_data **groups, const unsigned num_groups)
                 return ret;
         }
 
-        for (i = 0; i < num_groups; i++) {
-                int retval = pqos_mon_poll_events(groups[i]);
+        /* rollup groups need all their descendants polled */
+        ret = pqos_mon_rollup_expand(groups, num_groups, &all, &num_all);
+        if (ret != PQOS_RETVAL_OK) {
+                lock_release();
+                return ret;
+        }
 
-                if (retval != PQOS_RETVAL_OK) {
-                        LOG_WARN("Failed to poll event on group number %u\n",
-                                 i);
-                        ret = retval;
+        /* poll groups of each L3 domain concurrently if enabled */
+        ret = pqos_mon_poll_workers(all, num_all);
+        if (ret == PQOS_RETVAL_RESOURCE) {
+                ret = PQOS_RETVAL_OK;
+                for (i = 0; i < num_all; i++) {
+                        int retval;
+
+                        if (all[i]->intl->rollup.num_child > 0)
+                                continue;
+
+                        retval = pqos_mon_poll_events(all[i]);
+                        if (retval != PQOS_RETVAL_OK) {
+                                LOG_WARN("Failed to poll event on group "
+                                         "number %u\n",
+                                         i);
+                                ret = retval;
+                        }
                 }
         }
+
+        /* compute rollup groups from freshly polled children */
+        pqos_mon_rollup_poll(all, num_all);
+
         lock_release();
 
+        if (all != groups)
+                free(all);
+
         return ret;
 }
 
@@ -1143,24 +1190,9 @@ pqos_mon_start_pids(const unsigned num_pids,
         if (group->valid == GROUP_VALID_MARKER)
                 return PQOS_RETVAL_PARAM;
 
-        /**
-         * Validate event parameter
-         * - only combinations of events allowed
-         * - do not allow non-PQoS events to be monitored on its own
-         */
-        if (event & (~(PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                       PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW |
-                       PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                       PQOS_PERF_EVENT_LLC_REF)))
-                return PQOS_RETVAL_PARAM;
-
-        if ((event & (PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                      PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW)) == 0 &&
-            (event & (PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                      PQOS_PERF_EVENT_LLC_REF)) != 0) {
-                LOG_ERROR("Only PMU events selected for monitoring\n");
-                return PQOS_RETVAL_PARAM;
-        }
+        ret = mon_event_check(event);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
 
         struct pqos_mon_data_internal *mem = malloc(sizeof(*group->intl));
 
@@ -1210,24 +1242,9 @@ pqos_mon_start_pids2(const unsigned num_pids,
         if (group == NULL || num_pids == 0 || pids == NULL || event == 0)
                 return PQOS_RETVAL_PARAM;
 
-        /**
-         * Validate event parameter
-         * - only combinations of events allowed
-         * - do not allow non-PQoS events to be monitored on its own
-         */
-        if (event & (~(PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                       PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW |
-                       PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                       PQOS_PERF_EVENT_LLC_REF)))
-                return PQOS_RETVAL_PARAM;
-
-        if ((event & (PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |
-                      PQOS_MON_EVENT_TMEM_BW | PQOS_MON_EVENT_RMEM_BW)) == 0 &&
-            (event & (PQOS_PERF_EVENT_IPC | PQOS_PERF_EVENT_LLC_MISS |
-                      PQOS_PERF_EVENT_LLC_REF)) != 0) {
-                LOG_ERROR("Only PMU events selected for monitoring\n");
-                return PQOS_RETVAL_PARAM;
-        }
+        ret = mon_event_check(event);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
 
         data = calloc(1, sizeof(*data) + sizeof(struct pqos_mon_data_internal));
         if (data == NULL)
@@ -1247,6 +1264,206 @@ pqos_mon_start_pids2(const unsigned num_pids,
         return ret;
 }
 
+int
+pqos_mon_start_groups(const unsigned num_specs,
+                      const struct pqos_mon_group_spec *specs,
+                      struct pqos_mon_data **groups)
+{
+        return pqos_mon_start_groups_ext(num_specs, specs, NULL, groups);
+}
+
+int
+pqos_mon_start_groups_ext(const unsigned num_specs,
+                          const struct pqos_mon_group_spec *specs,
+                          const struct pqos_mon_options *opts,
+                          struct pqos_mon_data **groups)
+{
+        static const struct pqos_mon_options opt_default;
+        unsigned started = 0;
+        unsigned i;
+        int ret;
+
+        if (num_specs == 0 || specs == NULL || groups == NULL)
+                return PQOS_RETVAL_PARAM;
+
+        /**
+         * Validate all groups before touching any monitoring resources
+         */
+        for (i = 0; i < num_specs; i++) {
+                const struct pqos_mon_group_spec *spec = &specs[i];
+
+                if (spec->num == 0 || spec->event == 0)
+                        return PQOS_RETVAL_PARAM;
+                if (spec->type == PQOS_MON_GROUP_CORES) {
+                        if (spec->cores == NULL)
+                                return PQOS_RETVAL_PARAM;
+                } else if (spec->type == PQOS_MON_GROUP_PIDS) {
+                        if (spec->pids == NULL)
+                                return PQOS_RETVAL_PARAM;
+                } else
+                        return PQOS_RETVAL_PARAM;
+
+                ret = mon_event_check(spec->event);
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+        }
+
+        for (i = 0; i < num_specs; i++) {
+                struct pqos_mon_data *data;
+
+                data = calloc(1, sizeof(*data) +
+                                     sizeof(struct pqos_mon_data_internal));
+                if (data == NULL) {
+                        while (i > 0)
+                                free(groups[--i]);
+                        return PQOS_RETVAL_RESOURCE;
+                }
+                data->intl = (struct pqos_mon_data_internal *)(&data[1]);
+                data->intl->manage_memory = 1;
+                groups[i] = data;
+        }
+
+        lock_get();
+
+        ret = _pqos_check_init(1);
+        for (i = 0; ret == PQOS_RETVAL_OK && i < num_specs; i++)
+                if ((specs[i].type == PQOS_MON_GROUP_CORES &&
+                     api.mon_start_cores == NULL) ||
+                    (specs[i].type == PQOS_MON_GROUP_PIDS &&
+                     api.mon_start_pids == NULL)) {
+                        LOG_INFO(UNSUPPORTED_INTERFACE);
+                        ret = PQOS_RETVAL_RESOURCE;
+                }
+
+        /**
+         * Interface starting all groups in one pass rolls them back itself
+         */
+        if (ret == PQOS_RETVAL_OK && api.mon_start_groups != NULL)
+                ret = api.mon_start_groups(num_specs, specs, opts, groups);
+        else
+                for (i = 0; ret == PQOS_RETVAL_OK && i < num_specs; i++) {
+                        const struct pqos_mon_group_spec *spec = &specs[i];
+                        const struct pqos_mon_options *opt =
+                            opts != NULL ? &opts[i] : &opt_default;
+
+                        if (spec->type == PQOS_MON_GROUP_CORES)
+                                ret = api.mon_start_cores(
+                                    spec->num, spec->cores, spec->event,
+                                    spec->context, spec->mem_region, groups[i],
+                                    opt);
+                        else
+                                ret = api.mon_start_pids(
+                                    spec->num, spec->pids, spec->event,
+                                    spec->context, groups[i]);
+                        if (ret != PQOS_RETVAL_OK) {
+                                LOG_ERROR("Failed to start monitoring group "
+                                          "%u\n",
+                                          i);
+                                break;
+                        }
+                        started++;
+                }
+
+        /**
+         * Roll back groups started so far
+         */
+        if (ret != PQOS_RETVAL_OK)
+                while (started > 0) {
+                        started--;
+                        if (api.mon_stop(groups[started]) != PQOS_RETVAL_OK)
+                                LOG_WARN("Failed to stop monitoring group "
+                                         "%u\n",
+                                         started);
+                }
+
+        lock_release();
+
+        for (i = 0; i < num_specs; i++)
+                if (ret == PQOS_RETVAL_OK)
+                        groups[i]->valid = GROUP_VALID_MARKER;
+                else {
+                        free(groups[i]);
+                        groups[i] = NULL;
+                }
+
+        return ret;
+}
+
+int
+pqos_mon_start_rollup(const unsigned num_children,
+                      struct pqos_mon_data **children,
+                      void *context,
+                      struct pqos_mon_data **group)
+{
+        struct pqos_mon_data *data;
+        enum pqos_mon_event event = (enum pqos_mon_event)~0;
+        unsigned level = 0;
+        unsigned i, j;
+        int ret;
+
+        if (num_children == 0 || children == NULL || group == NULL)
+                return PQOS_RETVAL_PARAM;
+
+        for (i = 0; i < num_children; i++) {
+                if (children[i] == NULL ||
+                    children[i]->valid != GROUP_VALID_MARKER)
+                        return PQOS_RETVAL_PARAM;
+                for (j = 0; j < i; j++)
+                        if (children[j] == children[i]) {
+                                LOG_ERROR("Duplicate child monitoring group\n");
+                                return PQOS_RETVAL_PARAM;
+                        }
+                event &= children[i]->event;
+        }
+
+        if (event == 0) {
+                LOG_ERROR("Child monitoring groups have no common events\n");
+                return PQOS_RETVAL_PARAM;
+        }
+
+        data = calloc(1, sizeof(*data) + sizeof(struct pqos_mon_data_internal));
+        if (data == NULL)
+                return PQOS_RETVAL_RESOURCE;
+
+        data->intl = (struct pqos_mon_data_internal *)(&data[1]);
+        data->intl->manage_memory = 1;
+        data->intl->rollup.child = malloc(num_children * sizeof(*children));
+        if (data->intl->rollup.child == NULL) {
+                free(data);
+                return PQOS_RETVAL_RESOURCE;
+        }
+
+        lock_get();
+
+        ret = _pqos_check_init(1);
+        if (ret != PQOS_RETVAL_OK) {
+                lock_release();
+                free(data->intl->rollup.child);
+                free(data);
+                return ret;
+        }
+
+        for (i = 0; i < num_children; i++) {
+                struct pqos_mon_data *child = children[i];
+
+                if (child->intl->rollup.level >= level)
+                        level = child->intl->rollup.level + 1;
+                child->intl->rollup.num_parent++;
+                data->intl->rollup.child[i] = child;
+        }
+        data->intl->rollup.num_child = num_children;
+        data->intl->rollup.level = level;
+        data->event = event;
+        data->context = context;
+        data->regions = children[0]->regions;
+        data->valid = GROUP_VALID_MARKER;
+        *group = data;
+
+        lock_release();
+
+        return PQOS_RETVAL_OK;
+}
+
 int
 pqos_mon_add_pids(const unsigned num_pids,
                   const pid_t *pids,
@@ -1431,6 +1648,72 @@ pqos_mon_start_dev_exit:
         return ret;
 }
 
+/**
+ * @brief Retrieves monitoring value and delta of an event
+ *
+ * @param [in] group monitoring group
+ * @param [in] event_id event being monitored
+ * @param [out] value monitoring counter value
+ * @param [out] delta monitoring counter delta
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+mon_get_value(const struct pqos_mon_data *const group,
+              const enum pqos_mon_event event_id,
+              uint64_t *value,
+              uint64_t *delta)
+{
+        switch (event_id) {
+        case PQOS_MON_EVENT_L3_OCCUP:
+                *value = group->values.llc;
+                *delta = 0;
+                break;
+        case PQOS_MON_EVENT_LMEM_BW:
+                *value = group->values.mbm_local;
+                *delta = group->values.mbm_local_delta;
+                break;
+        case PQOS_MON_EVENT_TMEM_BW:
+                *value = group->values.mbm_total;
+                *delta = group->values.mbm_total_delta;
+                break;
+        case PQOS_MON_EVENT_RMEM_BW:
+                *value = group->values.mbm_remote;
+                *delta = group->values.mbm_remote_delta;
+                break;
+        case PQOS_PERF_EVENT_LLC_MISS:
+                *value = group->values.llc_misses;
+                *delta = group->values.llc_misses_delta;
+                break;
+        case PQOS_PERF_EVENT_LLC_REF:
+                *value = group->values.llc_references;
+                *delta = group->values.llc_references_delta;
+                break;
+        case PQOS_PERF_EVENT_LLC_MISS_PCIE_READ:
+                *value = group->intl->values.pcie.llc_misses.read;
+                *delta = group->intl->values.pcie.llc_misses.read_delta;
+                break;
+        case PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE:
+                *value = group->intl->values.pcie.llc_misses.write;
+                *delta = group->intl->values.pcie.llc_misses.write_delta;
+                break;
+        case PQOS_PERF_EVENT_LLC_REF_PCIE_READ:
+                *value = group->intl->values.pcie.llc_references.read;
+                *delta = group->intl->values.pcie.llc_references.read_delta;
+                break;
+        case PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE:
+                *value = group->intl->values.pcie.llc_references.write;
+                *delta = group->intl->values.pcie.llc_references.write_delta;
+                break;
+        default:
+                LOG_ERROR("Unknown event %x\n", event_id);
+                return PQOS_RETVAL_PARAM;
+        }
+
+        return PQOS_RETVAL_OK;
+}
+
 int
 pqos_mon_get_value(const struct pqos_mon_data *const group,
                    const enum pqos_mon_event event_id,
@@ -1464,55 +1747,11 @@ pqos_mon_get_value(const struct pqos_mon_data *const group,
                 return ret;
         }
 
-        switch (event_id) {
-        case PQOS_MON_EVENT_L3_OCCUP:
-                if (delta != NULL)
-                        LOG_WARN("Counter delta is undefined for "
-                                 "PQOS_MON_EVENT_L3_OCCUP\n");
-                _value = group->values.llc;
-                _delta = 0;
-                break;
-        case PQOS_MON_EVENT_LMEM_BW:
-                _value = group->values.mbm_local;
-                _delta = group->values.mbm_local_delta;
-                break;
-        case PQOS_MON_EVENT_TMEM_BW:
-                _value = group->values.mbm_total;
-                _delta = group->values.mbm_total_delta;
-                break;
-        case PQOS_MON_EVENT_RMEM_BW:
-                _value = group->values.mbm_remote;
-                _delta = group->values.mbm_remote_delta;
-                break;
-        case PQOS_PERF_EVENT_LLC_MISS:
-                _value = group->values.llc_misses;
-                _delta = group->values.llc_misses_delta;
-                break;
-        case PQOS_PERF_EVENT_LLC_REF:
-                _value = group->values.llc_references;
-                _delta = group->values.llc_references_delta;
-                break;
-        case PQOS_PERF_EVENT_LLC_MISS_PCIE_READ:
-                _value = group->intl->values.pcie.llc_misses.read;
-                _delta = group->intl->values.pcie.llc_misses.read_delta;
-                break;
-        case PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE:
-                _value = group->intl->values.pcie.llc_misses.write;
-                _delta = group->intl->values.pcie.llc_misses.write_delta;
-                break;
-        case PQOS_PERF_EVENT_LLC_REF_PCIE_READ:
-                _value = group->intl->values.pcie.llc_references.read;
-                _delta = group->intl->values.pcie.llc_references.read_delta;
-                break;
-        case PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE:
-                _value = group->intl->values.pcie.llc_references.write;
-                _delta = group->intl->values.pcie.llc_references.write_delta;
-                break;
-        default:
-                LOG_ERROR("Unknown event %x\n", event_id);
-                ret = PQOS_RETVAL_PARAM;
-        }
+        if (event_id == PQOS_MON_EVENT_L3_OCCUP && delta != NULL)
+                LOG_WARN("Counter delta is undefined for "
+                         "PQOS_MON_EVENT_L3_OCCUP\n");
 
+        ret = mon_get_value(group, event_id, &_value, &_delta);
         if (ret == PQOS_RETVAL_OK) {
                 if (value != NULL)
                         *value = _value;
@@ -1525,6 +1764,90 @@ pqos_mon_get_value(const struct pqos_mon_data *const group,
         return ret;
 }
 
+int
+pqos_mon_get_timestamp(const struct pqos_mon_data *const group,
+                       uint64_t *timestamp,
+                       uint64_t *elapsed)
+{
+        int ret;
+
+        if (group == NULL || (timestamp == NULL && elapsed == NULL))
+                return PQOS_RETVAL_PARAM;
+
+        if (group->valid != GROUP_VALID_MARKER || group->intl == NULL)
+                return PQOS_RETVAL_PARAM;
+
+        lock_get();
+
+        ret = _pqos_check_init(1);
+        if (ret != PQOS_RETVAL_OK) {
+                lock_release();
+                return ret;
+        }
+
+        if (timestamp != NULL)
+                *timestamp = group->intl->timestamp.read;
+        if (elapsed != NULL) {
+                *elapsed = 0;
+                if (group->intl->timestamp.prev_read != 0)
+                        *elapsed = group->intl->timestamp.read -
+                                   group->intl->timestamp.prev_read;
+        }
+
+        lock_release();
+
+        return ret;
+}
+
+int
+pqos_mon_get_rate(const struct pqos_mon_data *const group,
+                  const enum pqos_mon_event event_id,
+                  double *rate)
+{
+        int ret;
+        uint64_t value;
+        uint64_t delta;
+        uint64_t elapsed = 0;
+
+        if (group == NULL || rate == NULL)
+                return PQOS_RETVAL_PARAM;
+
+        if (event_id == PQOS_MON_EVENT_L3_OCCUP ||
+            event_id == PQOS_PERF_EVENT_IPC) {
+                LOG_ERROR("Rate is undefined for event %x\n", event_id);
+                return PQOS_RETVAL_PARAM;
+        }
+
+        if (group->valid != GROUP_VALID_MARKER || group->intl == NULL)
+                return PQOS_RETVAL_PARAM;
+
+        if ((group->event & event_id) == 0)
+                return PQOS_RETVAL_PARAM;
+
+        lock_get();
+
+        ret = _pqos_check_init(1);
+        if (ret != PQOS_RETVAL_OK) {
+                lock_release();
+                return ret;
+        }
+
+        ret = mon_get_value(group, event_id, &value, &delta);
+        if (ret == PQOS_RETVAL_OK) {
+                if (group->intl->timestamp.prev_read != 0)
+                        elapsed = group->intl->timestamp.read -
+                                  group->intl->timestamp.prev_read;
+                if (elapsed > 0)
+                        *rate = (double)delta * 1000000000.0 / (double)elapsed;
+                else
+                        *rate = 0.0;
+        }
+
+        lock_release();
+
+        return ret;
+}
+
 int
 pqos_mon_get_region_value(const struct pqos_mon_data *const group,
                           const enum pqos_mon_event event_id,
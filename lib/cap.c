@@ -150,6 +150,10 @@ _pqos_check_init(const int expect)
                 return PQOS_RETVAL_INIT;
         }
 
+        /* API lock is held, pick up register changes made by others */
+        if (m_init_done)
+                msr_shadow_validate();
+
         return PQOS_RETVAL_OK;
 }
 
@@ -785,6 +789,11 @@ pqos_init(const struct pqos_config *config)
                 goto cpuinfo_init_error;
         }
 
+        /* kernel rewrites PQR_ASSOC on context switch with OS interface */
+        if ((interface == PQOS_INTER_MSR || interface == PQOS_INTER_MMIO) &&
+            msr_shadow_init(cpu) != MACHINE_RETVAL_OK)
+                LOG_WARN("Failed to allocate MSR shadow table\n");
+
         if (hw_detect_hybrid())
                 LOG_WARN(
                     "Hybrid part with L2 CAT support detected.\n"
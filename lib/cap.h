@@ -118,6 +118,9 @@ PQOS_LOCAL void _pqos_cap_mon_snc_change(const enum pqos_snc_config cfg);
 /**
  * @brief Checks library initialization state
  *
+ * Called with the API lock held on entry to each API function. Validates
+ * MSR shadow registers of the initialized library.
+ *
  * @param expect expected stated of library initialization state
  *
  * @return Check status
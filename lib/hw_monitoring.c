@@ -45,6 +45,7 @@
 #include "cpu_registers.h"
 #include "cpuinfo.h"
 #include "iordt.h"
+#include "lock.h"
 #include "log.h"
 #include "machine.h"
 #include "monitoring.h"
@@ -54,8 +55,10 @@
 
 #include <dirent.h>
 #include <limits.h>
+#include <pthread.h>
 #include <stdlib.h>
 #include <string.h>
+#include <time.h>
 
 /**
  * ---------------------------------------
@@ -63,12 +66,90 @@
  * ---------------------------------------
  */
 
+/**
+ * RMID pool of an L3 cluster
+ */
+struct hw_mon_rmid_pool {
+        unsigned cluster; /**< L3 cluster id */
+        int synced;       /**< RMID usage read from the hardware */
+        uint64_t *used;   /**< bitmap of RMIDs in use */
+        uint64_t *held;   /**< bitmap of RMIDs allocated by this process */
+};
+
+/**
+ * Number of 64-bit words in the RMID pool bitmap
+ */
+#define RMID_POOL_WORDS(max) ((max) / 64 + 1)
+
+/**
+ * Environment variable overriding platform peak memory bandwidth in MB/s,
+ * used to compute MBM counter wrap time. Value 0 disables catch-up reads.
+ */
+#define MBM_PEAK_BW_ENV "RDT_MON_MBM_PEAK_BW"
+
+/**
+ * Default peak memory bandwidth in MB/s
+ */
+#define MBM_PEAK_BW_DEFAULT (512 * 1024)
+
+/**
+ * Minimum period of MBM catch-up reads in ns
+ */
+#define MBM_CATCHUP_MIN_NS (10ULL * 1000000ULL)
+
+/**
+ * Index of MBM event counter in poll context
+ */
+#define MBM_IDX(event) ((event) == PQOS_MON_EVENT_LMEM_BW ? 0 : 1)
+
 /**
  * ---------------------------------------
  * Local data structures
  * ---------------------------------------
  */
 static unsigned m_rmid_max = 0; /**< max RMID */
+static struct hw_mon_rmid_pool *m_rmid_pool = NULL; /**< RMID pools */
+static unsigned m_rmid_pool_num = 0; /**< number of RMID pools */
+
+/**
+ * PQR_ASSOC writes deferred by hw_mon_start_groups()
+ *
+ * When \a ops is set, hw_mon_start_counter() appends association writes
+ * to the table instead of writing them, so all groups are associated with
+ * a single batch.
+ */
+static struct {
+        struct msr_op *ops; /**< deferred writes, NULL when not batching */
+        unsigned num;       /**< number of writes in \a ops */
+} m_assoc_batch;
+
+/**
+ * Retry period of catch-up thread waiting for the API lock
+ */
+#define MBM_CATCHUP_RETRY_NS (1000000ULL)
+
+/**
+ * MBM counters catch-up reads
+ *
+ * MBM counters are extended to 64 bits per RMID on every read. Groups not
+ * read by the application within half of the worst case counter wrap time
+ * are read by the catch-up thread, so no wrap is missed. The thread reads
+ * the counters with the API lock held, so it does not interleave with the
+ * API calls programming the same registers. Group table is modified with
+ * the API lock held as well.
+ */
+static struct {
+        uint64_t period_ns;            /**< catch-up period, 0 if disabled */
+        uint64_t max_value[2];         /**< local and total counter range */
+        struct pqos_mon_data **groups; /**< groups with MBM events */
+        unsigned num_groups;
+        pthread_mutex_t mutex; /**< protects thread state */
+        pthread_cond_t wake;   /**< signals shutdown */
+        pthread_t thread;
+        int running;
+        int shutdown;
+} m_mbm = {.mutex = PTHREAD_MUTEX_INITIALIZER,
+           .wake = PTHREAD_COND_INITIALIZER};
 
 /**
  * ---------------------------------------
@@ -81,6 +162,14 @@ static unsigned get_event_id(const enum pqos_mon_event event);
 static uint64_t scale_event(const enum pqos_mon_event event,
                             const uint64_t val);
 
+static int rmid_pool_init(const struct pqos_cpuinfo *cpu);
+
+static void rmid_pool_fini(void);
+
+static void mbm_catchup_init(const struct pqos_cap *cap);
+
+static void mbm_catchup_fini(void);
+
 /*
  * =======================================
  * =======================================
@@ -97,8 +186,6 @@ hw_mon_init(const struct pqos_cpuinfo *cpu, const struct pqos_cap *cap)
         int ret;
         const struct pqos_capability *item = NULL;
 
-        UNUSED_PARAM(cpu);
-
         ret = pqos_cap_get_type(cap, PQOS_CAP_TYPE_MON, &item);
         if (ret != PQOS_RETVAL_OK)
                 return PQOS_RETVAL_RESOURCE;
@@ -110,6 +197,12 @@ hw_mon_init(const struct pqos_cpuinfo *cpu, const struct pqos_cap *cap)
         }
         LOG_DEBUG("Max RMID per monitoring cluster is %u\n", m_rmid_max);
 
+        ret = rmid_pool_init(cpu);
+        if (ret != PQOS_RETVAL_OK)
+                goto hw_mon_init_exit;
+
+        mbm_catchup_init(cap);
+
 #ifdef __linux__
         ret = perf_mon_init(cpu, cap);
         if (ret != PQOS_RETVAL_RESOURCE && ret != PQOS_RETVAL_OK)
@@ -135,6 +228,10 @@ hw_mon_fini(void)
 {
         m_rmid_max = 0;
 
+        mbm_catchup_fini();
+
+        rmid_pool_fini();
+
         uncore_mon_fini();
 
 #ifdef __linux__
@@ -243,54 +340,183 @@ get_socket(const struct pqos_cpuinfo *cpu, unsigned numa, unsigned *socket)
         return PQOS_RETVAL_ERROR;
 }
 
-int
-hw_mon_assoc_unused(struct pqos_mon_poll_ctx *ctx,
-                    const enum pqos_mon_event event,
-                    pqos_rmid_t min_rmid,
-                    pqos_rmid_t max_rmid,
-                    const struct pqos_mon_options *opt)
+/**
+ * @brief Creates empty RMID pool for each L3 cluster
+ *
+ * Pools are synchronized with the hardware on first use.
+ *
+ * @param [in] cpu CPU information structure
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK success
+ */
+static int
+rmid_pool_init(const struct pqos_cpuinfo *cpu)
+{
+        unsigned *l3_clusters;
+        unsigned num = 0;
+        unsigned i;
+
+        l3_clusters = pqos_cpu_get_l3_clusters(cpu, &num);
+        if (l3_clusters == NULL)
+                return PQOS_RETVAL_ERROR;
+
+        m_rmid_pool = calloc(num, sizeof(m_rmid_pool[0]));
+        if (m_rmid_pool == NULL) {
+                free(l3_clusters);
+                return PQOS_RETVAL_RESOURCE;
+        }
+        m_rmid_pool_num = num;
+
+        for (i = 0; i < num; i++) {
+                m_rmid_pool[i].cluster = l3_clusters[i];
+                m_rmid_pool[i].used = calloc(RMID_POOL_WORDS(m_rmid_max),
+                                             sizeof(m_rmid_pool[i].used[0]));
+                m_rmid_pool[i].held = calloc(RMID_POOL_WORDS(m_rmid_max),
+                                             sizeof(m_rmid_pool[i].held[0]));
+                if (m_rmid_pool[i].used == NULL ||
+                    m_rmid_pool[i].held == NULL) {
+                        free(l3_clusters);
+                        return PQOS_RETVAL_RESOURCE;
+                }
+        }
+
+        free(l3_clusters);
+        return PQOS_RETVAL_OK;
+}
+
+/**
+ * @brief Frees RMID pools
+ */
+static void
+rmid_pool_fini(void)
+{
+        unsigned i;
+
+        if (m_rmid_pool != NULL) {
+                for (i = 0; i < m_rmid_pool_num; i++) {
+                        free(m_rmid_pool[i].used);
+                        free(m_rmid_pool[i].held);
+                }
+                free(m_rmid_pool);
+        }
+        m_rmid_pool = NULL;
+        m_rmid_pool_num = 0;
+}
+
+/**
+ * @brief Finds RMID pool of \a cluster
+ *
+ * @param [in] cluster L3 cluster id
+ *
+ * @return RMID pool
+ * @retval NULL if not found
+ */
+static struct hw_mon_rmid_pool *
+rmid_pool_get(const unsigned cluster)
+{
+        unsigned i;
+
+        for (i = 0; i < m_rmid_pool_num; i++)
+                if (m_rmid_pool[i].cluster == cluster)
+                        return &m_rmid_pool[i];
+
+        return NULL;
+}
+
+/**
+ * @brief Checks if \a rmid is marked as used in the pool
+ *
+ * @param [in] pool RMID pool
+ * @param [in] rmid RMID to check
+ *
+ * @return 1 if RMID is used, 0 otherwise
+ */
+static int
+rmid_pool_is_used(const struct hw_mon_rmid_pool *pool, const pqos_rmid_t rmid)
+{
+        return (pool->used[rmid / 64] >> (rmid % 64)) & 1;
+}
+
+/**
+ * @brief Marks \a rmid as used in the pool
+ *
+ * @param [in,out] pool RMID pool
+ * @param [in] rmid RMID to mark
+ */
+static void
+rmid_pool_set(struct hw_mon_rmid_pool *pool, const pqos_rmid_t rmid)
+{
+        if (rmid <= m_rmid_max)
+                pool->used[rmid / 64] |= 1LLU << (rmid % 64);
+}
+
+/**
+ * @brief Marks \a rmid as allocated by this process
+ *
+ * @param [in,out] pool RMID pool
+ * @param [in] rmid RMID to mark
+ */
+static void
+rmid_pool_hold(struct hw_mon_rmid_pool *pool, const pqos_rmid_t rmid)
+{
+        rmid_pool_set(pool, rmid);
+        if (rmid <= m_rmid_max)
+                pool->held[rmid / 64] |= 1LLU << (rmid % 64);
+}
+
+/**
+ * @brief Marks \a rmid as free in the pool
+ *
+ * @param [in,out] pool RMID pool
+ * @param [in] rmid RMID to mark
+ */
+static void
+rmid_pool_clear(struct hw_mon_rmid_pool *pool, const pqos_rmid_t rmid)
+{
+        if (rmid <= m_rmid_max) {
+                pool->used[rmid / 64] &= ~(1LLU << (rmid % 64));
+                pool->held[rmid / 64] &= ~(1LLU << (rmid % 64));
+        }
+}
+
+/**
+ * @brief Rebuilds RMID pool by reading current associations of cores and
+ *        channels in the cluster
+ *
+ * RMIDs allocated by this process stay used, whether their association
+ * has been written yet or not.
+ *
+ * @param [in,out] pool RMID pool
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK success
+ */
+static int
+rmid_pool_sync(struct hw_mon_rmid_pool *pool)
 {
         const struct pqos_cpuinfo *cpu = _pqos_get_cpu();
         const struct pqos_cap *cap = _pqos_get_cap();
         const struct pqos_devinfo *dev = _pqos_get_dev();
-        int ret = PQOS_RETVAL_OK;
-        unsigned rmid = 0;
+        int ret;
         unsigned *core_list = NULL;
         unsigned i, core_count;
-        uint8_t *rmid_list = NULL;
         int iordt;
 
-        ASSERT(ctx != NULL);
+        pool->synced = 0;
+        memcpy(pool->used, pool->held,
+               RMID_POOL_WORDS(m_rmid_max) * sizeof(pool->used[0]));
 
-#ifndef PQOS_RMID_CUSTOM
-        UNUSED_PARAM(opt);
-#endif
-        /* Getting max RMID for given event */
-        ret = rmid_get_event_max(cap, &rmid, event);
-        if (ret != PQOS_RETVAL_OK)
-                return ret;
-        if (rmid - 1 < max_rmid)
-                max_rmid = rmid - 1;
-        if (min_rmid < 1)
-                min_rmid = 1;
+        /* read associations from hardware, not from the shadow registers */
+        msr_shadow_invalidate();
 
         ret = pqos_mon_iordt_enabled(cap, NULL, &iordt);
         if (ret != PQOS_RETVAL_OK)
-                goto rmid_alloc_error;
-
-        /* list of used RMIDs */
-        rmid_list = (uint8_t *)calloc(max_rmid + 2, sizeof(rmid_list[0]));
-        if (rmid_list == NULL)
-                return PQOS_RETVAL_RESOURCE;
+                return ret;
 
-        /**
-         * Check for free RMID in the cluster by reading current associations.
-         */
-        core_list = pqos_cpu_get_cores_l3id(cpu, ctx->cluster, &core_count);
-        if (core_list == NULL) {
-                ret = PQOS_RETVAL_ERROR;
-                goto rmid_alloc_error;
-        }
+        core_list = pqos_cpu_get_cores_l3id(cpu, pool->cluster, &core_count);
+        if (core_list == NULL)
+                return PQOS_RETVAL_ERROR;
         ASSERT(core_count > 0);
 
         /* Mark RMIDs used for core monitoring */
@@ -299,9 +525,8 @@ hw_mon_assoc_unused(struct pqos_mon_poll_ctx *ctx,
 
                 ret = hw_mon_assoc_read(core_list[i], &rmid);
                 if (ret != PQOS_RETVAL_OK)
-                        goto rmid_alloc_error;
-                if (rmid <= max_rmid)
-                        rmid_list[rmid] = 1;
+                        goto rmid_pool_sync_exit;
+                rmid_pool_set(pool, rmid);
         }
 
         /* mark used RMIDs for channels */
@@ -319,58 +544,162 @@ hw_mon_assoc_unused(struct pqos_mon_poll_ctx *ctx,
                         if (ret == PQOS_RETVAL_OK)
                                 ret = get_socket(cpu, numa, &socket);
                         if (ret == PQOS_RETVAL_OK) {
-                                if (socket != ctx->cluster)
+                                if (socket != pool->cluster)
                                         continue;
                         } else if (ret != PQOS_RETVAL_RESOURCE)
-                                goto rmid_alloc_error;
+                                goto rmid_pool_sync_exit;
 
                         ret = iordt_mon_assoc_read(channel->channel_id, &rmid);
                         if (ret != PQOS_RETVAL_OK)
-                                goto rmid_alloc_error;
+                                goto rmid_pool_sync_exit;
 
-                        if (rmid <= max_rmid)
-                                rmid_list[rmid] = 1;
+                        rmid_pool_set(pool, rmid);
                 }
 
+        pool->synced = 1;
+        ret = PQOS_RETVAL_OK;
+
+rmid_pool_sync_exit:
+        free(core_list);
+        return ret;
+}
+
+/**
+ * @brief Returns RMIDs of poll contexts to the pool
+ *
+ * @param [in] ctx poll contexts
+ * @param [in] num_ctx number of poll contexts
+ */
+static void
+rmid_pool_release(const struct pqos_mon_poll_ctx *ctx, const unsigned num_ctx)
+{
+        unsigned i;
+
+        for (i = 0; i < num_ctx; i++) {
+                struct hw_mon_rmid_pool *pool;
+
+                /* Additional SNC contexts do not own the RMID */
+                if (ctx[i].quiet)
+                        continue;
+
+                pool = rmid_pool_get(ctx[i].cluster);
+                if (pool != NULL)
+                        rmid_pool_clear(pool, ctx[i].rmid);
+        }
+}
+
+/**
+ * @brief Marks RMID pool of \a cluster for rebuild on next allocation
+ *
+ * @param [in] cluster L3 cluster id
+ */
+static void
+rmid_pool_invalidate(const unsigned cluster)
+{
+        struct hw_mon_rmid_pool *pool = rmid_pool_get(cluster);
+
+        if (pool != NULL)
+                pool->synced = 0;
+}
+
+int
+hw_mon_assoc_unused(struct pqos_mon_poll_ctx *ctx,
+                    const enum pqos_mon_event event,
+                    pqos_rmid_t min_rmid,
+                    pqos_rmid_t max_rmid,
+                    const struct pqos_mon_options *opt)
+{
+        const struct pqos_cap *cap = _pqos_get_cap();
+        struct hw_mon_rmid_pool *pool;
+        int ret = PQOS_RETVAL_OK;
+        unsigned rmid = 0;
+        unsigned i;
+        int synced = 0;
+
+        ASSERT(ctx != NULL);
+
+#ifndef PQOS_RMID_CUSTOM
+        UNUSED_PARAM(opt);
+#endif
+        /* Getting max RMID for given event */
+        ret = rmid_get_event_max(cap, &rmid, event);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
+        if (rmid - 1 < max_rmid)
+                max_rmid = rmid - 1;
+        if (min_rmid < 1)
+                min_rmid = 1;
+
+        pool = rmid_pool_get(ctx->cluster);
+        if (pool == NULL)
+                return PQOS_RETVAL_ERROR;
+
+        /**
+         * Pool is built from current associations on first use. Later it
+         * is only updated on start/stop and rebuilt when it runs out of
+         * RMIDs, in case other processes released some.
+         */
+        if (!pool->synced) {
+                ret = rmid_pool_sync(pool);
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+                synced = 1;
+        }
+
+rmid_alloc_retry:
 #ifdef PQOS_RMID_CUSTOM
         if (opt->rmid.type == PQOS_RMID_TYPE_MAP) {
                 if (opt->rmid.rmid < min_rmid || opt->rmid.rmid > max_rmid) {
                         LOG_ERROR("Custom RMID %u not in range %u-%u\n",
                                   opt->rmid.rmid, min_rmid, max_rmid);
-                        ret = PQOS_RETVAL_PARAM;
-                        goto rmid_alloc_error;
+                        return PQOS_RETVAL_PARAM;
                 }
 
-                if (opt->rmid.rmid > max_rmid ||
-                    rmid_list[opt->rmid.rmid] != 0) {
-                        LOG_ERROR("Custom RMID %u in use\n", opt->rmid.rmid);
+                ret = PQOS_RETVAL_OK;
+                if (rmid_pool_is_used(pool, opt->rmid.rmid))
                         ret = PQOS_RETVAL_ERROR;
-                        goto rmid_alloc_error;
-                }
-
-                ctx->rmid = opt->rmid.rmid;
+                else
+                        ctx->rmid = opt->rmid.rmid;
 
         } else if (opt->rmid.type == PQOS_RMID_TYPE_DEFAULT) {
 #endif
                 ret = PQOS_RETVAL_ERROR;
-                for (i = min_rmid; i <= max_rmid; i++)
-                        if (rmid_list[i] == 0) {
+                for (i = min_rmid; i <= max_rmid; i++) {
+                        /* skip fully used words */
+                        if (i % 64 == 0 && i + 63 <= max_rmid &&
+                            pool->used[i / 64] == UINT64_MAX) {
+                                i += 63;
+                                continue;
+                        }
+                        if (!rmid_pool_is_used(pool, i)) {
                                 ret = PQOS_RETVAL_OK;
                                 ctx->rmid = i;
                                 break;
                         }
+                }
 #ifdef PQOS_RMID_CUSTOM
         } else {
                 LOG_ERROR("RMID Custom: Unsupported rmid type: %u\n",
                           opt->rmid.type);
+                return PQOS_RETVAL_ERROR;
+        }
+#endif
+
+        if (ret != PQOS_RETVAL_OK && !synced) {
+                ret = rmid_pool_sync(pool);
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+                synced = 1;
+                goto rmid_alloc_retry;
         }
+
+#ifdef PQOS_RMID_CUSTOM
+        if (ret != PQOS_RETVAL_OK && opt->rmid.type == PQOS_RMID_TYPE_MAP)
+                LOG_ERROR("Custom RMID %u in use\n", opt->rmid.rmid);
 #endif
+        if (ret == PQOS_RETVAL_OK)
+                rmid_pool_hold(pool, ctx->rmid);
 
-rmid_alloc_error:
-        if (rmid_list != NULL)
-                free(rmid_list);
-        if (core_list != NULL)
-                free(core_list);
         return ret;
 }
 
@@ -466,6 +795,12 @@ hw_mon_assoc_get_channel(const pqos_channel_t channel_id, pqos_rmid_t *rmid)
 int
 hw_mon_reset(const struct pqos_mon_config *cfg)
 {
+        unsigned i;
+
+        /* associations are changed, rebuild RMID pools on next use */
+        for (i = 0; i < m_rmid_pool_num; i++)
+                m_rmid_pool[i].synced = 0;
+
         return mon_reset(cfg);
 }
 
@@ -531,33 +866,445 @@ hw_mon_read(const unsigned lcore,
 }
 
 /**
- * @brief Gives the difference between two values with regard to the possible
- *        overrun and counter length
+ * @brief Reads monitoring event data of poll contexts in one MSR batch
+ *
+ * On success data value of context i is stored in ops[i * 2 + 1].value.
+ *
+ * @param [in] ctx poll contexts (core and RMID)
+ * @param [in] num_ctx number of contexts in \a ctx
+ * @param [in] event monitoring event id
+ * @param [out] ops table of num_ctx * 2 MSR operations
+ * @param [in] serial execute operations by the calling thread only
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+hw_mon_read_ctx_ops(const struct pqos_mon_poll_ctx *ctx,
+                    const unsigned num_ctx,
+                    const unsigned event,
+                    struct msr_op *ops,
+                    const int serial)
+{
+        unsigned i;
+
+        /**
+         * Select event and read counter for all contexts in one batch,
+         * operations on the same core are executed in order
+         */
+        for (i = 0; i < num_ctx; i++) {
+                uint64_t val_evtsel;
+
+                val_evtsel = ((uint64_t)ctx[i].rmid) &
+                             PQOS_MSR_MON_EVTSEL_RMID_MASK;
+                val_evtsel <<= PQOS_MSR_MON_EVTSEL_RMID_SHIFT;
+                val_evtsel |=
+                    ((uint64_t)event) & PQOS_MSR_MON_EVTSEL_EVTID_MASK;
+
+                ops[i * 2].lcore = ctx[i].lcore;
+                ops[i * 2].reg = PQOS_MSR_MON_EVTSEL;
+                ops[i * 2].value = val_evtsel;
+                ops[i * 2].write = 1;
+                ops[i * 2 + 1].lcore = ctx[i].lcore;
+                ops[i * 2 + 1].reg = PQOS_MSR_MON_QMC;
+        }
+
+        if (serial)
+                for (i = 0; i < num_ctx * 2; i++)
+                        ops[i].retval =
+                            ops[i].write
+                                ? msr_write(ops[i].lcore, ops[i].reg,
+                                            ops[i].value)
+                                : msr_read(ops[i].lcore, ops[i].reg,
+                                           &ops[i].value);
+        else
+                (void)msr_batch(ops, num_ctx * 2);
+
+        for (i = 0; i < num_ctx; i++) {
+                struct msr_op *op = &ops[i * 2 + 1];
+                uint64_t tmp = op->value;
+
+                /**
+                 * Fall back to single read with retries if the batch
+                 * operation failed or data was not available
+                 */
+                if (ops[i * 2].retval != MACHINE_RETVAL_OK ||
+                    op->retval != MACHINE_RETVAL_OK ||
+                    (tmp & (PQOS_MSR_MON_QMC_ERROR |
+                            PQOS_MSR_MON_QMC_UNAVAILABLE)) != 0ULL) {
+                        if (hw_mon_read(ctx[i].lcore, ctx[i].rmid, event,
+                                        &tmp) != PQOS_RETVAL_OK)
+                                return PQOS_RETVAL_ERROR;
+                } else
+                        tmp &= PQOS_MSR_MON_QMC_DATA_MASK;
+
+                op->value = tmp;
+        }
+
+        return PQOS_RETVAL_OK;
+}
+
+int
+hw_mon_read_ctx(const struct pqos_mon_poll_ctx *ctx,
+                const unsigned num_ctx,
+                const unsigned event,
+                uint64_t *value,
+                const uint64_t max_value)
+{
+        struct msr_op *ops;
+        unsigned i;
+        int ret;
+
+        ASSERT(ctx != NULL);
+        ASSERT(value != NULL);
+
+        *value = 0;
+        if (num_ctx == 0)
+                return PQOS_RETVAL_OK;
+
+        ops = calloc(num_ctx * 2, sizeof(ops[0]));
+        if (ops == NULL)
+                return PQOS_RETVAL_RESOURCE;
+
+        ret = hw_mon_read_ctx_ops(ctx, num_ctx, event, ops, 0);
+        for (i = 0; ret == PQOS_RETVAL_OK && i < num_ctx; i++) {
+                *value += ops[i * 2 + 1].value;
+
+                if (*value >= max_value)
+                        *value -= max_value;
+        }
+
+        free(ops);
+
+        return ret;
+}
+
+/*
+ * =======================================
+ * =======================================
  *
- * @param event event counter length to retrieve
- * @param old_value previous value
- * @param new_value current value
+ * MBM counters extension
  *
- * @return difference between the two values
+ * =======================================
+ * =======================================
+ */
+
+/**
+ * @brief Returns monotonic time in ns
  */
 static uint64_t
-get_delta(const enum pqos_mon_event event,
-          const uint64_t old_value,
-          const uint64_t new_value)
+mbm_time_ns(void)
 {
-        const struct pqos_cap *cap = _pqos_get_cap();
-        const struct pqos_monitor *pmon;
+        struct timespec ts;
+
+        clock_gettime(CLOCK_MONOTONIC, &ts);
+
+        return (uint64_t)ts.tv_sec * 1000000000ULL + (uint64_t)ts.tv_nsec;
+}
+
+/**
+ * @brief Reads MBM counters of the group and extends them to 64 bits
+ *
+ * Raw counter of every poll context is compared with its previous value,
+ * a decrease means the counter wrapped once since the last read.
+ *
+ * @param [in,out] group monitoring group
+ * @param [in] event PQOS_MON_EVENT_LMEM_BW or PQOS_MON_EVENT_TMEM_BW
+ * @param [in] max_value counter range
+ * @param [out] value sum of extended counters
+ * @param [in] serial read counters by the calling thread only
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+mbm_update(struct pqos_mon_data *group,
+           const enum pqos_mon_event event,
+           const uint64_t max_value,
+           uint64_t *value,
+           const int serial)
+{
+        struct pqos_mon_poll_ctx *ctx = group->intl->hw.ctx;
+        const unsigned num_ctx = group->intl->hw.num_ctx;
+        const unsigned idx = MBM_IDX(event);
+        struct msr_op *ops;
+        uint64_t now;
+        unsigned i;
         int ret;
-        uint64_t max_value = 1LLU << 24;
 
-        ret = pqos_cap_get_event(cap, event, &pmon);
-        if (ret == PQOS_RETVAL_OK)
-                max_value = 1LLU << pmon->counter_length;
+        *value = 0;
+        if (num_ctx == 0)
+                return PQOS_RETVAL_OK;
 
-        if (old_value > new_value)
-                return (max_value - old_value) + new_value;
-        else
-                return new_value - old_value;
+        ops = calloc(num_ctx * 2, sizeof(ops[0]));
+        if (ops == NULL)
+                return PQOS_RETVAL_RESOURCE;
+
+        ret = hw_mon_read_ctx_ops(ctx, num_ctx, get_event_id(event), ops,
+                                  serial);
+        if (ret != PQOS_RETVAL_OK)
+                goto mbm_update_exit;
+
+        now = mbm_time_ns();
+        for (i = 0; i < num_ctx; i++) {
+                const uint64_t raw = ops[i * 2 + 1].value;
+
+                if (!ctx[i].mbm[idx].valid) {
+                        ctx[i].mbm[idx].ext = raw;
+                        ctx[i].mbm[idx].valid = 1;
+                } else if (raw >= ctx[i].mbm[idx].raw)
+                        ctx[i].mbm[idx].ext += raw - ctx[i].mbm[idx].raw;
+                else
+                        ctx[i].mbm[idx].ext +=
+                            max_value - ctx[i].mbm[idx].raw + raw;
+                ctx[i].mbm[idx].raw = raw;
+                ctx[i].mbm[idx].read_ns = now;
+
+                *value += ctx[i].mbm[idx].ext;
+        }
+
+mbm_update_exit:
+        free(ops);
+
+        return ret;
+}
+
+/**
+ * @brief Reads MBM counters of groups not read within catch-up period
+ *
+ * Has to be called with the API lock held. Counters are read serially,
+ * catch-up is not time critical.
+ */
+static void
+mbm_catchup(void)
+{
+        const enum pqos_mon_event events[] = {PQOS_MON_EVENT_LMEM_BW,
+                                              PQOS_MON_EVENT_TMEM_BW};
+        uint64_t now;
+        unsigned i, j;
+
+        now = mbm_time_ns();
+        for (i = 0; i < m_mbm.num_groups; i++) {
+                struct pqos_mon_data *group = m_mbm.groups[i];
+
+                for (j = 0; j < DIM(events); j++) {
+                        const unsigned idx = MBM_IDX(events[j]);
+                        uint64_t value;
+
+                        if (!(group->intl->hw.event & events[j]) ||
+                            group->intl->hw.num_ctx == 0)
+                                continue;
+                        if (now - group->intl->hw.ctx[0].mbm[idx].read_ns <
+                            m_mbm.period_ns)
+                                continue;
+
+                        if (mbm_update(group, events[j], m_mbm.max_value[idx],
+                                       &value, 1) != PQOS_RETVAL_OK)
+                                LOG_DEBUG("MBM catch-up read failed on "
+                                          "core %u\n",
+                                          group->intl->hw.ctx[0].lcore);
+                }
+        }
+}
+
+/**
+ * @brief Waits for \a nsec or for shutdown of the catch-up thread
+ *
+ * Has to be called with thread state mutex held.
+ *
+ * @param [in] nsec time to wait
+ */
+static void
+mbm_catchup_wait(const uint64_t nsec)
+{
+        struct timespec ts;
+        uint64_t ns;
+
+        clock_gettime(CLOCK_REALTIME, &ts);
+        ns = (uint64_t)ts.tv_nsec + nsec;
+        ts.tv_sec += (time_t)(ns / 1000000000ULL);
+        ts.tv_nsec = (long)(ns % 1000000000ULL);
+
+        pthread_cond_timedwait(&m_mbm.wake, &m_mbm.mutex, &ts);
+}
+
+/**
+ * @brief MBM catch-up thread
+ *
+ * @param arg unused
+ *
+ * @return NULL
+ */
+static void *
+mbm_catchup_run(void *arg)
+{
+        UNUSED_PARAM(arg);
+
+        pthread_mutex_lock(&m_mbm.mutex);
+        while (!m_mbm.shutdown) {
+                mbm_catchup_wait(m_mbm.period_ns);
+
+                /**
+                 * pqos_fini() joins the thread with the API lock held,
+                 * so do not block on the lock
+                 */
+                while (!m_mbm.shutdown && lock_try_get() != 0)
+                        mbm_catchup_wait(MBM_CATCHUP_RETRY_NS);
+                if (m_mbm.shutdown)
+                        break;
+
+                pthread_mutex_unlock(&m_mbm.mutex);
+                mbm_catchup();
+                lock_release();
+                pthread_mutex_lock(&m_mbm.mutex);
+        }
+        pthread_mutex_unlock(&m_mbm.mutex);
+
+        return NULL;
+}
+
+/**
+ * @brief Computes MBM catch-up period
+ *
+ * Worst case wrap time of MBM counter is its range in bytes divided by
+ * peak memory bandwidth of the platform.
+ *
+ * @param [in] cap capabilities structure
+ */
+static void
+mbm_catchup_init(const struct pqos_cap *cap)
+{
+        const enum pqos_mon_event events[] = {PQOS_MON_EVENT_LMEM_BW,
+                                              PQOS_MON_EVENT_TMEM_BW};
+        const struct pqos_capability *cap_mon;
+        const char *env = getenv(MBM_PEAK_BW_ENV);
+        unsigned long long peak_bw = MBM_PEAK_BW_DEFAULT;
+        double wrap_ns = 0;
+        unsigned i;
+
+        m_mbm.period_ns = 0;
+
+        if (env != NULL) {
+                char *end = NULL;
+
+                peak_bw = strtoull(env, &end, 10);
+                if (*env == '\0' || end == NULL || *end != '\0') {
+                        LOG_WARN("Invalid %s value '%s'\n", MBM_PEAK_BW_ENV,
+                                 env);
+                        peak_bw = MBM_PEAK_BW_DEFAULT;
+                }
+        }
+
+        if (pqos_cap_get_type(cap, PQOS_CAP_TYPE_MON, &cap_mon) !=
+            PQOS_RETVAL_OK)
+                return;
+
+        for (i = 0; i < DIM(events); i++) {
+                const struct pqos_monitor *pmon;
+                double range;
+                double ns;
+
+                m_mbm.max_value[MBM_IDX(events[i])] = 1LLU << 24;
+                if (pqos_cap_get_event(cap, events[i], &pmon) !=
+                    PQOS_RETVAL_OK)
+                        continue;
+                m_mbm.max_value[MBM_IDX(events[i])] = 1LLU
+                                                      << pmon->counter_length;
+
+                /* counter range in bytes */
+                range = (double)(1LLU << pmon->counter_length) *
+                        pmon->scale_factor / cap_mon->u.mon->snc_num;
+                ns = range / ((double)peak_bw * 1024 * 1024) * 1e9;
+                if (wrap_ns == 0 || ns < wrap_ns)
+                        wrap_ns = ns;
+        }
+
+        if (peak_bw == 0 || wrap_ns == 0)
+                return;
+
+        m_mbm.period_ns = (uint64_t)(wrap_ns / 2);
+        if (m_mbm.period_ns < MBM_CATCHUP_MIN_NS)
+                m_mbm.period_ns = MBM_CATCHUP_MIN_NS;
+
+        LOG_INFO("MBM counters wrap in %.3fs at %lluMB/s, catch-up reads "
+                 "every %.3fs\n",
+                 wrap_ns / 1e9, peak_bw, (double)m_mbm.period_ns / 1e9);
+}
+
+/**
+ * @brief Stops MBM catch-up thread and clears group list
+ */
+static void
+mbm_catchup_fini(void)
+{
+        pthread_mutex_lock(&m_mbm.mutex);
+        m_mbm.shutdown = 1;
+        pthread_cond_signal(&m_mbm.wake);
+        pthread_mutex_unlock(&m_mbm.mutex);
+
+        if (m_mbm.running)
+                pthread_join(m_mbm.thread, NULL);
+
+        free(m_mbm.groups);
+        m_mbm.groups = NULL;
+        m_mbm.num_groups = 0;
+
+        m_mbm.running = 0;
+        m_mbm.shutdown = 0;
+        m_mbm.period_ns = 0;
+}
+
+/**
+ * @brief Adds group to MBM catch-up reads
+ *
+ * Catch-up thread is started with the first group.
+ *
+ * @param [in] group monitoring group
+ */
+static void
+mbm_catchup_add(struct pqos_mon_data *group)
+{
+        struct pqos_mon_data **groups;
+
+        if (m_mbm.period_ns == 0)
+                return;
+
+        groups = realloc(m_mbm.groups,
+                         (m_mbm.num_groups + 1) * sizeof(m_mbm.groups[0]));
+        if (groups != NULL) {
+                groups[m_mbm.num_groups++] = group;
+                m_mbm.groups = groups;
+        }
+
+        if (groups == NULL) {
+                LOG_WARN("No MBM catch-up reads for the group\n");
+                return;
+        }
+
+        if (!m_mbm.running) {
+                if (pthread_create(&m_mbm.thread, NULL, mbm_catchup_run,
+                                   NULL) == 0)
+                        m_mbm.running = 1;
+                else
+                        LOG_WARN("Failed to start MBM catch-up thread\n");
+        }
+}
+
+/**
+ * @brief Removes group from MBM catch-up reads
+ *
+ * @param [in] group monitoring group
+ */
+static void
+mbm_catchup_remove(const struct pqos_mon_data *group)
+{
+        unsigned i;
+
+        for (i = 0; i < m_mbm.num_groups; i++)
+                if (m_mbm.groups[i] == group) {
+                        m_mbm.groups[i] = m_mbm.groups[--m_mbm.num_groups];
+                        break;
+                }
 }
 
 int
@@ -685,13 +1432,24 @@ hw_mon_start_counter(struct pqos_mon_data *group,
          * the allocated RMID
          */
         group->num_cores = num_cores;
-        for (i = 0; i < num_cores; i++) {
-                pqos_rmid_t rmid = core2rmid[i];
+        if (m_assoc_batch.ops != NULL) {
+                /* written by hw_mon_start_groups() */
+                for (i = 0; i < num_cores; i++) {
+                        struct msr_op *op =
+                            &m_assoc_batch.ops[m_assoc_batch.num++];
+
+                        op->lcore = group->cores[i];
+                        op->reg = PQOS_MSR_ASSOC;
+                        op->value = core2rmid[i];
+                }
+        } else
+                for (i = 0; i < num_cores; i++) {
+                        pqos_rmid_t rmid = core2rmid[i];
 
-                ret = hw_mon_assoc_write(group->cores[i], rmid);
-                if (ret != PQOS_RETVAL_OK)
-                        break;
-        }
+                        ret = hw_mon_assoc_write(group->cores[i], rmid);
+                        if (ret != PQOS_RETVAL_OK)
+                                break;
+                }
 
         if (ret == PQOS_RETVAL_OK) {
                 group->intl->hw.num_ctx = num_ctxs;
@@ -699,13 +1457,17 @@ hw_mon_start_counter(struct pqos_mon_data *group,
         } else {
                 for (i = 0; i < num_cores; i++)
                         (void)hw_mon_assoc_write(group->cores[i], RMID0);
-                if (group->intl->hw.ctx != NULL)
+                if (group->intl->hw.ctx != NULL) {
+                        rmid_pool_release(group->intl->hw.ctx, num_ctxs);
                         free(group->intl->hw.ctx);
+                }
         }
 
 hw_mon_start_counter_exit:
-        if (ctxs != NULL)
+        if (ctxs != NULL) {
+                rmid_pool_release(ctxs, num_ctxs);
                 free(ctxs);
+        }
 
         return ret;
 }
@@ -848,12 +1610,29 @@ hw_mon_start_cores(const unsigned num_cores,
                 LOG_ERROR("Failed to start all selected "
                           "HW monitoring events\n");
                 retval = PQOS_RETVAL_ERROR;
-        }
+        } else if (group->intl->hw.event &
+                   (PQOS_MON_EVENT_LMEM_BW | PQOS_MON_EVENT_TMEM_BW))
+                mbm_catchup_add(group);
 
 pqos_mon_start_error:
         if (retval != PQOS_RETVAL_OK) {
                 hw_mon_stop_perf(group);
 
+                /* counters started but not all events available */
+                if (group->intl->hw.num_ctx > 0) {
+                        if (m_assoc_batch.ops == NULL)
+                                for (i = 0; i < num_cores; i++)
+                                        (void)hw_mon_assoc_write(
+                                            group->cores[i], RMID0);
+                        else
+                                m_assoc_batch.num -= num_cores;
+                        rmid_pool_release(group->intl->hw.ctx,
+                                          group->intl->hw.num_ctx);
+                        free(group->intl->hw.ctx);
+                        group->intl->hw.ctx = NULL;
+                        group->intl->hw.num_ctx = 0;
+                }
+
                 if (group->cores != NULL)
                         free(group->cores);
         }
@@ -861,6 +1640,142 @@ pqos_mon_start_error:
         return retval;
 }
 
+/**
+ * @brief Releases resources of a group which cores have not been associated
+ *        with its RMIDs yet
+ *
+ * @param [in,out] group monitoring group started by hw_mon_start_groups()
+ */
+static void
+hw_mon_group_release(struct pqos_mon_data *group)
+{
+        mbm_catchup_remove(group);
+        (void)hw_mon_stop_perf(group);
+        rmid_pool_release(group->intl->hw.ctx, group->intl->hw.num_ctx);
+        free(group->intl->hw.ctx);
+        free(group->cores);
+}
+
+int
+hw_mon_start_groups(const unsigned num_specs,
+                    const struct pqos_mon_group_spec *specs,
+                    const struct pqos_mon_options *opts,
+                    struct pqos_mon_data **groups)
+{
+        static const struct pqos_mon_options opt_default;
+        const struct pqos_cpuinfo *cpu = _pqos_get_cpu();
+        struct msr_op *ops = NULL;
+        pqos_rmid_t *rmids = NULL;
+        unsigned *owner = NULL;
+        unsigned max_core = 0;
+        unsigned num_ops = 0;
+        unsigned started = 0;
+        unsigned i, j;
+        int ret = PQOS_RETVAL_OK;
+
+        ASSERT(specs != NULL);
+        ASSERT(groups != NULL);
+
+        for (i = 0; i < num_specs; i++) {
+                if (specs[i].type != PQOS_MON_GROUP_CORES)
+                        return PQOS_RETVAL_PARAM;
+                for (j = 0; j < specs[i].num; j++) {
+                        if (pqos_cpu_check_core(cpu, specs[i].cores[j]) !=
+                            PQOS_RETVAL_OK)
+                                return PQOS_RETVAL_PARAM;
+                        if (specs[i].cores[j] > max_core)
+                                max_core = specs[i].cores[j];
+                }
+                num_ops += specs[i].num;
+        }
+
+        /**
+         * Associations are written once all groups are set up, so a core
+         * of an earlier group is not seen as monitored by later groups
+         */
+        owner = calloc(max_core + 1, sizeof(owner[0]));
+        if (owner == NULL)
+                return PQOS_RETVAL_RESOURCE;
+        for (i = 0; i < num_specs && ret == PQOS_RETVAL_OK; i++)
+                for (j = 0; j < specs[i].num; j++) {
+                        const unsigned lcore = specs[i].cores[j];
+
+                        if (owner[lcore] != 0 && owner[lcore] != i + 1) {
+                                LOG_ERROR("Monitoring on core %u is already "
+                                          "started\n",
+                                          lcore);
+                                ret = PQOS_RETVAL_RESOURCE;
+                                break;
+                        }
+                        owner[lcore] = i + 1;
+                }
+        free(owner);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
+
+        ops = calloc(num_ops, sizeof(ops[0]));
+        rmids = malloc(num_ops * sizeof(rmids[0]));
+        if (ops == NULL || rmids == NULL) {
+                ret = PQOS_RETVAL_RESOURCE;
+                goto hw_mon_start_groups_exit;
+        }
+
+        m_assoc_batch.ops = ops;
+        m_assoc_batch.num = 0;
+        for (i = 0; i < num_specs; i++) {
+                const struct pqos_mon_group_spec *spec = &specs[i];
+                const struct pqos_mon_options *opt =
+                    opts != NULL ? &opts[i] : &opt_default;
+
+                ret = hw_mon_start_cores(spec->num, spec->cores, spec->event,
+                                         spec->context, spec->mem_region,
+                                         groups[i], opt);
+                if (ret != PQOS_RETVAL_OK) {
+                        LOG_ERROR("Failed to start monitoring group %u\n", i);
+                        break;
+                }
+                started++;
+        }
+        num_ops = m_assoc_batch.num;
+        m_assoc_batch.ops = NULL;
+        m_assoc_batch.num = 0;
+
+        /**
+         * Associate cores of all groups with their RMIDs,
+         * class of service bits of PQR_ASSOC are preserved
+         */
+        if (ret == PQOS_RETVAL_OK) {
+                for (i = 0; i < num_ops; i++)
+                        rmids[i] = (pqos_rmid_t)ops[i].value;
+                if (msr_read_batch(ops, num_ops) != MACHINE_RETVAL_OK)
+                        ret = PQOS_RETVAL_ERROR;
+        }
+        if (ret == PQOS_RETVAL_OK) {
+                for (i = 0; i < num_ops; i++) {
+                        ops[i].value &= PQOS_MSR_ASSOC_QECOS_MASK;
+                        ops[i].value |=
+                            (uint64_t)(rmids[i] & PQOS_MSR_ASSOC_RMID_MASK);
+                }
+                if (msr_write_batch(ops, num_ops) != MACHINE_RETVAL_OK) {
+                        LOG_ERROR("Failed to associate cores with RMIDs\n");
+                        for (i = 0; i < num_ops; i++)
+                                ops[i].value &= PQOS_MSR_ASSOC_QECOS_MASK;
+                        (void)msr_write_batch(ops, num_ops);
+                        ret = PQOS_RETVAL_ERROR;
+                }
+        }
+
+        if (ret != PQOS_RETVAL_OK)
+                for (i = 0; i < started; i++)
+                        hw_mon_group_release(groups[i]);
+
+hw_mon_start_groups_exit:
+        free(rmids);
+        free(ops);
+
+        return ret;
+}
+
 int
 hw_mon_start_uncore(const unsigned num_sockets,
                     const unsigned *sockets,
@@ -1061,7 +1976,7 @@ hw_mon_start_channels(const unsigned num_channels,
                         continue;
                 }
 
-                ctx = &ctxs[num_ctx++];
+                ctx = &ctxs[num_ctx];
                 ctx->cluster = socket;
 
                 ret = pqos_cpu_get_one_core(cpu, ctx->cluster, &ctx->lcore);
@@ -1072,6 +1987,7 @@ hw_mon_start_channels(const unsigned num_channels,
                                           opt);
                 if (ret != PQOS_RETVAL_OK)
                         goto hw_mon_start_channels_exit;
+                num_ctx++;
 
                 ret = iordt_mon_assoc_write(channel_id, ctx->rmid);
                 if (ret != PQOS_RETVAL_OK)
@@ -1121,6 +2037,7 @@ hw_mon_start_channels_exit:
 
                                 iordt_mon_assoc_write(channel_id, RMID0);
                         }
+                        rmid_pool_release(ctxs, num_ctx);
                         free(ctxs);
                 }
                 if (group->channels != NULL)
@@ -1140,6 +2057,8 @@ hw_mon_stop(struct pqos_mon_data *group)
 
         ASSERT(group != NULL);
 
+        mbm_catchup_remove(group);
+
         if ((group->num_cores == 0 && group->num_channels == 0 &&
              group->intl->uncore.num_sockets == 0))
                 return PQOS_RETVAL_PARAM;
@@ -1171,10 +2090,13 @@ hw_mon_stop(struct pqos_mon_data *group)
                 if (ret != PQOS_RETVAL_OK)
                         return PQOS_RETVAL_PARAM;
                 if (rmid != group->intl->hw.ctx[i].rmid &&
-                    !group->intl->hw.ctx[i].quiet)
+                    !group->intl->hw.ctx[i].quiet) {
                         LOG_WARN("Core %u RMID association changed from %u "
                                  "to %u! The core has been hijacked!\n",
                                  lcore, group->intl->hw.ctx[i].rmid, rmid);
+                        /* external change, RMID pool is out of date */
+                        rmid_pool_invalidate(group->intl->hw.ctx[i].cluster);
+                }
         }
 
         /* Associate cores from the group back with RMID0 */
@@ -1210,6 +2132,7 @@ hw_mon_stop(struct pqos_mon_data *group)
                 free(group->cores);
         if (group->channels != NULL)
                 free(group->channels);
+        rmid_pool_release(group->intl->hw.ctx, group->intl->hw.num_ctx);
         free(group->intl->hw.ctx);
 
         return retval;
@@ -1224,7 +2147,6 @@ hw_mon_read_counter(struct pqos_mon_data *group,
         uint64_t max_value = 1LLU << 24;
         const struct pqos_cap *cap = _pqos_get_cap();
         const struct pqos_monitor *pmon;
-        unsigned i;
         int ret;
 
         ASSERT(event == PQOS_MON_EVENT_L3_OCCUP ||
@@ -1235,48 +2157,37 @@ hw_mon_read_counter(struct pqos_mon_data *group,
         if (ret == PQOS_RETVAL_OK)
                 max_value = 1LLU << pmon->counter_length;
 
-        for (i = 0; i < group->intl->hw.num_ctx; i++) {
-                uint64_t tmp = 0;
-                const unsigned lcore = group->intl->hw.ctx[i].lcore;
-                const pqos_rmid_t rmid = group->intl->hw.ctx[i].rmid;
-                int retval;
-
-                retval = hw_mon_read(lcore, rmid, get_event_id(event), &tmp);
-                if (retval != MACHINE_RETVAL_OK)
-                        return PQOS_RETVAL_ERROR;
-
-                value += tmp;
-
-                if (value >= max_value)
-                        value -= max_value;
-        }
+        if (event == PQOS_MON_EVENT_L3_OCCUP)
+                ret = hw_mon_read_ctx(group->intl->hw.ctx,
+                                      group->intl->hw.num_ctx,
+                                      get_event_id(event), &value, max_value);
+        else
+                ret = mbm_update(group, event, max_value, &value, 0);
+        if (ret != PQOS_RETVAL_OK)
+                return ret;
 
+        /**
+         * MBM values are sums of 64-bit extended counters, so deltas
+         * do not need to handle counter wrap
+         */
         switch (event) {
         case PQOS_MON_EVENT_L3_OCCUP:
                 pv->llc = scale_event(event, value);
                 break;
         case PQOS_MON_EVENT_LMEM_BW:
-                if (pmon->counter_length == 32 && pv->mbm_local > value)
-                        ret = PQOS_RETVAL_OVERFLOW;
-                if (group->intl->valid_mbm_read) {
-                        pv->mbm_local_delta =
-                            get_delta(event, pv->mbm_local, value);
+                if (group->intl->valid_mbm_read)
                         pv->mbm_local_delta =
-                            scale_event(event, pv->mbm_local_delta);
-                } else
+                            scale_event(event, value - pv->mbm_local);
+                else
                         /* Report zero memory bandwidth with first read */
                         pv->mbm_local_delta = 0;
                 pv->mbm_local = value;
                 break;
         case PQOS_MON_EVENT_TMEM_BW:
-                if (pmon->counter_length == 32 && pv->mbm_local > value)
-                        ret = PQOS_RETVAL_OVERFLOW;
-                if (group->intl->valid_mbm_read) {
-                        pv->mbm_total_delta =
-                            get_delta(event, pv->mbm_total, value);
+                if (group->intl->valid_mbm_read)
                         pv->mbm_total_delta =
-                            scale_event(event, pv->mbm_total_delta);
-                } else
+                            scale_event(event, value - pv->mbm_total);
+                else
                         /* Report zero memory bandwidth with first read */
                         pv->mbm_total_delta = 0;
                 pv->mbm_total = value;
@@ -1285,14 +2196,6 @@ hw_mon_read_counter(struct pqos_mon_data *group,
                 return PQOS_RETVAL_PARAM;
         }
 
-        if (ret == PQOS_RETVAL_OVERFLOW) {
-                LOG_WARN(
-                    "Counter overflow reading event %u on core %u (RMID%u)!\n",
-                    event, group->intl->hw.ctx[0].lcore,
-                    (unsigned)group->intl->hw.ctx[0].rmid);
-                group->intl->valid_mbm_read = 0;
-        }
-
         return ret;
 }
 
@@ -208,6 +208,26 @@ PQOS_LOCAL int hw_mon_start_cores(const unsigned num_cores,
                                   struct pqos_mon_data *group,
                                   const struct pqos_mon_options *opt);
 
+/**
+ * @brief Hardware interface to start monitoring of multiple core groups
+ *
+ * Groups are set up one by one and cores of all groups are associated
+ * with their RMIDs with a single batch of MSR writes. If any group fails
+ * to start, groups set up so far are released.
+ *
+ * @param [in] num_specs number of groups in \a specs
+ * @param [in] specs core group descriptions
+ * @param [in] opts extended options per group, NULL for defaults
+ * @param [in,out] groups monitoring structures to set up
+ *
+ * @return Operations status
+ * @retval PQOS_RETVAL_OK on success
+ */
+PQOS_LOCAL int hw_mon_start_groups(const unsigned num_specs,
+                                   const struct pqos_mon_group_spec *specs,
+                                   const struct pqos_mon_options *opts,
+                                   struct pqos_mon_data **groups);
+
 /**
  * @brief Hardware interface to start resource monitoring on selected
  * group of channels
@@ -261,6 +281,27 @@ PQOS_LOCAL int hw_mon_read(const unsigned lcore,
                            const unsigned event,
                            uint64_t *value);
 
+/**
+ * @brief Reads monitoring event data of poll contexts in one MSR batch
+ *
+ * Values of all contexts are summed up. Contexts with data not available
+ * in the batch are read again with \a hw_mon_read.
+ *
+ * @param [in] ctx poll contexts (core and RMID)
+ * @param [in] num_ctx number of contexts in \a ctx
+ * @param [in] event monitoring event
+ * @param [out] value place to store sum of read values
+ * @param [in] max_value counter range, the sum wraps around it
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+PQOS_LOCAL int hw_mon_read_ctx(const struct pqos_mon_poll_ctx *ctx,
+                               const unsigned num_ctx,
+                               const unsigned event,
+                               uint64_t *value,
+                               const uint64_t max_value);
+
 /**
  * @brief Hardware interface to start uncore monitoring of selected \a sockets
  *
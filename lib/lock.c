@@ -332,6 +332,12 @@ lock_get(void)
                 fprintf(stderr, "API mutex lock error: %s\n", strerror(errno));
 }
 
+int
+lock_try_get(void)
+{
+        return pthread_mutex_trylock(&m_apilock_mutex) == 0 ? 0 : -1;
+}
+
 void
 lock_release(void)
 {
@@ -79,6 +79,15 @@ PQOS_LOCAL int lock_fini(void);
  */
 PQOS_LOCAL void lock_get(void);
 
+/**
+ * @brief Acquires lock for PQoS API use if it is not held by other thread
+ *
+ * @return Operation status
+ * @retval 0 lock acquired
+ * @retval -1 lock is busy
+ */
+PQOS_LOCAL int lock_try_get(void);
+
 /**
  * @brief Symmetric operation to \a lock_get to release the lock
  */
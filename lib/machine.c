@@ -41,9 +41,13 @@
 
 #include "machine.h"
 
+#include "cpu_registers.h"
 #include "log.h"
 
 #include <fcntl.h>
+#include <limits.h>
+#include <pthread.h>
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -55,9 +59,106 @@
 #include <sys/ioctl.h>
 #endif
 
+/**
+ * Batches with fewer operations are executed by the calling thread
+ */
+#define MSR_BATCH_MIN_PARALLEL 64
+
+/**
+ * Maximum number of threads executing a batch
+ */
+#define MSR_BATCH_MAX_THREADS 16
+
+/**
+ * Range of COS mask registers kept in the shadow table
+ * (L3 CAT, L2 CAT and MBA)
+ */
+#define MSR_SHADOW_COS_START PQOS_MSR_L3CA_MASK_START
+#define MSR_SHADOW_COS_NUM                                                     \
+        (PQOS_MSR_MBA_MASK_START + 64 - PQOS_MSR_L3CA_MASK_START)
+
+/**
+ * Core not belonging to any domain
+ */
+#define MSR_SHADOW_NO_OWNER UINT_MAX
+
+/**
+ * Classes of COS mask registers, each class is scoped to its own domain
+ */
+enum msr_shadow_class {
+        MSR_SHADOW_L3CA = 0, /**< L3 CAT masks, per L3 CAT domain */
+        MSR_SHADOW_L2CA,     /**< L2 CAT masks, per L2 cluster */
+        MSR_SHADOW_MBA,      /**< MBA delays, per MBA domain */
+        MSR_SHADOW_CLASS_NUM
+};
+
+/**
+ * Cached value of a register
+ */
+struct msr_shadow_entry {
+        uint64_t value; /**< last value read or written */
+        unsigned gen;   /**< shadow generation the value belongs to */
+};
+
+/**
+ * Shadow registers of a logical core
+ */
+struct msr_shadow {
+        struct msr_shadow_entry assoc; /**< PQR_ASSOC */
+        struct msr_shadow_entry *cos;  /**< COS masks of domains represented
+                                          by the core, allocated on first use */
+        unsigned owner[MSR_SHADOW_CLASS_NUM]; /**< core representing domain
+                                                 of each COS class */
+        uint32_t check_reg; /**< COS register re-read on validation */
+};
+
+/**
+ * Share of a batch executed by single thread
+ */
+struct msr_batch_job {
+        struct msr_op *ops;     /**< batch operations */
+        const unsigned *order;  /**< operation indexes sorted by lcore */
+        const unsigned *groups; /**< start of each lcore group in order */
+        unsigned num_groups;    /**< number of lcore groups */
+        unsigned first;         /**< first group of the job */
+        unsigned stride;        /**< distance between groups of the job */
+        int retval;             /**< job status */
+};
+
+/**
+ * Persistent threads executing shares of large batches
+ *
+ * Threads are started by the first parallel batch and stopped by
+ * machine_fini(). One batch uses the threads at a time, a batch issued
+ * while they are busy, e.g. by another polling worker, is executed by the
+ * calling thread alone.
+ */
+static struct {
+        pthread_mutex_t mutex;
+        pthread_cond_t start; /**< signals new batch or shutdown */
+        pthread_cond_t done;  /**< signals end of the last thread job */
+        pthread_t threads[MSR_BATCH_MAX_THREADS - 1];
+        unsigned num_threads;       /**< number of started threads */
+        struct msr_batch_job *jobs; /**< jobs of the current batch */
+        unsigned num_jobs;          /**< number of jobs, 0 when idle */
+        unsigned pending;           /**< thread jobs not finished yet */
+        unsigned generation;        /**< batch sequence number */
+        int busy;                   /**< threads are used by a batch */
+        int shutdown;
+} m_batch = {.mutex = PTHREAD_MUTEX_INITIALIZER,
+             .start = PTHREAD_COND_INITIALIZER,
+             .done = PTHREAD_COND_INITIALIZER};
+
 static int *m_msr_fd = NULL;    /**< MSR driver file descriptors table */
+static pthread_mutex_t m_msr_fd_lock =
+    PTHREAD_MUTEX_INITIALIZER; /**< serializes opening of MSR files */
 static unsigned m_maxcores = 0; /**< max number of cores (size of the
                                    table above too) */
+static struct msr_shadow *m_shadow = NULL; /**< shadow registers per core */
+static unsigned m_shadow_gen = 1; /**< current shadow generation, accessed
+                                     atomically */
+static pthread_mutex_t m_shadow_lock =
+    PTHREAD_MUTEX_INITIALIZER; /**< protects shadow entries */
 
 int
 machine_init(const unsigned max_core_id)
@@ -87,6 +188,28 @@ machine_init(const unsigned max_core_id)
         return MACHINE_RETVAL_OK;
 }
 
+/**
+ * @brief Stops batch threads
+ */
+static void
+msr_batch_threads_stop(void)
+{
+        unsigned i;
+
+        pthread_mutex_lock(&m_batch.mutex);
+        m_batch.shutdown = 1;
+        pthread_cond_broadcast(&m_batch.start);
+        pthread_mutex_unlock(&m_batch.mutex);
+
+        for (i = 0; i < m_batch.num_threads; i++)
+                pthread_join(m_batch.threads[i], NULL);
+
+        pthread_mutex_lock(&m_batch.mutex);
+        m_batch.num_threads = 0;
+        m_batch.shutdown = 0;
+        pthread_mutex_unlock(&m_batch.mutex);
+}
+
 int
 machine_fini(void)
 {
@@ -96,6 +219,8 @@ machine_fini(void)
         if (m_msr_fd == NULL)
                 return MACHINE_RETVAL_ERROR;
 
+        msr_batch_threads_stop();
+
         /**
          * Close open file descriptors and free up table memory.
          */
@@ -105,6 +230,13 @@ machine_fini(void)
                         m_msr_fd[i] = -1;
                 }
 
+        if (m_shadow != NULL) {
+                for (i = 0; i < m_maxcores; i++)
+                        free(m_shadow[i].cos);
+                free(m_shadow);
+                m_shadow = NULL;
+        }
+
         free(m_msr_fd);
         m_msr_fd = NULL;
         m_maxcores = 0;
@@ -153,6 +285,7 @@ lcpuid(const unsigned leaf, const unsigned subleaf, struct cpuid_out *out)
  *
  * File descriptor could be previously open and comes from
  * m_msr_fd table or is open (& cached) during the call.
+ * Threads of a batch and poll workers may open files concurrently.
  *
  * @param lcore logical core id
  *
@@ -164,8 +297,13 @@ msr_file_open(const unsigned lcore)
         ASSERT(lcore < m_maxcores);
         ASSERT(m_msr_fd != NULL);
 
-        int fd = m_msr_fd[lcore];
+        int fd = __atomic_load_n(&m_msr_fd[lcore], __ATOMIC_ACQUIRE);
+
+        if (fd >= 0)
+                return fd;
 
+        pthread_mutex_lock(&m_msr_fd_lock);
+        fd = m_msr_fd[lcore];
         if (fd < 0) {
                 char fname[32];
 
@@ -180,34 +318,252 @@ msr_file_open(const unsigned lcore)
                 if (fd < 0)
                         LOG_WARN("Error opening file '%s'!\n", fname);
                 else
-                        m_msr_fd[lcore] = fd;
+                        __atomic_store_n(&m_msr_fd[lcore], fd,
+                                         __ATOMIC_RELEASE);
         }
+        pthread_mutex_unlock(&m_msr_fd_lock);
 
         return fd;
 }
 
 int
-msr_read(const unsigned lcore, const uint32_t reg, uint64_t *value)
+msr_shadow_init(const struct pqos_cpuinfo *cpu)
 {
-        int ret = MACHINE_RETVAL_OK;
-        int fd = -1;
-        ssize_t read_ret = 0;
-#ifdef __FreeBSD__
-        cpuctl_msr_args_t io;
-#endif
+        unsigned i;
 
-        ASSERT(value != NULL);
-        if (value == NULL)
-                return MACHINE_RETVAL_PARAM;
-
-        ASSERT(lcore < m_maxcores);
-        if (lcore >= m_maxcores)
+        ASSERT(cpu != NULL);
+        if (cpu == NULL)
                 return MACHINE_RETVAL_PARAM;
 
         ASSERT(m_msr_fd != NULL);
-        if (m_msr_fd == NULL)
+        if (m_msr_fd == NULL || m_shadow != NULL)
                 return MACHINE_RETVAL_ERROR;
 
+        m_shadow = calloc(m_maxcores, sizeof(m_shadow[0]));
+        if (m_shadow == NULL)
+                return MACHINE_RETVAL_ERROR;
+
+        /* COS masks of cores outside of the topology are not shadowed */
+        for (i = 0; i < m_maxcores; i++) {
+                unsigned class;
+
+                for (class = 0; class < MSR_SHADOW_CLASS_NUM; class++)
+                        m_shadow[i].owner[class] = MSR_SHADOW_NO_OWNER;
+        }
+
+        /* first core of each domain represents the domain */
+        for (i = 0; i < cpu->num_cores; i++) {
+                const struct pqos_coreinfo *core = &cpu->cores[i];
+                unsigned *owner;
+                unsigned j;
+
+                if (core->lcore >= m_maxcores)
+                        continue;
+
+                owner = m_shadow[core->lcore].owner;
+                for (j = 0; j <= i; j++) {
+                        const struct pqos_coreinfo *first = &cpu->cores[j];
+
+                        if (owner[MSR_SHADOW_L3CA] == MSR_SHADOW_NO_OWNER &&
+                            first->l3cat_id == core->l3cat_id)
+                                owner[MSR_SHADOW_L3CA] = first->lcore;
+                        if (owner[MSR_SHADOW_L2CA] == MSR_SHADOW_NO_OWNER &&
+                            first->l2_id == core->l2_id)
+                                owner[MSR_SHADOW_L2CA] = first->lcore;
+                        if (owner[MSR_SHADOW_MBA] == MSR_SHADOW_NO_OWNER &&
+                            first->mba_id == core->mba_id)
+                                owner[MSR_SHADOW_MBA] = first->lcore;
+                }
+        }
+
+        return MACHINE_RETVAL_OK;
+}
+
+/**
+ * @brief Returns current shadow generation
+ *
+ * @return shadow generation
+ */
+static unsigned
+msr_shadow_gen(void)
+{
+        return __atomic_load_n(&m_shadow_gen, __ATOMIC_ACQUIRE);
+}
+
+/**
+ * @brief Returns core holding shadow of COS mask register \a reg
+ *
+ * COS mask registers are shared by all cores of a domain, so they are kept
+ * in the table of the core representing the domain.
+ *
+ * @param lcore logical core id
+ * @param reg MSR register
+ *
+ * @return logical core id
+ * @retval MSR_SHADOW_NO_OWNER if register is not a shadowed COS mask
+ */
+static unsigned
+msr_shadow_owner(const unsigned lcore, const uint32_t reg)
+{
+        const unsigned *owner = m_shadow[lcore].owner;
+
+        if (reg < MSR_SHADOW_COS_START ||
+            reg >= MSR_SHADOW_COS_START + MSR_SHADOW_COS_NUM ||
+            reg == PQOS_MSR_SNC_CFG)
+                return MSR_SHADOW_NO_OWNER;
+
+        if (reg < PQOS_MSR_L2CA_MASK_START)
+                return owner[MSR_SHADOW_L3CA];
+        if (reg < PQOS_MSR_MBA_MASK_START)
+                return owner[MSR_SHADOW_L2CA];
+
+        return owner[MSR_SHADOW_MBA];
+}
+
+/**
+ * @brief Returns shadow entry of \a reg on \a lcore
+ *
+ * Only PQR_ASSOC and COS mask registers are shadowed. COS mask table of
+ * the domain is allocated on first use. Has to be called with the shadow
+ * lock held.
+ *
+ * @param lcore logical core id
+ * @param reg MSR register
+ *
+ * @return shadow entry
+ * @retval NULL if register is not shadowed
+ */
+static struct msr_shadow_entry *
+msr_shadow_get(const unsigned lcore, const uint32_t reg)
+{
+        struct msr_shadow *shadow;
+        unsigned owner;
+
+        if (m_shadow == NULL)
+                return NULL;
+
+        if (reg == PQOS_MSR_ASSOC)
+                return &m_shadow[lcore].assoc;
+
+        owner = msr_shadow_owner(lcore, reg);
+        if (owner == MSR_SHADOW_NO_OWNER)
+                return NULL;
+
+        shadow = &m_shadow[owner];
+        if (shadow->cos == NULL) {
+                shadow->cos =
+                    calloc(MSR_SHADOW_COS_NUM, sizeof(shadow->cos[0]));
+                if (shadow->cos == NULL)
+                        return NULL;
+        }
+
+        return &shadow->cos[reg - MSR_SHADOW_COS_START];
+}
+
+/**
+ * @brief Looks up valid shadow value of \a reg on \a lcore
+ *
+ * @param lcore logical core id
+ * @param reg MSR register
+ * @param [out] value cached value
+ *
+ * @return 1 if valid value was found, 0 otherwise
+ */
+static int
+msr_shadow_lookup(const unsigned lcore, const uint32_t reg, uint64_t *value)
+{
+        struct msr_shadow_entry *entry;
+        int found = 0;
+
+        if (m_shadow == NULL)
+                return 0;
+
+        pthread_mutex_lock(&m_shadow_lock);
+        entry = msr_shadow_get(lcore, reg);
+        if (entry != NULL && entry->gen == msr_shadow_gen()) {
+                *value = entry->value;
+                found = 1;
+        }
+        pthread_mutex_unlock(&m_shadow_lock);
+
+        return found;
+}
+
+/**
+ * @brief Updates shadow of \a reg on \a lcore after hardware access
+ *
+ * @param lcore logical core id
+ * @param reg MSR register
+ * @param value value read or written
+ * @param valid 0 if hardware access failed and register value is unknown
+ */
+static void
+msr_shadow_update(const unsigned lcore,
+                  const uint32_t reg,
+                  const uint64_t value,
+                  const int valid)
+{
+        struct msr_shadow_entry *entry;
+
+        if (m_shadow == NULL)
+                return;
+
+        pthread_mutex_lock(&m_shadow_lock);
+        entry = msr_shadow_get(lcore, reg);
+        if (entry != NULL && valid) {
+                entry->value = value;
+                entry->gen = msr_shadow_gen();
+                if (reg != PQOS_MSR_ASSOC)
+                        m_shadow[msr_shadow_owner(lcore, reg)].check_reg = reg;
+        } else if (entry != NULL)
+                entry->gen = 0;
+        pthread_mutex_unlock(&m_shadow_lock);
+}
+
+/**
+ * @brief Checks if write to \a reg changes meaning of shadowed registers
+ *
+ * Enabling or disabling CDP, MBA or SNC resets COS masks in hardware.
+ *
+ * @param reg MSR register
+ *
+ * @return 1 if shadow has to be invalidated, 0 otherwise
+ */
+static int
+msr_shadow_is_cfg(const uint32_t reg)
+{
+        return reg == PQOS_MSR_L3_QOS_CFG || reg == PQOS_MSR_L2_QOS_CFG ||
+               reg == PQOS_MSR_L3_IO_QOS_CFG || reg == PQOS_MSR_MBA_CFG ||
+               reg == PQOS_MSR_SNC_CFG;
+}
+
+void
+msr_shadow_invalidate(void)
+{
+        /* generation 0 marks entries which were never filled */
+        if (__atomic_add_fetch(&m_shadow_gen, 1, __ATOMIC_ACQ_REL) == 0)
+                __atomic_add_fetch(&m_shadow_gen, 1, __ATOMIC_ACQ_REL);
+}
+
+/**
+ * @brief Executes RDMSR on \a lcore bypassing the shadow table
+ *
+ * @param lcore logical core id
+ * @param reg MSR to read from
+ * @param [out] value place to store MSR value at
+ *
+ * @return Operation status
+ * @retval MACHINE_RETVAL_OK on success
+ */
+static int
+msr_read_hw(const unsigned lcore, const uint32_t reg, uint64_t *value)
+{
+        int fd = -1;
+        ssize_t read_ret = 0;
+#ifdef __FreeBSD__
+        cpuctl_msr_args_t io;
+#endif
+
         fd = msr_file_open(lcore);
         if (fd < 0)
                 return MACHINE_RETVAL_ERROR;
@@ -229,8 +585,85 @@ msr_read(const unsigned lcore, const uint32_t reg, uint64_t *value)
         if (read_ret != sizeof(value[0])) {
                 LOG_ERROR("RDMSR failed for reg[0x%x] on lcore %u\n",
                           (unsigned)reg, lcore);
-                ret = MACHINE_RETVAL_ERROR;
+                return MACHINE_RETVAL_ERROR;
+        }
+
+        return MACHINE_RETVAL_OK;
+}
+
+/**
+ * @brief Checks that cached value of \a reg on \a lcore matches hardware
+ *
+ * @param lcore logical core id
+ * @param reg MSR register
+ *
+ * @return 1 if value is not cached or matches hardware, 0 otherwise
+ */
+static int
+msr_shadow_check(const unsigned lcore, const uint32_t reg)
+{
+        uint64_t cached;
+        uint64_t value;
+
+        if (!msr_shadow_lookup(lcore, reg, &cached))
+                return 1;
+
+        if (msr_read_hw(lcore, reg, &value) != MACHINE_RETVAL_OK)
+                return 0;
+
+        return value == cached;
+}
+
+void
+msr_shadow_validate(void)
+{
+        unsigned i;
+
+        if (m_shadow == NULL)
+                return;
+
+        for (i = 0; i < m_maxcores; i++) {
+                const struct msr_shadow *shadow = &m_shadow[i];
+                int valid = 1;
+
+                /* one COS mask and one association per domain */
+                if (shadow->check_reg != 0)
+                        valid = msr_shadow_check(i, shadow->check_reg);
+                if (valid && shadow->owner[MSR_SHADOW_L3CA] == i)
+                        valid = msr_shadow_check(i, PQOS_MSR_ASSOC);
+
+                if (!valid) {
+                        LOG_DEBUG("MSR shadow out of date, invalidating\n");
+                        msr_shadow_invalidate();
+                        return;
+                }
         }
+}
+
+int
+msr_read(const unsigned lcore, const uint32_t reg, uint64_t *value)
+{
+        int ret;
+
+        ASSERT(value != NULL);
+        if (value == NULL)
+                return MACHINE_RETVAL_PARAM;
+
+        ASSERT(lcore < m_maxcores);
+        if (lcore >= m_maxcores)
+                return MACHINE_RETVAL_PARAM;
+
+        ASSERT(m_msr_fd != NULL);
+        if (m_msr_fd == NULL)
+                return MACHINE_RETVAL_ERROR;
+
+        if (msr_shadow_lookup(lcore, reg, value))
+                return MACHINE_RETVAL_OK;
+
+        ret = msr_read_hw(lcore, reg, value);
+        if (ret == MACHINE_RETVAL_OK)
+                msr_shadow_update(lcore, reg, *value, 1);
+
         return ret;
 }
 
@@ -240,6 +673,7 @@ msr_write(const unsigned lcore, const uint32_t reg, const uint64_t value)
         int ret = MACHINE_RETVAL_OK;
         int fd = -1;
         ssize_t write_ret = 0;
+        uint64_t cached;
 #ifdef __FreeBSD__
         cpuctl_msr_args_t io;
 #endif
@@ -252,6 +686,15 @@ msr_write(const unsigned lcore, const uint32_t reg, const uint64_t value)
         if (m_msr_fd == NULL)
                 return MACHINE_RETVAL_ERROR;
 
+        /**
+         * Skip COS mask writes which would not change the register.
+         * PQR_ASSOC is always written, shadow of a single core cannot be
+         * validated at domain granularity.
+         */
+        if (reg != PQOS_MSR_ASSOC && msr_shadow_lookup(lcore, reg, &cached) &&
+            cached == value)
+                return MACHINE_RETVAL_OK;
+
         fd = msr_file_open(lcore);
         if (fd < 0)
                 return MACHINE_RETVAL_ERROR;
@@ -275,6 +718,249 @@ msr_write(const unsigned lcore, const uint32_t reg, const uint64_t value)
                           (unsigned)reg, (unsigned long long)value, lcore);
                 ret = MACHINE_RETVAL_ERROR;
         }
+        msr_shadow_update(lcore, reg, value, ret == MACHINE_RETVAL_OK);
+
+        if (msr_shadow_is_cfg(reg))
+                msr_shadow_invalidate();
+
+        return ret;
+}
+
+/**
+ * @brief Executes lcore groups of a batch assigned to the job
+ *
+ * @param arg batch job
+ *
+ * @return NULL
+ */
+static void *
+msr_batch_job_run(void *arg)
+{
+        struct msr_batch_job *job = (struct msr_batch_job *)arg;
+        unsigned g;
+
+        job->retval = MACHINE_RETVAL_OK;
+
+        for (g = job->first; g < job->num_groups; g += job->stride) {
+                unsigned i;
+
+                for (i = job->groups[g]; i < job->groups[g + 1]; i++) {
+                        struct msr_op *op = &job->ops[job->order[i]];
+
+                        if (op->write)
+                                op->retval =
+                                    msr_write(op->lcore, op->reg, op->value);
+                        else
+                                op->retval =
+                                    msr_read(op->lcore, op->reg, &op->value);
+
+                        if (op->retval != MACHINE_RETVAL_OK)
+                                job->retval = MACHINE_RETVAL_ERROR;
+                }
+        }
+
+        return NULL;
+}
+
+/**
+ * @brief Batch thread executing job of its index in each parallel batch
+ *
+ * @param arg job index, job 0 is executed by the thread issuing the batch
+ *
+ * @return NULL
+ */
+static void *
+msr_batch_thread_run(void *arg)
+{
+        const unsigned id = (unsigned)(uintptr_t)arg;
+        unsigned generation = 0;
+
+        pthread_mutex_lock(&m_batch.mutex);
+        for (;;) {
+                struct msr_batch_job *job;
+
+                while (generation == m_batch.generation && !m_batch.shutdown)
+                        pthread_cond_wait(&m_batch.start, &m_batch.mutex);
+                if (m_batch.shutdown)
+                        break;
+                generation = m_batch.generation;
+                if (id >= m_batch.num_jobs)
+                        continue;
+                job = &m_batch.jobs[id];
+                pthread_mutex_unlock(&m_batch.mutex);
+
+                msr_batch_job_run(job);
+
+                pthread_mutex_lock(&m_batch.mutex);
+                if (--m_batch.pending == 0)
+                        pthread_cond_signal(&m_batch.done);
+        }
+        pthread_mutex_unlock(&m_batch.mutex);
+
+        return NULL;
+}
+
+/**
+ * @brief Reserves batch threads for a batch
+ *
+ * Threads are started on first use.
+ *
+ * @return number of threads available to the batch including the caller
+ * @retval 1 if threads are used by another batch
+ */
+static unsigned
+msr_batch_threads_get(void)
+{
+        unsigned num = 1;
+
+        pthread_mutex_lock(&m_batch.mutex);
+        if (!m_batch.busy && !m_batch.shutdown) {
+                while (m_batch.num_threads < MSR_BATCH_MAX_THREADS - 1 &&
+                       pthread_create(
+                           &m_batch.threads[m_batch.num_threads], NULL,
+                           msr_batch_thread_run,
+                           (void *)(uintptr_t)(m_batch.num_threads + 1)) == 0)
+                        m_batch.num_threads++;
+                num += m_batch.num_threads;
+                m_batch.busy = num > 1;
+        }
+        pthread_mutex_unlock(&m_batch.mutex);
+
+        return num;
+}
+
+int
+msr_batch(struct msr_op *ops, const unsigned num)
+{
+        struct msr_batch_job jobs[MSR_BATCH_MAX_THREADS];
+        unsigned *count = NULL;
+        unsigned *order = NULL;
+        unsigned *groups = NULL;
+        unsigned num_groups = 0;
+        unsigned num_threads = 1;
+        unsigned i;
+        int ret = MACHINE_RETVAL_OK;
+
+        if (num == 0)
+                return MACHINE_RETVAL_OK;
+
+        ASSERT(ops != NULL);
+        if (ops == NULL)
+                return MACHINE_RETVAL_PARAM;
+
+        for (i = 0; i < num; i++)
+                ops[i].retval = MACHINE_RETVAL_ERROR;
+
+        ASSERT(m_msr_fd != NULL);
+        if (m_msr_fd == NULL)
+                return MACHINE_RETVAL_ERROR;
+
+        for (i = 0; i < num; i++)
+                if (ops[i].lcore >= m_maxcores)
+                        return MACHINE_RETVAL_PARAM;
+
+        count = calloc(m_maxcores + 1, sizeof(count[0]));
+        order = malloc(num * sizeof(order[0]));
+        groups = malloc((num + 1) * sizeof(groups[0]));
+        if (count == NULL || order == NULL || groups == NULL) {
+                ret = MACHINE_RETVAL_ERROR;
+                goto msr_batch_exit;
+        }
+
+        /* stable counting sort of operations by lcore */
+        for (i = 0; i < num; i++)
+                count[ops[i].lcore + 1]++;
+        for (i = 0; i < m_maxcores; i++) {
+                if (count[i + 1] > 0) {
+                        groups[num_groups++] = count[i];
+                        /* open MSR file before it is used by threads */
+                        if (msr_file_open(i) < 0) {
+                                ret = MACHINE_RETVAL_ERROR;
+                                goto msr_batch_exit;
+                        }
+                }
+                count[i + 1] += count[i];
+        }
+        groups[num_groups] = num;
+        for (i = 0; i < num; i++)
+                order[count[ops[i].lcore]++] = i;
+
+        if (num >= MSR_BATCH_MIN_PARALLEL && num_groups > 1) {
+                num_threads = msr_batch_threads_get();
+                if (num_threads > num_groups)
+                        num_threads = num_groups;
+        }
+
+        for (i = 0; i < num_threads; i++) {
+                jobs[i].ops = ops;
+                jobs[i].order = order;
+                jobs[i].groups = groups;
+                jobs[i].num_groups = num_groups;
+                jobs[i].first = i;
+                jobs[i].stride = num_threads;
+        }
+
+        if (num_threads > 1) {
+                pthread_mutex_lock(&m_batch.mutex);
+                m_batch.jobs = jobs;
+                m_batch.num_jobs = num_threads;
+                m_batch.pending = num_threads - 1;
+                m_batch.generation++;
+                pthread_cond_broadcast(&m_batch.start);
+                pthread_mutex_unlock(&m_batch.mutex);
+        }
+
+        /* job 0 is executed by the calling thread */
+        msr_batch_job_run(&jobs[0]);
+
+        if (num_threads > 1) {
+                pthread_mutex_lock(&m_batch.mutex);
+                while (m_batch.pending > 0)
+                        pthread_cond_wait(&m_batch.done, &m_batch.mutex);
+                m_batch.jobs = NULL;
+                m_batch.num_jobs = 0;
+                m_batch.busy = 0;
+                pthread_mutex_unlock(&m_batch.mutex);
+        }
+
+        for (i = 0; i < num_threads; i++)
+                if (jobs[i].retval != MACHINE_RETVAL_OK)
+                        ret = MACHINE_RETVAL_ERROR;
+
+msr_batch_exit:
+        free(count);
+        free(order);
+        free(groups);
 
         return ret;
 }
+
+int
+msr_read_batch(struct msr_op *ops, const unsigned num)
+{
+        unsigned i;
+
+        ASSERT(ops != NULL || num == 0);
+        if (ops == NULL && num > 0)
+                return MACHINE_RETVAL_PARAM;
+
+        for (i = 0; i < num; i++)
+                ops[i].write = 0;
+
+        return msr_batch(ops, num);
+}
+
+int
+msr_write_batch(struct msr_op *ops, const unsigned num)
+{
+        unsigned i;
+
+        ASSERT(ops != NULL || num == 0);
+        if (ops == NULL && num > 0)
+                return MACHINE_RETVAL_PARAM;
+
+        for (i = 0; i < num; i++)
+                ops[i].write = 1;
+
+        return msr_batch(ops, num);
+}
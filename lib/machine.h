@@ -38,6 +38,7 @@
 #ifndef __PQOS_MACHINE_H__
 #define __PQOS_MACHINE_H__
 
+#include "pqos.h"
 #include "types.h"
 
 #include <stdint.h>
@@ -67,6 +68,17 @@ struct cpuid_out {
         uint32_t edx;
 };
 
+/**
+ * Single MSR operation of a batch
+ */
+struct msr_op {
+        unsigned lcore; /**< logical core id */
+        uint32_t reg;   /**< MSR register */
+        uint64_t value; /**< value to be written or value read */
+        int write;      /**< 1 for WRMSR, 0 for RDMSR */
+        int retval;     /**< operation status, MACHINE_RETVAL_* */
+};
+
 /**
  * @brief Initializes machine module
  *
@@ -100,6 +112,9 @@ lcpuid(const unsigned leaf, const unsigned subleaf, struct cpuid_out *out);
 /**
  * @brief Executes RDMSR on \a lcore logical core
  *
+ * PQR_ASSOC and COS mask registers are served from the shadow table
+ * when a valid value is cached.
+ *
  * @param [in] lcore logical core id
  * @param [in] reg MSR to read from
  * @param [out] value place to store MSR value at
@@ -113,6 +128,10 @@ msr_read(const unsigned lcore, const uint32_t reg, uint64_t *value);
 /**
  * @brief Executes WRMSR on \a lcore logical core
  *
+ * Writes of COS mask registers are skipped when the cached value is
+ * the same. Writes of QoS configuration registers invalidate the shadow
+ * table.
+ *
  * @param [in] lcore logical core id
  * @param [in] reg MSR to write to
  * @param [in] value to be written into \a reg
@@ -123,6 +142,79 @@ msr_read(const unsigned lcore, const uint32_t reg, uint64_t *value);
 PQOS_LOCAL int
 msr_write(const unsigned lcore, const uint32_t reg, const uint64_t value);
 
+/**
+ * @brief Enables shadow of PQR_ASSOC and COS mask registers
+ *
+ * COS mask registers are shared by the cores of a domain (L3 CAT, L2
+ * cluster, MBA) and are cached once per domain.
+ *
+ * @param [in] cpu CPU topology
+ *
+ * @return Operation status
+ * @retval MACHINE_RETVAL_OK on success
+ */
+PQOS_LOCAL int msr_shadow_init(const struct pqos_cpuinfo *cpu);
+
+/**
+ * @brief Invalidates all shadow register values
+ *
+ * PQR_ASSOC and COS mask registers are cached by msr_read() and
+ * msr_write(). Values are re-read from hardware after invalidation.
+ */
+PQOS_LOCAL void msr_shadow_invalidate(void);
+
+/**
+ * @brief Detects changes of shadowed registers made outside of the library
+ *
+ * Re-reads one COS mask register and one PQR_ASSOC per domain and
+ * invalidates the shadow table if any of them differs from the cached
+ * value. Has to be called with the API lock held.
+ */
+PQOS_LOCAL void msr_shadow_validate(void);
+
+/**
+ * @brief Executes batch of RDMSR and WRMSR operations
+ *
+ * Operations are grouped per logical core. Operations targeting the same
+ * core are executed in the order they appear in \a ops, groups of different
+ * cores are executed concurrently by persistent batch threads. A batch
+ * issued while the threads are used by another batch is executed by the
+ * calling thread alone.
+ *
+ * @param [in,out] ops table of operations, values read and status of each
+ *                 operation are stored in the table
+ * @param [in] num number of operations in \a ops
+ *
+ * @return Operation status
+ * @retval MACHINE_RETVAL_OK if all operations succeeded
+ * @retval MACHINE_RETVAL_PARAM on parameter error
+ * @retval MACHINE_RETVAL_ERROR if any operation failed
+ */
+PQOS_LOCAL int msr_batch(struct msr_op *ops, const unsigned num);
+
+/**
+ * @brief Executes RDMSR for each operation of \a ops
+ *
+ * @param [in,out] ops table of lcore/register pairs to read,
+ *                 values read are stored in the table
+ * @param [in] num number of operations in \a ops
+ *
+ * @return Operation status
+ * @retval MACHINE_RETVAL_OK if all operations succeeded
+ */
+PQOS_LOCAL int msr_read_batch(struct msr_op *ops, const unsigned num);
+
+/**
+ * @brief Executes WRMSR for each operation of \a ops
+ *
+ * @param [in,out] ops table of lcore/register/value to write
+ * @param [in] num number of operations in \a ops
+ *
+ * @return Operation status
+ * @retval MACHINE_RETVAL_OK if all operations succeeded
+ */
+PQOS_LOCAL int msr_write_batch(struct msr_op *ops, const unsigned num);
+
 #ifdef __cplusplus
 }
 #endif
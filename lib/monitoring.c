@@ -40,6 +40,12 @@
 #include "perf_monitoring.h"
 #include "types.h"
 #include "utils.h"
+
+#include <pthread.h>
+#include <sched.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
 #ifdef __linux__
 #include "resctrl.h"
 #include "resctrl_monitoring.h"
@@ -51,24 +57,296 @@
  * ---------------------------------------
  */
 
+/**
+ * Environment variable enabling parallel polling, maximum number of workers
+ */
+#define MON_POLL_WORKERS_ENV "RDT_MON_POLL_WORKERS"
+
+/**
+ * Group spans cores of several workers and is polled by the calling thread
+ */
+#define MON_POLL_WORKER_NONE ((unsigned)-1)
+
 /**
  * ---------------------------------------
  * Local data types
  * ---------------------------------------
  */
 
+/**
+ * Polling worker thread
+ */
+struct mon_poll_worker {
+        pthread_t thread;   /**< worker thread */
+        unsigned id;        /**< index of the worker */
+        unsigned num_cores; /**< number of cores the worker is pinned to */
+        unsigned *cores;    /**< cores of the worker L3 domains */
+        int ret;            /**< status of the last poll */
+};
+
 /**
  * ---------------------------------------
  * Local data structures
  * ---------------------------------------
  */
 
+/**
+ * Polling worker pool, groups are assigned to workers by their cores
+ */
+static struct {
+        unsigned num_workers;
+        struct mon_poll_worker *workers;
+        unsigned max_lcore;     /**< size of lcore_worker table */
+        unsigned *lcore_worker; /**< worker index for each lcore */
+        pthread_mutex_t mutex;
+        pthread_cond_t start; /**< signals new poll or shutdown */
+        pthread_cond_t done;  /**< signals all workers finished */
+        unsigned generation;  /**< poll counter */
+        unsigned pending;     /**< workers not finished yet */
+        int shutdown;
+        struct pqos_mon_data **groups; /**< groups of current poll */
+        unsigned num_groups;
+} m_poll = {.mutex = PTHREAD_MUTEX_INITIALIZER,
+            .start = PTHREAD_COND_INITIALIZER,
+            .done = PTHREAD_COND_INITIALIZER};
+
 /**
  * ---------------------------------------
  * Local Functions
  * ---------------------------------------
  */
 
+/**
+ * @brief Returns worker index of logical core
+ *
+ * @param lcore logical core id
+ *
+ * @return worker owning the core
+ */
+static unsigned
+mon_poll_lcore_worker(const unsigned lcore)
+{
+        if (lcore >= m_poll.max_lcore)
+                return 0;
+
+        return m_poll.lcore_worker[lcore];
+}
+
+/**
+ * @brief Returns worker index of monitoring group
+ *
+ * Counters are read with event select and counter register pairs, so
+ * all cores of a group have to belong to the same worker. Otherwise
+ * two workers could program the same core concurrently.
+ *
+ * @param group monitoring group
+ *
+ * @return worker polling the group
+ * @retval MON_POLL_WORKER_NONE if group spans cores of several workers
+ */
+static unsigned
+mon_poll_group_worker(const struct pqos_mon_data *group)
+{
+        unsigned worker;
+        unsigned i;
+
+        if (group->intl->hw.num_ctx == 0) {
+                if (group->num_cores > 0)
+                        return mon_poll_lcore_worker(group->cores[0]);
+                return 0;
+        }
+
+        worker = mon_poll_lcore_worker(group->intl->hw.ctx[0].lcore);
+        for (i = 1; i < group->intl->hw.num_ctx; i++)
+                if (mon_poll_lcore_worker(group->intl->hw.ctx[i].lcore) !=
+                    worker)
+                        return MON_POLL_WORKER_NONE;
+
+        return worker;
+}
+
+/**
+ * @brief Polling worker thread
+ *
+ * Waits for a poll request and polls groups assigned to the worker
+ *
+ * @param arg worker structure
+ *
+ * @return NULL
+ */
+static void *
+mon_poll_worker_run(void *arg)
+{
+        struct mon_poll_worker *worker = (struct mon_poll_worker *)arg;
+        unsigned generation = 0;
+
+#ifdef __linux__
+        if (worker->num_cores > 0) {
+                cpu_set_t cpuset;
+                unsigned i;
+
+                CPU_ZERO(&cpuset);
+                for (i = 0; i < worker->num_cores; i++)
+                        CPU_SET(worker->cores[i], &cpuset);
+                if (pthread_setaffinity_np(pthread_self(), sizeof(cpuset),
+                                           &cpuset) != 0)
+                        LOG_WARN("Failed to pin polling worker %u\n",
+                                 worker->id);
+        }
+#endif
+
+        pthread_mutex_lock(&m_poll.mutex);
+        for (;;) {
+                unsigned i;
+                int ret = PQOS_RETVAL_OK;
+
+                while (generation == m_poll.generation && !m_poll.shutdown)
+                        pthread_cond_wait(&m_poll.start, &m_poll.mutex);
+                if (m_poll.shutdown)
+                        break;
+                generation = m_poll.generation;
+                pthread_mutex_unlock(&m_poll.mutex);
+
+                for (i = 0; i < m_poll.num_groups; i++) {
+                        struct pqos_mon_data *group = m_poll.groups[i];
+                        int retval;
+
+                        if (group->intl->rollup.num_child > 0 ||
+                            mon_poll_group_worker(group) != worker->id)
+                                continue;
+
+                        retval = pqos_mon_poll_events(group);
+                        if (retval != PQOS_RETVAL_OK) {
+                                LOG_WARN("Failed to poll event on group "
+                                         "number %u\n",
+                                         i);
+                                ret = retval;
+                        }
+                }
+
+                pthread_mutex_lock(&m_poll.mutex);
+                worker->ret = ret;
+                if (--m_poll.pending == 0)
+                        pthread_cond_signal(&m_poll.done);
+        }
+        pthread_mutex_unlock(&m_poll.mutex);
+
+        return NULL;
+}
+
+/**
+ * @brief Stops polling workers and frees the pool
+ */
+PQOS_STATIC void
+mon_poll_workers_fini(void)
+{
+        unsigned i;
+
+        pthread_mutex_lock(&m_poll.mutex);
+        m_poll.shutdown = 1;
+        pthread_cond_broadcast(&m_poll.start);
+        pthread_mutex_unlock(&m_poll.mutex);
+
+        for (i = 0; m_poll.workers != NULL && i < m_poll.num_workers; i++) {
+                if (m_poll.workers[i].thread != 0)
+                        pthread_join(m_poll.workers[i].thread, NULL);
+                free(m_poll.workers[i].cores);
+        }
+
+        free(m_poll.workers);
+        free(m_poll.lcore_worker);
+        m_poll.workers = NULL;
+        m_poll.lcore_worker = NULL;
+        m_poll.num_workers = 0;
+        m_poll.max_lcore = 0;
+        m_poll.shutdown = 0;
+}
+
+/**
+ * @brief Starts polling workers, one per L3 domain up to \a max_workers
+ *
+ * @param cpu cpu topology structure
+ * @param max_workers maximum number of workers
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+PQOS_STATIC int
+mon_poll_workers_init(const struct pqos_cpuinfo *cpu,
+                      const unsigned max_workers)
+{
+        unsigned *l3cat_ids;
+        unsigned num_l3cat_ids = 0;
+        unsigned i;
+        int ret = PQOS_RETVAL_OK;
+
+        l3cat_ids = pqos_cpu_get_l3cat_ids(cpu, &num_l3cat_ids);
+        if (l3cat_ids == NULL)
+                return PQOS_RETVAL_ERROR;
+
+        /* single domain is polled by the calling thread */
+        if (num_l3cat_ids < 2 || max_workers < 2)
+                goto mon_poll_workers_init_exit;
+
+        m_poll.num_workers =
+            max_workers < num_l3cat_ids ? max_workers : num_l3cat_ids;
+        m_poll.workers = calloc(m_poll.num_workers, sizeof(m_poll.workers[0]));
+        for (i = 0; i < cpu->num_cores; i++)
+                if (cpu->cores[i].lcore + 1 > m_poll.max_lcore)
+                        m_poll.max_lcore = cpu->cores[i].lcore + 1;
+        m_poll.lcore_worker =
+            calloc(m_poll.max_lcore, sizeof(m_poll.lcore_worker[0]));
+        if (m_poll.workers == NULL || m_poll.lcore_worker == NULL) {
+                ret = PQOS_RETVAL_RESOURCE;
+                goto mon_poll_workers_init_exit;
+        }
+
+        for (i = 0; i < m_poll.num_workers; i++) {
+                m_poll.workers[i].id = i;
+                m_poll.workers[i].cores =
+                    calloc(cpu->num_cores, sizeof(m_poll.workers[i].cores[0]));
+                if (m_poll.workers[i].cores == NULL) {
+                        ret = PQOS_RETVAL_RESOURCE;
+                        goto mon_poll_workers_init_exit;
+                }
+        }
+
+        /* L3 domains are distributed round robin between workers */
+        for (i = 0; i < cpu->num_cores; i++) {
+                const struct pqos_coreinfo *core = &cpu->cores[i];
+                struct mon_poll_worker *worker;
+                unsigned j;
+
+                for (j = 0; j < num_l3cat_ids; j++)
+                        if (l3cat_ids[j] == core->l3cat_id)
+                                break;
+
+                worker = &m_poll.workers[j % m_poll.num_workers];
+                worker->cores[worker->num_cores++] = core->lcore;
+                m_poll.lcore_worker[core->lcore] = worker->id;
+        }
+
+        for (i = 0; i < m_poll.num_workers; i++) {
+                if (pthread_create(&m_poll.workers[i].thread, NULL,
+                                   mon_poll_worker_run,
+                                   &m_poll.workers[i]) != 0) {
+                        LOG_ERROR("Failed to start polling worker\n");
+                        m_poll.workers[i].thread = 0;
+                        ret = PQOS_RETVAL_ERROR;
+                        goto mon_poll_workers_init_exit;
+                }
+        }
+
+        LOG_INFO("Polling with %u worker threads\n", m_poll.num_workers);
+
+mon_poll_workers_init_exit:
+        if (ret != PQOS_RETVAL_OK)
+                mon_poll_workers_fini();
+        free(l3cat_ids);
+
+        return ret;
+}
+
 /*
  * =======================================
  * =======================================
@@ -116,6 +394,20 @@ pqos_mon_init(const struct pqos_cpuinfo *cpu,
         if (ret != PQOS_RETVAL_OK)
                 return ret;
 
+        /**
+         * Parallel polling is supported for MSR interface only,
+         * resctrl lock is shared by all threads of the process
+         */
+        if (interface == PQOS_INTER_MSR &&
+            getenv(MON_POLL_WORKERS_ENV) != NULL) {
+                unsigned long max_workers =
+                    strtoul(getenv(MON_POLL_WORKERS_ENV), NULL, 10);
+
+                if (mon_poll_workers_init(cpu, (unsigned)max_workers) !=
+                    PQOS_RETVAL_OK)
+                        LOG_WARN("Parallel polling disabled\n");
+        }
+
         if (interface == PQOS_INTER_MMIO)
                 ret = mmio_mon_init(cpu, cap);
 
@@ -127,6 +419,8 @@ int
 pqos_mon_fini(void)
 {
         int ret = PQOS_RETVAL_OK;
+
+        mon_poll_workers_fini();
 #ifdef __linux__
         enum pqos_interface interface = _pqos_get_inter();
 
@@ -148,47 +442,69 @@ pqos_mon_fini(void)
         return ret;
 }
 
-int
-pqos_mon_poll_events(struct pqos_mon_data *group)
+/** List of non virtual events in poll order */
+static const enum pqos_mon_event m_poll_event[] = {
+    PQOS_MON_EVENT_L3_OCCUP,
+    PQOS_MON_EVENT_LMEM_BW,
+    PQOS_MON_EVENT_TMEM_BW,
+    PQOS_MON_EVENT_IO_L3_OCCUP,
+    PQOS_MON_EVENT_IO_TOTAL_MEM_BW,
+    PQOS_MON_EVENT_IO_MISS_MEM_BW,
+    PQOS_PERF_EVENT_LLC_MISS,
+    PQOS_PERF_EVENT_LLC_REF,
+    (enum pqos_mon_event)PQOS_PERF_EVENT_CYCLES,
+    (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS,
+    PQOS_PERF_EVENT_LLC_MISS_PCIE_READ,
+    PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE,
+    PQOS_PERF_EVENT_LLC_REF_PCIE_READ,
+    PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE};
+
+/**
+ * @brief Appends operation to the group poll plan
+ *
+ * @param [in,out] group monitoring group
+ * @param [in] backend backend to read the event from
+ * @param [in] event event to read
+ */
+static void
+mon_poll_plan_add(struct pqos_mon_data *group,
+                  const enum mon_poll_backend backend,
+                  const enum pqos_mon_event event)
 {
-        unsigned i;
-        int ret = PQOS_RETVAL_OK;
-        enum pqos_interface interface = _pqos_get_inter();
+        struct pqos_mon_poll_op *op;
 
-        /** List of non virtual events */
-        const enum pqos_mon_event mon_event[] = {
-            PQOS_MON_EVENT_L3_OCCUP,
-            PQOS_MON_EVENT_LMEM_BW,
-            PQOS_MON_EVENT_TMEM_BW,
-            PQOS_MON_EVENT_IO_L3_OCCUP,
-            PQOS_MON_EVENT_IO_TOTAL_MEM_BW,
-            PQOS_MON_EVENT_IO_MISS_MEM_BW,
-            PQOS_PERF_EVENT_LLC_MISS,
-            PQOS_PERF_EVENT_LLC_REF,
-            (enum pqos_mon_event)PQOS_PERF_EVENT_CYCLES,
-            (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS,
-            PQOS_PERF_EVENT_LLC_MISS_PCIE_READ,
-            PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE,
-            PQOS_PERF_EVENT_LLC_REF_PCIE_READ,
-            PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE};
+        ASSERT(group->intl->plan.num_op < MON_POLL_PLAN_MAX);
 
-#ifdef __linux__
-        if (group->intl->resctrl.event != 0) {
-                ret = resctrl_lock_shared();
-                if (ret != PQOS_RETVAL_OK)
-                        return ret;
-        }
-#endif
+        op = &group->intl->plan.op[group->intl->plan.num_op++];
+        op->backend = backend;
+        op->event = event;
+}
+
+/**
+ * @brief Compiles poll plan of the monitoring group
+ *
+ * The plan is an ordered list of backend reads for started events of the
+ * group, so that polling does not need to go through all events and
+ * interfaces every time.
+ *
+ * @param [in,out] group monitoring group
+ */
+static void
+mon_poll_plan_build(struct pqos_mon_data *group)
+{
+        const enum pqos_interface interface = _pqos_get_inter();
+        const struct pqos_cap *cap = _pqos_get_cap();
+        const struct pqos_monitor *pmon;
+        unsigned i;
+
+        group->intl->plan.num_op = 0;
 
-        for (i = 0; i < DIM(mon_event); i++) {
-                enum pqos_mon_event evt = mon_event[i];
+        for (i = 0; i < DIM(m_poll_event); i++) {
+                enum pqos_mon_event evt = m_poll_event[i];
 
-                /**
-                 * poll hw event
-                 */
                 if (group->intl->hw.event & evt) {
                         if (interface == PQOS_INTER_MMIO) {
-                                // Skip MMIO events that are not supported
+                                /* Skip MMIO events that are not supported */
                                 if ((evt ==
                                      PQOS_PERF_EVENT_LLC_MISS_PCIE_READ) ||
                                     (evt ==
@@ -198,43 +514,113 @@ pqos_mon_poll_events(struct pqos_mon_data *group)
                                     (evt == PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE))
                                         continue;
 
-                                ret = mmio_mon_poll(group, evt);
-                        } else {
-                                ret = hw_mon_poll(group, evt);
-                        }
-
-                        if (ret != PQOS_RETVAL_OK)
-                                goto poll_events_exit;
+                                mon_poll_plan_add(group, MON_POLL_MMIO, evt);
+                        } else
+                                mon_poll_plan_add(group, MON_POLL_HW, evt);
                 }
 
 #ifdef __linux__
-                /**
-                 * poll perf event
-                 */
-                if (group->intl->perf.event & evt) {
-                        ret = perf_mon_poll(group, evt);
-                        if (ret != PQOS_RETVAL_OK)
-                                goto poll_events_exit;
-                }
+                if (group->intl->perf.event & evt)
+                        mon_poll_plan_add(group, MON_POLL_PERF, evt);
 
-                /**
-                 * poll resctrl event
-                 */
-                if (group->intl->resctrl.event & evt) {
-                        ret = resctrl_mon_poll(group, evt);
-                        if (ret != PQOS_RETVAL_OK)
-                                goto poll_events_exit;
-                }
+                if (group->intl->resctrl.event & evt)
+                        mon_poll_plan_add(group, MON_POLL_RESCTRL, evt);
 #endif
         }
 
+        group->intl->plan.rmem_max = 0;
+        if ((group->event & PQOS_MON_EVENT_RMEM_BW) &&
+            pqos_cap_get_event(cap, PQOS_MON_EVENT_RMEM_BW, &pmon) ==
+                PQOS_RETVAL_OK)
+                group->intl->plan.rmem_max = 1LLU << pmon->counter_length;
+
+        group->intl->plan.hw = group->intl->hw.event;
+        group->intl->plan.perf = group->intl->perf.event;
+        group->intl->plan.resctrl = group->intl->resctrl.event;
+        group->intl->plan.valid = 1;
+}
+
+/**
+ * @brief Records read time of the monitoring group
+ *
+ * @param [in,out] group monitoring group
+ */
+static void
+mon_timestamp_update(struct pqos_mon_data *group)
+{
+        struct timespec ts;
+
+        if (clock_gettime(CLOCK_MONOTONIC, &ts) != 0)
+                return;
+
+        group->intl->timestamp.prev_read = group->intl->timestamp.read;
+        group->intl->timestamp.read =
+            (uint64_t)ts.tv_sec * 1000000000LLU + (uint64_t)ts.tv_nsec;
+}
+
+int
+pqos_mon_poll_events(struct pqos_mon_data *group)
+{
+        unsigned i;
+        int ret = PQOS_RETVAL_OK;
+
+        /**
+         * (Re)compile poll plan if started events have changed
+         */
+        if (!group->intl->plan.valid ||
+            group->intl->plan.hw != group->intl->hw.event ||
+            group->intl->plan.perf != group->intl->perf.event ||
+            group->intl->plan.resctrl != group->intl->resctrl.event)
+                mon_poll_plan_build(group);
+
+        /**
+         * Grouped perf events are read by the first of them polled, drop
+         * values left over by an incomplete previous poll
+         */
+        group->intl->perf.pending = (enum pqos_mon_event)0;
+
+#ifdef __linux__
+        if (group->intl->resctrl.event != 0) {
+                ret = resctrl_lock_shared();
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+        }
+#endif
+
+        for (i = 0; i < group->intl->plan.num_op; i++) {
+                const struct pqos_mon_poll_op *op = &group->intl->plan.op[i];
+
+                switch (op->backend) {
+                case MON_POLL_HW:
+                        ret = hw_mon_poll(group, op->event);
+                        break;
+                case MON_POLL_MMIO:
+                        ret = mmio_mon_poll(group, op->event);
+                        break;
+#ifdef __linux__
+                case MON_POLL_PERF:
+                        ret = perf_mon_poll(group, op->event);
+                        break;
+                case MON_POLL_RESCTRL:
+                        ret = resctrl_mon_poll(group, op->event);
+                        break;
+#endif
+                default:
+                        ret = PQOS_RETVAL_ERROR;
+                        break;
+                }
+
+                if (ret != PQOS_RETVAL_OK)
+                        goto poll_events_exit;
+        }
+
+        mon_timestamp_update(group);
+
         /**
          * Calculate values of virtual events
          */
         if (group->event & PQOS_MON_EVENT_RMEM_BW) {
-                const struct pqos_cap *cap = _pqos_get_cap();
-                const struct pqos_monitor *pmon;
-                uint64_t max_value = 0;
+                const uint64_t max_value = group->intl->plan.rmem_max;
 
                 group->values.mbm_remote_delta = 0;
                 if (group->values.mbm_total_delta >
@@ -243,10 +629,6 @@ pqos_mon_poll_events(struct pqos_mon_data *group)
                             group->values.mbm_total_delta -
                             group->values.mbm_local_delta;
 
-                ret = pqos_cap_get_event(cap, PQOS_MON_EVENT_RMEM_BW, &pmon);
-                if (ret == PQOS_RETVAL_OK)
-                        max_value = 1LLU << pmon->counter_length;
-
                 if (max_value > 0 &&
                     group->values.mbm_local > group->values.mbm_total)
                         group->values.mbm_remote = max_value -
@@ -265,8 +647,7 @@ pqos_mon_poll_events(struct pqos_mon_data *group)
                         group->values.ipc = 0;
         }
 
-        if (ret == PQOS_RETVAL_OK)
-                group->intl->valid_mbm_read = 1;
+        group->intl->valid_mbm_read = 1;
 
 poll_events_exit:
 #ifdef __linux__
@@ -276,3 +657,215 @@ poll_events_exit:
 
         return ret;
 }
+
+/**
+ * @brief Sums values of rollup group children
+ *
+ * @param [in,out] group rollup monitoring group
+ */
+static void
+mon_rollup_sum(struct pqos_mon_data *group)
+{
+        struct pqos_event_values *values = &group->values;
+        struct pqos_region_aware_event_values *region = &group->region_values;
+        unsigned i;
+        int j;
+
+        memset(values, 0, sizeof(*values));
+        memset(region, 0, sizeof(*region));
+        memset(&group->intl->values, 0, sizeof(group->intl->values));
+
+        for (i = 0; i < group->intl->rollup.num_child; i++) {
+                const struct pqos_mon_data *child =
+                    group->intl->rollup.child[i];
+                const struct pqos_event_values *cv = &child->values;
+                const struct pqos_region_aware_event_values *cr =
+                    &child->region_values;
+
+                values->llc += cv->llc;
+                values->mbm_local += cv->mbm_local;
+                values->mbm_total += cv->mbm_total;
+                values->mbm_remote += cv->mbm_remote;
+                values->mbm_local_delta += cv->mbm_local_delta;
+                values->mbm_total_delta += cv->mbm_total_delta;
+                values->mbm_remote_delta += cv->mbm_remote_delta;
+                values->ipc_retired += cv->ipc_retired;
+                values->ipc_retired_delta += cv->ipc_retired_delta;
+                values->ipc_unhalted += cv->ipc_unhalted;
+                values->ipc_unhalted_delta += cv->ipc_unhalted_delta;
+                values->llc_misses += cv->llc_misses;
+                values->llc_misses_delta += cv->llc_misses_delta;
+                values->llc_references += cv->llc_references;
+                values->llc_references_delta += cv->llc_references_delta;
+
+                for (j = 0; j < PQOS_MAX_MEM_REGIONS; j++) {
+                        region->mbm_total[j] += cr->mbm_total[j];
+                        region->mbm_total_delta[j] += cr->mbm_total_delta[j];
+                }
+                region->io_llc += cr->io_llc;
+                region->io_total += cr->io_total;
+                region->io_total_delta += cr->io_total_delta;
+                region->io_miss += cr->io_miss;
+                region->io_miss_delta += cr->io_miss_delta;
+
+                group->intl->values.pcie.llc_misses.read +=
+                    child->intl->values.pcie.llc_misses.read;
+                group->intl->values.pcie.llc_misses.read_delta +=
+                    child->intl->values.pcie.llc_misses.read_delta;
+                group->intl->values.pcie.llc_misses.write +=
+                    child->intl->values.pcie.llc_misses.write;
+                group->intl->values.pcie.llc_misses.write_delta +=
+                    child->intl->values.pcie.llc_misses.write_delta;
+                group->intl->values.pcie.llc_references.read +=
+                    child->intl->values.pcie.llc_references.read;
+                group->intl->values.pcie.llc_references.read_delta +=
+                    child->intl->values.pcie.llc_references.read_delta;
+                group->intl->values.pcie.llc_references.write +=
+                    child->intl->values.pcie.llc_references.write;
+                group->intl->values.pcie.llc_references.write_delta +=
+                    child->intl->values.pcie.llc_references.write_delta;
+        }
+
+        if (values->ipc_unhalted_delta > 0)
+                values->ipc = (double)values->ipc_retired_delta /
+                              (double)values->ipc_unhalted_delta;
+
+        group->intl->timestamp.prev_read = group->intl->timestamp.read;
+        group->intl->timestamp.read = 0;
+        for (i = 0; i < group->intl->rollup.num_child; i++) {
+                const struct pqos_mon_data *child =
+                    group->intl->rollup.child[i];
+
+                if (child->intl->timestamp.read > group->intl->timestamp.read)
+                        group->intl->timestamp.read =
+                            child->intl->timestamp.read;
+        }
+
+        group->intl->valid_mbm_read = 1;
+}
+
+int
+pqos_mon_rollup_expand(struct pqos_mon_data **groups,
+                       const unsigned num_groups,
+                       struct pqos_mon_data ***all,
+                       unsigned *num_all)
+{
+        struct pqos_mon_data **table = groups;
+        unsigned num = num_groups;
+        unsigned size = num_groups;
+        int ret = PQOS_RETVAL_OK;
+        unsigned i, j;
+
+        for (i = 0; i < num_groups; i++)
+                groups[i]->intl->rollup.mark = 1;
+
+        /* appended children are visited by the same loop */
+        for (i = 0; i < num && ret == PQOS_RETVAL_OK; i++) {
+                const struct pqos_mon_data *group = table[i];
+
+                for (j = 0; j < group->intl->rollup.num_child; j++) {
+                        struct pqos_mon_data *child =
+                            group->intl->rollup.child[j];
+
+                        if (child->intl->rollup.mark)
+                                continue;
+
+                        if (num == size) {
+                                struct pqos_mon_data **tmp;
+
+                                size *= 2;
+                                if (table == groups) {
+                                        tmp = malloc(size * sizeof(tmp[0]));
+                                        if (tmp != NULL)
+                                                memcpy(tmp, groups,
+                                                       num * sizeof(tmp[0]));
+                                } else
+                                        tmp = realloc(table,
+                                                      size * sizeof(tmp[0]));
+                                if (tmp == NULL) {
+                                        ret = PQOS_RETVAL_RESOURCE;
+                                        break;
+                                }
+                                table = tmp;
+                        }
+
+                        child->intl->rollup.mark = 1;
+                        table[num++] = child;
+                }
+        }
+
+        for (i = 0; i < num; i++)
+                table[i]->intl->rollup.mark = 0;
+
+        if (ret != PQOS_RETVAL_OK) {
+                if (table != groups)
+                        free(table);
+                return ret;
+        }
+
+        *all = table;
+        *num_all = num;
+
+        return PQOS_RETVAL_OK;
+}
+
+void
+pqos_mon_rollup_poll(struct pqos_mon_data **groups, const unsigned num_groups)
+{
+        unsigned max_level = 0;
+        unsigned level;
+        unsigned i;
+
+        for (i = 0; i < num_groups; i++)
+                if (groups[i]->intl->rollup.level > max_level)
+                        max_level = groups[i]->intl->rollup.level;
+
+        for (level = 1; level <= max_level; level++)
+                for (i = 0; i < num_groups; i++)
+                        if (groups[i]->intl->rollup.level == level)
+                                mon_rollup_sum(groups[i]);
+}
+
+int
+pqos_mon_poll_workers(struct pqos_mon_data **groups, const unsigned num_groups)
+{
+        int ret = PQOS_RETVAL_OK;
+        unsigned i;
+
+        if (m_poll.num_workers == 0)
+                return PQOS_RETVAL_RESOURCE;
+
+        pthread_mutex_lock(&m_poll.mutex);
+        m_poll.groups = groups;
+        m_poll.num_groups = num_groups;
+        m_poll.pending = m_poll.num_workers;
+        m_poll.generation++;
+        pthread_cond_broadcast(&m_poll.start);
+        while (m_poll.pending > 0)
+                pthread_cond_wait(&m_poll.done, &m_poll.mutex);
+        m_poll.groups = NULL;
+        m_poll.num_groups = 0;
+        pthread_mutex_unlock(&m_poll.mutex);
+
+        for (i = 0; i < m_poll.num_workers; i++)
+                if (m_poll.workers[i].ret != PQOS_RETVAL_OK)
+                        ret = m_poll.workers[i].ret;
+
+        /* groups spanning several workers are polled once workers are idle */
+        for (i = 0; i < num_groups; i++) {
+                int retval;
+
+                if (groups[i]->intl->rollup.num_child > 0 ||
+                    mon_poll_group_worker(groups[i]) != MON_POLL_WORKER_NONE)
+                        continue;
+
+                retval = pqos_mon_poll_events(groups[i]);
+                if (retval != PQOS_RETVAL_OK) {
+                        LOG_WARN("Failed to poll event on group number %u\n",
+                                 i);
+                        ret = retval;
+                }
+        }
+
+        return ret;
+}
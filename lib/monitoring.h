@@ -54,8 +54,19 @@ struct pqos_mon_poll_ctx {
         unsigned numa;
         uint8_t quiet; /**< Do not warn abut RMID hijacking */
         pqos_rmid_t rmid;
+        struct {
+                uint64_t raw;     /**< last raw counter value */
+                uint64_t ext;     /**< 64-bit extended counter value */
+                uint64_t read_ns; /**< time of the last read */
+                int valid;        /**< counter has been read */
+        } mbm[2]; /**< local and total MBM counters */
 };
 
+/**
+ * Maximum number of perf events read together as one group
+ */
+#define MON_PERF_GROUP_MAX 4
+
 /**
  * Perf monitoring poll context
  */
@@ -69,6 +80,30 @@ struct pqos_mon_perf_ctx {
         int fd_llc_references;
 };
 
+/**
+ * Maximum number of poll plan operations - 14 non virtual events,
+ * each read from at most 3 backends
+ */
+#define MON_POLL_PLAN_MAX 42
+
+/**
+ * Poll plan backends
+ */
+enum mon_poll_backend {
+        MON_POLL_HW = 0,
+        MON_POLL_MMIO,
+        MON_POLL_PERF,
+        MON_POLL_RESCTRL
+};
+
+/**
+ * Poll plan operation - read of one event from the backend
+ */
+struct pqos_mon_poll_op {
+        enum pqos_mon_event event;
+        enum mon_poll_backend backend;
+};
+
 /**
  * Internal monitoring group data structure
  */
@@ -100,6 +135,12 @@ struct pqos_mon_data_internal {
                 enum pqos_mon_event event;     /**< Started perf events */
                 struct pqos_mon_perf_ctx *ctx; /**< Perf poll context for each
                                                   core/tid */
+                enum pqos_mon_event group;     /**< Events read as a group */
+                enum pqos_mon_event pending;   /**< Grouped events with
+                                                  values not polled yet */
+                enum pqos_mon_event group_evt[MON_PERF_GROUP_MAX];
+                /**< Grouped events in read order, leader first */
+                unsigned group_num; /**< Number of grouped events */
         } perf;
 
         /**
@@ -132,6 +173,39 @@ struct pqos_mon_data_internal {
                 unsigned *sockets;
         } uncore;
 
+        /**
+         * Poll plan, compiled from the started events on first poll
+         */
+        struct {
+                int valid;                 /**< plan has been compiled */
+                enum pqos_mon_event hw;    /**< hw events of the plan */
+                enum pqos_mon_event perf;  /**< perf events of the plan */
+                enum pqos_mon_event resctrl; /**< resctrl events of the
+                                                plan */
+                uint64_t rmem_max;         /**< MBM counter wrap value */
+                unsigned num_op;           /**< number of operations */
+                struct pqos_mon_poll_op op[MON_POLL_PLAN_MAX];
+        } plan;
+
+        /**
+         * Rollup specific section
+         */
+        struct {
+                struct pqos_mon_data **child; /**< child groups */
+                unsigned num_child;           /**< number of child groups */
+                unsigned level;     /**< 0 for groups read from hardware */
+                unsigned num_parent; /**< rollup groups using this group */
+                int mark; /**< group is in the expanded poll table */
+        } rollup;
+
+        /**
+         * Read time section, CLOCK_MONOTONIC in ns (0 if not read yet)
+         */
+        struct {
+                uint64_t read;      /**< time of the last poll */
+                uint64_t prev_read; /**< time of the previous poll */
+        } timestamp;
+
         int valid_mbm_read; /**< flag to discard 1st invalid read */
         int manage_memory;  /**< mon data memory is managed by lib */
 
@@ -172,6 +246,59 @@ int pqos_mon_fini(void);
  */
 int pqos_mon_poll_events(struct pqos_mon_data *group);
 
+/**
+ * @brief Adds descendants of rollup groups missing from the poll table
+ *
+ * Rollup groups are computed from their children, so all their descendants
+ * have to be polled in the same call. Each group is present in the expanded
+ * table once.
+ *
+ * @param [in] groups table of monitoring groups
+ * @param [in] num_groups number of groups in \a groups
+ * @param [out] all expanded table, \a groups if nothing was missing,
+ *              otherwise allocated table to be freed by the caller
+ * @param [out] num_all number of groups in \a all
+ *
+ * @return Operations status
+ * @retval PQOS_RETVAL_OK on success
+ * @retval PQOS_RETVAL_RESOURCE on memory allocation error
+ */
+int pqos_mon_rollup_expand(struct pqos_mon_data **groups,
+                           const unsigned num_groups,
+                           struct pqos_mon_data ***all,
+                           unsigned *num_all);
+
+/**
+ * @brief Computes values of rollup groups from their child groups
+ *
+ * Rollup groups are updated in order of their level, so that rollups of
+ * rollups see updated values of their children.
+ *
+ * @param groups table of monitoring groups
+ * @param num_groups number of groups in \a groups
+ */
+void pqos_mon_rollup_poll(struct pqos_mon_data **groups,
+                          const unsigned num_groups);
+
+/**
+ * @brief Polls monitoring data of groups using worker threads
+ *
+ * Worker pool is enabled with RDT_MON_POLL_WORKERS environment variable set
+ * to maximum number of workers. Each worker is pinned to the cores of its
+ * L3 domains and polls groups with all cores in these domains. Groups
+ * spanning domains of several workers are polled by the calling thread
+ * after the workers finish.
+ *
+ * @param groups table of monitoring groups
+ * @param num_groups number of groups in \a groups
+ *
+ * @return Operations status
+ * @retval PQOS_RETVAL_OK on success
+ * @retval PQOS_RETVAL_RESOURCE if worker pool is not enabled
+ */
+int pqos_mon_poll_workers(struct pqos_mon_data **groups,
+                          const unsigned num_groups);
+
 #ifdef __cplusplus
 }
 #endif
@@ -660,6 +660,11 @@ os_mon_add_pids(const unsigned num_pids,
         ASSERT(num_pids > 0);
         ASSERT(pids != NULL);
 
+        if (group->intl->rollup.num_child > 0) {
+                LOG_ERROR("Cannot add tasks to rollup monitoring group\n");
+                return PQOS_RETVAL_PARAM;
+        }
+
         memset(&added, 0, sizeof(added));
         memset(&added_intl, 0, sizeof(added_intl));
         added.intl = &added_intl;
@@ -723,6 +728,20 @@ os_mon_add_pids(const unsigned num_pids,
         if (ret != PQOS_RETVAL_OK)
                 goto os_mon_add_pids_exit;
 
+        /**
+         * Perf event groups of the new TIDs have to match the existing ones
+         * as all of them are read with the same layout
+         */
+        if (added.intl->perf.group_num != group->intl->perf.group_num ||
+            memcmp(added.intl->perf.group_evt, group->intl->perf.group_evt,
+                   sizeof(added.intl->perf.group_evt[0]) *
+                       group->intl->perf.group_num) != 0) {
+                LOG_ERROR("Failed to group perf events of the new TIDs\n");
+                os_mon_stop_events(&added);
+                ret = PQOS_RETVAL_ERROR;
+                goto os_mon_add_pids_exit;
+        }
+
         /**
          * Update mon group
          */
@@ -761,6 +780,9 @@ os_mon_add_pids(const unsigned num_pids,
                 group->num_pids++;
         }
 
+        /* recompile poll plan for the updated task set on next poll */
+        group->intl->plan.valid = 0;
+
 os_mon_add_pids_exit:
         if (added.intl->resctrl.mon_group != NULL) {
                 free(added.intl->resctrl.mon_group);
@@ -796,6 +818,12 @@ os_mon_remove_pids(const unsigned num_pids,
         ASSERT(pids != NULL);
         ASSERT(group != NULL);
 
+        if (group->intl->rollup.num_child > 0) {
+                LOG_ERROR("Cannot remove tasks from rollup monitoring "
+                          "group\n");
+                return PQOS_RETVAL_PARAM;
+        }
+
         memset(&remove, 0, sizeof(remove));
         memset(&remove_intl, 0, sizeof(remove_intl));
         remove.intl = &remove_intl;
@@ -877,6 +905,9 @@ os_mon_remove_pids(const unsigned num_pids,
         group->pids =
             realloc(group->pids, sizeof(group->pids[0]) * group->num_pids);
 
+        /* recompile poll plan for the updated task set on next poll */
+        group->intl->plan.valid = 0;
+
 os_mon_remove_pids_exit:
         if (remove.tid_map != NULL)
                 free(remove.tid_map);
@@ -150,3 +150,26 @@ perf_read_counter(int counter_fd, uint64_t *value)
         LOG_ERROR("Failed to read perf counter!\n");
         return PQOS_RETVAL_ERROR;
 }
+
+int
+perf_read_group(int leader_fd, const unsigned num, uint64_t *values)
+{
+        uint64_t buf[PERF_GROUP_MAX_EVENTS + 1];
+        const ssize_t size = (ssize_t)(sizeof(buf[0]) * (num + 1));
+        unsigned i;
+
+        if (leader_fd <= 0 || num == 0 || num > PERF_GROUP_MAX_EVENTS ||
+            values == NULL)
+                return PQOS_RETVAL_PARAM;
+
+        /* PERF_FORMAT_GROUP layout: number of events followed by values */
+        if (read(leader_fd, buf, size) != size || buf[0] != num) {
+                LOG_ERROR("Failed to read perf counter group!\n");
+                return PQOS_RETVAL_ERROR;
+        }
+
+        for (i = 0; i < num; i++)
+                values[i] = buf[i + 1];
+
+        return PQOS_RETVAL_OK;
+}
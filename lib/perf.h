@@ -43,6 +43,11 @@ extern "C" {
 #include <stdint.h>
 #include <unistd.h>
 
+/**
+ * Maximum number of events read with perf_read_group()
+ */
+#define PERF_GROUP_MAX_EVENTS 8
+
 /**
  * @brief Function to setup perf event counters
  *
@@ -105,6 +110,23 @@ PQOS_LOCAL int perf_stop_counter(int counter_fd);
  */
 PQOS_LOCAL int perf_read_counter(int counter_fd, uint64_t *value);
 
+/**
+ * @brief Function to read all counters of a perf event group
+ *
+ * Group leader has to be opened with PERF_FORMAT_GROUP read format.
+ *
+ * @param leader_fd fd of the group leader
+ * @param num number of events in the group
+ * @param values array of \a num entries to store counter values in
+ *               group order
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK on success
+ */
+PQOS_LOCAL int perf_read_group(int leader_fd,
+                               const unsigned num,
+                               uint64_t *values);
+
 #ifdef __cplusplus
 }
 #endif
@@ -499,37 +499,59 @@ perf_mon_get_fd(struct pqos_mon_perf_ctx *ctx, const enum pqos_mon_event event)
         }
 }
 
-int
-perf_mon_start(struct pqos_mon_data *group, enum pqos_mon_event event)
+/**
+ * @brief Checks if event can be a member of the perf event group
+ *
+ * Only architectural events are grouped, RDT events are handled by a
+ * different PMU and have to be opened independently.
+ *
+ * @param event monitoring event
+ *
+ * @retval 1 if event can be grouped
+ * @retval 0 otherwise
+ */
+static int
+perf_mon_is_group_event(const enum pqos_mon_event event)
 {
-        int i, num_ctrs;
-        struct perf_mon_supported_event *se;
-
-        ASSERT(group != NULL);
-        ASSERT(group->intl != NULL);
-        ASSERT(group->intl->perf.ctx != NULL);
-
-        /**
-         * Check if monitoring cores/tasks
-         */
-        if (group->num_cores > 0)
-                num_ctrs = group->num_cores;
-        else if (group->tid_nr > 0)
-                num_ctrs = group->tid_nr;
-        else
-                return PQOS_RETVAL_ERROR;
+        switch (event) {
+        case PQOS_PERF_EVENT_LLC_MISS:
+        case PQOS_PERF_EVENT_LLC_REF:
+        case (enum pqos_mon_event)PQOS_PERF_EVENT_CYCLES:
+        case (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS:
+                return 1;
+        default:
+                return 0;
+        }
+}
 
-        se = get_supported_event(event);
-        if (se == NULL)
-                return PQOS_RETVAL_ERROR;
+/**
+ * @brief Opens perf counters of \a event for each core/task of the group
+ *
+ * On failure counters opened so far are closed.
+ *
+ * @param group monitoring group
+ * @param attr perf event attributes
+ * @param event monitoring event
+ * @param leader event of the group leader or 0 to open independently
+ * @param num_ctrs number of cores/tasks
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+perf_mon_open(struct pqos_mon_data *group,
+              struct perf_event_attr *attr,
+              const enum pqos_mon_event event,
+              const enum pqos_mon_event leader,
+              const int num_ctrs)
+{
+        int i;
 
-        /**
-         * For each core/task assign fd to read counter
-         */
         for (i = 0; i < num_ctrs; i++) {
                 int ret;
                 struct pqos_mon_perf_ctx *ctx = &group->intl->perf.ctx[i];
                 int *fd;
+                int group_fd = -1;
                 int core = -1;
                 pid_t tid = -1;
 
@@ -541,15 +563,19 @@ perf_mon_start(struct pqos_mon_data *group, enum pqos_mon_event event)
                 fd = perf_mon_get_fd(ctx, event);
                 if (fd == NULL)
                         return PQOS_RETVAL_ERROR;
+                if (leader != 0)
+                        group_fd = *perf_mon_get_fd(ctx, leader);
                 /*
                  * If monitoring cores, pass core list
                  * Otherwise, pass list of TID's
                  */
-                ret = perf_setup_counter(&se->attrs, tid, core, -1, 0, fd);
+                ret = perf_setup_counter(attr, tid, core, group_fd, 0, fd);
                 if (ret != PQOS_RETVAL_OK) {
-                        LOG_ERROR("Failed to start perf "
-                                  "counters for %s\n",
-                                  se->desc);
+                        while (i-- > 0) {
+                                ctx = &group->intl->perf.ctx[i];
+                                perf_shutdown_counter(
+                                    *perf_mon_get_fd(ctx, event));
+                        }
                         return PQOS_RETVAL_ERROR;
                 }
         }
@@ -558,9 +584,13 @@ perf_mon_start(struct pqos_mon_data *group, enum pqos_mon_event event)
 }
 
 int
-perf_mon_stop(struct pqos_mon_data *group, enum pqos_mon_event event)
+perf_mon_start(struct pqos_mon_data *group, enum pqos_mon_event event)
 {
-        int i, num_ctrs;
+        int ret, num_ctrs;
+        struct perf_mon_supported_event *se;
+        struct perf_event_attr attr;
+        enum pqos_mon_event leader = (enum pqos_mon_event)0;
+        int grouped = 0;
 
         ASSERT(group != NULL);
         ASSERT(group->intl != NULL);
@@ -576,46 +606,57 @@ perf_mon_stop(struct pqos_mon_data *group, enum pqos_mon_event event)
         else
                 return PQOS_RETVAL_ERROR;
 
+        se = get_supported_event(event);
+        if (se == NULL)
+                return PQOS_RETVAL_ERROR;
+
         /**
-         * For each counter, close associated file descriptor
+         * Architectural events of the context are opened as one group so
+         * that a single read returns all of them. First one becomes
+         * the group leader.
          */
-        for (i = 0; i < num_ctrs; i++) {
-                struct pqos_mon_perf_ctx *ctx = &group->intl->perf.ctx[i];
-                int *fd = perf_mon_get_fd(ctx, event);
+        attr = se->attrs;
+        if (perf_mon_is_group_event(event) &&
+            group->intl->perf.group_num < MON_PERF_GROUP_MAX) {
+                grouped = 1;
+                if (group->intl->perf.group_num == 0)
+                        attr.read_format = PERF_FORMAT_GROUP;
+                else
+                        leader = group->intl->perf.group_evt[0];
+        }
 
-                if (fd == NULL)
-                        return PQOS_RETVAL_ERROR;
+        /**
+         * For each core/task assign fd to read counter
+         */
+        ret = perf_mon_open(group, &attr, event, leader, num_ctrs);
+        if (ret != PQOS_RETVAL_OK && leader != 0) {
+                LOG_WARN("Failed to add %s to perf event group, "
+                         "reading it independently\n",
+                         se->desc);
+                grouped = 0;
+                attr = se->attrs;
+                ret = perf_mon_open(group, &attr, event, 0, num_ctrs);
+        }
+        if (ret != PQOS_RETVAL_OK) {
+                LOG_ERROR("Failed to start perf "
+                          "counters for %s\n",
+                          se->desc);
+                return PQOS_RETVAL_ERROR;
+        }
 
-                perf_shutdown_counter(*fd);
+        if (grouped) {
+                group->intl->perf.group_evt[group->intl->perf.group_num++] =
+                    event;
+                group->intl->perf.group |= event;
         }
 
         return PQOS_RETVAL_OK;
 }
 
-/**
- * @brief Gives the difference between two values with regard to the possible
- *        overrun
- *
- * @param old_value previous value
- * @param new_value current value
- * @return difference between the two values
- */
-static uint64_t
-get_delta(const uint64_t old_value, const uint64_t new_value)
-{
-        if (old_value > new_value)
-                return (UINT64_MAX - old_value) + new_value;
-        else
-                return new_value - old_value;
-}
-
 int
-perf_mon_poll(struct pqos_mon_data *group, enum pqos_mon_event event)
+perf_mon_stop(struct pqos_mon_data *group, enum pqos_mon_event event)
 {
-        int ret;
         int i, num_ctrs;
-        uint64_t value = 0;
-        uint64_t old_value;
 
         ASSERT(group != NULL);
         ASSERT(group->intl != NULL);
@@ -632,25 +673,76 @@ perf_mon_poll(struct pqos_mon_data *group, enum pqos_mon_event event)
                 return PQOS_RETVAL_ERROR;
 
         /**
-         * For each task read counter and sum of all counter values
+         * For each counter, close associated file descriptor
          */
         for (i = 0; i < num_ctrs; i++) {
                 struct pqos_mon_perf_ctx *ctx = &group->intl->perf.ctx[i];
-                uint64_t counter_value;
                 int *fd = perf_mon_get_fd(ctx, event);
 
                 if (fd == NULL)
                         return PQOS_RETVAL_ERROR;
 
-                ret = perf_read_counter(*fd, &counter_value);
-                if (ret != PQOS_RETVAL_OK)
-                        return ret;
-                value += counter_value;
+                perf_shutdown_counter(*fd);
         }
 
         /**
-         * Set value
+         * Closing the leader turns remaining members into independent
+         * events, so the group is dissolved
          */
+        if (group->intl->perf.group & event) {
+                if (group->intl->perf.group_evt[0] == event) {
+                        group->intl->perf.group = (enum pqos_mon_event)0;
+                        group->intl->perf.group_num = 0;
+                } else {
+                        unsigned j, num = 0;
+
+                        for (j = 0; j < group->intl->perf.group_num; j++)
+                                if (group->intl->perf.group_evt[j] != event)
+                                        group->intl->perf.group_evt[num++] =
+                                            group->intl->perf.group_evt[j];
+                        group->intl->perf.group_num = num;
+                        group->intl->perf.group &= ~event;
+                }
+                group->intl->perf.pending = (enum pqos_mon_event)0;
+        }
+
+        return PQOS_RETVAL_OK;
+}
+
+/**
+ * @brief Gives the difference between two values with regard to the possible
+ *        overrun
+ *
+ * @param old_value previous value
+ * @param new_value current value
+ * @return difference between the two values
+ */
+static uint64_t
+get_delta(const uint64_t old_value, const uint64_t new_value)
+{
+        if (old_value > new_value)
+                return (UINT64_MAX - old_value) + new_value;
+        else
+                return new_value - old_value;
+}
+
+/**
+ * @brief Stores new counter value of \a event in the group
+ *
+ * @param group monitoring group
+ * @param event monitoring event
+ * @param value counter value summed over all cores/tasks
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+perf_mon_set_value(struct pqos_mon_data *group,
+                   const enum pqos_mon_event event,
+                   const uint64_t value)
+{
+        uint64_t old_value;
+
         switch (event) {
         case PQOS_MON_EVENT_L3_OCCUP:
                 group->values.llc = value;
@@ -698,6 +790,110 @@ perf_mon_poll(struct pqos_mon_data *group, enum pqos_mon_event event)
         return PQOS_RETVAL_OK;
 }
 
+/**
+ * @brief Reads all grouped events with one read per core/task
+ *
+ * @param group monitoring group
+ * @param num_ctrs number of cores/tasks
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+perf_mon_poll_group(struct pqos_mon_data *group, const int num_ctrs)
+{
+        const unsigned num = group->intl->perf.group_num;
+        const enum pqos_mon_event leader = group->intl->perf.group_evt[0];
+        uint64_t value[MON_PERF_GROUP_MAX];
+        unsigned j;
+        int i;
+
+        memset(value, 0, sizeof(value));
+
+        for (i = 0; i < num_ctrs; i++) {
+                struct pqos_mon_perf_ctx *ctx = &group->intl->perf.ctx[i];
+                uint64_t counter_value[MON_PERF_GROUP_MAX];
+                int ret;
+
+                ret = perf_read_group(*perf_mon_get_fd(ctx, leader), num,
+                                      counter_value);
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+                for (j = 0; j < num; j++)
+                        value[j] += counter_value[j];
+        }
+
+        for (j = 0; j < num; j++) {
+                int ret = perf_mon_set_value(
+                    group, group->intl->perf.group_evt[j], value[j]);
+
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+        }
+
+        return PQOS_RETVAL_OK;
+}
+
+int
+perf_mon_poll(struct pqos_mon_data *group, enum pqos_mon_event event)
+{
+        int ret;
+        int i, num_ctrs;
+        uint64_t value = 0;
+
+        ASSERT(group != NULL);
+        ASSERT(group->intl != NULL);
+        ASSERT(group->intl->perf.ctx != NULL);
+
+        /**
+         * Check if monitoring cores/tasks
+         */
+        if (group->num_cores > 0)
+                num_ctrs = group->num_cores;
+        else if (group->tid_nr > 0)
+                num_ctrs = group->tid_nr;
+        else
+                return PQOS_RETVAL_ERROR;
+
+        /**
+         * Grouped events are read together by the first of them polled.
+         * Values of the other ones are already set, just mark them as
+         * consumed so that the next poll triggers a new read.
+         */
+        if (group->intl->perf.group & event) {
+                if (!(group->intl->perf.pending & event)) {
+                        ret = perf_mon_poll_group(group, num_ctrs);
+                        if (ret != PQOS_RETVAL_OK)
+                                return ret;
+                        group->intl->perf.pending = group->intl->perf.group;
+                }
+                group->intl->perf.pending &= ~event;
+                return PQOS_RETVAL_OK;
+        }
+
+        /**
+         * For each task read counter and sum of all counter values
+         */
+        for (i = 0; i < num_ctrs; i++) {
+                struct pqos_mon_perf_ctx *ctx = &group->intl->perf.ctx[i];
+                uint64_t counter_value;
+                int *fd = perf_mon_get_fd(ctx, event);
+
+                if (fd == NULL)
+                        return PQOS_RETVAL_ERROR;
+
+                ret = perf_read_counter(*fd, &counter_value);
+                if (ret != PQOS_RETVAL_OK)
+                        return ret;
+                value += counter_value;
+        }
+
+        /**
+         * Set value
+         */
+        return perf_mon_set_value(group, event, value);
+}
+
 int
 perf_mon_is_event_supported(const enum pqos_mon_event event)
 {
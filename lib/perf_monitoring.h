@@ -45,9 +45,11 @@ extern "C" {
 #include "pqos.h"
 #include "types.h"
 
-#define PERF_MON_PATH   "/sys/devices/intel_cqm"
-#define PERF_MON_TYPE   "/sys/devices/intel_cqm/type"
-#define PERF_MON_EVENTS "/sys/devices/intel_cqm/events"
+#ifndef PERF_MON_PATH
+#define PERF_MON_PATH "/sys/devices/intel_cqm"
+#endif
+#define PERF_MON_TYPE   PERF_MON_PATH "/type"
+#define PERF_MON_EVENTS PERF_MON_PATH "/events"
 
 /**
  * Local monitor event types
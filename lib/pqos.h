@@ -975,6 +975,28 @@ struct pqos_mon_data {
         struct pqos_mon_mem_region regions; /**< memory regions information */
 };
 
+/**
+ * Monitoring group specification type
+ */
+enum pqos_mon_group_type {
+        PQOS_MON_GROUP_CORES = 0, /**< group of logical cores */
+        PQOS_MON_GROUP_PIDS       /**< group of processes */
+};
+
+/**
+ * Monitoring group specification used by pqos_mon_start_groups()
+ */
+struct pqos_mon_group_spec {
+        enum pqos_mon_group_type type; /**< type of monitored resources */
+        unsigned num;                  /**< number of cores or pids */
+        const unsigned *cores;         /**< core ids for PQOS_MON_GROUP_CORES */
+        const pid_t *pids;             /**< pids for PQOS_MON_GROUP_PIDS */
+        enum pqos_mon_event event;     /**< combination of monitoring events */
+        void *context;                 /**< application specific context */
+        struct pqos_mon_mem_region *mem_region; /**< memory regions, cores
+                                                   only, may be NULL */
+};
+
 /**
  * @brief Resets monitoring by binding all cores with RMID0
  *
@@ -1173,6 +1195,53 @@ int pqos_mon_start_pids2(const unsigned num_pids,
                          void *context,
                          struct pqos_mon_data **group);
 
+/**
+ * @brief Starts resource monitoring of multiple groups
+ *
+ * All \a specs are validated before any monitoring resources are touched and
+ * the groups are started under a single library lock. With the MSR interface
+ * cores of all groups are associated with their RMIDs in a single batch.
+ * Operation is all or nothing - if any of the groups fails to start, groups
+ * started so far are stopped and all entries of \a groups are set to NULL.
+ *
+ * @param [in] num_specs number of entries in \a specs array
+ * @param [in] specs array of monitoring group specifications
+ * @param [out] groups array of \a num_specs monitoring structure pointers
+ *
+ * @return Operations status
+ * @retval PQOS_RETVAL_OK on success
+ */
+int pqos_mon_start_groups(const unsigned num_specs,
+                          const struct pqos_mon_group_spec *specs,
+                          struct pqos_mon_data **groups);
+
+/**
+ * @brief Starts rollup monitoring group aggregating \a children groups
+ *
+ * Rollup group does not use any monitoring resources. Its values are the
+ * sum of values of its child groups and are computed by pqos_mon_poll()
+ * after all other groups in the poll table have been read, so parent and
+ * children values are consistent. Descendants missing from the poll table
+ * are polled together with the rollup group. Rollup groups can be children
+ * of other rollup groups, e.g. core to L3 to socket.
+ *
+ * Event of the rollup group is the set of events common to all children.
+ * Child groups cannot be stopped before the rollup groups using them.
+ *
+ * @param [in] num_children number of groups in \a children array
+ * @param [in] children array of child monitoring groups
+ * @param [in] context a pointer for application's convenience
+ *             (unused by the library)
+ * @param [out] group a pointer to monitoring structure
+ *
+ * @return Operations status
+ * @retval PQOS_RETVAL_OK on success
+ */
+int pqos_mon_start_rollup(const unsigned num_children,
+                          struct pqos_mon_data **children,
+                          void *context,
+                          struct pqos_mon_data **group);
+
 /**
  * @brief Adds pids to the resource monitoring grpup
  *
@@ -2257,6 +2326,47 @@ int pqos_mon_get_region_value(const struct pqos_mon_data *const group,
  */
 int pqos_mon_get_ipc(const struct pqos_mon_data *const group, double *value);
 
+/*
+ * @brief Retrieves read time of a monitoring group.
+ *
+ * Read times are taken from CLOCK_MONOTONIC when the group is polled.
+ * Elapsed time is 0 until the group has been polled at least twice.
+ *
+ * @note Update event values using \a pqos_mon_poll
+ *
+ * @param [in] group monitoring group
+ * @param [out] timestamp time of the last poll in ns (can be NULL)
+ * @param [out] elapsed time between the last two polls in ns (can be NULL)
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+int pqos_mon_get_timestamp(const struct pqos_mon_data *const group,
+                           uint64_t *timestamp,
+                           uint64_t *elapsed);
+
+/*
+ * @brief Retrieves a rate of event from a monitoring group.
+ *
+ * Counter delta is normalized to one second using the time elapsed
+ * between the last two polls of the group. Memory bandwidth events are
+ * reported in bytes per second and perf events in events per second.
+ * Rate is 0 until the group has been polled at least twice.
+ *
+ * @note Update event values using \a pqos_mon_poll
+ *
+ * @param [in] group monitoring group
+ * @param [in] event_id event being monitored, PQOS_MON_EVENT_L3_OCCUP and
+ *             PQOS_PERF_EVENT_IPC are not supported
+ * @param [out] rate event rate per second
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+int pqos_mon_get_rate(const struct pqos_mon_data *const group,
+                      const enum pqos_mon_event event_id,
+                      double *rate);
+
 /**
  * @brief Frees memory previously allocated and returned by the library
  * functions.
@@ -111,4 +111,24 @@ pqos_mon_start_channels_ext(const unsigned num_channels,
                             struct pqos_mon_data **group,
                             const struct pqos_mon_options *opt);
 
+/**
+ * @brief Starts resource monitoring of multiple groups
+ *
+ * @param [in] num_specs number of entries in \a specs array
+ * @param [in] specs array of monitoring group specifications
+ * @param [in] opts array of \a num_specs extended options or NULL
+ * @param [out] groups array of \a num_specs monitoring structure pointers
+ *
+ * @return Operations status
+ * @retval PQOS_RETVAL_OK on success
+ */
+#ifndef PQOS_RMID_CUSTOM
+__attribute__((visibility("hidden")))
+#endif /* PQOS_RMID_CUSTOM */
+int
+pqos_mon_start_groups_ext(const unsigned num_specs,
+                          const struct pqos_mon_group_spec *specs,
+                          const struct pqos_mon_options *opts,
+                          struct pqos_mon_data **groups);
+
 #endif /* __PQOS_INTERNAL_H__ */
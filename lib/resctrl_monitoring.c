@@ -42,13 +42,45 @@
 
 #include <dirent.h>
 #include <errno.h>
+#include <fcntl.h>
+#include <limits.h>
 #include <stdlib.h>
 #include <string.h>
+#include <sys/resource.h>
 #include <time.h>
 #include <unistd.h>
 
 #define GROUP_NAME_PREFIX "pqos-"
 
+/**
+ * Number of hash buckets of counter file descriptor cache
+ */
+#define RESCTRL_MON_FD_BUCKETS 1024
+
+struct resctrl_mon_fd_group;
+
+/**
+ * Open mon_data counter file kept in file descriptor cache
+ */
+struct resctrl_mon_fd {
+        unsigned class_id;                  /**< COS id */
+        struct resctrl_mon_fd_group *group; /**< monitoring group */
+        unsigned l3id;                      /**< L3 domain */
+        enum pqos_mon_event event;          /**< counter event */
+        int fd;                             /**< open counter file */
+        struct resctrl_mon_fd *next;        /**< next entry in hash bucket */
+        struct resctrl_mon_fd *group_next;  /**< next entry of the group */
+};
+
+/**
+ * Monitoring group with counter files in file descriptor cache
+ */
+struct resctrl_mon_fd_group {
+        char *name;                        /**< monitoring group name */
+        struct resctrl_mon_fd *fds;        /**< cached counter files */
+        struct resctrl_mon_fd_group *next; /**< next group in hash bucket */
+};
+
 /**
  * ---------------------------------------
  * Local data structures
@@ -58,6 +90,273 @@ static int supported_events = 0;
 
 static unsigned resctrl_mon_counter = 0;
 
+/**
+ * Counter file descriptor cache
+ */
+static struct {
+        struct resctrl_mon_fd *buckets[RESCTRL_MON_FD_BUCKETS];
+        struct resctrl_mon_fd_group *groups[RESCTRL_MON_FD_BUCKETS];
+        unsigned num; /**< number of cached file descriptors */
+        unsigned max; /**< cache limit, 0 if not initialized */
+} resctrl_mon_fds;
+
+/**
+ * @brief Calculates hash of monitoring group name
+ *
+ * @param [in] resctrl_group mon group name
+ *
+ * @return FNV-1a hash of the name
+ */
+static uint32_t
+resctrl_mon_fd_name_hash(const char *resctrl_group)
+{
+        uint32_t hash = 2166136261u;
+        const char *c;
+
+        for (c = resctrl_group; *c != '\0'; c++)
+                hash = (hash ^ (uint8_t)*c) * 16777619u;
+
+        return hash;
+}
+
+/**
+ * @brief Calculates hash of counter file descriptor cache key
+ *
+ * @param [in] class_id COS id
+ * @param [in] resctrl_group mon group name
+ * @param [in] l3id l3id to read from
+ * @param [in] event resctrl mon event
+ *
+ * @return bucket index
+ */
+static unsigned
+resctrl_mon_fd_hash(const unsigned class_id,
+                    const char *resctrl_group,
+                    const unsigned l3id,
+                    const enum pqos_mon_event event)
+{
+        uint32_t hash = resctrl_mon_fd_name_hash(resctrl_group);
+
+        hash = (hash ^ class_id) * 16777619u;
+        hash = (hash ^ l3id) * 16777619u;
+        hash = (hash ^ (uint32_t)event) * 16777619u;
+
+        return hash % RESCTRL_MON_FD_BUCKETS;
+}
+
+/**
+ * @brief Finds monitoring group in file descriptor cache
+ *
+ * @param [in] resctrl_group mon group name
+ * @param [in] create add the group if it is not cached
+ *
+ * @return cached group
+ * @retval NULL if not cached or on allocation error
+ */
+static struct resctrl_mon_fd_group *
+resctrl_mon_fd_group_get(const char *resctrl_group, const int create)
+{
+        const unsigned hash =
+            resctrl_mon_fd_name_hash(resctrl_group) % RESCTRL_MON_FD_BUCKETS;
+        struct resctrl_mon_fd_group *grp;
+
+        for (grp = resctrl_mon_fds.groups[hash]; grp != NULL; grp = grp->next)
+                if (strcmp(grp->name, resctrl_group) == 0)
+                        return grp;
+
+        if (!create)
+                return NULL;
+
+        grp = malloc(sizeof(*grp));
+        if (grp == NULL)
+                return NULL;
+        grp->name = strdup(resctrl_group);
+        if (grp->name == NULL) {
+                free(grp);
+                return NULL;
+        }
+        grp->fds = NULL;
+        grp->next = resctrl_mon_fds.groups[hash];
+        resctrl_mon_fds.groups[hash] = grp;
+
+        return grp;
+}
+
+/**
+ * @brief Closes cached file descriptors of one monitoring group
+ *
+ * Group is removed from the cache once it has no file descriptors left.
+ *
+ * @param [in] grp cached group
+ * @param [in] class_id COS id, UINT_MAX for all classes
+ */
+static void
+resctrl_mon_fd_group_invalidate(struct resctrl_mon_fd_group *grp,
+                                const unsigned class_id)
+{
+        struct resctrl_mon_fd **entry = &grp->fds;
+        struct resctrl_mon_fd_group **group_entry;
+        unsigned hash;
+
+        while (*entry != NULL) {
+                struct resctrl_mon_fd *item = *entry;
+                struct resctrl_mon_fd **bucket;
+
+                if (class_id != UINT_MAX && item->class_id != class_id) {
+                        entry = &item->group_next;
+                        continue;
+                }
+
+                *entry = item->group_next;
+
+                hash = resctrl_mon_fd_hash(item->class_id, grp->name,
+                                           item->l3id, item->event);
+                bucket = &resctrl_mon_fds.buckets[hash];
+                while (*bucket != item)
+                        bucket = &(*bucket)->next;
+                *bucket = item->next;
+
+                close(item->fd);
+                free(item);
+                resctrl_mon_fds.num--;
+        }
+
+        if (grp->fds != NULL)
+                return;
+
+        hash = resctrl_mon_fd_name_hash(grp->name) % RESCTRL_MON_FD_BUCKETS;
+        group_entry = &resctrl_mon_fds.groups[hash];
+        while (*group_entry != grp)
+                group_entry = &(*group_entry)->next;
+        *group_entry = grp->next;
+
+        free(grp->name);
+        free(grp);
+}
+
+/**
+ * @brief Closes cached file descriptors of monitoring group
+ *
+ * @param [in] class_id COS id, UINT_MAX for all classes
+ * @param [in] resctrl_group mon group name, NULL for all groups
+ */
+static void
+resctrl_mon_fd_invalidate(const unsigned class_id, const char *resctrl_group)
+{
+        struct resctrl_mon_fd_group *grp;
+        unsigned i;
+
+        if (resctrl_group != NULL) {
+                grp = resctrl_mon_fd_group_get(resctrl_group, 0);
+                if (grp != NULL)
+                        resctrl_mon_fd_group_invalidate(grp, class_id);
+                return;
+        }
+
+        for (i = 0; i < RESCTRL_MON_FD_BUCKETS; i++) {
+                grp = resctrl_mon_fds.groups[i];
+                while (grp != NULL) {
+                        struct resctrl_mon_fd_group *next = grp->next;
+
+                        resctrl_mon_fd_group_invalidate(grp, class_id);
+                        grp = next;
+                }
+        }
+}
+
+/**
+ * @brief Gets cached file descriptor of counter file
+ *
+ * @param [in] class_id COS id
+ * @param [in] resctrl_group mon group name
+ * @param [in] l3id l3id to read from
+ * @param [in] event resctrl mon event
+ *
+ * @return cache entry
+ * @retval NULL if not cached
+ */
+static struct resctrl_mon_fd *
+resctrl_mon_fd_get(const unsigned class_id,
+                   const char *resctrl_group,
+                   const unsigned l3id,
+                   const enum pqos_mon_event event)
+{
+        struct resctrl_mon_fd *item;
+        unsigned hash =
+            resctrl_mon_fd_hash(class_id, resctrl_group, l3id, event);
+
+        for (item = resctrl_mon_fds.buckets[hash]; item != NULL;
+             item = item->next)
+                if (item->class_id == class_id && item->l3id == l3id &&
+                    item->event == event &&
+                    strcmp(item->group->name, resctrl_group) == 0)
+                        return item;
+
+        return NULL;
+}
+
+/**
+ * @brief Stores file descriptor of counter file in cache
+ *
+ * @param [in] class_id COS id
+ * @param [in] resctrl_group mon group name
+ * @param [in] l3id l3id to read from
+ * @param [in] event resctrl mon event
+ * @param [in] fd open counter file
+ *
+ * @return Operational status
+ * @retval PQOS_RETVAL_OK if fd is owned by the cache
+ * @retval PQOS_RETVAL_RESOURCE if cache is full
+ */
+static int
+resctrl_mon_fd_put(const unsigned class_id,
+                   const char *resctrl_group,
+                   const unsigned l3id,
+                   const enum pqos_mon_event event,
+                   const int fd)
+{
+        struct resctrl_mon_fd_group *grp;
+        struct resctrl_mon_fd *item;
+        unsigned hash;
+
+        /* keep half of the process file limit for the other users */
+        if (resctrl_mon_fds.max == 0) {
+                struct rlimit limit;
+
+                if (getrlimit(RLIMIT_NOFILE, &limit) == 0 &&
+                    limit.rlim_cur != RLIM_INFINITY)
+                        resctrl_mon_fds.max = limit.rlim_cur / 2;
+                else
+                        resctrl_mon_fds.max = 512;
+        }
+
+        if (resctrl_mon_fds.num >= resctrl_mon_fds.max)
+                return PQOS_RETVAL_RESOURCE;
+
+        item = malloc(sizeof(*item));
+        if (item == NULL)
+                return PQOS_RETVAL_RESOURCE;
+        grp = resctrl_mon_fd_group_get(resctrl_group, 1);
+        if (grp == NULL) {
+                free(item);
+                return PQOS_RETVAL_RESOURCE;
+        }
+
+        hash = resctrl_mon_fd_hash(class_id, resctrl_group, l3id, event);
+        item->class_id = class_id;
+        item->group = grp;
+        item->l3id = l3id;
+        item->event = event;
+        item->fd = fd;
+        item->next = resctrl_mon_fds.buckets[hash];
+        resctrl_mon_fds.buckets[hash] = item;
+        item->group_next = grp->fds;
+        grp->fds = item;
+        resctrl_mon_fds.num++;
+
+        return PQOS_RETVAL_OK;
+}
+
 /**
  * @brief Filter directory filenames
  *
@@ -157,6 +456,8 @@ int
 resctrl_mon_fini(void)
 {
         supported_events = 0;
+        resctrl_mon_fd_invalidate(UINT_MAX, NULL);
+        resctrl_mon_fds.max = 0;
 
         return PQOS_RETVAL_OK;
 }
@@ -360,7 +661,10 @@ resctrl_mon_read_counter(const unsigned class_id,
         char buf[128];
         const char *name;
         char path[PATH_MAX];
-        FILE *fd;
+        struct resctrl_mon_fd *cached;
+        int fd;
+        ssize_t size;
+        char *end;
         unsigned long long counter;
 
         ASSERT(resctrl_group != NULL);
@@ -384,15 +688,39 @@ resctrl_mon_read_counter(const unsigned class_id,
 
         *value = 0;
 
+        /**
+         * Counter files are kept open between polls and read from offset 0,
+         * kernfs regenerates the content on each read
+         */
+        cached = resctrl_mon_fd_get(class_id, resctrl_group, l3id, event);
+        if (cached != NULL) {
+                size = pread(cached->fd, buf, sizeof(buf) - 1, 0);
+                if (size >= 0)
+                        goto resctrl_mon_read_counter_parse;
+
+                /* group could be recreated, reopen the file */
+                resctrl_mon_fd_invalidate(class_id, resctrl_group);
+        }
+
         resctrl_mon_group_path(class_id, resctrl_group, NULL, buf, sizeof(buf));
         snprintf(path, sizeof(path), "%s/mon_data/mon_L3_%02u/%s", buf, l3id,
                  name);
-        fd = pqos_fopen(path, "r");
-        if (fd == NULL)
+        fd = pqos_open(path, O_RDONLY);
+        if (fd < 0)
+                return PQOS_RETVAL_ERROR;
+
+        size = pread(fd, buf, sizeof(buf) - 1, 0);
+        if (size < 0 || resctrl_mon_fd_put(class_id, resctrl_group, l3id,
+                                           event, fd) != PQOS_RETVAL_OK)
+                close(fd);
+        if (size < 0)
                 return PQOS_RETVAL_ERROR;
-        if (fscanf(fd, "%llu", &counter) == 1 && counter < UINT64_MAX)
+
+resctrl_mon_read_counter_parse:
+        buf[size] = '\0';
+        counter = strtoull(buf, &end, 10);
+        if (end != buf && counter < UINT64_MAX)
                 *value = counter;
-        pqos_fclose(fd);
 
         return PQOS_RETVAL_OK;
 }
@@ -632,6 +960,8 @@ resctrl_mon_rmdir(const unsigned class_id, const char *name)
 
         resctrl_mon_group_path(class_id, name, NULL, path, sizeof(path));
 
+        resctrl_mon_fd_invalidate(class_id, name);
+
         if (rmdir(path) == -1 && errno != ENOENT)
                 return PQOS_RETVAL_ERROR;
 
@@ -1211,6 +1541,9 @@ resctrl_mon_start(struct pqos_mon_data *group)
                 return PQOS_RETVAL_ERROR;
         group->intl->resctrl.mon_group = resctrl_group;
 
+        /* drop counter files of a previous group with the same name */
+        resctrl_mon_fd_invalidate(UINT_MAX, resctrl_group);
+
         /**
          * Add pids to the resctrl group
          */
@@ -42,6 +42,7 @@
 #include "dump.h"
 #include "dump_rmids.h"
 #include "monitor.h"
+#include "monitor_bin.h"
 #include "pqos.h"
 #include "profiles.h"
 
@@ -459,6 +460,26 @@ selfn_strdup(char **sel, const char *arg)
         }
 }
 
+/**
+ * @brief Checks if binary file decoding is selected
+ *
+ * @param argc number of command line arguments
+ * @param argv command line arguments
+ *
+ * @return 1 if --decode option is present, 0 otherwise
+ */
+static int
+decode_selected(int argc, char **argv)
+{
+        int i;
+
+        for (i = 1; i < argc; i++)
+                if (strncmp(argv[i], "--decode", strlen("--decode")) == 0)
+                        return 1;
+
+        return 0;
+}
+
 /**
  * @brief Function to print warning to users as utility begins
  */
@@ -946,9 +967,14 @@ parse_config_file(const char *fname)
             {"monitor-channels:",   selfn_monitor_channels },
             {"monitor-time:",       selfn_monitor_time },      /**< -t */
             {"monitor-interval:",   selfn_monitor_interval },  /**< -i */
+            {"monitor-interval-us:", selfn_monitor_interval_us },
+            {"monitor-sampler-core:", selfn_monitor_sampler_core },
+            {"monitor-output-policy:", selfn_monitor_output_policy },
             {"monitor-file:",       selfn_monitor_file },      /**< -o */
             {"monitor-file-type:",  selfn_monitor_file_type }, /**< -u */
             {"monitor-top-like:",   selfn_monitor_top_like },  /**< -T */
+            {"monitor-top-sort:",   selfn_monitor_top_sort },
+            {"monitor-top-incremental:", selfn_monitor_top_incremental },
             {"reset-cat:",          selfn_reset_alloc },       /**< -R */
             {"iface-os:",           selfn_iface_os },          /**< -I */
             {"iface:",              selfn_iface },
@@ -1034,12 +1060,15 @@ static const char help_printf_short[] =
 #endif
     "       %s [--disable-mon-ipc] [--disable-mon-llc_miss]\n"
     "          [-t SECONDS] [--mon-time=SECONDS]\n"
-    "          [-i N] [--mon-interval=N]\n"
-    "          [-T] [--mon-top]\n"
+    "          [-i N] [--mon-interval=N] [--mon-interval-us=N]\n"
+    "          [--mon-sampler-core=CORE] [--mon-output-policy=POLICY]\n"
+    "          [-T] [--mon-top] [--mon-top-sort=METRICS]\n"
+    "          [--mon-top-incremental]\n"
     "          [-o FILE] [--mon-file=FILE]\n"
     "          [-u TYPE] [--mon-file-type=TYPE]\n"
     "          [-r] [--mon-reset]\n"
     "          [-P] [--percent-llc]\n"
+    "          [--decode=FILE]\n"
     "       %s [-e CLASSDEF] [--alloc-class=CLASSDEF]\n"
     "          [-a CLASS2ID] [--alloc-assoc=CLASS2ID]\n"
     "       %s [-R] [--alloc-reset]\n"
@@ -1144,10 +1173,31 @@ static const char help_printf_long[] =
     "  -o FILE, --mon-file=FILE    output monitored data in a FILE\n"
     "  -u TYPE, --mon-file-type=TYPE\n"
     "          select output file format type for monitored data.\n"
-    "          TYPE is one of: text (default), xml or csv.\n"
+    "          TYPE is one of: text (default), xml, csv, bin or binz.\n"
+    "          bin and binz are binary formats, binz with compressed\n"
+    "          data blocks. Binary output requires an output FILE.\n"
+    "  --decode=FILE  convert binary monitoring FILE to CSV on stdout\n"
     "  -i N, --mon-interval=N      set sampling interval to Nx100ms,\n"
     "                              default 10 = 10 x 100ms = 1s.\n"
+    "  --mon-interval-us=N\n"
+    "          set high resolution sampling interval to N microseconds\n"
+    "          (minimum 100). Samples are taken by a dedicated thread\n"
+    "          into a memory buffer and written out asynchronously.\n"
+    "  --mon-sampler-core=CORE\n"
+    "          pin high resolution sampling thread to CORE, by default\n"
+    "          the last available core is used.\n"
+    "  --mon-output-policy=POLICY\n"
+    "          select what happens when the output does not keep up\n"
+    "          with sampling. POLICY is one of: drop (default) to drop\n"
+    "          samples or block to delay sampling.\n"
     "  -T, --mon-top               top like monitoring output\n"
+    "  --mon-top-sort=METRICS\n"
+    "          sort top like monitoring output by comma separated list\n"
+    "          of METRICS, most significant first. METRICS are: llc\n"
+    "          (default), mbl, mbr, mbt, misses, references and ipc.\n"
+    "  --mon-top-incremental\n"
+    "          rank top like monitoring output starting from the order\n"
+    "          of the previous sample.\n"
     "  -t SECONDS, --mon-time=SECONDS\n"
     "          set monitoring time in seconds. Use 'inf' or 'infinite'\n"
     "          for infinite monitoring. CTRL+C stops monitoring.\n"
@@ -1393,6 +1443,12 @@ print_lib_version(const struct pqos_cap *p_cap)
 #define OPTION_DUMP_RMID_UPSCALING   1033
 #define OPTION_PRINT_IO_DEVS         1034
 #define OPTION_PRINT_IO_DEV          1035
+#define OPTION_MON_INTERVAL_US       1036
+#define OPTION_MON_SAMPLER_CORE      1037
+#define OPTION_DECODE                1038
+#define OPTION_MON_OUTPUT_POLICY     1039
+#define OPTION_MON_TOP_SORT          1040
+#define OPTION_MON_TOP_INCREMENTAL   1041
 
 static struct option long_cmd_opts[] = {
     /* clang-format off */
@@ -1405,6 +1461,9 @@ static struct option long_cmd_opts[] = {
     {"profile-list",          no_argument,       0, 'H'},
     {"profile-set",           required_argument, 0, 'c'},
     {"mon-interval",          required_argument, 0, 'i'},
+    {"mon-interval-us",       required_argument, 0, OPTION_MON_INTERVAL_US},
+    {"mon-sampler-core",      required_argument, 0, OPTION_MON_SAMPLER_CORE},
+    {"mon-output-policy",     required_argument, 0, OPTION_MON_OUTPUT_POLICY},
     {"mon-pid",               required_argument, 0, 'p'},
     {"mon-core",              required_argument, 0, 'm'},
     {"mon-uncore",            optional_argument, 0, OPTION_MON_UNCORE},
@@ -1412,6 +1471,9 @@ static struct option long_cmd_opts[] = {
     {"mon-channel",           required_argument, 0, OPTION_MON_CHANNELS},
     {"mon-time",              required_argument, 0, 't'},
     {"mon-top",               no_argument,       0, 'T'},
+    {"mon-top-sort",          required_argument, 0, OPTION_MON_TOP_SORT},
+    {"mon-top-incremental",   no_argument,       0,
+                                              OPTION_MON_TOP_INCREMENTAL},
     {"mon-file",              required_argument, 0, 'o'},
     {"mon-file-type",         required_argument, 0, 'u'},
     {"mon-reset",             optional_argument, 0, 'r'},
@@ -1460,6 +1522,7 @@ static struct option long_cmd_opts[] = {
     {"dump-rmid-upscaling",   no_argument,       0, OPTION_DUMP_RMID_UPSCALING},
     {"print-io-devs",         no_argument,       0, OPTION_PRINT_IO_DEVS},
     {"print-io-dev",          required_argument, 0, OPTION_PRINT_IO_DEV},
+    {"decode",                required_argument, 0, OPTION_DECODE},
     {0, 0, 0, 0} /* end */
     /* clang-format on */
 };
@@ -1479,7 +1542,9 @@ main(int argc, char **argv)
         int opt_index = 0, pid_flag = 0;
 
         m_cmd_name = argv[0];
-        print_warning();
+        /* keep stdout clean for decoded output */
+        if (!decode_selected(argc, argv))
+                print_warning();
 
         memset(&cfg, 0, sizeof(cfg));
 
@@ -1493,6 +1558,10 @@ main(int argc, char **argv)
                 case 'H':
                         profile_l3ca_list();
                         return EXIT_SUCCESS;
+                case OPTION_DECODE:
+                        if (monitor_bin_decode(optarg, stdout) != 0)
+                                return EXIT_FAILURE;
+                        return EXIT_SUCCESS;
                 case OPTION_VERSION:
                         selfn_print_version(NULL);
                         break;
@@ -1538,12 +1607,27 @@ main(int argc, char **argv)
                 case OPTION_MON_UNCORE:
                         selfn_monitor_uncore(optarg);
                         break;
+                case OPTION_MON_INTERVAL_US:
+                        selfn_monitor_interval_us(optarg);
+                        break;
+                case OPTION_MON_SAMPLER_CORE:
+                        selfn_monitor_sampler_core(optarg);
+                        break;
+                case OPTION_MON_OUTPUT_POLICY:
+                        selfn_monitor_output_policy(optarg);
+                        break;
                 case 't':
                         selfn_monitor_time(optarg);
                         break;
                 case 'T':
                         selfn_monitor_top_like(NULL);
                         break;
+                case OPTION_MON_TOP_SORT:
+                        selfn_monitor_top_sort(optarg);
+                        break;
+                case OPTION_MON_TOP_INCREMENTAL:
+                        selfn_monitor_top_incremental(NULL);
+                        break;
                 case 'l':
                         if (optarg == NULL)
                                 return EXIT_FAILURE;
@@ -34,12 +34,18 @@
  * @brief Platform QoS utility - monitoring module
  *
  */
+#ifdef __linux__
+#define _GNU_SOURCE /**< pthread_setaffinity_np() */
+#endif
+
 #include "monitor.h"
 
 #include "common.h"
 #include "main.h"
+#include "monitor_bin.h"
 #include "monitor_csv.h"
 #include "monitor_text.h"
+#include "monitor_top.h"
 #include "monitor_utils.h"
 #include "monitor_xml.h"
 #include "pqos.h"
@@ -48,8 +54,12 @@
 #endif
 
 #include <dirent.h> /**< for dir list*/
+#include <errno.h>
 #include <fcntl.h>
 #include <inttypes.h>
+#include <limits.h>
+#include <pthread.h>
+#include <sched.h>
 #include <signal.h>
 #include <stdio.h>
 #include <stdlib.h>
@@ -88,6 +98,13 @@
 
 #define NULL_CHAR_LENGTH 1
 
+#define MON_HIRES_MIN_INTERVAL_US 100      /**< shortest sampling interval */
+#define MON_RING_TIME_US          1000000l /**< ring covers 1s of samples */
+#define MON_RING_MIN_SLOTS        16
+#define MON_RING_MAX_SLOTS        65536
+#define MON_RING_MAX_BYTES        (64ul * 1024 * 1024)
+#define MON_RING_WAIT_MS          100 /**< stop check period when blocked */
+
 /**
  * Local data structures
  *
@@ -184,12 +201,35 @@ static int sel_monitor_type = 0;
  */
 static int sel_mon_interval = 10; /**< 10 = 10x100ms = 1s */
 
+/**
+ * Maintains high resolution monitoring interval in microseconds.
+ * 0 means high resolution sampling is disabled.
+ */
+static unsigned sel_mon_interval_us = 0;
+
+/**
+ * Core the high resolution sampling thread is pinned to.
+ * -1 selects the last core the process is allowed to run on.
+ */
+static int sel_mon_sampler_core = -1;
+
+/**
+ * Output policy when the output does not keep up with sampling.
+ * 0 drops samples, 1 blocks sampling until the output catches up.
+ */
+static int sel_mon_output_block = 0;
+
 /**
  * Maintains TOP like output that is selected in config string for
  * monitoring L3 occupancy
  */
 static int sel_mon_top_like = 0;
 
+/**
+ * Reuse ranking of the previous sample in top like mode
+ */
+static int sel_mon_top_incremental = 0;
+
 /**
  * Maintains monitoring time that is selected in config string for
  * monitoring L3 occupancy
@@ -209,13 +249,31 @@ static char *sel_output_type = NULL;
 /**
  * Stop monitoring indicator for infinite monitoring loop
  */
-static int stop_monitoring_loop = 0;
+static volatile sig_atomic_t stop_monitoring_loop = 0;
 
 /**
  * File descriptor for writing monitored data into
  */
 static FILE *fp_monitor = NULL;
 
+/**
+ * Monitoring output backend
+ */
+struct monitor_output {
+        void (*begin)(FILE *fp,
+                      const int num_mem_regions,
+                      const int *region_num);
+        void (*header)(FILE *fp,
+                       const char *timestamp,
+                       const int num_mem_regions,
+                       const int *region_num);
+        void (*row)(FILE *fp,
+                    const char *timestamp,
+                    const struct pqos_mon_data *data);
+        void (*footer)(FILE *fp);
+        void (*end)(FILE *fp);
+};
+
 /**
  * Maintains process statistics. It is used for getting N pids to be displayed
  * in top-pid monitoring mode.
@@ -1391,6 +1449,169 @@ monitor_setup_events(enum mon_group_type type,
         sel_events_max |= *events;
 }
 
+/**
+ * @brief Fills in library specification of core or process group
+ *
+ * @param [in] grp monitoring group
+ * @param [out] spec group specification
+ *
+ * @return 1 if \a grp is core or process group, 0 otherwise
+ */
+static int
+monitor_group_spec(struct mon_group *grp, struct pqos_mon_group_spec *spec)
+{
+        if (grp->type == MON_GROUP_TYPE_CORE) {
+                spec->type = PQOS_MON_GROUP_CORES;
+                spec->cores = grp->cores;
+                spec->mem_region = &grp->mem_region;
+        } else if (grp->type == MON_GROUP_TYPE_PID) {
+                spec->type = PQOS_MON_GROUP_PIDS;
+                spec->pids = grp->pids;
+        } else
+                return 0;
+
+        spec->num = grp->num_res;
+        spec->event = grp->events;
+        spec->context = (void *)grp->desc;
+
+        return 1;
+}
+
+/**
+ * @brief Reports core or process monitoring group which failed to start
+ *
+ * The library rolls back all groups on error, so the groups are started
+ * one by one until the failing one is found and then stopped again.
+ *
+ * @param [in] status status of starting all groups at once
+ */
+static void
+monitor_setup_groups_error(const int status)
+{
+        struct pqos_mon_data *data[sel_monitor_num];
+        struct mon_group *grp = NULL;
+        unsigned num = 0;
+        unsigned i;
+        int ret = PQOS_RETVAL_OK;
+
+        for (i = 0; i < sel_monitor_num; i++) {
+                struct pqos_mon_group_spec spec;
+
+                grp = &sel_monitor_group[i];
+                memset(&spec, 0, sizeof(spec));
+                if (!monitor_group_spec(grp, &spec))
+                        continue;
+#ifdef PQOS_RMID_CUSTOM
+                ret = pqos_mon_start_groups_ext(1, &spec, &grp->opt,
+                                                &data[num]);
+#else
+                ret = pqos_mon_start_groups(1, &spec, &data[num]);
+#endif
+                if (ret != PQOS_RETVAL_OK)
+                        break;
+                num++;
+        }
+
+        if (ret == PQOS_RETVAL_OK)
+                printf("Monitoring start error, status %d\n", status);
+        else if (grp->type == MON_GROUP_TYPE_CORE)
+                printf("Monitoring start error on core(s) %s, status %d\n",
+                       grp->desc, ret);
+        else
+                printf("PID %s monitoring start error, status %d\n",
+                       grp->desc, ret);
+
+        while (num > 0)
+                (void)pqos_mon_stop(data[--num]);
+}
+
+/**
+ * @brief Starts core and process monitoring groups
+ *
+ * All core and pid groups are handed to the library at once so that they
+ * are either all started or none of them is.
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+monitor_setup_groups(void)
+{
+        struct pqos_mon_group_spec *specs = NULL;
+        struct pqos_mon_data **data = NULL;
+#ifdef PQOS_RMID_CUSTOM
+        struct pqos_mon_options *opts = NULL;
+#endif
+        unsigned num = 0;
+        unsigned i;
+        int ret = PQOS_RETVAL_OK;
+
+        if (sel_monitor_num == 0)
+                return PQOS_RETVAL_OK;
+
+        specs = calloc(sel_monitor_num, sizeof(*specs));
+        data = calloc(sel_monitor_num, sizeof(*data));
+#ifdef PQOS_RMID_CUSTOM
+        opts = calloc(sel_monitor_num, sizeof(*opts));
+        if (opts == NULL)
+                ret = PQOS_RETVAL_RESOURCE;
+#endif
+        if (specs == NULL || data == NULL || ret != PQOS_RETVAL_OK) {
+                printf("Memory allocation error!\n");
+                ret = PQOS_RETVAL_RESOURCE;
+                goto setup_groups_exit;
+        }
+
+        for (i = 0; i < sel_monitor_num; i++) {
+                struct mon_group *grp = &sel_monitor_group[i];
+
+                if (!monitor_group_spec(grp, &specs[num]))
+                        continue;
+#ifdef PQOS_RMID_CUSTOM
+                opts[num] = grp->opt;
+#endif
+                num++;
+        }
+
+        if (num == 0)
+                goto setup_groups_exit;
+
+#ifdef PQOS_RMID_CUSTOM
+        ret = pqos_mon_start_groups_ext(num, specs, opts, data);
+#else
+        ret = pqos_mon_start_groups(num, specs, data);
+#endif
+        if (ret == PQOS_RETVAL_PERF_CTR)
+                printf("Use -r option to start monitoring anyway.\n");
+        /**
+         * The error raised also if two instances of PQoS
+         * attempt to use the same core id or pid.
+         */
+        if (ret != PQOS_RETVAL_OK) {
+                monitor_setup_groups_error(ret);
+                goto setup_groups_exit;
+        }
+
+        for (i = 0, num = 0; i < sel_monitor_num; i++) {
+                struct mon_group *grp = &sel_monitor_group[i];
+
+                if (grp->type != MON_GROUP_TYPE_CORE &&
+                    grp->type != MON_GROUP_TYPE_PID)
+                        continue;
+
+                grp->data = data[num++];
+                grp->started = 1;
+        }
+
+setup_groups_exit:
+        free(specs);
+        free(data);
+#ifdef PQOS_RMID_CUSTOM
+        free(opts);
+#endif
+        return ret;
+}
+
 int
 monitor_setup(const struct pqos_cpuinfo *cpu_info,
               const struct pqos_capability *const cap_mon,
@@ -1422,12 +1643,28 @@ monitor_setup(const struct pqos_cpuinfo *cpu_info,
 
         if (strcasecmp(sel_output_type, "text") != 0 &&
             strcasecmp(sel_output_type, "xml") != 0 &&
-            strcasecmp(sel_output_type, "csv") != 0) {
+            strcasecmp(sel_output_type, "csv") != 0 &&
+            strcasecmp(sel_output_type, "bin") != 0 &&
+            strcasecmp(sel_output_type, "binz") != 0) {
                 printf("Invalid selection of file output type '%s'!\n",
                        sel_output_type);
                 return -1;
         }
 
+        if (strcasecmp(sel_output_type, "bin") == 0 ||
+            strcasecmp(sel_output_type, "binz") == 0) {
+                if (sel_output_file == NULL) {
+                        printf("Binary output requires an output file!\n");
+                        return -1;
+                }
+                if (strcasecmp(sel_output_type, "binz") == 0 &&
+                    !monitor_bin_compress_supported()) {
+                        printf("Compressed binary output is not supported "
+                               "by this build!\n");
+                        return -1;
+                }
+        }
+
         /**
          * Set up file descriptor for monitored data
          */
@@ -1435,7 +1672,9 @@ monitor_setup(const struct pqos_cpuinfo *cpu_info,
                 fp_monitor = stdout;
         } else {
                 if (strcasecmp(sel_output_type, "xml") == 0 ||
-                    strcasecmp(sel_output_type, "csv") == 0)
+                    strcasecmp(sel_output_type, "csv") == 0 ||
+                    strcasecmp(sel_output_type, "bin") == 0 ||
+                    strcasecmp(sel_output_type, "binz") == 0)
                         fp_monitor = safe_fopen(sel_output_file, "w+");
                 else
                         fp_monitor = safe_fopen(sel_output_file, "a");
@@ -1543,55 +1782,19 @@ monitor_setup(const struct pqos_cpuinfo *cpu_info,
                                 ret = PQOS_RETVAL_PARAM;
                                 break;
                         }
+                }
+        }
 
-                        /**
-                         * Make calls to pqos_mon_start - track cores
-                         */
-#ifdef PQOS_RMID_CUSTOM
-                        ret = pqos_mon_start_cores_ext(
-                            grp->num_res, grp->cores, grp->events,
-                            (void *)grp->desc, &grp->mem_region, &grp->data,
-                            &grp->opt);
-#else
-                        ret = pqos_mon_start_cores(
-                            grp->num_res, grp->cores, grp->events,
-                            (void *)grp->desc, &grp->mem_region, &grp->data);
-#endif
-
-                        if (ret == PQOS_RETVAL_PERF_CTR)
-                                printf("Use -r option to start monitoring "
-                                       "anyway.\n");
-                        /**
-                         * The error raised also if two instances of PQoS
-                         * attempt to use the same core id.
-                         */
-                        if (ret != PQOS_RETVAL_OK) {
-                                printf("Monitoring start error on core(s) "
-                                       "%s, status %d\n",
-                                       grp->desc, ret);
-                                break;
-                        } else
-                                grp->started = 1;
+        /**
+         * Start all core and process groups in one library call
+         */
+        if (ret == PQOS_RETVAL_OK)
+                ret = monitor_setup_groups();
 
-                } else if (grp->type == MON_GROUP_TYPE_PID) {
-                        /**
-                         * Make calls to pqos_mon_start_pid - track PIDs
-                         */
-                        ret = pqos_mon_start_pids2(
-                            grp->num_res, grp->pids, grp->events,
-                            (void *)grp->desc, &grp->data);
-                        /**
-                         * Any problem with monitoring the process?
-                         */
-                        if (ret != PQOS_RETVAL_OK) {
-                                printf("PID %s monitoring start error,"
-                                       "status %d\n",
-                                       grp->desc, ret);
-                                break;
-                        } else
-                                grp->started = 1;
+        for (i = 0; ret == PQOS_RETVAL_OK && i < sel_monitor_num; i++) {
+                struct mon_group *grp = &sel_monitor_group[i];
 
-                } else if (grp->type == MON_GROUP_TYPE_CHANNEL) {
+                if (grp->type == MON_GROUP_TYPE_CHANNEL) {
                         /*
                          * Make calls to pqos_mon_start_channels
                          *  - track channels
@@ -1688,6 +1891,40 @@ selfn_monitor_interval(const char *arg)
                 parse_error(arg, "Invalid interval value!\n");
 }
 
+void
+selfn_monitor_interval_us(const char *arg)
+{
+        uint64_t interval = strtouint64(arg);
+
+        if (interval < MON_HIRES_MIN_INTERVAL_US || interval > UINT_MAX)
+                parse_error(arg, "Invalid high resolution interval value!\n");
+        sel_mon_interval_us = (unsigned)interval;
+}
+
+void
+selfn_monitor_sampler_core(const char *arg)
+{
+        uint64_t core = strtouint64(arg);
+
+        if (core > INT_MAX)
+                parse_error(arg, "Invalid sampler core value!\n");
+        sel_mon_sampler_core = (int)core;
+}
+
+void
+selfn_monitor_output_policy(const char *arg)
+{
+        if (arg == NULL)
+                parse_error(arg, "NULL output policy argument!");
+
+        if (strcasecmp(arg, "drop") == 0)
+                sel_mon_output_block = 0;
+        else if (strcasecmp(arg, "block") == 0)
+                sel_mon_output_block = 1;
+        else
+                parse_error(arg, "Invalid output policy, use drop or block!");
+}
+
 void
 selfn_monitor_top_like(const char *arg)
 {
@@ -1695,6 +1932,27 @@ selfn_monitor_top_like(const char *arg)
         sel_mon_top_like = 1;
 }
 
+void
+selfn_monitor_top_sort(const char *arg)
+{
+        if (arg == NULL)
+                parse_error(arg, "NULL pointer!");
+
+        if (monitor_top_set_sort(arg) != 0)
+                parse_error(arg, "Invalid sort metric, use comma separated "
+                                 "list of: llc, mbl, mbr, mbt, misses, "
+                                 "references, ipc!");
+        sel_mon_top_like = 1;
+}
+
+void
+selfn_monitor_top_incremental(const char *arg)
+{
+        UNUSED_ARG(arg);
+        sel_mon_top_incremental = 1;
+        sel_mon_top_like = 1;
+}
+
 /**
  * @brief Verifies and translates monitoring config string into
  *        internal monitoring configuration.
@@ -2749,33 +3007,6 @@ cleanup_pslist:
         }
 }
 
-/**
- * @brief Compare LLC occupancy in two monitoring data sets
- *
- * @param a monitoring data A
- * @param b monitoring data B
- *
- * @return LLC monitoring data compare status for descending order
- * @retval 0 if \a  = \b
- * @retval >0 if \b > \a
- * @retval <0 if \b < \a
- */
-static int
-mon_qsort_llc_cmp_desc(const void *a, const void *b)
-{
-        const struct pqos_mon_data *const *app =
-            (const struct pqos_mon_data *const *)a;
-        const struct pqos_mon_data *const *bpp =
-            (const struct pqos_mon_data *const *)b;
-        const struct pqos_mon_data *ap = *app;
-        const struct pqos_mon_data *bp = *bpp;
-        /**
-         * This (b-a) is to get descending order
-         * otherwise it would be (a-b)
-         */
-        return (int)(((int64_t)bp->values.llc) - ((int64_t)ap->values.llc));
-}
-
 /**
  * @brief Compare core id in two monitoring data sets
  *
@@ -2859,6 +3090,619 @@ get_mon_arrays(struct pqos_mon_data ***parray1, struct pqos_mon_data ***parray2)
         return sel_monitor_num;
 }
 
+/**
+ * Monitoring sample queue
+ *
+ * Sampling side produces samples at head, output writer consumes them
+ * from tail. Slots between tail and head are owned by the writer.
+ */
+struct mon_ring {
+        unsigned num_slots;               /**< number of samples in the ring */
+        unsigned num_groups;              /**< number of groups per sample */
+        struct pqos_mon_data **groups;    /**< groups polled by the sampler */
+        struct timespec *ts;              /**< wall clock time of samples */
+        struct pqos_event_values *values; /**< group values of samples */
+        struct pqos_region_aware_event_values *region_values;
+        struct monitor_sample *sample;    /**< group data of samples */
+        uint64_t head;                    /**< number of samples produced */
+        uint64_t tail;                    /**< number of samples consumed */
+        int block;                        /**< wait for space when full */
+        int done;                         /**< sampling finished */
+        int error;                        /**< sampling failed */
+        pthread_mutex_t mutex;
+        pthread_cond_t cond;  /**< signaled when samples are produced */
+        pthread_cond_t space; /**< signaled when samples are consumed */
+
+        /**
+         * Sampling statistics, updated by the sampling side only
+         */
+        uint64_t samples;    /**< samples taken */
+        uint64_t missed;     /**< missed sampling deadlines */
+        uint64_t dropped;    /**< samples dropped due to full ring */
+        uint64_t wakeups;    /**< sampling thread wake ups */
+        uint64_t jitter_min; /**< min wake up delay in ns */
+        uint64_t jitter_max; /**< max wake up delay in ns */
+        uint64_t jitter_sum; /**< total wake up delay in ns */
+};
+
+/**
+ * Monitoring output writer
+ */
+struct mon_writer {
+        const struct monitor_output *output; /**< output backend */
+        struct mon_ring *ring;               /**< sample queue */
+        struct pqos_mon_data *shadow;    /**< groups loaded with sample data */
+        struct pqos_mon_data **mon_data; /**< array used for sorting */
+        int ranked;                      /**< mon_data holds a ranking */
+        struct monitor_sample *sample;   /**< shadow group data */
+        unsigned display_num;            /**< number of groups to display */
+};
+
+/**
+ * Output writer in use, source of data of shadow groups
+ */
+static const struct mon_writer *mon_active_writer = NULL;
+
+/**
+ * @brief Converts timespec into nanoseconds
+ *
+ * @param ts time to convert
+ *
+ * @return time in nanoseconds
+ */
+static uint64_t
+mon_time_ns(const struct timespec *ts)
+{
+        return (uint64_t)ts->tv_sec * 1000000000ull + (uint64_t)ts->tv_nsec;
+}
+
+/**
+ * @brief Reads group data that is not part of the group values
+ *
+ * @param [in] group monitoring group
+ * @param [out] sample group data
+ */
+static void
+mon_sample_read(const struct pqos_mon_data *group,
+                struct monitor_sample *sample)
+{
+        memset(sample, 0, sizeof(*sample));
+
+        if (pqos_mon_get_timestamp(group, NULL, &sample->elapsed) !=
+            PQOS_RETVAL_OK)
+                sample->elapsed = 0;
+
+        if (group->event & PQOS_PERF_EVENT_LLC_MISS_PCIE_READ)
+                pqos_mon_get_value(group, PQOS_PERF_EVENT_LLC_MISS_PCIE_READ,
+                                   NULL, &sample->llc_misses_pcie_read);
+        if (group->event & PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE)
+                pqos_mon_get_value(group, PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE,
+                                   NULL, &sample->llc_misses_pcie_write);
+        if (group->event & PQOS_PERF_EVENT_LLC_REF_PCIE_READ)
+                pqos_mon_get_value(group, PQOS_PERF_EVENT_LLC_REF_PCIE_READ,
+                                   NULL, &sample->llc_references_pcie_read);
+        if (group->event & PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE)
+                pqos_mon_get_value(group, PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE,
+                                   NULL, &sample->llc_references_pcie_write);
+}
+
+/**
+ * @brief Allocates monitoring sample queue
+ *
+ * Ring is sized to hold one second of samples, and no less than
+ * MON_RING_MIN_SLOTS samples, within memory limits.
+ *
+ * @param ring ring buffer to initialize
+ * @param groups monitoring groups to sample
+ * @param num_groups number of monitoring groups
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+static int
+mon_ring_init(struct mon_ring *ring,
+              struct pqos_mon_data **groups,
+              const unsigned num_groups)
+{
+        const size_t sample_size =
+            sizeof(ring->values[0]) + sizeof(ring->region_values[0]) +
+            sizeof(ring->sample[0]);
+        uint64_t num_slots = MON_RING_TIME_US / monitor_get_interval_us();
+        uint64_t max_slots = MON_RING_MAX_SLOTS;
+
+        if (num_groups > 0)
+                max_slots = MON_RING_MAX_BYTES / (sample_size * num_groups);
+        if (max_slots > MON_RING_MAX_SLOTS)
+                max_slots = MON_RING_MAX_SLOTS;
+        if (num_slots < MON_RING_MIN_SLOTS)
+                num_slots = MON_RING_MIN_SLOTS;
+        if (num_slots > max_slots)
+                num_slots = max_slots;
+        if (num_slots < 2)
+                num_slots = 2;
+
+        memset(ring, 0, sizeof(*ring));
+        ring->num_slots = (unsigned)num_slots;
+        ring->num_groups = num_groups;
+        ring->groups = groups;
+        ring->block = sel_mon_output_block;
+        ring->jitter_min = UINT64_MAX;
+        ring->ts = calloc(num_slots, sizeof(ring->ts[0]));
+        ring->values = calloc(num_slots * num_groups, sizeof(ring->values[0]));
+        ring->region_values =
+            calloc(num_slots * num_groups, sizeof(ring->region_values[0]));
+        ring->sample = calloc(num_slots * num_groups, sizeof(ring->sample[0]));
+        if (ring->ts == NULL || ring->values == NULL ||
+            ring->region_values == NULL || ring->sample == NULL) {
+                free(ring->ts);
+                free(ring->values);
+                free(ring->region_values);
+                free(ring->sample);
+                return -1;
+        }
+
+        pthread_mutex_init(&ring->mutex, NULL);
+        pthread_cond_init(&ring->cond, NULL);
+        pthread_cond_init(&ring->space, NULL);
+
+        return 0;
+}
+
+/**
+ * @brief Releases monitoring sample queue
+ *
+ * @param ring ring buffer
+ */
+static void
+mon_ring_fini(struct mon_ring *ring)
+{
+        pthread_cond_destroy(&ring->space);
+        pthread_cond_destroy(&ring->cond);
+        pthread_mutex_destroy(&ring->mutex);
+        free(ring->ts);
+        free(ring->values);
+        free(ring->region_values);
+        free(ring->sample);
+}
+
+/**
+ * @brief Waits for the writer to free a slot
+ *
+ * Wait is abandoned when monitoring is being stopped.
+ *
+ * @param ring ring buffer, mutex held by the caller
+ */
+static void
+mon_ring_wait_space(struct mon_ring *ring)
+{
+        while (ring->head - ring->tail >= ring->num_slots &&
+               !stop_monitoring_loop) {
+                struct timespec wait;
+
+                clock_gettime(CLOCK_REALTIME, &wait);
+                wait.tv_nsec += MON_RING_WAIT_MS * 1000000l;
+                if (wait.tv_nsec >= 1000000000l) {
+                        wait.tv_sec++;
+                        wait.tv_nsec -= 1000000000l;
+                }
+                pthread_cond_timedwait(&ring->space, &ring->mutex, &wait);
+        }
+}
+
+/**
+ * @brief Stores current values of polled groups in the ring buffer
+ *
+ * When the ring is full the sample is dropped, or with the block policy,
+ * the caller waits until the writer catches up.
+ *
+ * @param ring ring buffer
+ */
+static void
+mon_ring_push(struct mon_ring *ring)
+{
+        unsigned slot, i;
+        int full;
+
+        ring->samples++;
+
+        pthread_mutex_lock(&ring->mutex);
+        if (ring->block)
+                mon_ring_wait_space(ring);
+        full = (ring->head - ring->tail) >= ring->num_slots;
+        pthread_mutex_unlock(&ring->mutex);
+
+        if (full) {
+                ring->dropped++;
+                return;
+        }
+
+        slot = (unsigned)(ring->head % ring->num_slots);
+        clock_gettime(CLOCK_REALTIME, &ring->ts[slot]);
+        for (i = 0; i < ring->num_groups; i++) {
+                const unsigned idx = slot * ring->num_groups + i;
+
+                ring->values[idx] = ring->groups[i]->values;
+                ring->region_values[idx] = ring->groups[i]->region_values;
+                mon_sample_read(ring->groups[i], &ring->sample[idx]);
+        }
+
+        pthread_mutex_lock(&ring->mutex);
+        if (ring->head == ring->tail)
+                pthread_cond_signal(&ring->cond);
+        ring->head++;
+        pthread_mutex_unlock(&ring->mutex);
+}
+
+/**
+ * @brief Marks end of sampling
+ *
+ * @param ring ring buffer
+ */
+static void
+mon_ring_finish(struct mon_ring *ring)
+{
+        pthread_mutex_lock(&ring->mutex);
+        ring->done = 1;
+        pthread_cond_signal(&ring->cond);
+        pthread_mutex_unlock(&ring->mutex);
+}
+
+/**
+ * @brief Prints sampling statistics
+ *
+ * @param ring ring buffer
+ */
+static void
+mon_ring_report(const struct mon_ring *ring)
+{
+        if (sel_mon_interval_us == 0) {
+                if (ring->dropped > 0)
+                        fprintf(stderr,
+                                "Output too slow, %" PRIu64 " of %" PRIu64
+                                " samples dropped\n",
+                                ring->dropped, ring->samples);
+                return;
+        }
+
+        fprintf(stderr,
+                "Sampling statistics: %" PRIu64 " samples, %" PRIu64
+                " missed deadlines, %" PRIu64 " dropped samples\n",
+                ring->samples, ring->missed, ring->dropped);
+        if (ring->wakeups == 0)
+                return;
+        fprintf(stderr,
+                "Sampling jitter: min %.3fus, avg %.3fus, max %.3fus\n",
+                (double)ring->jitter_min / 1000.0,
+                (double)ring->jitter_sum / (double)ring->wakeups / 1000.0,
+                (double)ring->jitter_max / 1000.0);
+}
+
+/**
+ * @brief Pins calling thread to the selected sampler core
+ */
+static void
+mon_hires_pin(void)
+{
+#ifdef __linux__
+        cpu_set_t cpuset;
+        int core = sel_mon_sampler_core;
+
+        if (core < 0) {
+                CPU_ZERO(&cpuset);
+                if (sched_getaffinity(0, sizeof(cpuset), &cpuset) != 0)
+                        return;
+                for (core = CPU_SETSIZE - 1; core >= 0; core--)
+                        if (CPU_ISSET(core, &cpuset))
+                                break;
+        }
+        if (core < 0 || core >= CPU_SETSIZE) {
+                fprintf(stderr, "Invalid sampling thread core %d\n", core);
+                return;
+        }
+
+        CPU_ZERO(&cpuset);
+        CPU_SET(core, &cpuset);
+        if (pthread_setaffinity_np(pthread_self(), sizeof(cpuset), &cpuset) !=
+            0)
+                fprintf(stderr, "Failed to pin sampling thread to core %d\n",
+                        core);
+#endif
+}
+
+/**
+ * @brief High resolution sampling thread
+ *
+ * Polls monitoring groups on absolute CLOCK_MONOTONIC deadlines and stores
+ * samples in the ring buffer. Wake up delay past the deadline is accounted
+ * as jitter, whole intervals lost are accounted as missed deadlines.
+ *
+ * @param arg ring buffer
+ *
+ * @return NULL
+ */
+static void *
+mon_hires_sampler(void *arg)
+{
+        struct mon_ring *ring = (struct mon_ring *)arg;
+        const uint64_t period = (uint64_t)sel_mon_interval_us * 1000;
+        const uint64_t timeout = (uint64_t)sel_timeout * 1000000000ull;
+        struct timespec now;
+        uint64_t start;
+        uint64_t deadline;
+
+        mon_hires_pin();
+
+        clock_gettime(CLOCK_MONOTONIC, &now);
+        start = mon_time_ns(&now);
+        deadline = start + period;
+
+        while (!stop_monitoring_loop) {
+                struct timespec wake;
+                uint64_t now_ns;
+                uint64_t late = 0;
+                int ret;
+
+                wake.tv_sec = (time_t)(deadline / 1000000000ull);
+                wake.tv_nsec = (long)(deadline % 1000000000ull);
+                ret = clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &wake,
+                                      NULL);
+                if (ret == EINTR)
+                        continue;
+                if (ret != 0) {
+                        fprintf(stderr, "Failed to wait for timer\n");
+                        ring->error = 1;
+                        break;
+                }
+
+                clock_gettime(CLOCK_MONOTONIC, &now);
+                now_ns = mon_time_ns(&now);
+                if (now_ns > deadline)
+                        late = now_ns - deadline;
+
+                ring->wakeups++;
+                ring->jitter_sum += late;
+                if (late < ring->jitter_min)
+                        ring->jitter_min = late;
+                if (late > ring->jitter_max)
+                        ring->jitter_max = late;
+
+                if (late >= period) {
+                        ring->missed += late / period;
+                        deadline += (late / period) * period;
+                }
+                deadline += period;
+
+                ret = pqos_mon_poll(ring->groups, ring->num_groups);
+                if (ret != PQOS_RETVAL_OK && ret != PQOS_RETVAL_OVERFLOW) {
+                        ring->error = 1;
+                        break;
+                }
+                if (ret == PQOS_RETVAL_OK)
+                        mon_ring_push(ring);
+
+                if (sel_timeout != TIMEOUT_INFINITE &&
+                    now_ns - start >= timeout)
+                        break;
+        }
+
+        mon_ring_finish(ring);
+
+        return NULL;
+}
+
+/**
+ * @brief Creates monitoring helper thread
+ *
+ * Termination signals are blocked in the new thread so they interrupt
+ * the sampling loop of the main thread.
+ *
+ * @param thread created thread
+ * @param start_routine thread function
+ * @param arg thread function argument
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+static int
+mon_thread_create(pthread_t *thread,
+                  void *(*start_routine)(void *),
+                  void *arg)
+{
+        sigset_t set, old;
+        int ret;
+
+        sigemptyset(&set);
+        sigaddset(&set, SIGINT);
+        sigaddset(&set, SIGHUP);
+        sigaddset(&set, SIGTERM);
+        pthread_sigmask(SIG_BLOCK, &set, &old);
+        ret = pthread_create(thread, NULL, start_routine, arg);
+        pthread_sigmask(SIG_SETMASK, &old, NULL);
+
+        return ret;
+}
+
+/**
+ * @brief Initializes output writer
+ *
+ * @param writer writer to initialize
+ * @param output output backend
+ * @param ring sample queue
+ * @param mon_data array of mon_number pointers used for sorting
+ * @param display_num number of groups to display
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+static int
+mon_writer_init(struct mon_writer *writer,
+                const struct monitor_output *output,
+                struct mon_ring *ring,
+                struct pqos_mon_data **mon_data,
+                const unsigned display_num)
+{
+        unsigned i;
+
+        writer->output = output;
+        writer->ring = ring;
+        writer->mon_data = mon_data;
+        writer->ranked = 0;
+        writer->display_num = display_num;
+        writer->shadow = malloc(sizeof(writer->shadow[0]) * ring->num_groups);
+        writer->sample = calloc(ring->num_groups, sizeof(writer->sample[0]));
+        if (writer->shadow == NULL || writer->sample == NULL) {
+                free(writer->shadow);
+                free(writer->sample);
+                return -1;
+        }
+
+        for (i = 0; i < ring->num_groups; i++)
+                writer->shadow[i] = *ring->groups[i];
+
+        mon_active_writer = writer;
+
+        return 0;
+}
+
+/**
+ * @brief Releases monitoring output writer
+ *
+ * @param writer output writer
+ */
+static void
+mon_writer_fini(struct mon_writer *writer)
+{
+        mon_active_writer = NULL;
+        free(writer->shadow);
+        free(writer->sample);
+}
+
+/**
+ * @brief Writes single ring buffer sample to the output
+ *
+ * @param writer output writer
+ * @param seq sample sequence number
+ */
+static void
+mon_writer_output(struct mon_writer *writer, const uint64_t seq)
+{
+        const struct mon_ring *ring = writer->ring;
+        const unsigned slot = (unsigned)(seq % ring->num_slots);
+        const struct timespec *ts = &ring->ts[slot];
+        struct pqos_mon_data **mon_data = writer->mon_data;
+        char cb_time[64];
+        struct tm tm;
+        unsigned i;
+
+        for (i = 0; i < ring->num_groups; i++) {
+                const unsigned idx = slot * ring->num_groups + i;
+
+                writer->shadow[i].values = ring->values[idx];
+                writer->shadow[i].region_values = ring->region_values[idx];
+                writer->sample[i] = ring->sample[idx];
+                if (!writer->ranked)
+                        mon_data[i] = &writer->shadow[i];
+        }
+
+        if (sel_mon_top_like) {
+                /* only displayed groups need to be ranked */
+                monitor_top_rank(mon_data, ring->num_groups,
+                                 writer->display_num, sel_mon_top_incremental);
+                writer->ranked = sel_mon_top_incremental;
+        } else if (monitor_core_mode())
+                qsort(mon_data, ring->num_groups, sizeof(mon_data[0]),
+                      mon_qsort_coreid_cmp_asc);
+
+        /**
+         * Get time string
+         */
+        if (localtime_r(&ts->tv_sec, &tm) != NULL) {
+                size_t len = strftime(cb_time, sizeof(cb_time) - 1,
+                                      "%Y-%m-%d %H:%M:%S", &tm);
+
+                snprintf(cb_time + len, sizeof(cb_time) - len, ".%06ld",
+                         ts->tv_nsec / 1000);
+        } else
+                strncpy(cb_time, "error", sizeof(cb_time) - 1);
+
+        writer->output->header(fp_monitor, cb_time,
+                               sel_mon_mem_region.num_mem_regions,
+                               sel_mon_mem_region.region_num);
+        for (i = 0; i < writer->display_num; i++)
+                writer->output->row(fp_monitor, cb_time, mon_data[i]);
+        writer->output->footer(fp_monitor);
+}
+
+/**
+ * @brief Output writer loop
+ *
+ * Writes samples to the output as they become available, until sampling
+ * is finished and the queue is drained.
+ *
+ * @param arg output writer
+ *
+ * @return NULL
+ */
+static void *
+mon_writer_run(void *arg)
+{
+        struct mon_writer *writer = (struct mon_writer *)arg;
+        struct mon_ring *ring = writer->ring;
+        int done = 0;
+
+        writer->output->begin(fp_monitor, sel_mon_mem_region.num_mem_regions,
+                              sel_mon_mem_region.region_num);
+        while (!done) {
+                uint64_t head, seq;
+
+                pthread_mutex_lock(&ring->mutex);
+                while (ring->head == ring->tail && !ring->done)
+                        pthread_cond_wait(&ring->cond, &ring->mutex);
+                head = ring->head;
+                seq = ring->tail;
+                done = ring->done;
+                pthread_mutex_unlock(&ring->mutex);
+
+                for (; seq < head; seq++)
+                        mon_writer_output(writer, seq);
+                fflush(fp_monitor);
+
+                pthread_mutex_lock(&ring->mutex);
+                ring->tail = head;
+                pthread_cond_signal(&ring->space);
+                pthread_mutex_unlock(&ring->mutex);
+        }
+        writer->output->end(fp_monitor);
+
+        return NULL;
+}
+
+/**
+ * @brief High resolution monitoring loop
+ *
+ * Sampling is done by a dedicated, pinned thread into the sample queue.
+ * The calling thread writes samples to the output.
+ *
+ * @param writer output writer
+ */
+static void
+monitor_loop_hires(struct mon_writer *writer)
+{
+        struct mon_ring *ring = writer->ring;
+        pthread_t sampler;
+
+        if (mon_thread_create(&sampler, mon_hires_sampler, ring) != 0) {
+                fprintf(stderr, "Failed to create sampling thread\n");
+                return;
+        }
+
+        mon_writer_run(writer);
+
+        pthread_join(sampler, NULL);
+        if (ring->error)
+                printf("Failed to poll monitoring data!\n");
+}
+
 void
 monitor_loop(void)
 {
@@ -2879,21 +3723,10 @@ monitor_loop(void)
         int retval;
         struct itimerspec timer_spec;
         enum pqos_interface interface;
-
-        struct {
-                void (*begin)(FILE *fp,
-                              const int num_mem_regions,
-                              const int *region_num);
-                void (*header)(FILE *fp,
-                               const char *timestamp,
-                               const int num_mem_regions,
-                               const int *region_num);
-                void (*row)(FILE *fp,
-                            const char *timestamp,
-                            const struct pqos_mon_data *data);
-                void (*footer)(FILE *fp);
-                void (*end)(FILE *fp);
-        } output;
+        struct monitor_output output;
+        struct mon_ring ring;
+        struct mon_writer writer;
+        pthread_t writer_thread;
 
         retval = pqos_inter_get(&interface);
         if (retval != PQOS_RETVAL_OK) {
@@ -2925,6 +3758,16 @@ monitor_loop(void)
                 output.row = monitor_xml_row;
                 output.footer = monitor_xml_footer;
                 output.end = monitor_xml_end;
+        } else if (strcasecmp(sel_output_type, "bin") == 0 ||
+                   strcasecmp(sel_output_type, "binz") == 0) {
+                if (strcasecmp(sel_output_type, "binz") == 0)
+                        output.begin = monitor_binz_begin;
+                else
+                        output.begin = monitor_bin_begin;
+                output.header = monitor_bin_header;
+                output.row = monitor_bin_row;
+                output.footer = monitor_bin_footer;
+                output.end = monitor_bin_end;
         } else {
                 printf("Invalid selection of output file type '%s'!\n",
                        sel_output_type);
@@ -2979,6 +3822,21 @@ monitor_loop(void)
                         display_num = max_lines - TERM_MIN_NUM_LINES + 1;
         }
 
+        if (mon_ring_init(&ring, mon_grps, mon_number) != 0) {
+                printf("Error with memory allocation\n");
+                goto monitor_loop_exit;
+        }
+        if (mon_writer_init(&writer, &output, &ring, mon_data, display_num) !=
+            0) {
+                printf("Error with memory allocation\n");
+                goto monitor_loop_ring_exit;
+        }
+
+        if (sel_mon_interval_us != 0) {
+                monitor_loop_hires(&writer);
+                goto monitor_loop_report;
+        }
+
         timer_spec.it_interval.tv_sec = sel_mon_interval / 10l;
         timer_spec.it_interval.tv_nsec =
             sel_mon_interval % 10l * 100l * 1000000l;
@@ -2995,60 +3853,28 @@ monitor_loop(void)
                 stop_monitoring_loop = 1;
         }
 
-        output.begin(fp_monitor, sel_mon_mem_region.num_mem_regions,
-                     sel_mon_mem_region.region_num);
+        /**
+         * Output is formatted and written by a separate thread so a slow
+         * output does not delay sampling
+         */
+        if (mon_thread_create(&writer_thread, mon_writer_run, &writer) != 0) {
+                fprintf(stderr, "Failed to create output thread\n");
+                goto monitor_loop_writer_exit;
+        }
+
         while (!stop_monitoring_loop) {
-                struct tm *ptm = NULL;
-                unsigned i = 0;
-                char cb_time[64];
                 int ret;
                 uint64_t timer_count = 0;
-                time_t curr_time;
 
                 ret = pqos_mon_poll(mon_grps, mon_number);
-                if (ret == PQOS_RETVAL_OVERFLOW) {
+                /* MMIO counter overflow, drop the sample and wait */
+                if (ret == PQOS_RETVAL_OVERFLOW)
                         printf("MBM counter overflow\n");
-                        continue;
-                } else if (ret != PQOS_RETVAL_OK) {
+                else if (ret != PQOS_RETVAL_OK) {
                         printf("Failed to poll monitoring data!\n");
                         break;
-                }
-
-                memcpy(mon_data, mon_grps, mon_number * sizeof(mon_grps[0]));
-
-                if (sel_mon_top_like)
-                        qsort(mon_data, mon_number, sizeof(mon_data[0]),
-                              mon_qsort_llc_cmp_desc);
-                else if (monitor_core_mode())
-                        qsort(mon_data, mon_number, sizeof(mon_data[0]),
-                              mon_qsort_coreid_cmp_asc);
-
-                /**
-                 * Get time string
-                 */
-                curr_time = time(0);
-                ptm = localtime(&curr_time);
-                if (ptm != NULL)
-                        strftime(cb_time, sizeof(cb_time) - 1,
-                                 "%Y-%m-%d %H:%M:%S", ptm);
-                else
-                        strncpy(cb_time, "error", sizeof(cb_time) - 1);
-
-                output.header(fp_monitor, cb_time,
-                              sel_mon_mem_region.num_mem_regions,
-                              sel_mon_mem_region.region_num);
-                for (i = 0; i < display_num; i++) {
-#ifndef __clang_analyzer__
-                        const struct pqos_mon_data *data = mon_data[i];
-#else
-                        const struct pqos_mon_data *data = NULL;
-#endif
-
-                        output.row(fp_monitor, cb_time, data);
-                }
-                output.footer(fp_monitor);
-
-                fflush(fp_monitor);
+                } else
+                        mon_ring_push(&ring);
 
                 if (stop_monitoring_loop)
                         break;
@@ -3071,8 +3897,22 @@ monitor_loop(void)
                 }
                 runtime += timer_count * sel_mon_interval * 100l;
         }
-        output.end(fp_monitor);
 
+        mon_ring_finish(&ring);
+        pthread_join(writer_thread, NULL);
+
+monitor_loop_report:
+        mon_ring_report(&ring);
+monitor_loop_writer_exit:
+        mon_writer_fini(&writer);
+monitor_loop_ring_exit:
+        mon_ring_fini(&ring);
+monitor_loop_exit:
+#ifdef __linux__
+        close(tfd);
+#else
+        timer_delete(timerid);
+#endif
         free(mon_grps);
         free(mon_data);
 }
@@ -3104,6 +3944,31 @@ monitor_get_interval(void)
         return sel_mon_interval;
 }
 
+uint64_t
+monitor_get_interval_us(void)
+{
+        if (sel_mon_interval_us != 0)
+                return sel_mon_interval_us;
+
+        return (uint64_t)sel_mon_interval * 100000;
+}
+
+void
+monitor_get_sample(const struct pqos_mon_data *group,
+                   struct monitor_sample *sample)
+{
+        const struct mon_writer *writer = mon_active_writer;
+
+        if (writer != NULL && group >= writer->shadow &&
+            group < writer->shadow + writer->ring->num_groups)
+                *sample = writer->sample[group - writer->shadow];
+        else
+                mon_sample_read(group, sample);
+
+        if (sample->elapsed == 0)
+                sample->elapsed = monitor_get_interval_us() * 1000;
+}
+
 enum pqos_mon_event
 monitor_get_events(void)
 {
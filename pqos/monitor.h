@@ -68,6 +68,20 @@ void selfn_monitor_top_pids(void);
  */
 void selfn_monitor_top_like(const char *arg);
 
+/**
+ * @brief Selects metrics used to sort top-like monitoring output
+ *
+ * @param arg string passed to --mon-top-sort command line option
+ */
+void selfn_monitor_top_sort(const char *arg);
+
+/**
+ * @brief Selects incremental ranking of top-like monitoring output
+ *
+ * @param arg not used
+ */
+void selfn_monitor_top_incremental(const char *arg);
+
 /**
  * @brief Selects monitoring interval
  *
@@ -75,6 +89,27 @@ void selfn_monitor_top_like(const char *arg);
  */
 void selfn_monitor_interval(const char *arg);
 
+/**
+ * @brief Selects high resolution monitoring interval
+ *
+ * @param arg string passed to --mon-interval-us command line option
+ */
+void selfn_monitor_interval_us(const char *arg);
+
+/**
+ * @brief Selects core for high resolution sampling thread
+ *
+ * @param arg string passed to --mon-sampler-core command line option
+ */
+void selfn_monitor_sampler_core(const char *arg);
+
+/**
+ * @brief Selects policy for monitoring output not keeping up with sampling
+ *
+ * @param arg string passed to --mon-output-policy command line option
+ */
+void selfn_monitor_output_policy(const char *arg);
+
 /**
  * @brief Selects monitoring time
  *
@@ -242,6 +277,37 @@ void monitor_loop(void);
  */
 int monitor_get_interval(void);
 
+/**
+ * @brief Retrieve monitoring interval in microseconds
+ *
+ * @return monitoring interval in microseconds
+ */
+uint64_t monitor_get_interval_us(void);
+
+/**
+ * Group data read along with the group values
+ */
+struct monitor_sample {
+        uint64_t elapsed;                   /**< read interval in ns */
+        uint64_t llc_misses_pcie_read;      /**< PCIe read LLC misses */
+        uint64_t llc_misses_pcie_write;     /**< PCIe write LLC misses */
+        uint64_t llc_references_pcie_read;  /**< PCIe read LLC references */
+        uint64_t llc_references_pcie_write; /**< PCIe write LLC references */
+};
+
+/**
+ * @brief Retrieve group data read along with the group values
+ *
+ * Groups loaded from the sample queue return data taken with the sample,
+ * data of other groups is read from the library. Read interval falls back
+ * to the monitoring interval when the read time is not known.
+ *
+ * @param [in] group monitoring group
+ * @param [out] sample group data
+ */
+void monitor_get_sample(const struct pqos_mon_data *group,
+                        struct monitor_sample *sample);
+
 /**
  * @brief List of events being monitored
  *
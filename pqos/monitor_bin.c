@@ -0,0 +1,959 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+/**
+ * Binary monitoring output
+ *
+ * File layout, all integers are little endian:
+ *
+ * File header
+ *   char magic[8]              "PQOSMON\0"
+ *   u32  version               MONITOR_BIN_VERSION
+ *   u32  num_columns           number of counter columns
+ *   u64  interval_us           sampling interval in microseconds
+ *   u32  num_groups            number of monitoring groups
+ *   u32  column[num_columns]   column ids, see enum monitor_bin_column
+ *   num_groups group descriptors
+ *     u32  event               monitored events
+ *     u32  label_len           length of group label
+ *     char label[label_len]    group label, not NULL terminated
+ *
+ * Blocks, until end of file
+ *   u32  encoding              MONITOR_BIN_ENC_RAW or MONITOR_BIN_ENC_ZLIB
+ *   u32  num_samples           number of samples in the block
+ *   u32  raw_size              size of decoded payload
+ *   u32  size                  size of payload stored in the file
+ *   u8   payload[size]
+ *
+ * Decoded payload holds num_samples records, each made of
+ * 1 + num_groups * num_columns zigzag encoded LEB128 varints: sample time in
+ * nanoseconds since the epoch followed by raw counter values of each group.
+ * Every value is stored as a delta against the previous record of the block,
+ * the first record of a block is stored as a delta against 0.
+ */
+
+#include "monitor_bin.h"
+
+#include "common.h"
+#include "monitor.h"
+
+#include <inttypes.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#ifdef PQOS_ZLIB
+#include <zlib.h>
+#endif
+
+#define MONITOR_BIN_MAGIC         "PQOSMON"
+#define MONITOR_BIN_MAGIC_SIZE    8
+#define MONITOR_BIN_VERSION       1
+#define MONITOR_BIN_ENC_RAW       0
+#define MONITOR_BIN_ENC_ZLIB      1
+#define MONITOR_BIN_BLOCK_SIZE    (64 * 1024)
+#define MONITOR_BIN_BLOCK_SAMPLES 256
+#define MONITOR_BIN_BLOCK_MAX     (256 * 1024 * 1024)
+#define MONITOR_BIN_VARINT_MAX    10
+#define MONITOR_BIN_LABEL_MAX     4096
+
+/**
+ * Binary file counter columns
+ */
+enum monitor_bin_column {
+        MONITOR_BIN_COL_LLC = 0,
+        MONITOR_BIN_COL_MBL,
+        MONITOR_BIN_COL_MBR,
+        MONITOR_BIN_COL_MBT,
+        MONITOR_BIN_COL_LLC_MISSES,
+        MONITOR_BIN_COL_LLC_REFERENCES,
+        MONITOR_BIN_COL_IPC_RETIRED,
+        MONITOR_BIN_COL_IPC_UNHALTED,
+        MONITOR_BIN_COL_NUM
+};
+
+/**
+ * Events stored in the columns
+ */
+static const enum pqos_mon_event column_event[MONITOR_BIN_COL_NUM] = {
+    [MONITOR_BIN_COL_LLC] = PQOS_MON_EVENT_L3_OCCUP,
+    [MONITOR_BIN_COL_MBL] = PQOS_MON_EVENT_LMEM_BW,
+    [MONITOR_BIN_COL_MBR] = PQOS_MON_EVENT_RMEM_BW,
+    [MONITOR_BIN_COL_MBT] = PQOS_MON_EVENT_TMEM_BW,
+    [MONITOR_BIN_COL_LLC_MISSES] = PQOS_PERF_EVENT_LLC_MISS,
+    [MONITOR_BIN_COL_LLC_REFERENCES] = PQOS_PERF_EVENT_LLC_REF,
+    [MONITOR_BIN_COL_IPC_RETIRED] = PQOS_PERF_EVENT_IPC,
+    [MONITOR_BIN_COL_IPC_UNHALTED] = PQOS_PERF_EVENT_IPC,
+};
+
+/**
+ * Binary output state
+ */
+static struct {
+        int compress;                 /**< compress blocks */
+        int started;                  /**< file header written */
+        unsigned num_columns;         /**< number of columns */
+        enum monitor_bin_column column[MONITOR_BIN_COL_NUM];
+        unsigned num_groups;          /**< number of groups */
+        const struct pqos_mon_data **group; /**< groups in file order */
+        unsigned hint;                /**< next group lookup position */
+        uint64_t time;                /**< current sample time */
+        uint64_t *value;              /**< current sample values */
+        uint64_t prev_time;           /**< previous record time */
+        uint64_t *prev;               /**< previous record values */
+        uint8_t *block;               /**< encoded block */
+        size_t block_size;            /**< allocated block size */
+        size_t block_len;             /**< used block size */
+        unsigned block_samples;       /**< number of samples in block */
+} bin;
+
+/**
+ * @brief Reads raw counter value for a column
+ *
+ * @param [in] values group values
+ * @param column column id
+ *
+ * @return counter value
+ */
+static uint64_t
+bin_column_value(const struct pqos_event_values *values,
+                 const enum monitor_bin_column column)
+{
+        switch (column) {
+        case MONITOR_BIN_COL_LLC:
+                return values->llc;
+        case MONITOR_BIN_COL_MBL:
+                return values->mbm_local;
+        case MONITOR_BIN_COL_MBR:
+                return values->mbm_remote;
+        case MONITOR_BIN_COL_MBT:
+                return values->mbm_total;
+        case MONITOR_BIN_COL_LLC_MISSES:
+                return values->llc_misses;
+        case MONITOR_BIN_COL_LLC_REFERENCES:
+                return values->llc_references;
+        case MONITOR_BIN_COL_IPC_RETIRED:
+                return values->ipc_retired;
+        case MONITOR_BIN_COL_IPC_UNHALTED:
+                return values->ipc_unhalted;
+        default:
+                return 0;
+        }
+}
+
+/**
+ * @brief Writes little endian integer
+ *
+ * @param fp file descriptor
+ * @param value value to write
+ * @param size integer size in bytes
+ */
+static void
+bin_write_int(FILE *fp, uint64_t value, const unsigned size)
+{
+        uint8_t buf[sizeof(value)];
+        unsigned i;
+
+        for (i = 0; i < size; i++, value >>= 8)
+                buf[i] = (uint8_t)value;
+        fwrite(buf, size, 1, fp);
+}
+
+/**
+ * @brief Reads little endian integer
+ *
+ * @param fp file descriptor
+ * @param value read value
+ * @param size integer size in bytes
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+static int
+bin_read_int(FILE *fp, uint64_t *value, const unsigned size)
+{
+        uint8_t buf[sizeof(*value)];
+        unsigned i;
+
+        if (fread(buf, size, 1, fp) != 1)
+                return -1;
+
+        *value = 0;
+        for (i = size; i > 0; i--)
+                *value = (*value << 8) | buf[i - 1];
+
+        return 0;
+}
+
+/**
+ * @brief Appends zigzag encoded varint to the block
+ *
+ * @param delta value to encode
+ */
+static void
+bin_put_varint(const int64_t delta)
+{
+        uint64_t value = ((uint64_t)delta << 1) ^ (uint64_t)(delta >> 63);
+
+        while (value >= 0x80) {
+                bin.block[bin.block_len++] = (uint8_t)(value | 0x80);
+                value >>= 7;
+        }
+        bin.block[bin.block_len++] = (uint8_t)value;
+}
+
+/**
+ * @brief Decodes zigzag encoded varint
+ *
+ * @param [in] buf encoded data
+ * @param len size of \a buf
+ * @param pos position in \a buf, updated on return
+ * @param delta decoded value
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+static int
+bin_get_varint(const uint8_t *buf, const size_t len, size_t *pos,
+               int64_t *delta)
+{
+        uint64_t value = 0;
+        unsigned shift;
+
+        for (shift = 0; shift < 64 && *pos < len; shift += 7) {
+                const uint8_t byte = buf[(*pos)++];
+
+                value |= (uint64_t)(byte & 0x7f) << shift;
+                if ((byte & 0x80) == 0) {
+                        *delta = (int64_t)(value >> 1) ^ -(int64_t)(value & 1);
+                        return 0;
+                }
+        }
+
+        return -1;
+}
+
+/**
+ * @brief Converts timestamp string into nanoseconds since the epoch
+ *
+ * @param [in] timestamp time in "%Y-%m-%d %H:%M:%S[.usec]" format
+ *
+ * @return time in nanoseconds, 0 on error
+ */
+static uint64_t
+bin_parse_timestamp(const char *timestamp)
+{
+        struct tm tm;
+        long usec = 0;
+        time_t t;
+
+        memset(&tm, 0, sizeof(tm));
+        if (sscanf(timestamp, "%d-%d-%d %d:%d:%d.%ld", &tm.tm_year,
+                   &tm.tm_mon, &tm.tm_mday, &tm.tm_hour, &tm.tm_min,
+                   &tm.tm_sec, &usec) < 6)
+                return 0;
+
+        tm.tm_year -= 1900;
+        tm.tm_mon -= 1;
+        tm.tm_isdst = -1;
+        t = mktime(&tm);
+        if (t == (time_t)-1)
+                return 0;
+
+        return (uint64_t)t * 1000000000ull + (uint64_t)usec * 1000;
+}
+
+/**
+ * @brief Starts binary output
+ *
+ * @param compress compress blocks
+ */
+static void
+bin_begin(const int compress)
+{
+        const enum pqos_mon_event events = monitor_get_events();
+        unsigned i;
+
+        memset(&bin, 0, sizeof(bin));
+        bin.compress = compress;
+        for (i = 0; i < MONITOR_BIN_COL_NUM; i++)
+                if (events & column_event[i])
+                        bin.column[bin.num_columns++] =
+                            (enum monitor_bin_column)i;
+}
+
+void
+monitor_bin_begin(FILE *fp, const int num_mem_regions, const int *region_num)
+{
+        UNUSED_ARG(fp);
+        UNUSED_ARG(num_mem_regions);
+        UNUSED_ARG(region_num);
+
+        bin_begin(0);
+}
+
+void
+monitor_binz_begin(FILE *fp, const int num_mem_regions, const int *region_num)
+{
+        UNUSED_ARG(fp);
+        UNUSED_ARG(num_mem_regions);
+        UNUSED_ARG(region_num);
+
+        bin_begin(1);
+}
+
+void
+monitor_bin_header(FILE *fp,
+                   const char *timestamp,
+                   const int num_mem_regions,
+                   const int *region_num)
+{
+        UNUSED_ARG(fp);
+        UNUSED_ARG(num_mem_regions);
+        UNUSED_ARG(region_num);
+
+        bin.time = bin_parse_timestamp(timestamp);
+}
+
+/**
+ * @brief Finds group position in the file
+ *
+ * Groups are usually reported in the same order, so the search starts
+ * after the previously found group.
+ *
+ * @param [in] data monitoring group
+ *
+ * @return group index
+ * @retval bin.num_groups if group is not stored in the file
+ */
+static unsigned
+bin_group_find(const struct pqos_mon_data *data)
+{
+        unsigned i;
+
+        for (i = 0; i < bin.num_groups; i++) {
+                unsigned idx = (bin.hint + i) % bin.num_groups;
+
+                if (bin.group[idx] == data) {
+                        bin.hint = idx + 1;
+                        return idx;
+                }
+        }
+
+        return bin.num_groups;
+}
+
+void
+monitor_bin_row(FILE *fp,
+                const char *timestamp,
+                const struct pqos_mon_data *data)
+{
+        unsigned idx;
+        unsigned i;
+
+        UNUSED_ARG(fp);
+        UNUSED_ARG(timestamp);
+        ASSERT(data != NULL);
+
+        if (!bin.started) {
+                /* groups of the first sample make up the file header */
+                const struct pqos_mon_data **group;
+                uint64_t *value;
+
+                idx = bin.num_groups;
+                group = realloc(bin.group, (idx + 1) * sizeof(group[0]));
+                if (group == NULL)
+                        return;
+                bin.group = group;
+                value = realloc(bin.value, (idx + 1) * bin.num_columns *
+                                               sizeof(value[0]));
+                if (value == NULL)
+                        return;
+                bin.value = value;
+                bin.group[idx] = data;
+                bin.num_groups++;
+        } else {
+                idx = bin_group_find(data);
+                if (idx >= bin.num_groups)
+                        return;
+        }
+
+        for (i = 0; i < bin.num_columns; i++)
+                bin.value[idx * bin.num_columns + i] =
+                    bin_column_value(&data->values, bin.column[i]);
+}
+
+/**
+ * @brief Writes binary file header
+ *
+ * @param fp file descriptor
+ */
+static void
+bin_write_header(FILE *fp)
+{
+        char magic[MONITOR_BIN_MAGIC_SIZE] = MONITOR_BIN_MAGIC;
+        unsigned i;
+
+        fwrite(magic, sizeof(magic), 1, fp);
+        bin_write_int(fp, MONITOR_BIN_VERSION, 4);
+        bin_write_int(fp, bin.num_columns, 4);
+        bin_write_int(fp, monitor_get_interval_us(), 8);
+        bin_write_int(fp, bin.num_groups, 4);
+        for (i = 0; i < bin.num_columns; i++)
+                bin_write_int(fp, bin.column[i], 4);
+        for (i = 0; i < bin.num_groups; i++) {
+                const char *label = (const char *)bin.group[i]->context;
+                size_t len = label != NULL ? strlen(label) : 0;
+
+                if (len > MONITOR_BIN_LABEL_MAX)
+                        len = MONITOR_BIN_LABEL_MAX;
+                bin_write_int(fp, bin.group[i]->event, 4);
+                bin_write_int(fp, len, 4);
+                if (len > 0)
+                        fwrite(label, len, 1, fp);
+        }
+}
+
+/**
+ * @brief Writes encoded block to the file
+ *
+ * @param fp file descriptor
+ */
+static void
+bin_block_flush(FILE *fp)
+{
+        uint32_t encoding = MONITOR_BIN_ENC_RAW;
+        const uint8_t *payload = bin.block;
+        size_t size = bin.block_len;
+#ifdef PQOS_ZLIB
+        uint8_t *zblock = NULL;
+
+        if (bin.compress) {
+                uLongf zsize = compressBound(bin.block_len);
+
+                zblock = malloc(zsize);
+                if (zblock != NULL &&
+                    compress2(zblock, &zsize, bin.block, bin.block_len,
+                              Z_DEFAULT_COMPRESSION) == Z_OK &&
+                    zsize < bin.block_len) {
+                        encoding = MONITOR_BIN_ENC_ZLIB;
+                        payload = zblock;
+                        size = zsize;
+                }
+        }
+#endif
+
+        bin_write_int(fp, encoding, 4);
+        bin_write_int(fp, bin.block_samples, 4);
+        bin_write_int(fp, bin.block_len, 4);
+        bin_write_int(fp, size, 4);
+        fwrite(payload, size, 1, fp);
+        fflush(fp);
+
+#ifdef PQOS_ZLIB
+        free(zblock);
+#endif
+        bin.block_len = 0;
+        bin.block_samples = 0;
+        bin.prev_time = 0;
+        memset(bin.prev, 0,
+               bin.num_groups * bin.num_columns * sizeof(bin.prev[0]));
+}
+
+void
+monitor_bin_footer(FILE *fp)
+{
+        const unsigned num_values = bin.num_groups * bin.num_columns;
+        const size_t max_len = (1 + num_values) * MONITOR_BIN_VARINT_MAX;
+        unsigned i;
+
+        ASSERT(fp != NULL);
+
+        if (!bin.started) {
+                if (bin.num_groups == 0)
+                        return;
+                bin.prev = calloc(num_values + 1, sizeof(bin.prev[0]));
+                if (bin.prev == NULL) {
+                        printf("Error with memory allocation\n");
+                        return;
+                }
+                bin_write_header(fp);
+                bin.started = 1;
+        }
+
+        if (bin.block_len + max_len > bin.block_size) {
+                size_t size = bin.block_len + max_len;
+                uint8_t *block;
+
+                if (size < MONITOR_BIN_BLOCK_SIZE + max_len)
+                        size = MONITOR_BIN_BLOCK_SIZE + max_len;
+                block = realloc(bin.block, size);
+                if (block == NULL) {
+                        printf("Error with memory allocation\n");
+                        return;
+                }
+                bin.block = block;
+                bin.block_size = size;
+        }
+
+        bin_put_varint((int64_t)(bin.time - bin.prev_time));
+        bin.prev_time = bin.time;
+        for (i = 0; i < num_values; i++) {
+                bin_put_varint((int64_t)(bin.value[i] - bin.prev[i]));
+                bin.prev[i] = bin.value[i];
+        }
+        bin.block_samples++;
+
+        if (bin.block_len >= MONITOR_BIN_BLOCK_SIZE ||
+            bin.block_samples >= MONITOR_BIN_BLOCK_SAMPLES)
+                bin_block_flush(fp);
+}
+
+void
+monitor_bin_end(FILE *fp)
+{
+        ASSERT(fp != NULL);
+
+        if (bin.started && bin.block_samples > 0)
+                bin_block_flush(fp);
+        fflush(fp);
+
+        free(bin.group);
+        free(bin.value);
+        free(bin.prev);
+        free(bin.block);
+        memset(&bin, 0, sizeof(bin));
+}
+
+int
+monitor_bin_compress_supported(void)
+{
+#ifdef PQOS_ZLIB
+        return 1;
+#else
+        return 0;
+#endif
+}
+
+/**
+ * Binary file content being decoded
+ */
+struct bin_file {
+        unsigned num_columns;
+        uint32_t column[MONITOR_BIN_COL_NUM];
+        uint64_t interval_us;
+        unsigned num_groups;
+        uint32_t *event;      /**< events of each group */
+        char **label;         /**< label of each group */
+        int col_idx[MONITOR_BIN_COL_NUM]; /**< column position or -1 */
+};
+
+/**
+ * @brief Releases decoded file header
+ *
+ * @param file decoded file header
+ */
+static void
+bin_file_free(struct bin_file *file)
+{
+        unsigned i;
+
+        if (file->label != NULL)
+                for (i = 0; i < file->num_groups; i++)
+                        free(file->label[i]);
+        free(file->label);
+        free(file->event);
+}
+
+/**
+ * @brief Reads binary file header
+ *
+ * @param fp file descriptor
+ * @param file decoded file header
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+static int
+bin_read_header(FILE *fp, struct bin_file *file)
+{
+        char magic[MONITOR_BIN_MAGIC_SIZE];
+        uint64_t value;
+        unsigned i;
+
+        memset(file, 0, sizeof(*file));
+        for (i = 0; i < MONITOR_BIN_COL_NUM; i++)
+                file->col_idx[i] = -1;
+
+        if (fread(magic, sizeof(magic), 1, fp) != 1 ||
+            memcmp(magic, MONITOR_BIN_MAGIC, sizeof(magic)) != 0) {
+                printf("Not a binary monitoring file!\n");
+                return -1;
+        }
+        if (bin_read_int(fp, &value, 4) != 0 || value != MONITOR_BIN_VERSION) {
+                printf("Unsupported binary monitoring file version!\n");
+                return -1;
+        }
+        if (bin_read_int(fp, &value, 4) != 0 || value > MONITOR_BIN_COL_NUM)
+                goto bin_read_header_error;
+        file->num_columns = (unsigned)value;
+        if (bin_read_int(fp, &file->interval_us, 8) != 0)
+                goto bin_read_header_error;
+        if (bin_read_int(fp, &value, 4) != 0 || value == 0 ||
+            value > UINT32_MAX / MONITOR_BIN_COL_NUM)
+                goto bin_read_header_error;
+        file->num_groups = (unsigned)value;
+
+        for (i = 0; i < file->num_columns; i++) {
+                if (bin_read_int(fp, &value, 4) != 0 ||
+                    value >= MONITOR_BIN_COL_NUM)
+                        goto bin_read_header_error;
+                file->column[i] = (uint32_t)value;
+                file->col_idx[value] = (int)i;
+        }
+
+        file->event = calloc(file->num_groups, sizeof(file->event[0]));
+        file->label = calloc(file->num_groups, sizeof(file->label[0]));
+        if (file->event == NULL || file->label == NULL)
+                goto bin_read_header_error;
+        for (i = 0; i < file->num_groups; i++) {
+                if (bin_read_int(fp, &value, 4) != 0)
+                        goto bin_read_header_error;
+                file->event[i] = (uint32_t)value;
+                if (bin_read_int(fp, &value, 4) != 0 ||
+                    value > MONITOR_BIN_LABEL_MAX)
+                        goto bin_read_header_error;
+                file->label[i] = calloc(value + 1, 1);
+                if (file->label[i] == NULL ||
+                    (value > 0 && fread(file->label[i], value, 1, fp) != 1))
+                        goto bin_read_header_error;
+        }
+
+        return 0;
+
+bin_read_header_error:
+        printf("Invalid binary monitoring file header!\n");
+        return -1;
+}
+
+/**
+ * @brief Prints CSV column names
+ *
+ * @param fp CSV output file descriptor
+ * @param [in] file decoded file header
+ */
+static void
+bin_print_csv_header(FILE *fp, const struct bin_file *file)
+{
+        fprintf(fp, "Time,Group");
+        if (file->col_idx[MONITOR_BIN_COL_IPC_RETIRED] >= 0 &&
+            file->col_idx[MONITOR_BIN_COL_IPC_UNHALTED] >= 0)
+                fprintf(fp, ",IPC");
+        if (file->col_idx[MONITOR_BIN_COL_LLC_MISSES] >= 0)
+                fprintf(fp, ",LLC Misses");
+        if (file->col_idx[MONITOR_BIN_COL_LLC_REFERENCES] >= 0)
+                fprintf(fp, ",LLC References");
+        if (file->col_idx[MONITOR_BIN_COL_LLC] >= 0)
+                fprintf(fp, ",LLC[KB]");
+        if (file->col_idx[MONITOR_BIN_COL_MBL] >= 0)
+                fprintf(fp, ",MBL[MB/s]");
+        if (file->col_idx[MONITOR_BIN_COL_MBR] >= 0)
+                fprintf(fp, ",MBR[MB/s]");
+        if (file->col_idx[MONITOR_BIN_COL_MBT] >= 0)
+                fprintf(fp, ",MBT[MB/s]");
+        fputs("\n", fp);
+}
+
+/**
+ * @brief Prints single group sample as CSV row
+ *
+ * @param fp CSV output file descriptor
+ * @param [in] file decoded file header
+ * @param [in] timestamp sample time
+ * @param group group index
+ * @param [in] cur current sample values of the group
+ * @param [in] prev previous sample values of the group
+ * @param elapsed time between samples in seconds
+ */
+static void
+bin_print_csv_row(FILE *fp,
+                  const struct bin_file *file,
+                  const char *timestamp,
+                  const unsigned group,
+                  const uint64_t *cur,
+                  const uint64_t *prev,
+                  const double elapsed)
+{
+        static const enum monitor_bin_column delta_col[] = {
+            MONITOR_BIN_COL_LLC_MISSES, MONITOR_BIN_COL_LLC_REFERENCES};
+        static const enum monitor_bin_column bw_col[] = {
+            MONITOR_BIN_COL_MBL, MONITOR_BIN_COL_MBR, MONITOR_BIN_COL_MBT};
+        const uint32_t event = file->event[group];
+        const int ret_idx = file->col_idx[MONITOR_BIN_COL_IPC_RETIRED];
+        const int unh_idx = file->col_idx[MONITOR_BIN_COL_IPC_UNHALTED];
+        int idx;
+        unsigned i;
+
+        fprintf(fp, "%s,\"%s\"", timestamp, file->label[group]);
+
+        if (ret_idx >= 0 && unh_idx >= 0) {
+                const uint64_t unhalted = cur[unh_idx] - prev[unh_idx];
+
+                if ((event & PQOS_PERF_EVENT_IPC) && unhalted != 0)
+                        fprintf(fp, ",%.2f",
+                                (double)(cur[ret_idx] - prev[ret_idx]) /
+                                    (double)unhalted);
+                else if (event & PQOS_PERF_EVENT_IPC)
+                        fprintf(fp, ",%.2f", 0.0);
+                else
+                        fputs(",", fp);
+        }
+
+        for (i = 0; i < DIM(delta_col); i++) {
+                idx = file->col_idx[delta_col[i]];
+                if (idx < 0)
+                        continue;
+                if (event & column_event[delta_col[i]])
+                        fprintf(fp, ",%" PRIu64, cur[idx] - prev[idx]);
+                else
+                        fputs(",", fp);
+        }
+
+        idx = file->col_idx[MONITOR_BIN_COL_LLC];
+        if (idx >= 0) {
+                if (event & PQOS_MON_EVENT_L3_OCCUP)
+                        fprintf(fp, ",%.1f", (double)cur[idx] / 1024.0);
+                else
+                        fputs(",", fp);
+        }
+
+        for (i = 0; i < DIM(bw_col); i++) {
+                idx = file->col_idx[bw_col[i]];
+                if (idx < 0)
+                        continue;
+                if ((event & column_event[bw_col[i]]) && elapsed > 0.0)
+                        fprintf(fp, ",%.1f",
+                                (double)(cur[idx] - prev[idx]) /
+                                    (1024.0 * 1024.0) / elapsed);
+                else
+                        fputs(",", fp);
+        }
+
+        fputs("\n", fp);
+}
+
+/**
+ * @brief Formats sample time
+ *
+ * @param time_ns time in nanoseconds since the epoch
+ * @param buf output buffer
+ * @param size size of \a buf
+ */
+static void
+bin_format_time(const uint64_t time_ns, char *buf, const size_t size)
+{
+        const time_t sec = (time_t)(time_ns / 1000000000ull);
+        struct tm tm;
+        size_t len;
+
+        if (localtime_r(&sec, &tm) == NULL) {
+                snprintf(buf, size, "error");
+                return;
+        }
+
+        len = strftime(buf, size, "%Y-%m-%d %H:%M:%S", &tm);
+        snprintf(buf + len, size - len, ".%06u",
+                 (unsigned)(time_ns % 1000000000ull / 1000));
+}
+
+/**
+ * @brief Reads and decodes single block
+ *
+ * @param fp file descriptor
+ * @param raw decoded payload, to be freed by the caller
+ * @param raw_size size of decoded payload
+ * @param num_samples number of samples in the block
+ *
+ * @return Operation status
+ * @retval 0 on success
+ * @retval 1 end of file
+ * @retval -1 on error
+ */
+static int
+bin_read_block(FILE *fp, uint8_t **raw, size_t *raw_size, unsigned *num_samples)
+{
+        uint64_t encoding, samples, rsize, size;
+        uint8_t *payload;
+
+        *raw = NULL;
+        if (bin_read_int(fp, &encoding, 4) != 0)
+                return feof(fp) ? 1 : -1;
+        if (bin_read_int(fp, &samples, 4) != 0 ||
+            bin_read_int(fp, &rsize, 4) != 0 ||
+            bin_read_int(fp, &size, 4) != 0 || rsize > MONITOR_BIN_BLOCK_MAX ||
+            size > MONITOR_BIN_BLOCK_MAX || size == 0)
+                return -1;
+
+        payload = malloc(size);
+        if (payload == NULL)
+                return -1;
+        if (fread(payload, size, 1, fp) != 1) {
+                free(payload);
+                return -1;
+        }
+
+        if (encoding == MONITOR_BIN_ENC_RAW && rsize == size) {
+                *raw = payload;
+#ifdef PQOS_ZLIB
+        } else if (encoding == MONITOR_BIN_ENC_ZLIB) {
+                uLongf len = rsize;
+
+                *raw = malloc(rsize);
+                if (*raw == NULL ||
+                    uncompress(*raw, &len, payload, size) != Z_OK ||
+                    len != rsize) {
+                        free(*raw);
+                        free(payload);
+                        *raw = NULL;
+                        return -1;
+                }
+                free(payload);
+#endif
+        } else {
+                if (encoding == MONITOR_BIN_ENC_ZLIB)
+                        printf("Compressed blocks are not supported!\n");
+                free(payload);
+                return -1;
+        }
+
+        *raw_size = (size_t)rsize;
+        *num_samples = (unsigned)samples;
+        return 0;
+}
+
+int
+monitor_bin_decode(const char *file_name, FILE *fp)
+{
+        struct bin_file file;
+        FILE *in;
+        uint64_t *cur = NULL;
+        uint64_t *prev = NULL;
+        uint64_t prev_time = 0;
+        unsigned num_values;
+        int have_prev = 0;
+        int ret = -1;
+
+        ASSERT(file_name != NULL);
+        ASSERT(fp != NULL);
+
+        in = safe_fopen(file_name, "rb");
+        if (in == NULL) {
+                printf("Error opening '%s' file!\n", file_name);
+                return -1;
+        }
+
+        if (bin_read_header(in, &file) != 0)
+                goto monitor_bin_decode_exit;
+
+        num_values = 1 + file.num_groups * file.num_columns;
+        cur = calloc(num_values, sizeof(cur[0]));
+        prev = calloc(num_values, sizeof(prev[0]));
+        if (cur == NULL || prev == NULL) {
+                printf("Error with memory allocation\n");
+                goto monitor_bin_decode_exit;
+        }
+
+        bin_print_csv_header(fp, &file);
+
+        for (;;) {
+                uint8_t *raw;
+                size_t raw_size, pos = 0;
+                unsigned num_samples, s;
+                int res;
+
+                res = bin_read_block(in, &raw, &raw_size, &num_samples);
+                if (res == 1)
+                        break;
+                if (res != 0) {
+                        printf("Invalid or truncated data block!\n");
+                        goto monitor_bin_decode_exit;
+                }
+
+                /* block values are deltas against 0 */
+                memset(cur, 0, num_values * sizeof(cur[0]));
+                for (s = 0; s < num_samples; s++) {
+                        char timestamp[64];
+                        unsigned i;
+
+                        for (i = 0; i < num_values; i++) {
+                                int64_t delta;
+
+                                if (bin_get_varint(raw, raw_size, &pos,
+                                                   &delta) != 0)
+                                        break;
+                                cur[i] += (uint64_t)delta;
+                        }
+                        if (i < num_values) {
+                                printf("Invalid or truncated data block!\n");
+                                free(raw);
+                                goto monitor_bin_decode_exit;
+                        }
+
+                        /* rates need a previous sample */
+                        if (have_prev) {
+                                const double elapsed =
+                                    (double)(cur[0] - prev_time) / 1e9;
+
+                                bin_format_time(cur[0], timestamp,
+                                                sizeof(timestamp));
+                                for (i = 0; i < file.num_groups; i++)
+                                        bin_print_csv_row(
+                                            fp, &file, timestamp, i,
+                                            &cur[1 + i * file.num_columns],
+                                            &prev[1 + i * file.num_columns],
+                                            elapsed);
+                        }
+                        prev_time = cur[0];
+                        memcpy(prev, cur, num_values * sizeof(prev[0]));
+                        have_prev = 1;
+                }
+                free(raw);
+        }
+        ret = 0;
+
+monitor_bin_decode_exit:
+        free(cur);
+        free(prev);
+        bin_file_free(&file);
+        fclose(in);
+        return ret;
+}
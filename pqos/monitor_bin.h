@@ -0,0 +1,119 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+#ifndef __MONITOR_BIN_H__
+#define __MONITOR_BIN_H__
+
+#include "pqos.h"
+
+#include <stdio.h>
+
+/**
+ * @brief Start binary output
+ *
+ * @param fp file descriptor
+ * @param num_mem_regions number of memory regions
+ * @param region_num list of memory regions
+ */
+void monitor_bin_begin(FILE *fp,
+                       const int num_mem_regions,
+                       const int *region_num);
+
+/**
+ * @brief Start compressed binary output
+ *
+ * @param fp file descriptor
+ * @param num_mem_regions number of memory regions
+ * @param region_num list of memory regions
+ */
+void monitor_binz_begin(FILE *fp,
+                        const int num_mem_regions,
+                        const int *region_num);
+
+/**
+ * @brief Start binary sample
+ *
+ * @param fp file descriptor
+ * @param [in] timestamp data timestamp
+ * @param num_mem_regions number of memory regions
+ * @param region_num list of memory regions
+ */
+void monitor_bin_header(FILE *fp,
+                        const char *timestamp,
+                        const int num_mem_regions,
+                        const int *region_num);
+
+/**
+ * @brief Store monitoring data in binary sample
+ *
+ * @param fp file descriptor
+ * @param [in] timestamp data timestamp
+ * @param [in] data monitoring data
+ */
+void monitor_bin_row(FILE *fp,
+                     const char *timestamp,
+                     const struct pqos_mon_data *data);
+
+/**
+ * @brief Finish binary sample
+ *
+ * @param fp file descriptor
+ */
+void monitor_bin_footer(FILE *fp);
+
+/**
+ * @brief Finalize binary output
+ *
+ * @param fp file descriptor
+ */
+void monitor_bin_end(FILE *fp);
+
+/**
+ * @brief Check if compressed binary output is supported
+ *
+ * @return 1 if supported, 0 otherwise
+ */
+int monitor_bin_compress_supported(void);
+
+/**
+ * @brief Converts binary monitoring file into CSV
+ *
+ * @param [in] file binary monitoring file
+ * @param fp CSV output file descriptor
+ *
+ * @return Operation status
+ * @retval 0 on success
+ */
+int monitor_bin_decode(const char *file, FILE *fp);
+
+#endif /* __MONITOR_BIN_H__ */
@@ -0,0 +1,364 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+/**
+ * Top like ranking of monitoring groups
+ */
+
+#include "monitor_top.h"
+
+#include "common.h"
+
+#include <stdlib.h>
+#include <string.h>
+#include <strings.h>
+
+/**
+ * Metrics available for ranking
+ */
+enum monitor_top_metric {
+        MONITOR_TOP_LLC = 0,
+        MONITOR_TOP_MBL,
+        MONITOR_TOP_MBR,
+        MONITOR_TOP_MBT,
+        MONITOR_TOP_MISSES,
+        MONITOR_TOP_REFERENCES,
+        MONITOR_TOP_IPC,
+};
+
+static const struct {
+        const char *name;
+        enum monitor_top_metric metric;
+} top_metric_names[] = {
+    {"llc", MONITOR_TOP_LLC},       {"mbl", MONITOR_TOP_MBL},
+    {"mbr", MONITOR_TOP_MBR},       {"mbt", MONITOR_TOP_MBT},
+    {"misses", MONITOR_TOP_MISSES}, {"references", MONITOR_TOP_REFERENCES},
+    {"ipc", MONITOR_TOP_IPC},
+};
+
+/**
+ * Sort keys, most significant first. LLC occupancy by default.
+ */
+static enum monitor_top_metric sel_top_sort[MONITOR_TOP_MAX_KEYS] = {
+    MONITOR_TOP_LLC};
+static unsigned sel_top_sort_num = 1;
+
+int
+monitor_top_set_sort(const char *str)
+{
+        enum monitor_top_metric sort[MONITOR_TOP_MAX_KEYS];
+        unsigned num = 0;
+
+        if (str == NULL || *str == '\0')
+                return -1;
+
+        while (*str != '\0') {
+                const char *end = strchr(str, ',');
+                size_t len = end != NULL ? (size_t)(end - str) : strlen(str);
+                unsigned i;
+
+                if (num >= MONITOR_TOP_MAX_KEYS)
+                        return -1;
+
+                for (i = 0; i < DIM(top_metric_names); i++)
+                        if (strlen(top_metric_names[i].name) == len &&
+                            strncasecmp(top_metric_names[i].name, str, len) ==
+                                0)
+                                break;
+                if (i == DIM(top_metric_names))
+                        return -1;
+
+                sort[num++] = top_metric_names[i].metric;
+
+                if (end == NULL)
+                        break;
+                str = end + 1;
+                if (*str == '\0')
+                        return -1;
+        }
+
+        memcpy(sel_top_sort, sort, sizeof(sort[0]) * num);
+        sel_top_sort_num = num;
+
+        return 0;
+}
+
+/**
+ * @brief Compares two values
+ *
+ * @param a value A
+ * @param b value B
+ *
+ * @return value compare status
+ * @retval 0 if \a a = \a b
+ * @retval 1 if \a a > \a b
+ * @retval -1 if \a a < \a b
+ */
+#define TOP_CMP(a, b) (((a) > (b)) - ((a) < (b)))
+
+/**
+ * @brief Compares rank of two monitoring groups using selected sort keys
+ *
+ * Counter deltas are compared for bandwidth and cache events.
+ *
+ * @param a monitoring group A
+ * @param b monitoring group B
+ *
+ * @return rank compare status
+ * @retval 0 if \a a and \a b rank equal
+ * @retval >0 if \a a ranks higher than \a b
+ * @retval <0 if \a a ranks lower than \a b
+ */
+static int
+top_cmp(const struct pqos_mon_data *a, const struct pqos_mon_data *b)
+{
+        const struct pqos_event_values *av = &a->values;
+        const struct pqos_event_values *bv = &b->values;
+        unsigned i;
+
+        for (i = 0; i < sel_top_sort_num; i++) {
+                int ret = 0;
+
+                switch (sel_top_sort[i]) {
+                case MONITOR_TOP_LLC:
+                        ret = TOP_CMP(av->llc, bv->llc);
+                        break;
+                case MONITOR_TOP_MBL:
+                        ret = TOP_CMP(av->mbm_local_delta,
+                                      bv->mbm_local_delta);
+                        break;
+                case MONITOR_TOP_MBR:
+                        ret = TOP_CMP(av->mbm_remote_delta,
+                                      bv->mbm_remote_delta);
+                        break;
+                case MONITOR_TOP_MBT:
+                        ret = TOP_CMP(av->mbm_total_delta,
+                                      bv->mbm_total_delta);
+                        break;
+                case MONITOR_TOP_MISSES:
+                        ret = TOP_CMP(av->llc_misses_delta,
+                                      bv->llc_misses_delta);
+                        break;
+                case MONITOR_TOP_REFERENCES:
+                        ret = TOP_CMP(av->llc_references_delta,
+                                      bv->llc_references_delta);
+                        break;
+                case MONITOR_TOP_IPC:
+                        ret = TOP_CMP(av->ipc, bv->ipc);
+                        break;
+                }
+
+                if (ret != 0)
+                        return ret;
+        }
+
+        return 0;
+}
+
+/**
+ * @brief Compares rank of two monitoring groups for qsort
+ *
+ * @param a pointer to monitoring group A
+ * @param b pointer to monitoring group B
+ *
+ * @return rank compare status for descending order
+ * @retval 0 if \a a and \a b rank equal
+ * @retval >0 if \a b ranks higher than \a a
+ * @retval <0 if \a b ranks lower than \a a
+ */
+static int
+top_qsort_cmp_desc(const void *a, const void *b)
+{
+        const struct pqos_mon_data *const *app =
+            (const struct pqos_mon_data *const *)a;
+        const struct pqos_mon_data *const *bpp =
+            (const struct pqos_mon_data *const *)b;
+
+        return top_cmp(*bpp, *app);
+}
+
+/**
+ * @brief Restores heap property of a min heap from a given node down
+ *
+ * The lowest ranked group is kept at the root.
+ *
+ * @param [in,out] heap heap array
+ * @param num number of heap elements
+ * @param node index of node to sift down
+ */
+static void
+top_heap_sift_down(struct pqos_mon_data **heap, const unsigned num,
+                   unsigned node)
+{
+        struct pqos_mon_data *data = heap[node];
+
+        for (;;) {
+                unsigned child = 2 * node + 1;
+
+                if (child >= num)
+                        break;
+                if (child + 1 < num &&
+                    top_cmp(heap[child + 1], heap[child]) < 0)
+                        child++;
+                if (top_cmp(heap[child], data) >= 0)
+                        break;
+                heap[node] = heap[child];
+                node = child;
+        }
+        heap[node] = data;
+}
+
+/**
+ * @brief Selects and sorts top k groups using a heap
+ *
+ * @param [in,out] mon_data array of monitoring groups
+ * @param num number of groups
+ * @param k number of groups to rank
+ */
+static void
+top_rank_heap(struct pqos_mon_data **mon_data, const unsigned num,
+              const unsigned k)
+{
+        unsigned i;
+
+        for (i = k / 2; i > 0; i--)
+                top_heap_sift_down(mon_data, k, i - 1);
+
+        for (i = k; i < num; i++) {
+                struct pqos_mon_data *data = mon_data[i];
+
+                if (top_cmp(data, mon_data[0]) <= 0)
+                        continue;
+                mon_data[i] = mon_data[0];
+                mon_data[0] = data;
+                top_heap_sift_down(mon_data, k, 0);
+        }
+
+        /* heap sort, lowest ranked group is moved to the end first */
+        for (i = k; i > 1; i--) {
+                struct pqos_mon_data *data = mon_data[0];
+
+                mon_data[0] = mon_data[i - 1];
+                mon_data[i - 1] = data;
+                top_heap_sift_down(mon_data, i - 1, 0);
+        }
+}
+
+/**
+ * @brief Finds position of a group in top k groups sorted descending
+ *
+ * @param [in] mon_data sorted array of monitoring groups
+ * @param k number of sorted groups
+ * @param [in] data monitoring group
+ *
+ * @return index of the first group ranked lower than \a data
+ */
+static unsigned
+top_sorted_position(struct pqos_mon_data *const *mon_data, const unsigned k,
+                    const struct pqos_mon_data *data)
+{
+        unsigned lo = 0;
+        unsigned hi = k;
+
+        while (lo < hi) {
+                const unsigned mid = lo + (hi - lo) / 2;
+
+                if (top_cmp(mon_data[mid], data) >= 0)
+                        lo = mid + 1;
+                else
+                        hi = mid;
+        }
+
+        return lo;
+}
+
+/**
+ * @brief Updates top k groups starting from the previous ranking
+ *
+ * @param [in,out] mon_data array of monitoring groups
+ * @param num number of groups
+ * @param k number of groups to rank
+ */
+static void
+top_rank_incremental(struct pqos_mon_data **mon_data, const unsigned num,
+                     const unsigned k)
+{
+        unsigned i;
+
+        /* insertion sort, previous top k is expected to be nearly sorted */
+        for (i = 1; i < k; i++) {
+                struct pqos_mon_data *data = mon_data[i];
+                unsigned j = i;
+
+                while (j > 0 && top_cmp(mon_data[j - 1], data) < 0) {
+                        mon_data[j] = mon_data[j - 1];
+                        j--;
+                }
+                mon_data[j] = data;
+        }
+
+        for (i = k; i < num; i++) {
+                struct pqos_mon_data *data = mon_data[i];
+                unsigned pos;
+
+                if (top_cmp(data, mon_data[k - 1]) <= 0)
+                        continue;
+
+                pos = top_sorted_position(mon_data, k - 1, data);
+                mon_data[i] = mon_data[k - 1];
+                memmove(&mon_data[pos + 1], &mon_data[pos],
+                        sizeof(mon_data[0]) * (k - 1 - pos));
+                mon_data[pos] = data;
+        }
+}
+
+void
+monitor_top_rank(struct pqos_mon_data **mon_data,
+                 const unsigned num,
+                 const unsigned k,
+                 const int incremental)
+{
+        if (mon_data == NULL || num == 0 || k == 0)
+                return;
+
+        /* nothing to select from, sort all groups */
+        if (k >= num) {
+                qsort(mon_data, num, sizeof(mon_data[0]), top_qsort_cmp_desc);
+                return;
+        }
+
+        if (incremental)
+                top_rank_incremental(mon_data, num, k);
+        else
+                top_rank_heap(mon_data, num, k);
+}
@@ -0,0 +1,77 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+#ifndef __MONITOR_TOP_H__
+#define __MONITOR_TOP_H__
+
+#include "pqos.h"
+
+/**
+ * Maximum number of sort keys
+ */
+#define MONITOR_TOP_MAX_KEYS 8
+
+/**
+ * @brief Selects metrics used to rank monitoring groups in top like mode
+ *
+ * @param [in] str comma separated list of metrics, most significant first
+ *
+ * @return Operation status
+ * @retval 0 on success
+ * @retval -1 on invalid metric list
+ */
+int monitor_top_set_sort(const char *str);
+
+/**
+ * @brief Ranks monitoring groups in top like mode
+ *
+ * Moves \a k highest ranked groups to the front of \a mon_data in
+ * descending order. Remaining groups are left in unspecified order.
+ * Only the top \a k groups are ordered, using a heap of size \a k.
+ *
+ * With \a incremental set, \a mon_data is expected to hold the ranking
+ * of the previous sample. Previous top \a k groups are re-sorted with
+ * insertion sort and only groups overtaking them are inserted, which is
+ * cheap while ranking is stable between samples.
+ *
+ * @param [in,out] mon_data array of monitoring groups
+ * @param num number of groups in \a mon_data
+ * @param k number of groups to rank
+ * @param incremental reuse order of \a mon_data from the previous sample
+ */
+void monitor_top_rank(struct pqos_mon_data **mon_data,
+                      const unsigned num,
+                      const unsigned k,
+                      const int incremental);
+
+#endif /* __MONITOR_TOP_H__ */
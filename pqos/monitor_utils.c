@@ -101,52 +101,102 @@ bytes_to_mb(const double bytes)
         return bytes / (1024.0 * 1024.0);
 }
 
+/**
+ * @brief Converts LLC occupancy into selected LLC format
+ *
+ * @param bytes LLC occupancy in bytes
+ * @param [out] value LLC occupancy in selected format
+ *
+ * @return Operation status
+ * @retval PQOS_RETVAL_OK on success
+ */
+static int
+get_llc_value(const uint64_t bytes, double *value)
+{
+        enum monitor_llc_format format = monitor_get_llc_format();
+        unsigned cache_total;
+        int ret;
+
+        switch (format) {
+        case LLC_FORMAT_KILOBYTES:
+                *value = bytes_to_kb(bytes);
+                return PQOS_RETVAL_OK;
+        case LLC_FORMAT_PERCENT:
+                ret = monitor_utils_get_cache_size(&cache_total);
+                if (ret == PQOS_RETVAL_OK)
+                        *value = bytes * 100 / cache_total;
+                return ret;
+        default:
+                printf("Incorrect llc_format: %i\n", format);
+                return PQOS_RETVAL_PARAM;
+        }
+}
+
+/**
+ * @brief Retrieves counter delta of LLC event
+ *
+ * @param [in] group monitoring group
+ * @param [in] sample group data read along with the group values
+ * @param event LLC misses or references event
+ *
+ * @return counter delta
+ */
+static uint64_t
+get_llc_delta(const struct pqos_mon_data *const group,
+              const struct monitor_sample *sample,
+              const enum pqos_mon_event event)
+{
+        switch (event) {
+        case PQOS_PERF_EVENT_LLC_MISS:
+                return group->values.llc_misses_delta;
+        case PQOS_PERF_EVENT_LLC_REF:
+                return group->values.llc_references_delta;
+        case PQOS_PERF_EVENT_LLC_MISS_PCIE_READ:
+                return sample->llc_misses_pcie_read;
+        case PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE:
+                return sample->llc_misses_pcie_write;
+        case PQOS_PERF_EVENT_LLC_REF_PCIE_READ:
+                return sample->llc_references_pcie_read;
+        case PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE:
+                return sample->llc_references_pcie_write;
+        default:
+                return 0;
+        }
+}
+
 double
 monitor_utils_get_value(const struct pqos_mon_data *const group,
                         const enum pqos_mon_event event)
 {
-        int ret;
-        uint64_t delta;
+        struct monitor_sample sample;
+        int ret = PQOS_RETVAL_OK;
         double value;
-
-        /** Coefficient to display the data as MB/s */
-        const double coeff = 10.0 / (double)monitor_get_interval();
+        double coeff;
 
         if ((group->event & event) == 0)
                 return 0.0;
 
+        /**
+         * Values are read from the group and its sample directly, output
+         * of sampled groups must not contend for the library lock
+         */
+        monitor_get_sample(group, &sample);
+
+        /** Coefficient to display the data as MB/s */
+        coeff = 1000000000.0 / (double)sample.elapsed;
+
         switch (event) {
         case PQOS_MON_EVENT_L3_OCCUP:
-                ret = pqos_mon_get_value(group, event, &delta, NULL);
-                if (ret == PQOS_RETVAL_OK) {
-                        enum monitor_llc_format format =
-                            monitor_get_llc_format();
-                        unsigned cache_total;
-
-                        ret = monitor_utils_get_cache_size(&cache_total);
-                        if (ret != PQOS_RETVAL_OK)
-                                break;
-
-                        switch (format) {
-                        case LLC_FORMAT_KILOBYTES:
-                                value = bytes_to_kb(delta);
-                                break;
-                        case LLC_FORMAT_PERCENT:
-                                value = delta * 100 / cache_total;
-                                break;
-                        default:
-                                printf("Incorrect llc_format: %i\n", format);
-                                ret = PQOS_RETVAL_PARAM;
-                        }
-                }
+                ret = get_llc_value(group->values.llc, &value);
                 break;
         case PQOS_MON_EVENT_LMEM_BW:
+                value = bytes_to_mb(group->values.mbm_local_delta) * coeff;
+                break;
         case PQOS_MON_EVENT_TMEM_BW:
+                value = bytes_to_mb(group->values.mbm_total_delta) * coeff;
+                break;
         case PQOS_MON_EVENT_RMEM_BW:
-                ret = pqos_mon_get_value(group, event, NULL, &delta);
-                if (ret == PQOS_RETVAL_OK)
-                        value = bytes_to_mb(delta) * coeff;
-
+                value = bytes_to_mb(group->values.mbm_remote_delta) * coeff;
                 break;
         case PQOS_PERF_EVENT_LLC_MISS:
         case PQOS_PERF_EVENT_LLC_REF:
@@ -154,11 +204,10 @@ monitor_utils_get_value(const struct pqos_mon_data *const group,
         case PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE:
         case PQOS_PERF_EVENT_LLC_REF_PCIE_READ:
         case PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE:
-                ret = pqos_mon_get_value(group, event, NULL, &delta);
-                value = (double)delta;
+                value = (double)get_llc_delta(group, &sample, event);
                 break;
         case PQOS_PERF_EVENT_IPC:
-                ret = pqos_mon_get_ipc(group, &value);
+                value = group->values.ipc;
                 break;
         default:
                 ret = PQOS_RETVAL_PARAM;
@@ -175,50 +224,37 @@ monitor_utils_get_region_value(const struct pqos_mon_data *const group,
                                const enum pqos_mon_event event,
                                int region_num)
 {
-        int ret;
-        uint64_t delta;
+        const struct pqos_region_aware_event_values *region =
+            &group->region_values;
+        struct monitor_sample sample;
+        int ret = PQOS_RETVAL_OK;
         double value;
-
-        /** Coefficient to display the data as MB/s */
-        const double coeff = 10.0 / (double)monitor_get_interval();
+        double coeff;
 
         if ((group->event & event) == 0)
                 return 0.0;
 
+        monitor_get_sample(group, &sample);
+
+        /** Coefficient to display the data as MB/s */
+        coeff = 1000000000.0 / (double)sample.elapsed;
+
         switch (event) {
         case PQOS_MON_EVENT_L3_OCCUP:
+                ret = get_llc_value(group->values.llc, &value);
+                break;
         case PQOS_MON_EVENT_IO_L3_OCCUP:
-                ret = pqos_mon_get_region_value(group, event, region_num,
-                                                &delta, NULL);
-                if (ret == PQOS_RETVAL_OK) {
-                        enum monitor_llc_format format =
-                            monitor_get_llc_format();
-                        unsigned cache_total;
-
-                        ret = monitor_utils_get_cache_size(&cache_total);
-                        if (ret != PQOS_RETVAL_OK)
-                                break;
-
-                        switch (format) {
-                        case LLC_FORMAT_KILOBYTES:
-                                value = bytes_to_kb(delta);
-                                break;
-                        case LLC_FORMAT_PERCENT:
-                                value = delta * 100 / cache_total;
-                                break;
-                        default:
-                                printf("Incorrect llc_format: %i\n", format);
-                                ret = PQOS_RETVAL_PARAM;
-                        }
-                }
+                ret = get_llc_value(region->io_llc, &value);
                 break;
         case PQOS_MON_EVENT_TMEM_BW:
+                value = bytes_to_mb(region->mbm_total_delta[region_num]) *
+                        coeff;
+                break;
         case PQOS_MON_EVENT_IO_TOTAL_MEM_BW:
+                value = bytes_to_mb(region->io_total_delta) * coeff;
+                break;
         case PQOS_MON_EVENT_IO_MISS_MEM_BW:
-                ret = pqos_mon_get_region_value(group, event, region_num, NULL,
-                                                &delta);
-                if (ret == PQOS_RETVAL_OK)
-                        value = bytes_to_mb(delta) * coeff;
+                value = bytes_to_mb(region->io_miss_delta) * coeff;
                 break;
         case PQOS_PERF_EVENT_LLC_MISS:
         case PQOS_PERF_EVENT_LLC_REF:
@@ -226,12 +262,10 @@ monitor_utils_get_region_value(const struct pqos_mon_data *const group,
         case PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE:
         case PQOS_PERF_EVENT_LLC_REF_PCIE_READ:
         case PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE:
-                ret = pqos_mon_get_value(group, event, NULL, &delta);
-                if (ret == PQOS_RETVAL_OK)
-                        value = (double)delta;
+                value = (double)get_llc_delta(group, &sample, event);
                 break;
         case PQOS_PERF_EVENT_IPC:
-                ret = pqos_mon_get_ipc(group, &value);
+                value = group->values.ipc;
                 break;
         default:
                 ret = PQOS_RETVAL_PARAM;
@@ -246,22 +280,28 @@ monitor_utils_get_region_value(const struct pqos_mon_data *const group,
 int
 monitor_utils_get_cache_size(unsigned *p_cache_size)
 {
+        static unsigned cache_size = 0;
         const struct pqos_cpuinfo *p_cpu = NULL;
         int ret;
 
         if (p_cache_size == NULL)
                 return PQOS_RETVAL_PARAM;
 
-        ret = pqos_cap_get(NULL, &p_cpu);
-        if (ret != PQOS_RETVAL_OK) {
-                printf("Error retrieving PQoS capabilities!\n");
-                return ret;
-        }
+        /* cache size does not change, avoid taking library lock per row */
+        if (cache_size == 0) {
+                ret = pqos_cap_get(NULL, &p_cpu);
+                if (ret != PQOS_RETVAL_OK) {
+                        printf("Error retrieving PQoS capabilities!\n");
+                        return ret;
+                }
+
+                if (p_cpu == NULL)
+                        return PQOS_RETVAL_ERROR;
 
-        if (p_cpu == NULL)
-                return PQOS_RETVAL_ERROR;
+                cache_size = p_cpu->l3.total_size;
+        }
 
-        *p_cache_size = p_cpu->l3.total_size;
+        *p_cache_size = cache_size;
 
         return PQOS_RETVAL_OK;
 }
@@ -30,10 +30,16 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ################################################################################
 
+import json
+import os
+import tempfile
 import pytest
+from _pytest.reports import TestReport
+from _pytest.runner import runtestprotocol
 from testlib.env import Env
 from testlib.features_rdt_msr import FeaturesRdtMsr
 from testlib.features_rdt_os import FeaturesRdtOs
+from testlib.fake_resctrl import FakeResctrl
 
 
 def pytest_addoption(parser):
@@ -43,6 +49,15 @@ def pytest_addoption(parser):
                      help="OS interface")
     parser.addoption("--env", action="store", dest="env", required=True,
                      help="Path to environment file")
+    parser.addoption("--no-features-cache", action="store_true", dest="no_features_cache",
+                     help="Probe OS features without using the on-disk cache")
+    parser.addoption("--fake-resctrl", action="store", dest="fake_resctrl", default=None,
+                     help="Generate fake resctrl/sysfs tree in given directory and use it "
+                          "instead of the real one")
+    parser.addoption("--fake-resctrl-perf", action="store_true", dest="fake_resctrl_perf",
+                     help="Generate perf monitoring events in the fake resctrl/sysfs tree")
+    parser.addoption("--rdt-workers", action="store", type=int, default=1, dest="rdt_workers",
+                     help="Number of tests with non-conflicting resources run concurrently")
 
 
 def pytest_configure(config):
@@ -54,6 +69,12 @@ def pytest_configure(config):
     if env_path:
         Env().load(env_path)
 
+    fake_dir = config.getoption("--fake-resctrl")
+    if fake_dir:
+        fake = FakeResctrl(fake_dir, perf=config.getoption("--fake-resctrl-perf"))
+        fake.activate()
+        fake.start_counters()
+
     if not config.iface_os and not config.iface_msr:
         config.iface_msr = True
         config.iface_os = True
@@ -65,10 +86,17 @@ def pytest_configure(config):
         config.features['MSR'] = msr_features.get_features()
 
     if config.iface_os:
-        os_features = FeaturesRdtOs()
+        os_features = FeaturesRdtOs(use_cache=not config.getoption("--no-features-cache"))
         config.features['OS'] = os_features.get_features()
 
 
+def pytest_unconfigure(config):
+    # pylint: disable=unused-argument
+    fake = FakeResctrl.active()
+    if fake:
+        fake.deactivate()
+
+
 def pytest_generate_tests(metafunc):
     ## get required interface for test case
     def get_req_iface():
@@ -99,34 +127,241 @@ def pytest_generate_tests(metafunc):
         metafunc.parametrize("iface", iface)
 
 
-def pytest_pyfunc_call(pyfuncitem):
+def get_unmet_requirement(item):
+    """
+    Checks test feature requirements against features of tested interface
+
+    Parameters:
+        item: test item
+    Returns:
+        reason why requirements are not met or None
+    """
     iface = "MSR"
     reqs_supported = []
     reqs_unsupported = []
 
     # get selected interface
-    if "iface" in pyfuncitem.funcargs:
-        iface = pyfuncitem.funcargs["iface"]
+    callspec = getattr(item, "callspec", None)
+    if callspec:
+        iface = callspec.params.get("iface", iface)
 
     # get features for selected interface
-    features = pyfuncitem.config.features.get(iface, [])
+    features = item.config.features.get(iface, [])
 
     # get test requirements
     # supported features
-    for req in pyfuncitem.iter_markers("rdt_supported"):
+    for req in item.iter_markers("rdt_supported"):
         reqs_supported += list(req.args)
 
     # unsupported features
-    for req in pyfuncitem.iter_markers("rdt_unsupported"):
+    for req in item.iter_markers("rdt_unsupported"):
         reqs_unsupported += list(req.args)
 
-    # skip tests based on required features
-    # skip if feature requested but not supported
+    # feature requested but not supported
     for req in reqs_supported:
         if req not in features:
-            pytest.skip(f"{req} requirement not met")
+            return f"{req} requirement not met"
 
-    # skip if feature requested to be unsupported but it is supported
+    # feature requested to be unsupported but it is supported
     for req in reqs_unsupported:
         if req in features:
-            pytest.skip(f"{req} requirement met")
+            return f"{req} requirement met"
+
+    return None
+
+
+def pytest_collection_modifyitems(config, items):
+    # deselect tests before any fixture (platform reset) is executed
+    selected = []
+    deselected = []
+
+    for item in items:
+        reason = get_unmet_requirement(item)
+        if reason:
+            item.rdt_deselect_reason = reason
+            deselected.append(item)
+        else:
+            selected.append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+class RdtResources:
+    """
+    Platform resources used by test, declared with rdt_resources marker
+
+    Tests without declaration are treated as barriers and run exclusively.
+    """
+
+    def __init__(self, item):
+        marker = item.get_closest_marker("rdt_resources")
+        kwargs = marker.kwargs if marker else {}
+
+        self.barrier = marker is None or kwargs.get("barrier", False)
+        self.cores = set(kwargs.get("cores", []))
+        self.cos = set(kwargs.get("cos", []))
+        self.mount = kwargs.get("mount", "default")
+        self.iface = "MSR"
+
+        callspec = getattr(item, "callspec", None)
+        if callspec:
+            self.iface = callspec.params.get("iface", "MSR")
+
+    def mode(self):
+        """Interface and resctrl mount mode the test expects"""
+        if self.iface == "OS":
+            return self.iface, self.mount
+        return self.iface, None
+
+    def conflicts(self, other):
+        if self.barrier or other.barrier:
+            return True
+
+        if self.mode() != other.mode():
+            return True
+
+        return bool(self.cores & other.cores or self.cos & other.cos)
+
+
+class RdtScheduler:
+    """
+    Runs tests with non-conflicting resources concurrently in forked workers
+
+    Test which uses resources touched since the last platform reset, or a
+    barrier test, is started alone and performs full reset in Test.init.
+    Remaining tests are marked with rdt_shared and skip the reset.
+
+    Fingerprint of the platform state after reset (see Test.init) is passed
+    back from workers with the reports and handed to tests started later,
+    as rdt_default_state, so they can skip a reset too.
+    """
+
+    def __init__(self, session, workers):
+        self.session = session
+        self.workers = workers
+        self.running = {}
+
+        # platform state is unknown before the first reset and after barrier
+        self.mode = None
+        self.dirty_cores = set()
+        self.dirty_cos = set()
+        self.default_state = None
+
+    def _needs_reset(self, res):
+        if res.barrier or self.mode is None or res.mode() != self.mode:
+            return True
+
+        return bool(res.cores & self.dirty_cores or res.cos & self.dirty_cos)
+
+    def _can_start(self, res):
+        if len(self.running) >= self.workers:
+            return False
+
+        if self._needs_reset(res):
+            return not self.running
+
+        return all(not res.conflicts(other) for _, other, _ in self.running.values())
+
+    def _run_child(self, item, path):
+        status = 0
+        try:
+            config = self.session.config
+            reports = runtestprotocol(item, log=False, nextitem=None)
+            data = [config.hook.pytest_report_to_serializable(config=config, report=report)
+                    for report in reports]
+            result = {"reports": data,
+                      "default_state": getattr(item, "rdt_default_state", None)}
+            # pylint: disable=unspecified-encoding
+            with open(path, 'w') as fd:
+                json.dump(result, fd)
+        # pylint: disable=broad-exception-caught
+        except BaseException:
+            status = 1
+        finally:
+            # pylint: disable=protected-access
+            os._exit(status)
+
+    def _start(self, item, res):
+        reset = self._needs_reset(res)
+        if reset:
+            self.dirty_cores.clear()
+            self.dirty_cos.clear()
+
+        item.rdt_shared = not reset
+        item.rdt_default_state = self.default_state
+        self.mode = None if res.barrier else res.mode()
+        self.dirty_cores |= res.cores
+        self.dirty_cos |= res.cos
+
+        fd, path = tempfile.mkstemp(prefix="rdt-report-", suffix=".json")
+        os.close(fd)
+
+        pid = os.fork()
+        if pid == 0:
+            self._run_child(item, path)
+
+        self.running[pid] = (item, res, path)
+
+    def _load_reports(self, item, path, status):
+        config = self.session.config
+        try:
+            # pylint: disable=unspecified-encoding
+            with open(path, 'r') as fd:
+                result = json.load(fd)
+            if result.get("default_state") is not None:
+                self.default_state = result["default_state"]
+            return [config.hook.pytest_report_from_serializable(config=config, data=report)
+                    for report in result["reports"]]
+        except (OSError, ValueError, KeyError, AttributeError):
+            keywords = {keyword: 1 for keyword in item.keywords}
+            return [TestReport(item.nodeid, item.location, keywords, "failed",
+                               f"worker exited with status {status}", "call")]
+        finally:
+            os.unlink(path)
+
+    def _finish(self, pid, status):
+        item, _, path = self.running.pop(pid)
+        reports = self._load_reports(item, path, status)
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    def _wait(self):
+        while True:
+            pid, status = os.wait()
+            if pid in self.running:
+                self._finish(pid, status)
+                return
+
+    def run(self):
+        pending = [(item, RdtResources(item)) for item in self.session.items]
+
+        while pending or self.running:
+            if self.session.shouldfail or self.session.shouldstop:
+                pending = []
+
+            for entry in list(pending):
+                item, res = entry
+                if self._can_start(res):
+                    pending.remove(entry)
+                    self._start(item, res)
+                elif self._needs_reset(res):
+                    # do not let following tests overtake exclusive one
+                    break
+
+            if self.running:
+                self._wait()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    workers = session.config.getoption("--rdt-workers")
+    if workers <= 1 or session.config.option.collectonly or session.testsfailed:
+        return None
+
+    RdtScheduler(session, workers).run()
+    return True
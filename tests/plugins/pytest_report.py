@@ -30,12 +30,24 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ################################################################################
 
+import json
 import re
 import warnings
 import pytest
+from testlib.timing import Timing
 
 def pytest_addoption(parser):
     parser.addoption("--report", action="store_true", dest='report', help='Print Test Report')
+    parser.addoption("--timing-report", action="store", dest="timing_report", default=None,
+                     metavar="FILE", help="Write per-phase and tool timing to JSON file")
+    parser.addoption("--timing-baseline", action="store", dest="timing_baseline",
+                     default=None, metavar="FILE",
+                     help="Compare timing against JSON file written by --timing-report")
+    parser.addoption("--timing-ratio", action="store", type=float, dest="timing_ratio",
+                     default=1.5, help="Slowdown ratio reported as regression")
+    parser.addoption("--timing-min", action="store", type=float, dest="timing_min",
+                     default=0.1, help="Ignore regressions of durations shorter than "
+                     "given number of seconds")
 
 
 def pytest_configure(config):
@@ -43,6 +55,10 @@ def pytest_configure(config):
         config.report = TestReport(config)
         config.pluginmanager.register(config.report)
 
+    if config.getoption("--timing-report") or config.getoption("--timing-baseline"):
+        config.timing_report = TimingReport(config)
+        config.pluginmanager.register(config.timing_report)
+
 
 def pytest_unconfigure(config):
     report = getattr(config, 'report', None)
@@ -50,6 +66,22 @@ def pytest_unconfigure(config):
         del config.report
         config.pluginmanager.unregister(report)
 
+    timing_report = getattr(config, 'timing_report', None)
+    if timing_report:
+        del config.timing_report
+        config.pluginmanager.unregister(timing_report)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport():
+    outcome = yield
+    report = outcome.get_result()
+
+    # attach timing records of the phase, reports are serialized by workers
+    records = Timing.drain()
+    if records:
+        report.user_properties.append(("rdt_timing", records))
+
 
 class Result:
     def __init__(self, nodeid, outcome, priority):
@@ -90,6 +122,12 @@ class TestReport:
         # priority os processed test
         self.current_priority = None
 
+        # priorities of collected tests, tests may be executed in workers
+        self.priorities = {}
+
+        # tests deselected due to unmet feature requirements
+        self.deselected = {}
+
 
     def report(self, terminalreporter):
         terminalreporter.write_sep('=', 'Test Report')
@@ -116,6 +154,28 @@ class TestReport:
 
         terminalreporter.write_sep('-')
 
+        if self.deselected:
+            terminalreporter.write_sep('=', 'Deselected Tests')
+            for test in sorted(self.deselected):
+                # pylint: disable=consider-using-f-string
+                terminalreporter.write_line('{:56} | {}'.format(test, self.deselected[test]))
+            terminalreporter.write_sep('-')
+
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            priority = item.get_closest_marker("priority")
+            if priority:
+                self.priorities[item.nodeid] = priority.args[0]
+
+
+    def pytest_deselected(self, items):
+        for item in items:
+            reason = getattr(item, "rdt_deselect_reason", None)
+            if reason:
+                nodeid = item.nodeid.rsplit("::", 1)[1]
+                self.deselected[nodeid] = reason
+
 
     def pytest_runtest_setup(self, item):
         priority = item.get_closest_marker("priority")
@@ -135,12 +195,14 @@ class TestReport:
         if report.outcome == "skipped":
             return
 
+        priority = self.priorities.get(report.nodeid, self.current_priority)
+
         nodeid = report.nodeid
         nodeid = nodeid.rsplit("::", 1)[1]
         nodeid = re.sub(r"\[.*\]$", "", nodeid)
 
         if nodeid not in self.results:
-            self.results[nodeid] = Result(nodeid, report.outcome, self.current_priority)
+            self.results[nodeid] = Result(nodeid, report.outcome, priority)
 
         else:
             self.results[nodeid].update(report.outcome)
@@ -149,3 +211,117 @@ class TestReport:
     def pytest_terminal_summary(self, terminalreporter):
         if self.config.getoption("--report"):
             self.report(terminalreporter)
+
+
+class TimingReport:
+    """Collects per-phase and tool timing, compares it against baseline"""
+
+    def __init__(self, config):
+        self.config = config
+
+        # {nodeid: {setup/call/teardown: seconds}}
+        self.stages = {}
+
+        # {nodeid: {phase: seconds}}, phases recorded by tests
+        self.phases = {}
+
+        # {command: [seconds]}
+        self.tools = {}
+
+        self.regressions = []
+
+
+    def pytest_runtest_logreport(self, report):
+        stages = self.stages.setdefault(report.nodeid, {})
+        stages[report.when] = stages.get(report.when, 0.0) + report.duration
+        phases = self.phases.setdefault(report.nodeid, {})
+
+        warmup = 0.0
+        for name, records in report.user_properties:
+            if name != "rdt_timing":
+                continue
+            for kind, record, seconds in records:
+                if kind == "phase":
+                    phases[record] = phases.get(record, 0.0) + seconds
+                    if record == "warmup" and report.when == "call":
+                        warmup += seconds
+                elif kind == "tool":
+                    self.tools.setdefault(record, []).append(seconds)
+
+        if report.when == "call":
+            phases["measurement"] = report.duration - warmup
+
+
+    def get_data(self):
+        tests = {}
+        for nodeid, stages in self.stages.items():
+            tests[nodeid] = {"duration": sum(stages.values()), "stages": stages,
+                             "phases": self.phases[nodeid]}
+
+        tools = {}
+        for command, durations in self.tools.items():
+            tools[command] = {"count": len(durations),
+                              "mean": sum(durations) / len(durations),
+                              "max": max(durations)}
+
+        return {"tests": tests, "tools": tools}
+
+
+    def compare(self, data, baseline):
+        ratio = self.config.getoption("--timing-ratio")
+        minimum = self.config.getoption("--timing-min")
+        regressions = []
+
+        def check(name, current, previous):
+            if previous is None or current < minimum:
+                return
+            if current > previous * ratio:
+                regressions.append((name, previous, current))
+
+        for nodeid, test in data["tests"].items():
+            previous = baseline.get("tests", {}).get(nodeid)
+            if previous is None:
+                continue
+            check(nodeid, test["duration"], previous.get("duration"))
+            for phase, seconds in test["phases"].items():
+                check(f"{nodeid} ({phase})", seconds, previous["phases"].get(phase))
+
+        for command, tool in data["tools"].items():
+            previous = baseline.get("tools", {}).get(command)
+            if previous is not None:
+                check(command, tool["mean"], previous.get("mean"))
+
+        return regressions
+
+
+    def pytest_sessionfinish(self, session):
+        data = self.get_data()
+
+        path = self.config.getoption("--timing-report")
+        if path:
+            # pylint: disable=unspecified-encoding
+            with open(path, "w") as fd:
+                json.dump(data, fd, indent=2, sort_keys=True)
+
+        path = self.config.getoption("--timing-baseline")
+        if path:
+            # pylint: disable=unspecified-encoding
+            with open(path) as fd:
+                baseline = json.load(fd)
+            self.regressions = self.compare(data, baseline)
+            if self.regressions and session.exitstatus == pytest.ExitCode.OK:
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.config.getoption("--timing-baseline"):
+            return
+
+        terminalreporter.write_sep('=', 'Timing Regressions')
+        for name, previous, current in sorted(self.regressions):
+            # pylint: disable=consider-using-f-string
+            terminalreporter.write_line('{:70} | {:8.3f}s -> {:8.3f}s'\
+                                        .format(name, previous, current), red=True)
+        if not self.regressions:
+            terminalreporter.write_line('No regressions', green=True)
+        terminalreporter.write_sep('-')
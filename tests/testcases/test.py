@@ -31,11 +31,22 @@
 ################################################################################
 
 import os
+import hashlib
 import logging
 import subprocess
 import time
 import psutil
 from testlib.env import Env
+from testlib.fake_resctrl import FakeResctrl
+from testlib.resctrl import Resctrl
+from testlib import readiness
+from testlib.timing import Timing
+from testlib.tool_lock import ToolLock
+
+## Size of memory unit used by memtester size argument
+MB = 1024 * 1024
+## Size of memory unit used by pqos LLC[KB] column
+KB = 1024
 
 ## @cond
 logging.basicConfig(level=logging.DEBUG)
@@ -47,36 +58,86 @@ class Test:
     rdtset = None
     pqos = None
 
+    ## Fingerprint of platform state after full reset, see init
+    default_state = None
+
     def init(self, request):
         self.membw = request.config.membw
         self.rdtset = request.config.rdtset
         self.pqos = request.config.pqos
-        if os.path.isdir("/sys/fs/resctrl/info"):
-            subprocess.call("umount /sys/fs/resctrl".split(),
-                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-        reset_opt = ""
-        if Env().exists('cat', 'l3'):
-            reset_opt += 'l3cdp-off,'
-        if Env().exists('cat', 'l2'):
-            reset_opt += 'l2cdp-off,'
+        # tests run in forked workers get the fingerprint from the scheduler
+        known_state = getattr(request.node, "rdt_default_state", None)
+        if known_state is not None:
+            Test.default_state = known_state
+
+        # platform already reset by a test scheduled earlier, see pytest_rdt
+        if getattr(request.node, "rdt_shared", False):
+            return
+
+        with Timing.phase("reset"):
+            iface = None
+            callspec = getattr(request.node, "callspec", None)
+            if callspec:
+                iface = callspec.params.get("iface")
+
+            resctrl = Resctrl()
+            if os.path.isdir(os.path.join(resctrl.root, "info")):
+                if iface == "OS" and resctrl.is_default():
+                    return
+                resctrl.umount()
+
+            # fake tree replaces resctrl only, leave MSRs of the host alone
+            if FakeResctrl.active():
+                return
+
+            # skip reset if the platform is still in the state left by last reset
+            state = self.get_state_fingerprint()
+            if state is not None and state == Test.default_state:
+                return
 
-        subprocess.call(f"{self.pqos} --iface=msr -R {reset_opt}".split(),
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        subprocess.call(f"{self.pqos} --iface=msr -r -t 0".split(),
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            reset_opt = ""
+            if Env().exists('cat', 'l3'):
+                reset_opt += 'l3cdp-off,'
+            if Env().exists('cat', 'l2'):
+                reset_opt += 'l2cdp-off,'
+
+            for command in [f"{self.pqos} --iface=msr -R {reset_opt}",
+                            f"{self.pqos} --iface=msr -r -t 0"]:
+                with ToolLock.held(), Timing.tool(command):
+                    subprocess.call(command.split(), stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+
+            Test.default_state = self.get_state_fingerprint()
+            request.node.rdt_default_state = Test.default_state
+
+
+    ## Returns fingerprint of COS definitions and COS/RMID core associations
+    def get_state_fingerprint(self):
+        command = f"{self.pqos} --iface=msr -s"
+        with ToolLock.held(), Timing.tool(command), \
+             subprocess.Popen(command.split(), stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL) as child:
+            (stdout, _) = child.communicate()
+
+        if child.returncode != 0:
+            return None
+
+        return hashlib.sha1(stdout).hexdigest()
 
 
     def fini(self):
-        subprocess.call("killall -9 memtester".split(),
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        subprocess.call("killall -9 membw".split(),
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with Timing.phase("teardown"):
+            subprocess.call("killall -9 memtester".split(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.call("killall -9 membw".split(),
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
     ## Runs command and adds output to log
     def run(self, command, quiet=False):
-        with subprocess.Popen(command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        with ToolLock.held(), Timing.tool(command), \
+             subprocess.Popen(command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
                               encoding="utf-8") as child:
             (stdout, stderr) = child.communicate()
 
@@ -84,8 +145,9 @@ class Test:
         if "Failed to create resctrl group /sys/fs/resctrl/COS" in stdout:
             # wait for limbo list cleanup
             time.sleep(1)
-            with subprocess.Popen(command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                              encoding="utf-8") as child:
+            with ToolLock.held(), Timing.tool(command), \
+                 subprocess.Popen(command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                  encoding="utf-8") as child:
                 (stdout, stderr) = child.communicate()
 
         if not quiet:
@@ -120,6 +182,12 @@ class Test:
         return self.cmd(iface, self.rdtset, params)
 
 
+    ## Holds tool lock, for tools run in background, see testlib.tool_lock
+    @staticmethod
+    def tool_lock():
+        return ToolLock.held()
+
+
     ## Runs pqos command
     def run_pqos(self, iface, params):
         command = self.cmd_pqos(iface, params)
@@ -134,12 +202,49 @@ class Test:
         return self.run(command)
 
     ## Wait for line in the output
-    def stdout_wait(self, process, line):
-        while True:
-            stdout = process.stdout.readline()
-            assert stdout != '' or process.poll() is None
-            if line in stdout:
-                break
+    def stdout_wait(self, process, line, timeout=readiness.READY_TIMEOUT):
+        with Timing.phase("warmup"):
+            assert readiness.wait_output(process.stdout, line, timeout)
+
+
+    ## Wait until workload has its memory buffer resident
+    #
+    #  Readiness is best effort, checks of the test decide on the result
+    @staticmethod
+    def workload_wait(process, size, timeout=readiness.READY_TIMEOUT):
+        # allow for allocator rounding and pages not touched yet
+        with Timing.phase("warmup"):
+            if not readiness.wait_rss(process.pid, size * 9 // 10, timeout):
+                Test.log.warning("Workload %d not resident after %ss", process.pid, timeout)
+
+
+    ## Wait until workloads of default resctrl group occupy min_bytes of LLC
+    #
+    #  Nothing to wait for if resctrl is not mounted
+    @staticmethod
+    def workload_wait_llc(min_bytes, timeout=readiness.READY_TIMEOUT):
+        resctrl = Resctrl()
+        if not resctrl.is_mounted():
+            return
+
+        with Timing.phase("warmup"):
+            if not readiness.wait_llc_occupancy(resctrl.root, min_bytes, timeout):
+                Test.log.warning("LLC occupancy below %d bytes after %ss", min_bytes, timeout)
+
+
+    ## Wait until workloads of default resctrl group reach min_bytes_per_sec of memory bandwidth
+    #
+    #  Nothing to wait for if resctrl is not mounted
+    @staticmethod
+    def workload_wait_bandwidth(min_bytes_per_sec, timeout=readiness.READY_TIMEOUT):
+        resctrl = Resctrl()
+        if not resctrl.is_mounted():
+            return
+
+        with Timing.phase("warmup"):
+            if not readiness.wait_bandwidth(resctrl.root, min_bytes_per_sec, timeout=timeout):
+                Test.log.warning("Memory bandwidth below %d B/s after %ss", min_bytes_per_sec,
+                                 timeout)
 
 
     @staticmethod
@@ -0,0 +1,183 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+import os
+import pytest
+from priority import PRIORITY_MEDIUM
+from testlib.env import Env
+from testlib.fake_resctrl import FakeResctrl, FAKE_LLC_OCCUPANCY, FAKE_MBM_BYTES_PER_TICK
+from testlib.resctrl import Resctrl
+
+## Environment of the fake platform
+FAKE_ENV = {
+    "cpu": {"sockets": 2, "cores": 4},
+    "cat": {
+        "l3": {"cos": 16, "ways": 11, "minCbmBits": 1, "cdp": True},
+        "l2": {"cos": 8, "ways": 16, "minCbmBits": 1, "cdp": False}
+    },
+    "mba": {"cos": 8},
+    "cmt": {"occup_llc": True},
+    "mbm": {"mbm_total": True, "mbm_local": True}
+}
+
+
+def read(path):
+    # pylint: disable=unspecified-encoding
+    with open(path, 'r') as fd:
+        return fd.read()
+
+
+class TestFakeResctrl:
+
+    ## @cond
+    @pytest.fixture(autouse=True)
+    def init(self, monkeypatch):
+        monkeypatch.setattr(Env, "env", FAKE_ENV)
+        instance = FakeResctrl.instance
+        yield
+        FakeResctrl.instance = instance
+    ## @endcond
+
+
+    ## FAKE RESCTRL - Mount and unmount
+    #
+    #  \b Priority: Medium
+    #
+    #  \b Objective:
+    #  Verify generated tree follows the environment file
+    #
+    #  \b Instruction:
+    #  1. Mount fake resctrl with L3 CDP enabled
+    #  2. Unmount fake resctrl
+    #
+    #  \b Result:
+    #  Info directories, number of classes and default schemata match the environment.
+    #  Tree is empty after unmount.
+    @PRIORITY_MEDIUM
+    def test_fake_resctrl_mount(self, tmp_path):
+        fake = FakeResctrl(tmp_path)
+        fake.activate()
+        resctrl = Resctrl()
+        assert resctrl.root == os.path.join(tmp_path, "sys/fs/resctrl")
+
+        assert not fake.is_mounted()
+        assert resctrl.mount(cdp=True)
+        assert fake.is_mounted()
+
+        info = os.path.join(fake.root, "info")
+        assert sorted(os.listdir(info)) == ["L2", "L3CODE", "L3DATA", "L3_MON", "MB"]
+        assert read(os.path.join(info, "L3CODE", "num_closids")) == "8\n"
+        assert read(os.path.join(info, "L2", "num_closids")) == "8\n"
+        assert read(os.path.join(info, "L3DATA", "cbm_mask")) == "7ff\n"
+        assert read(os.path.join(info, "L3_MON", "mon_features")).split() == \
+            ["llc_occupancy", "mbm_total_bytes", "mbm_local_bytes"]
+
+        schemata = read(os.path.join(fake.root, "schemata")).splitlines()
+        assert "L3CODE:0=7ff;1=7ff" in schemata
+        assert "L2:0=ffff;1=ffff" in schemata
+        assert "MB:0=100;1=100" in schemata
+        assert read(os.path.join(fake.root, "cpus_list")) == "0-3\n"
+
+        assert resctrl.umount()
+        assert not fake.is_mounted()
+        assert not os.listdir(fake.root)
+        fake.deactivate()
+        assert FakeResctrl.active() is None
+
+
+    ## FAKE RESCTRL - Groups and counters
+    #
+    #  \b Priority: Medium
+    #
+    #  \b Objective:
+    #  Verify stand-in for the kernel populates groups and advances counters
+    #
+    #  \b Instruction:
+    #  1. Mount fake resctrl and create control and monitoring group
+    #  2. Advance counters twice
+    #
+    #  \b Result:
+    #  New groups are populated. MBM counters grow by fixed amount per tick, LLC
+    #  occupancy is constant.
+    @PRIORITY_MEDIUM
+    def test_fake_resctrl_tick(self, tmp_path):
+        fake = FakeResctrl(tmp_path)
+        fake.activate()
+        assert fake.mount()
+
+        ctrl = os.path.join(fake.root, "COS1")
+        mon = os.path.join(ctrl, "mon_groups", "mon1")
+        os.makedirs(ctrl)
+        fake.tick()
+        os.makedirs(mon)
+        fake.tick()
+
+        assert os.path.exists(os.path.join(ctrl, "schemata"))
+        assert os.path.exists(os.path.join(mon, "tasks"))
+        assert not os.path.exists(os.path.join(mon, "schemata"))
+
+        counters = os.path.join(ctrl, "mon_data", "mon_L3_01")
+        assert read(os.path.join(counters, "mbm_total_bytes")) == \
+            f"{2 * FAKE_MBM_BYTES_PER_TICK}\n"
+        assert read(os.path.join(counters, "llc_occupancy")) == f"{FAKE_LLC_OCCUPANCY}\n"
+        assert read(os.path.join(mon, "mon_data", "mon_L3_00", "mbm_local_bytes")) == \
+            f"{FAKE_MBM_BYTES_PER_TICK}\n"
+        fake.deactivate()
+
+
+    ## FAKE RESCTRL - Perf events
+    #
+    #  \b Priority: Medium
+    #
+    #  \b Objective:
+    #  Verify perf monitoring events are generated only on request
+    #
+    #  \b Instruction:
+    #  1. Activate fake tree without and with perf enabled
+    #
+    #  \b Result:
+    #  Perf events of enabled monitoring features are present only with perf enabled
+    @PRIORITY_MEDIUM
+    def test_fake_resctrl_perf(self, tmp_path):
+        fake = FakeResctrl(tmp_path / "noperf")
+        fake.activate()
+        assert not os.path.exists(fake.perf_root)
+        fake.deactivate()
+
+        fake = FakeResctrl(tmp_path / "perf", perf=True)
+        fake.activate()
+        events = os.path.join(fake.perf_root, "events")
+        assert sorted(os.listdir(events)) == ["llc_occupancy", "local_bytes", "total_bytes"]
+        assert read(os.path.join(fake.perf_root, "type")) == "42\n"
+        assert FakeResctrl.path("/sys/devices/intel_cqm") == fake.perf_root
+        fake.deactivate()
+        assert FakeResctrl.path("/sys/devices/intel_cqm") == "/sys/devices/intel_cqm"
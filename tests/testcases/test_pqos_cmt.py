@@ -32,11 +32,12 @@
 
 import subprocess
 import re
-import time
 import test
 import pytest
-from priority import PRIORITY_HIGH
+import numpy
+from priority import PRIORITY_HIGH, PRIORITY_MEDIUM
 from snc import snc_enabled
+from testlib import monitor_bin, monitor_output
 
 class TestPqosCMT(test.Test):
 
@@ -62,6 +63,7 @@ class TestPqosCMT(test.Test):
     #  \b Result:
     #  Observe "LLC Occupancy" in "Cache Monitoring Technology (CMT) events" section
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources()
     @pytest.mark.rdt_supported("cqm_occup_llc")
     def test_pqos_cmt_detection(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-d")
@@ -100,8 +102,10 @@ class TestPqosCMT(test.Test):
             return cmt
 
         command = "taskset -c 4 memtester 100M"
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE, stdout=subprocess.PIPE):
-            time.sleep(5)
+        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+                              stdout=subprocess.PIPE) as memtester:
+            self.workload_wait(memtester, 100 * test.MB)
+            self.workload_wait_llc(1000 * test.KB)
 
             (stdout, _, exitcode) = self.run_pqos(iface, "--mon-reset -m llc:0-15 -t 10")
             assert exitcode == 0
@@ -151,7 +155,8 @@ class TestPqosCMT(test.Test):
              subprocess.Popen("sleep 60".split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as sleep:
 
-            time.sleep(2)
+            self.workload_wait(memtester, 100 * test.MB)
+            self.workload_wait_llc(1000 * test.KB)
 
             (stdout, _, exitcode) = \
                 self.run_pqos(iface, f"-p llc:{sleep.pid} -p llc:{memtester.pid} -t 1")
@@ -208,7 +213,8 @@ class TestPqosCMT(test.Test):
              subprocess.Popen("sleep 60".split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as sleep:
 
-            time.sleep(2)
+            self.workload_wait(memtester, 100 * test.MB)
+            self.workload_wait_llc(1000 * test.KB)
 
             (stdout, _, exitcode) = \
                 self.run_pqos(iface, f"-p llc:{sleep.pid} -p llc:{memtester.pid} -t 2 -P")
@@ -223,3 +229,37 @@ class TestPqosCMT(test.Test):
 
             memtester.kill()
             sleep.terminate()
+
+
+    ## PQOS - CMT Monitor LLC occupancy (binary output)
+    #
+    #  \b Priority: Medium
+    #
+    #  \b Objective:
+    #  Verify binary monitoring output read by testlib matches decoded CSV
+    #
+    #  \b Instruction:
+    #  1. Run "pqos [-I] -m llc:0-3 -u bin -o <file> -t 3" to record CMT monitoring
+    #  2. Run "pqos --decode=<file>" to convert the recording into CSV
+    #  3. Read the recording with testlib monitor_bin reader
+    #
+    #  \b Result:
+    #  Groups and LLC values of both outputs are the same
+    @PRIORITY_MEDIUM
+    @pytest.mark.rdt_supported("cqm_occup_llc")
+    def test_pqos_cmt_llc_occupancy_bin(self, iface, tmp_path):
+        path = tmp_path / "monitor.bin"
+
+        (_, _, exitcode) = self.run_pqos(iface, f"--mon-reset -m llc:0-3 -u bin -o {path} -t 3")
+        assert exitcode == 0
+
+        (stdout, _, exitcode) = self.run_pqos(iface, f"--decode={path}")
+        assert exitcode == 0
+
+        decoded = monitor_output.parse(stdout)
+        data = monitor_bin.read(path).to_monitor_data()
+        assert len(data) > 0
+        assert len(data) == len(decoded)
+        assert list(data["group"]) == list(decoded["group"])
+        # csv holds LLC[KB] rounded to single decimal place
+        assert numpy.allclose(data["llc"], decoded["llc"], atol=0.05, equal_nan=True)
@@ -60,6 +60,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "L2CA capability not detected" in output
     @PRIORITY_MEDIUM
+    @pytest.mark.rdt_resources()
     @pytest.mark.rdt_unsupported("cat_l3")
     def test_pqos_l3cat_detection_negative(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-s -v")
@@ -81,6 +82,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "L3CA capability detected" in output
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources()
     @pytest.mark.rdt_supported("cat_l3")
     def test_pqos_l3cat_detection(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-s -v")
@@ -107,6 +109,7 @@ class TestPqosL3Cat(test.Test):
     #  2. L3CA COS1 MASK for socket 0 is set to 0xf
     #     L3CA COS2 MASK for socket 0 is set to 0xf0
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[1, 2])
     @pytest.mark.rdt_supported("cat_l3")
     def test_pqos_l3cat_set(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-e llc:1=0xf;llc:2=0xf0")
@@ -134,6 +137,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "SOCKET 0 L3CA COS2 - FAILED!" and "Allocation configuration error!" in output
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[2])
     @pytest.mark.rdt_supported("cat_l3")
     def test_pqos_l3cat_set_negative(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-e llc:2=0xfffffffff")
@@ -156,6 +160,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "Allocation configuration altered." in output. Cores 1 and 3 are assigned to COS 7.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cores=[1, 3], cos=[7])
     @pytest.mark.rdt_supported("cat_l3")
     @pytest.mark.parametrize("type_id", ["cos", "llc", "core"])
     def test_pqos_l3cat_association_core(self, iface, type_id):
@@ -182,6 +187,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "Core number or class id is out of bounds!" in output.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[7])
     @pytest.mark.rdt_supported("cat_l3")
     @pytest.mark.parametrize("type_id", ["cos", "llc", "core"])
     def test_pqos_l3cat_association_core_negative(self, iface, type_id):
@@ -203,6 +209,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "Allocation configuration altered." in output.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[1])
     @pytest.mark.iface_os
     @pytest.mark.rdt_supported("cat_l3")
     def test_pqos_l3cat_association_tasks(self, iface):
@@ -224,6 +231,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "Task ID number or class id is out of bounds!" in output.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[2])
     @pytest.mark.iface_os
     @pytest.mark.rdt_supported("cat_l3")
     def test_pqos_l3cat_association_tasks_negative(self, iface):
@@ -265,6 +273,7 @@ class TestPqosL3Cat(test.Test):
     #  \b Result:
     #  Observe "INFO: L3 CAT details: CDP support=1" in output
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources()
     @pytest.mark.rdt_supported("cdp_l3")
     def test_pqos_l3cat_cdp_detection(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-s -v")
@@ -60,6 +60,7 @@ class TestPqosMba(test.Test):
     #  \b Result:
     #  Observe "MBA capability detected" in output
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources()
     @pytest.mark.rdt_supported("mba")
     def test_pqos_mba_detection(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-s -v")
@@ -81,6 +82,7 @@ class TestPqosMba(test.Test):
     #  Observe the following in output
     #  SOCKET 0 MBA COS2 => 50% requested, 50% applied
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[2])
     @pytest.mark.rdt_supported("mba")
     @pytest.mark.parametrize("rate", [20, 50, 90])
     def test_pqos_mba_set(self, iface, rate):
@@ -102,6 +104,7 @@ class TestPqosMba(test.Test):
     #  \b Result:
     #  Observe "MBA COS2 rate out of range (from 1-100)" in output
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[2])
     @pytest.mark.rdt_supported("mba")
     def test_pqos_mba_set_negative(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-e mba:2=200")
@@ -123,6 +126,7 @@ class TestPqosMba(test.Test):
     #  \b Result:
     #  Observe "Allocation configuration altered." in output. Cores 1 and 3 are assigned to COS 7.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cores=[1, 3], cos=[7])
     @pytest.mark.rdt_supported("mba")
     @pytest.mark.parametrize("type_id", ["cos", "llc", "core"])
     def test_pqos_mba_association_core(self, iface, type_id):
@@ -149,6 +153,7 @@ class TestPqosMba(test.Test):
     #  \b Result:
     #  Observe "Core number or class id is out of bounds!" in output.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[7])
     @pytest.mark.rdt_supported("mba")
     @pytest.mark.parametrize("type_id", ["cos", "llc", "core"])
     def test_pqos_mba_association_core_negative(self, iface, type_id):
@@ -170,6 +175,7 @@ class TestPqosMba(test.Test):
     #  \b Result:
     #  Observe "Allocation configuration altered." in output.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[1])
     @pytest.mark.iface_os
     @pytest.mark.rdt_supported("mba")
     def test_pqos_mba_association_tasks(self, iface):
@@ -191,6 +197,7 @@ class TestPqosMba(test.Test):
     #  \b Result:
     #  Observe "Task ID number or class id is out of bounds!" in output.
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources(cos=[2])
     @pytest.mark.iface_os
     @pytest.mark.rdt_supported("mba")
     def test_pqos_mba_association_tasks_negative(self, iface):
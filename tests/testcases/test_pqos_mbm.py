@@ -31,7 +31,6 @@
 ################################################################################
 
 import subprocess
-import time
 import re
 import test
 import pytest
@@ -63,6 +62,7 @@ class TestPqosMBM(test.Test):
     #  Observe "Total Memory Bandwidth" and "Local Memory Bandwidth" in
     #  "Memory Bandwidth Monitoring (CMT) events" section
     @PRIORITY_HIGH
+    @pytest.mark.rdt_resources()
     @pytest.mark.rdt_supported("cqm_mbm_local", "cqm_mbm_total")
     def test_pqos_mbm_detection(self, iface):
         (stdout, _, exitstatus) = self.run_pqos(iface, "-d")
@@ -107,8 +107,10 @@ class TestPqosMBM(test.Test):
             return mbl, mbr
 
         command = "taskset -c 4 memtester 1000M"
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE, stdout=subprocess.PIPE):
-            time.sleep(2)
+        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+                              stdout=subprocess.PIPE) as memtester:
+            self.workload_wait(memtester, 1000 * test.MB)
+            self.workload_wait_bandwidth(100 * test.MB)
 
             (stdout, _, exitcode) = self.run_pqos(iface, "-m mbl:0-15 -m mbr:0-15 -t 1")
             assert exitcode == 0
@@ -156,7 +158,8 @@ class TestPqosMBM(test.Test):
         with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as memtester:
 
-            time.sleep(2)
+            self.workload_wait(memtester, 1000 * test.MB)
+            self.workload_wait_bandwidth(100 * test.MB)
 
             (stdout, _, exitcode) = self.run_pqos(iface, \
                 f"-p mbl:1 -p mbl:{memtester.pid} -p mbr:1 -p mbr:{memtester.pid} -t 1")
@@ -64,7 +64,8 @@ class TestRdtsetAffinity(test.Test):
     @pytest.mark.rdt_supported("rdt_a")
     def test_rdtset_affinity_command_single_core(self, iface):
         command = self.cmd_rdtset(iface, "-c 4 memtester 10M")
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+        with self.tool_lock(), \
+             subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as rdtset:
 
             self.stdout_wait(rdtset, b"memtester version")
@@ -98,7 +99,8 @@ class TestRdtsetAffinity(test.Test):
     @pytest.mark.rdt_supported("rdt_a")
     def test_rdtset_affinity_command_multiple_cores(self, iface):
         command = self.cmd_rdtset(iface, "-c 4-5 memtester 10M")
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+        with self.tool_lock(), \
+             subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as rdtset:
 
             self.stdout_wait(rdtset, b"memtester version")
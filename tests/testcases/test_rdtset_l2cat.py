@@ -73,7 +73,8 @@ class TestRdtsetL2Cat(test.Test):
     def test_rdtset_l2cat_set_command(self, iface):
         param = "-t l2=0xf;cpu=5-6 -c 5-6 memtester 10M"
         command = self.cmd_rdtset(iface, param)
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+        with self.tool_lock(), \
+             subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as rdtset:
 
             self.stdout_wait(rdtset, b"memtester version")
@@ -156,7 +157,8 @@ class TestRdtsetL2Cat(test.Test):
 
         param = f"-t l2=0xf;cpu={cores[0]},{cores[1]} -c {cores[0]},{cores[1]} memtester 10M"
         command = self.cmd_rdtset(iface, param)
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+        with self.tool_lock(), \
+             subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as rdtset:
 
             self.stdout_wait(rdtset, b"memtester version")
@@ -71,7 +71,8 @@ class TestRdtsetL3Cat(test.Test):
     def test_rdtset_l3cat_set_command(self, iface):
         param = "-t l3=0xf;cpu=5-6 -c 5-6 memtester 10M"
         command = self.cmd_rdtset(iface, param)
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+        with self.tool_lock(), \
+             subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as rdtset:
 
             self.stdout_wait(rdtset, b"memtester version")
@@ -68,7 +68,8 @@ class TestRdtsetMba(test.Test):
     @pytest.mark.rdt_supported("mba")
     def test_rdtset_mba_set_command(self, iface):
         command = self.cmd_rdtset(iface, "-t mba=50;cpu=5-6 -c 5-6 memtester 10M")
-        with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
+        with self.tool_lock(), \
+             subprocess.Popen(command.split(), stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE) as rdtset:
 
             self.stdout_wait(rdtset, b"memtester version")
@@ -0,0 +1,337 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+import os
+import shutil
+import json
+import multiprocessing
+from .env import Env
+
+## Bytes added to each MBM counter per update tick
+FAKE_MBM_BYTES_PER_TICK = 64 * 1024 * 1024
+## LLC occupancy reported for each group in bytes
+FAKE_LLC_OCCUPANCY = 2 * 1024 * 1024
+## MBA value reported when mounted with mba_MBps
+FAKE_MBA_MBPS_MAX = 4294967295
+
+
+def _write(path, data):
+    # pylint: disable=unspecified-encoding
+    with open(path, 'w') as fd:
+        fd.write(data)
+
+
+def _read_int(path):
+    try:
+        # pylint: disable=unspecified-encoding
+        with open(path, 'r') as fd:
+            return int(fd.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _counter_loop(fake, interval, stop_event):
+    while not stop_event.is_set():
+        fake.tick()
+        stop_event.wait(interval)
+
+
+class FakeResctrl:
+    """
+    Generated resctrl/sysfs tree mimicking RDT hardware described by Env
+
+    While a tree is active, Resctrl and Perf resolve their paths inside of it
+    and mount/umount are emulated by creating and removing the tree contents.
+    A stand-in process populates newly created groups and advances mon_data
+    counters, as the kernel would.
+    """
+
+    ## Active fake tree, None when running against the real sysfs
+    instance = None
+
+    def __init__(self, base_dir, perf=False):
+        self.base_dir = os.path.abspath(base_dir)
+        self.perf = perf
+        self.root = os.path.join(self.base_dir, "sys/fs/resctrl")
+        self.perf_root = os.path.join(self.base_dir, "sys/devices/intel_cqm")
+        self.updater = None
+        self.stop_event = None
+
+    @property
+    def options(self):
+        """Mount options, kept in the tree so the stand-in process sees them"""
+        try:
+            # pylint: disable=unspecified-encoding
+            with open(os.path.join(self.base_dir, "mount_options"), 'r') as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return {}
+
+    @options.setter
+    def options(self, value):
+        _write(os.path.join(self.base_dir, "mount_options"), json.dumps(value))
+
+    @staticmethod
+    def path(path):
+        """
+        Translates absolute sysfs path into the active fake tree
+
+        Parameters:
+            path: absolute path
+        Returns:
+            path inside of the fake tree or unchanged path if no tree is active
+        """
+        if FakeResctrl.instance is None:
+            return path
+        return os.path.join(FakeResctrl.instance.base_dir, path.lstrip("/"))
+
+    @staticmethod
+    def active():
+        return FakeResctrl.instance
+
+    def activate(self):
+        os.makedirs(self.root, exist_ok=True)
+        if self.perf:
+            self._create_perf()
+        FakeResctrl.instance = self
+
+    def deactivate(self):
+        self.stop_counters()
+        if FakeResctrl.instance is self:
+            FakeResctrl.instance = None
+
+    def _create_perf(self):
+        events = os.path.join(self.perf_root, "events")
+        os.makedirs(events, exist_ok=True)
+        _write(os.path.join(self.perf_root, "type"), "42\n")
+        for name, enabled in self._mon_events().items():
+            if enabled:
+                perf_name = name.replace("mbm_", "")
+                _write(os.path.join(events, perf_name), "event=0x1\n")
+
+    @staticmethod
+    def _sockets():
+        if Env().exists("cpu", "sockets"):
+            return Env().get("cpu", "sockets")
+        return 1
+
+    @staticmethod
+    def _cpus():
+        if Env().exists("cpu", "cores"):
+            return Env().get("cpu", "cores")
+        return 1
+
+    @staticmethod
+    def _mon_events():
+        env = Env()
+        return {
+            "llc_occupancy": env.exists("cmt", "occup_llc") and env.get("cmt", "occup_llc"),
+            "mbm_total_bytes": env.exists("mbm", "mbm_total") and env.get("mbm", "mbm_total"),
+            "mbm_local_bytes": env.exists("mbm", "mbm_local") and env.get("mbm", "mbm_local")
+        }
+
+    def _resources(self):
+        """Returns list of (schemata label, env level) for allocation"""
+        env = Env()
+        options = self.options
+        resources = []
+
+        for level, option in (("l3", "cdp"), ("l2", "cdpl2")):
+            if not env.exists("cat", level):
+                continue
+            name = level.upper()
+            if options.get(option) and env.get("cat", level, "cdp"):
+                resources.append((f"{name}CODE", level))
+                resources.append((f"{name}DATA", level))
+            else:
+                resources.append((name, level))
+
+        if env.exists("mba"):
+            resources.append(("MB", "mba"))
+
+        return resources
+
+    def _default_schemata(self):
+        lines = []
+        sockets = self._sockets()
+        mba_mbps = self.options.get("mba_mbps")
+        for label, level in self._resources():
+            if level == "mba":
+                value = FAKE_MBA_MBPS_MAX if mba_mbps else 100
+                masks = [f"{i}={value}" for i in range(sockets)]
+            else:
+                ways = Env().get("cat", level, "ways")
+                masks = [f"{i}={(1 << ways) - 1:x}" for i in range(sockets)]
+            lines.append(f"{label}:" + ";".join(masks))
+        return "\n".join(lines) + "\n"
+
+    def _populate_group(self, path, ctrl=True):
+        cpus = self._cpus()
+        if ctrl:
+            _write(os.path.join(path, "schemata"), self._default_schemata())
+        if not os.path.exists(os.path.join(path, "tasks")):
+            _write(os.path.join(path, "tasks"), "")
+            _write(os.path.join(path, "cpus"), "0\n" if path != self.root else
+                   f"{(1 << cpus) - 1:x}\n")
+            _write(os.path.join(path, "cpus_list"), "\n" if path != self.root else
+                   f"0-{cpus - 1}\n")
+
+        events = [name for name, enabled in self._mon_events().items() if enabled]
+        if not events:
+            return
+
+        if ctrl:
+            os.makedirs(os.path.join(path, "mon_groups"), exist_ok=True)
+        for socket in range(self._sockets()):
+            mon_dir = os.path.join(path, "mon_data", f"mon_L3_{socket:02d}")
+            os.makedirs(mon_dir, exist_ok=True)
+            for event in events:
+                counter = os.path.join(mon_dir, event)
+                if not os.path.exists(counter):
+                    _write(counter, "0\n")
+
+    def _create_info(self):
+        env = Env()
+        info = os.path.join(self.root, "info")
+        os.makedirs(info)
+
+        for label, level in self._resources():
+            res_dir = os.path.join(info, label)
+            os.makedirs(res_dir, exist_ok=True)
+            if level == "mba":
+                cos = env.get("mba", "cos")
+            else:
+                cos = env.get("cat", level, "cos")
+            if label.endswith("CODE") or label.endswith("DATA"):
+                cos //= 2
+            _write(os.path.join(res_dir, "num_closids"), f"{cos}\n")
+            if level == "mba":
+                _write(os.path.join(res_dir, "min_bandwidth"), "10\n")
+                _write(os.path.join(res_dir, "bandwidth_gran"), "10\n")
+                _write(os.path.join(res_dir, "delay_linear"), "1\n")
+            else:
+                ways = env.get("cat", level, "ways")
+                _write(os.path.join(res_dir, "cbm_mask"), f"{(1 << ways) - 1:x}\n")
+                _write(os.path.join(res_dir, "min_cbm_bits"),
+                       f"{env.get('cat', level, 'minCbmBits')}\n")
+                _write(os.path.join(res_dir, "shareable_bits"), "0\n")
+
+        events = [name for name, enabled in self._mon_events().items() if enabled]
+        if events:
+            mon_dir = os.path.join(info, "L3_MON")
+            os.makedirs(mon_dir)
+            _write(os.path.join(mon_dir, "mon_features"), "\n".join(events) + "\n")
+            _write(os.path.join(mon_dir, "num_rmids"), "224\n")
+            _write(os.path.join(mon_dir, "max_threshold_occupancy"), "1081344\n")
+
+    def is_mounted(self):
+        return os.path.isdir(os.path.join(self.root, "info"))
+
+    def mount(self, cdp=False, cdpl2=False, mba_mbps=False):
+        if self.is_mounted():
+            return True
+
+        if mba_mbps and not (Env().exists("mba") and any(self._mon_events().values())):
+            return False
+
+        self.options = {"cdp": cdp, "cdpl2": cdpl2, "mba_mbps": mba_mbps}
+        self._create_info()
+        self._populate_group(self.root)
+        return True
+
+    def umount(self):
+        if os.path.isdir(self.root):
+            for entry in os.scandir(self.root):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        self.options = {}
+        return True
+
+    def _groups(self):
+        """Yields (path, is control group) for every group in the tree"""
+        ctrl_groups = [self.root]
+        ctrl_groups += [entry.path for entry in os.scandir(self.root)
+                        if entry.is_dir() and entry.name not in ("info", "mon_data",
+                                                                 "mon_groups")]
+        for ctrl in ctrl_groups:
+            yield ctrl, True
+            mon_groups = os.path.join(ctrl, "mon_groups")
+            if os.path.isdir(mon_groups):
+                for entry in os.scandir(mon_groups):
+                    if entry.is_dir():
+                        yield entry.path, False
+
+    def tick(self):
+        """Populates new groups and advances mon_data counters once"""
+        if not self.is_mounted():
+            return
+
+        for path, ctrl in self._groups():
+            if ctrl and not os.path.exists(os.path.join(path, "schemata")):
+                self._populate_group(path)
+            elif not ctrl and not os.path.exists(os.path.join(path, "tasks")):
+                self._populate_group(path, ctrl=False)
+
+            mon_data = os.path.join(path, "mon_data")
+            if not os.path.isdir(mon_data):
+                continue
+            for domain in os.scandir(mon_data):
+                for counter in os.scandir(domain.path):
+                    if counter.name == "llc_occupancy":
+                        value = FAKE_LLC_OCCUPANCY
+                    else:
+                        value = _read_int(counter.path) + FAKE_MBM_BYTES_PER_TICK
+                    _write(counter.path, f"{value}\n")
+
+    def start_counters(self, interval=0.1):
+        """Starts stand-in process advancing counters every interval seconds"""
+        if self.updater is not None:
+            return
+
+        self.stop_event = multiprocessing.Event()
+        self.updater = multiprocessing.Process(target=_counter_loop,
+                                               args=(self, interval, self.stop_event),
+                                               daemon=True)
+        self.updater.start()
+
+    def stop_counters(self):
+        if self.updater is None:
+            return
+
+        self.stop_event.set()
+        self.updater.join(timeout=5)
+        if self.updater.is_alive():
+            self.updater.terminate()
+        self.updater = None
+        self.stop_event = None
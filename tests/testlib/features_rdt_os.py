@@ -30,74 +30,203 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ################################################################################
 
+import hashlib
+import json
+import os
+import stat
+import tempfile
 from .resctrl import Resctrl
 from .perf import Perf
 from .features_rdt import FeaturesRdt
 
+## Mount option sets probed by FeaturesRdtOs, each one mounted exactly once
+PROBE_MOUNT_OPTIONS = {
+    "default": {},
+    "cdp": {"cdp": True},
+    "cdpl2": {"cdpl2": True},
+    "mba_mbps": {"mba_mbps": True}
+}
+
+## Bump when the layout of the probe result changes
+PROBE_CACHE_VERSION = 1
+
+
 class FeaturesRdtOs(FeaturesRdt):
-    def __init__(self):
+    def __init__(self, cache_dir=None, use_cache=True):
         self.resctrl = Resctrl()
         self.perf = Perf()
+        self.cache_dir = cache_dir if cache_dir else tempfile.gettempdir()
+        self.use_cache = use_cache
+        self.probe = None
 
-    def _check_resctrl_info_dir(self, dir_name):
-        if not self.resctrl.is_mounted():
-            return False
+    @staticmethod
+    def _read_first_line(path):
+        try:
+            # pylint: disable=unspecified-encoding
+            with open(path, 'r') as fd:
+                return fd.readline().strip()
+        except OSError:
+            return ""
+
+    @staticmethod
+    def _get_cpu_model():
+        try:
+            # pylint: disable=unspecified-encoding
+            with open("/proc/cpuinfo", 'r') as fd:
+                for line in fd:
+                    if line.startswith("model name"):
+                        return line.split(":", 1)[1].strip()
+        except OSError:
+            pass
+        return ""
 
-        if not self.resctrl.info_dir_exists(dir_name):
+    def get_cache_path(self):
+        boot_id = self._read_first_line("/proc/sys/kernel/random/boot_id")
+        cpu_model = self._get_cpu_model()
+        key = f"{PROBE_CACHE_VERSION}:{boot_id}:{cpu_model}:{self.resctrl.root}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"rdt-features-os-{digest}.json")
+
+    @staticmethod
+    def _is_trusted(fd):
+        """
+        Checks that cache file is a regular file owned by the current user
+        and not writable by anyone else
+
+        Cache lives in a shared directory by default, a file planted there
+        by another user must not be trusted.
+        """
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
             return False
+        if st.st_uid != os.geteuid():
+            return False
+        return (st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)) == 0
 
-        return True
+    def _load_cache(self):
+        path = self.get_cache_path()
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return None
 
-    def is_l2_cat_supported(self):
+        try:
+            if not self._is_trusted(fd):
+                return None
+            # pylint: disable=unspecified-encoding
+            with os.fdopen(fd, 'r') as file:
+                fd = None
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+        if data.get("version") != PROBE_CACHE_VERSION:
+            return None
+
+        return data.get("probe")
+
+    def _store_cache(self, probe):
+        path = self.get_cache_path()
+        tmp_path = path + f".{os.getpid()}"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW,
+                         0o644)
+        except OSError:
+            return
+
+        try:
+            # pylint: disable=unspecified-encoding
+            with os.fdopen(fd, 'w') as file:
+                json.dump({"version": PROBE_CACHE_VERSION, "probe": probe}, file)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _probe_mount(self, options):
         self.resctrl.umount()
-        if not self.resctrl.mount():
-            return False
-        result = self._check_resctrl_info_dir("L2")
+        if not self.resctrl.mount(**options):
+            return None
+
+        info_path = os.path.join(self.resctrl.root, "info")
+        info_dirs = []
+        if os.path.isdir(info_path):
+            info_dirs = sorted(entry.name for entry in os.scandir(info_path)
+                               if entry.is_dir())
+
+        mb_values = []
+        if "MB" in info_dirs:
+            schemata = self.resctrl.get_schemata()
+            mb_values = schemata.data.get("MB", [])
+
+        result = {
+            "info_dirs": info_dirs,
+            "mon_features": self.resctrl.get_mon_features(),
+            "mb": mb_values
+        }
+
         self.resctrl.umount()
         return result
 
-    def is_l2_cdp_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount(cdpl2=True):
+    def _probe_all(self):
+        probe = {}
+        for name, options in PROBE_MOUNT_OPTIONS.items():
+            probe[name] = self._probe_mount(options)
+        return probe
+
+    ## Returns probe result, mounting resctrl at most once per option set
+    def get_probe(self):
+        if self.probe is not None:
+            return self.probe
+
+        if self.use_cache:
+            self.probe = self._load_cache()
+
+        if self.probe is None:
+            self.probe = self._probe_all()
+            # do not cache a failed mount, it may be a transient condition
+            if self.use_cache and self.probe["default"] is not None:
+                self._store_cache(self.probe)
+
+        return self.probe
+
+    def _check_resctrl_info_dir(self, dir_name, mount="default"):
+        mount_probe = self.get_probe().get(mount)
+        if not mount_probe:
             return False
-        result = self._check_resctrl_info_dir("L2CODE") or \
-                 self._check_resctrl_info_dir("L2DATA")
-        self.resctrl.umount()
-        return result
 
-    def is_l3_cat_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount():
+        return dir_name in mount_probe["info_dirs"]
+
+    def _resctrl_has_mon_feature(self, feature):
+        mount_probe = self.get_probe().get("default")
+        if not mount_probe:
             return False
-        result = self._check_resctrl_info_dir("L3")
-        self.resctrl.umount()
-        return result
+
+        return feature in mount_probe["mon_features"]
+
+    def is_l2_cat_supported(self):
+        return self._check_resctrl_info_dir("L2")
+
+    def is_l2_cdp_supported(self):
+        return self._check_resctrl_info_dir("L2CODE", "cdpl2") or \
+               self._check_resctrl_info_dir("L2DATA", "cdpl2")
+
+    def is_l3_cat_supported(self):
+        return self._check_resctrl_info_dir("L3")
 
     def is_l3_cdp_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount(cdp=True):
-            return False
-        result = self._check_resctrl_info_dir("L3CODE") or \
-                 self._check_resctrl_info_dir("L3DATA")
-        self.resctrl.umount()
-        return result
+        return self._check_resctrl_info_dir("L3CODE", "cdp") or \
+               self._check_resctrl_info_dir("L3DATA", "cdp")
 
     def is_cqm_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount():
-            return False
-        result = self._check_resctrl_info_dir("L3_MON") or \
-                 self._check_resctrl_info_dir("L2_MON")
-        self.resctrl.umount()
-        return result
+        return self._check_resctrl_info_dir("L3_MON") or \
+               self._check_resctrl_info_dir("L2_MON")
 
     def _resctrl_is_cqm_llc_occupancy_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount():
-            return False
-        mon_features = self.resctrl.get_mon_features()
-        self.resctrl.umount()
-        return 'llc_occupancy' in mon_features
+        return self._resctrl_has_mon_feature('llc_occupancy')
 
     def _perf_is_cqm_llc_occupancy_supported(self):
         return self.perf.is_mon_event_supported("llc_occupancy")
@@ -107,34 +236,19 @@ class FeaturesRdtOs(FeaturesRdt):
                self._perf_is_cqm_llc_occupancy_supported()
 
     def is_mba_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount():
-            return False
-        result = self._check_resctrl_info_dir("MB")
-        self.resctrl.umount()
-        return result
+        return self._check_resctrl_info_dir("MB")
 
     def is_mba_ctrl_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount(mba_mbps=True):
-            return False
-
-        result = self._check_resctrl_info_dir("MB") and \
-                 self._check_resctrl_info_dir("L3_MON")
+        result = self._check_resctrl_info_dir("MB", "mba_mbps") and \
+                 self._check_resctrl_info_dir("L3_MON", "mba_mbps")
         if result:
-            schemata = self.resctrl.get_schemata()
-            result = schemata.get('MB', 0) > 100
+            mb_values = self.get_probe()["mba_mbps"]["mb"]
+            result = bool(mb_values) and mb_values[0] > 100
 
-        self.resctrl.umount()
         return result
 
     def _resctrl_is_mbm_local_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount():
-            return False
-        mon_features = self.resctrl.get_mon_features()
-        self.resctrl.umount()
-        return 'mbm_local_bytes' in mon_features
+        return self._resctrl_has_mon_feature('mbm_local_bytes')
 
     def _perf_is_mbm_local_supported(self):
         return self.perf.is_mon_event_supported("local_bytes")
@@ -144,12 +258,7 @@ class FeaturesRdtOs(FeaturesRdt):
                self._perf_is_mbm_local_supported()
 
     def _resctrl_is_mbm_total_supported(self):
-        self.resctrl.umount()
-        if not self.resctrl.mount():
-            return False
-        mon_features = self.resctrl.get_mon_features()
-        self.resctrl.umount()
-        return 'mbm_total_bytes' in mon_features
+        return self._resctrl_has_mon_feature('mbm_total_bytes')
 
     def _perf_is_mbm_total_supported(self):
         return self.perf.is_mon_event_supported("total_bytes")
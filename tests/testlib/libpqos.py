@@ -0,0 +1,439 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+"""
+In-process binding to libpqos
+
+Keeps one library session open across calls so tests and monitoring scripts
+can sample at high rate without spawning pqos and parsing its output.
+Monitoring groups are treated as opaque pointers and values are read through
+pqos_mon_get_value()/pqos_mon_get_ipc(), so the binding does not depend on
+the layout of struct pqos_mon_data.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import time
+import numpy
+
+PQOS_RETVAL_OK = 0
+PQOS_RETVAL_UNAVAILABLE = 10
+
+PQOS_MAX_MEM_REGIONS = 4
+PQOS_BW_CTRL_TYPE_COUNT = 3
+
+LOG_VER_SILENT = -1
+LOG_VER_DEFAULT = 0
+
+PQOS_REQUIRE_CDP_ANY = 0
+PQOS_MBA_ANY = 0
+
+PQOS_INTERFACES = {
+    "MSR": 0,
+    "OS": 1,
+    "OS_RESCTRL_MON": 2,
+    "AUTO": 3,
+    "MMIO": 4
+}
+
+## Monitoring events by name
+PQOS_MON_EVENTS = {
+    "llc": 0x1,
+    "mbl": 0x2,
+    "mbt": 0x4,
+    "mbr": 0x8,
+    "llc_miss": 0x4000,
+    "ipc": 0x8000,
+    "llc_ref": 0x10000
+}
+
+
+class PqosError(Exception):
+    def __init__(self, function, retval):
+        super().__init__(f"{function} failed with status {retval}")
+        self.function = function
+        self.retval = retval
+
+
+# pylint: disable=too-few-public-methods
+class PqosConfig(ctypes.Structure):
+    _fields_ = [
+        ("fd_log", ctypes.c_int),
+        ("callback_log", ctypes.c_void_p),
+        ("context_log", ctypes.c_void_p),
+        ("verbose", ctypes.c_int),
+        ("interface", ctypes.c_int)
+    ]
+
+
+class PqosCaMasks(ctypes.Structure):
+    _fields_ = [
+        ("data_mask", ctypes.c_uint64),
+        ("code_mask", ctypes.c_uint64)
+    ]
+
+
+class PqosCaUnion(ctypes.Union):
+    _fields_ = [
+        ("ways_mask", ctypes.c_uint64),
+        ("s", PqosCaMasks)
+    ]
+
+
+class PqosL3ca(ctypes.Structure):
+    _fields_ = [
+        ("domain_id", ctypes.c_uint16),
+        ("class_id", ctypes.c_uint),
+        ("cdp", ctypes.c_int),
+        ("u", PqosCaUnion)
+    ]
+
+
+class PqosL2ca(ctypes.Structure):
+    _fields_ = [
+        ("class_id", ctypes.c_uint),
+        ("cdp", ctypes.c_int),
+        ("u", PqosCaUnion)
+    ]
+
+
+class PqosMbaMemRegion(ctypes.Structure):
+    _fields_ = [
+        ("bw_ctrl_val", ctypes.c_int * PQOS_BW_CTRL_TYPE_COUNT),
+        ("region_num", ctypes.c_int)
+    ]
+
+
+class PqosMba(ctypes.Structure):
+    _fields_ = [
+        ("class_id", ctypes.c_uint),
+        ("mb_max", ctypes.c_uint),
+        ("ctrl", ctypes.c_int),
+        ("smba", ctypes.c_int),
+        ("domain_id", ctypes.c_uint16),
+        ("num_mem_regions", ctypes.c_int),
+        ("mem_regions", PqosMbaMemRegion * PQOS_MAX_MEM_REGIONS)
+    ]
+
+
+def _load_library(path=None):
+    if path is None:
+        path = os.environ.get("LIBPQOS") or ctypes.util.find_library("pqos")
+    if path is None:
+        raise OSError("libpqos not found, set LIBPQOS to the library path")
+
+    lib = ctypes.CDLL(path)
+
+    group_p = ctypes.c_void_p
+    uint_p = ctypes.POINTER(ctypes.c_uint)
+    uint64_p = ctypes.POINTER(ctypes.c_uint64)
+
+    prototypes = {
+        "pqos_init": [ctypes.POINTER(PqosConfig)],
+        "pqos_fini": [],
+        "pqos_mon_reset": [],
+        "pqos_mon_start_cores": [ctypes.c_uint, uint_p, ctypes.c_int, ctypes.c_void_p,
+                                 ctypes.c_void_p, ctypes.POINTER(group_p)],
+        "pqos_mon_start_pids2": [ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.c_int,
+                                 ctypes.c_void_p, ctypes.POINTER(group_p)],
+        "pqos_mon_stop": [group_p],
+        "pqos_mon_poll": [ctypes.POINTER(group_p), ctypes.c_uint],
+        "pqos_mon_get_value": [group_p, ctypes.c_int, uint64_p, uint64_p],
+        "pqos_mon_get_ipc": [group_p, ctypes.POINTER(ctypes.c_double)],
+        "pqos_mon_get_timestamp": [group_p, uint64_p, uint64_p],
+        "pqos_mon_get_rate": [group_p, ctypes.c_int, ctypes.POINTER(ctypes.c_double)],
+        "pqos_alloc_assoc_set": [ctypes.c_uint, ctypes.c_uint],
+        "pqos_alloc_assoc_get": [ctypes.c_uint, uint_p],
+        "pqos_alloc_assoc_set_pid": [ctypes.c_int, ctypes.c_uint],
+        "pqos_alloc_assoc_get_pid": [ctypes.c_int, uint_p],
+        "pqos_alloc_reset": [ctypes.c_int, ctypes.c_int, ctypes.c_int],
+        "pqos_l3ca_set": [ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(PqosL3ca)],
+        "pqos_l3ca_get": [ctypes.c_uint, ctypes.c_uint, uint_p, ctypes.POINTER(PqosL3ca)],
+        "pqos_l2ca_set": [ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(PqosL2ca)],
+        "pqos_l2ca_get": [ctypes.c_uint, ctypes.c_uint, uint_p, ctypes.POINTER(PqosL2ca)],
+        "pqos_mba_set": [ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(PqosMba),
+                         ctypes.POINTER(PqosMba)],
+        "pqos_mba_get": [ctypes.c_uint, ctypes.c_uint, uint_p, ctypes.POINTER(PqosMba)]
+    }
+
+    for name, argtypes in prototypes.items():
+        function = getattr(lib, name)
+        function.argtypes = argtypes
+        function.restype = ctypes.c_int
+
+    return lib
+
+
+class MonGroup:
+    """Monitoring group started by Pqos session"""
+
+    def __init__(self, pqos, pointer, events):
+        self.pqos = pqos
+        self.pointer = pointer
+        self.events = events
+
+    def value(self, event):
+        """Returns (value, delta) of event read during the last poll"""
+        value = ctypes.c_uint64()
+        delta = ctypes.c_uint64()
+        self.pqos.call("pqos_mon_get_value", self.pointer, PQOS_MON_EVENTS[event],
+                       ctypes.byref(value), ctypes.byref(delta))
+        return value.value, delta.value
+
+    def ipc(self):
+        value = ctypes.c_double()
+        self.pqos.call("pqos_mon_get_ipc", self.pointer, ctypes.byref(value))
+        return value.value
+
+    def timestamp(self):
+        """Returns (read time, elapsed time) of the last poll in ns"""
+        timestamp = ctypes.c_uint64()
+        elapsed = ctypes.c_uint64()
+        self.pqos.call("pqos_mon_get_timestamp", self.pointer,
+                       ctypes.byref(timestamp), ctypes.byref(elapsed))
+        return timestamp.value, elapsed.value
+
+    def rate(self, event):
+        """Returns event delta per second of the last poll"""
+        value = ctypes.c_double()
+        self.pqos.call("pqos_mon_get_rate", self.pointer, PQOS_MON_EVENTS[event],
+                       ctypes.byref(value))
+        return value.value
+
+    def stop(self):
+        if self.pointer:
+            self.pqos.call("pqos_mon_stop", self.pointer)
+            self.pointer = None
+
+
+class Pqos:
+    """
+    libpqos session
+
+    Session is initialized once and reused, see Pqos.get().
+    """
+
+    ## Shared session, kept open across tests
+    session = None
+
+    def __init__(self, interface="MSR", library=None, verbose=LOG_VER_SILENT):
+        self.lib = _load_library(library)
+        self.interface = interface
+
+        config = PqosConfig(fd_log=2, verbose=verbose,
+                            interface=PQOS_INTERFACES[interface])
+        self.call("pqos_init", ctypes.byref(config))
+        self.initialized = True
+
+    @staticmethod
+    def get(interface="MSR", library=None):
+        """Returns shared session for interface, reinitializing on interface change"""
+        session = Pqos.session
+        if session is not None and session.interface != interface:
+            session.fini()
+            session = None
+
+        if session is None:
+            session = Pqos(interface, library)
+            Pqos.session = session
+
+        return session
+
+    def call(self, function, *args):
+        retval = getattr(self.lib, function)(*args)
+        if retval != PQOS_RETVAL_OK:
+            raise PqosError(function, retval)
+
+    def fini(self):
+        if self.initialized:
+            self.initialized = False
+            self.call("pqos_fini")
+        if Pqos.session is self:
+            Pqos.session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fini()
+
+    @staticmethod
+    def _event_mask(events):
+        mask = 0
+        for event in events:
+            mask |= PQOS_MON_EVENTS[event]
+        return mask
+
+    def mon_reset(self):
+        self.call("pqos_mon_reset")
+
+    def mon_start_cores(self, cores, events):
+        group = ctypes.c_void_p()
+        core_array = (ctypes.c_uint * len(cores))(*cores)
+        self.call("pqos_mon_start_cores", len(cores), core_array, self._event_mask(events),
+                  None, None, ctypes.byref(group))
+        return MonGroup(self, group, list(events))
+
+    def mon_start_pids(self, pids, events):
+        group = ctypes.c_void_p()
+        pid_array = (ctypes.c_int * len(pids))(*pids)
+        self.call("pqos_mon_start_pids2", len(pids), pid_array, self._event_mask(events),
+                  None, ctypes.byref(group))
+        return MonGroup(self, group, list(events))
+
+    def mon_poll(self, groups):
+        group_array = (ctypes.c_void_p * len(groups))(*[group.pointer for group in groups])
+        self.call("pqos_mon_poll", group_array, len(groups))
+
+    def alloc_assoc_set(self, lcore, class_id):
+        self.call("pqos_alloc_assoc_set", lcore, class_id)
+
+    def alloc_assoc_get(self, lcore):
+        class_id = ctypes.c_uint()
+        self.call("pqos_alloc_assoc_get", lcore, ctypes.byref(class_id))
+        return class_id.value
+
+    def alloc_assoc_set_pid(self, pid, class_id):
+        self.call("pqos_alloc_assoc_set_pid", pid, class_id)
+
+    def alloc_assoc_get_pid(self, pid):
+        class_id = ctypes.c_uint()
+        self.call("pqos_alloc_assoc_get_pid", pid, ctypes.byref(class_id))
+        return class_id.value
+
+    def alloc_reset(self):
+        self.call("pqos_alloc_reset", PQOS_REQUIRE_CDP_ANY, PQOS_REQUIRE_CDP_ANY, PQOS_MBA_ANY)
+
+    def l3ca_set(self, l3cat_id, masks):
+        """Sets L3 CAT ways masks given as {class_id: mask}"""
+        ca = (PqosL3ca * len(masks))()
+        for i, (class_id, mask) in enumerate(sorted(masks.items())):
+            ca[i].class_id = class_id
+            ca[i].u.ways_mask = mask
+        self.call("pqos_l3ca_set", l3cat_id, len(masks), ca)
+
+    def l3ca_get(self, l3cat_id, max_cos=16):
+        """Returns {class_id: ways mask} of L3 CAT id"""
+        ca = (PqosL3ca * max_cos)()
+        num = ctypes.c_uint()
+        self.call("pqos_l3ca_get", l3cat_id, max_cos, ctypes.byref(num), ca)
+        return {ca[i].class_id: ca[i].u.ways_mask for i in range(num.value)}
+
+    def l2ca_set(self, l2id, masks):
+        """Sets L2 CAT ways masks given as {class_id: mask}"""
+        ca = (PqosL2ca * len(masks))()
+        for i, (class_id, mask) in enumerate(sorted(masks.items())):
+            ca[i].class_id = class_id
+            ca[i].u.ways_mask = mask
+        self.call("pqos_l2ca_set", l2id, len(masks), ca)
+
+    def l2ca_get(self, l2id, max_cos=16):
+        """Returns {class_id: ways mask} of L2 id"""
+        ca = (PqosL2ca * max_cos)()
+        num = ctypes.c_uint()
+        self.call("pqos_l2ca_get", l2id, max_cos, ctypes.byref(num), ca)
+        return {ca[i].class_id: ca[i].u.ways_mask for i in range(num.value)}
+
+    def mba_set(self, mba_id, rates, ctrl=False):
+        """Sets MBA rates given as {class_id: rate}, returns applied rates"""
+        requested = (PqosMba * len(rates))()
+        actual = (PqosMba * len(rates))()
+        for i, (class_id, rate) in enumerate(sorted(rates.items())):
+            requested[i].class_id = class_id
+            requested[i].mb_max = rate
+            requested[i].ctrl = int(ctrl)
+        self.call("pqos_mba_set", mba_id, len(rates), requested, actual)
+        return {actual[i].class_id: actual[i].mb_max for i in range(len(rates))}
+
+    def mba_get(self, mba_id, max_cos=16):
+        """Returns {class_id: rate} of MBA id"""
+        mba = (PqosMba * max_cos)()
+        num = ctypes.c_uint()
+        self.call("pqos_mba_get", mba_id, max_cos, ctypes.byref(num), mba)
+        return {mba[i].class_id: mba[i].mb_max for i in range(num.value)}
+
+
+class MonSampler:
+    """
+    Samples monitoring groups into preallocated NumPy arrays
+
+    values[sample, group, event] holds event values - deltas for bandwidth,
+    misses and references, occupancy for llc and ratio for ipc.
+    timestamps[sample] holds CLOCK_MONOTONIC time of each poll.
+    """
+
+    ## Events reported as delta between polls
+    DELTA_EVENTS = ("mbl", "mbt", "mbr", "llc_miss", "llc_ref")
+
+    def __init__(self, pqos, groups, events, num_samples):
+        self.pqos = pqos
+        self.groups = groups
+        self.events = list(events)
+        self.values = numpy.zeros((num_samples, len(groups), len(self.events)),
+                                  dtype=numpy.float64)
+        self.timestamps = numpy.zeros(num_samples, dtype=numpy.float64)
+        self.count = 0
+
+    def sample(self):
+        """Polls all groups and stores values in the next row"""
+        if self.count >= len(self.timestamps):
+            raise IndexError("sample buffer full")
+
+        self.pqos.mon_poll(self.groups)
+        self.timestamps[self.count] = time.monotonic()
+
+        row = self.values[self.count]
+        for i, group in enumerate(self.groups):
+            for j, event in enumerate(self.events):
+                if event == "ipc":
+                    row[i, j] = group.ipc()
+                    continue
+                value, delta = group.value(event)
+                row[i, j] = delta if event in self.DELTA_EVENTS else value
+
+        self.count += 1
+
+    def run(self, interval, num_samples=None):
+        """Takes num_samples samples (all remaining by default) every interval seconds"""
+        if num_samples is None:
+            num_samples = len(self.timestamps) - self.count
+
+        deadline = time.monotonic()
+        for _ in range(num_samples):
+            self.sample()
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        return self.values[:self.count], self.timestamps[:self.count]
@@ -0,0 +1,229 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+
+"""
+Reader of pqos binary monitoring output written with -u bin or -u binz
+
+The file is memory-mapped and each data block is decoded with vectorized
+NumPy operations into per-counter arrays of shape (samples, groups).
+Counters hold raw values as recorded by pqos, rates can be derived with
+MonitorBinData.to_monitor_data() which produces the same columns as the
+csv parser in monitor_output.
+"""
+
+import mmap
+import struct
+import zlib
+import numpy
+
+from testlib.monitor_output import MonitorData
+
+MAGIC = b"PQOSMON\0"
+VERSION = 1
+
+ENC_RAW = 0
+ENC_ZLIB = 1
+
+## Column ids mapped to counter names
+COLUMNS = {
+    0: "llc",
+    1: "mbl",
+    2: "mbr",
+    3: "mbt",
+    4: "misses",
+    5: "references",
+    6: "ipc_retired",
+    7: "ipc_unhalted"
+}
+
+## Monitoring event bits of counters
+EVENTS = {
+    "llc": 0x1,
+    "mbl": 0x2,
+    "mbt": 0x4,
+    "mbr": 0x8,
+    "misses": 0x4000,
+    "references": 0x10000,
+    "ipc_retired": 0x8000,
+    "ipc_unhalted": 0x8000
+}
+
+_FILE_HEADER = struct.Struct("<8sIIQI")
+_BLOCK_HEADER = struct.Struct("<IIII")
+
+
+def _decode_varints(payload):
+    """Decodes zigzag LEB128 varints into int64 array"""
+    data = numpy.frombuffer(payload, dtype=numpy.uint8)
+    ends = numpy.flatnonzero(data < 0x80)
+    if len(ends) == 0 or ends[-1] != len(data) - 1:
+        raise ValueError("Truncated varint")
+
+    starts = numpy.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shift = (numpy.arange(len(data)) - numpy.repeat(starts, ends - starts + 1)) * 7
+    parts = (data & 0x7f).astype(numpy.uint64) << shift.astype(numpy.uint64)
+    values = numpy.add.reduceat(parts, starts)
+
+    return (values >> numpy.uint64(1)).astype(numpy.int64) ^ \
+        -(values & numpy.uint64(1)).astype(numpy.int64)
+
+
+class MonitorBinData:
+    """Content of binary monitoring file"""
+
+    def __init__(self, interval_us, groups, events, time_ns, counters):
+        self.interval_us = interval_us
+        self.groups = groups
+        self.events = events
+        self.time_ns = time_ns
+        self.counters = counters
+
+    def __len__(self):
+        return len(self.time_ns)
+
+    def __getitem__(self, name):
+        return self.counters[name]
+
+    @property
+    def time(self):
+        """Sample times as datetime64[ns] in UTC"""
+        return self.time_ns.astype("datetime64[ns]")
+
+    def to_monitor_data(self):
+        """
+        Converts counters into rows of rates as reported by csv output
+
+        Rates need a previous sample so the first sample is skipped.
+        Counters of groups not monitoring the event are NaN.
+        """
+        data = MonitorData()
+        samples = len(self) - 1
+        if samples < 1:
+            return data
+
+        num_groups = len(self.groups)
+        elapsed = numpy.diff(self.time_ns).astype(numpy.float64) / 1e9
+        elapsed = numpy.repeat(elapsed, num_groups)
+        delta = {name: numpy.diff(values, axis=0).reshape(-1).astype(numpy.float64)
+                 for name, values in self.counters.items()}
+
+        chunk = {
+            "time": numpy.repeat(self.time[1:], num_groups).astype("datetime64[us]"),
+            "group": numpy.tile(numpy.array(self.groups, dtype=str), samples)
+        }
+
+        if "ipc_retired" in delta and "ipc_unhalted" in delta:
+            with numpy.errstate(invalid="ignore", divide="ignore"):
+                ipc = delta["ipc_retired"] / delta["ipc_unhalted"]
+            chunk["ipc"] = numpy.where(delta["ipc_unhalted"] > 0, ipc, 0.0)
+        for name in ("misses", "references"):
+            if name in delta:
+                chunk[name] = delta[name]
+        if "llc" in self.counters:
+            chunk["llc"] = self.counters["llc"][1:].reshape(-1).astype(numpy.float64) / 1024
+        for name in ("mbl", "mbr", "mbt"):
+            if name in delta:
+                with numpy.errstate(invalid="ignore", divide="ignore"):
+                    chunk[name] = delta[name] / (1024 * 1024) / elapsed
+
+        events = numpy.tile(self.events, samples)
+        for name, values in chunk.items():
+            bit = EVENTS.get("ipc_retired" if name == "ipc" else name)
+            if bit is not None:
+                values[(events & bit) == 0] = numpy.nan
+
+        data.append(chunk)
+        return data
+
+
+def read(path):
+    """
+    Reads binary monitoring file
+
+    Returns:
+        MonitorBinData with counters of shape (samples, groups)
+    """
+    with open(path, "rb") as fd, mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+        magic, version, num_columns, interval_us, num_groups = \
+            _FILE_HEADER.unpack_from(mem, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a binary monitoring file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported version {version}")
+        offset = _FILE_HEADER.size
+
+        columns = struct.unpack_from(f"<{num_columns}I", mem, offset)
+        offset += 4 * num_columns
+        names = [COLUMNS[column] for column in columns]
+
+        groups = []
+        events = numpy.zeros(num_groups, dtype=numpy.uint32)
+        for i in range(num_groups):
+            events[i], length = struct.unpack_from("<II", mem, offset)
+            offset += 8
+            groups.append(mem[offset:offset + length].decode("utf-8", errors="replace"))
+            offset += length
+
+        width = 1 + num_groups * num_columns
+        blocks = []
+        while offset + _BLOCK_HEADER.size <= len(mem):
+            encoding, samples, raw_size, size = _BLOCK_HEADER.unpack_from(mem, offset)
+            offset += _BLOCK_HEADER.size
+            if offset + size > len(mem):
+                raise ValueError("Truncated data block")
+            payload = memoryview(mem)[offset:offset + size]
+            offset += size
+            if encoding == ENC_ZLIB:
+                payload = zlib.decompress(payload)
+            elif encoding != ENC_RAW:
+                raise ValueError(f"Unknown block encoding {encoding}")
+            if len(payload) != raw_size:
+                raise ValueError("Invalid data block size")
+
+            deltas = _decode_varints(payload)
+            if len(deltas) != samples * width:
+                raise ValueError("Invalid number of values in data block")
+            # first record of a block is stored against 0
+            blocks.append(numpy.cumsum(deltas.reshape(samples, width), axis=0,
+                                       dtype=numpy.int64))
+            del payload
+
+    values = numpy.concatenate(blocks) if blocks else numpy.zeros((0, width), numpy.int64)
+    values = values.view(numpy.uint64)
+    counters = {}
+    for i, name in enumerate(names):
+        counters[name] = values[:, 1 + i::num_columns]
+    return MonitorBinData(interval_us, groups, events, values[:, 0].view(numpy.int64),
+                          counters)
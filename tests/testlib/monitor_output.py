@@ -0,0 +1,354 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+"""
+Streaming parser of pqos monitoring output written with -u csv or -u xml
+
+Rows are converted to typed columns in chunks: time as datetime64[us],
+group identifiers (core, pid, channel, socket) as strings and counters as
+float64 with NaN for empty fields. Input can be fed incrementally, tailed
+from a file that is still being written or read from memory-mapped file.
+"""
+
+import csv
+import mmap
+import os
+import re
+import time
+import numpy
+
+## CSV header names mapped to column names
+CSV_COLUMNS = {
+    "Time": "time",
+    "Core": "core",
+    "PID": "pid",
+    "Channel": "channel",
+    "Socket": "socket",
+    "Group": "group",
+    "RMID": "rmid",
+    "IPC": "ipc",
+    "LLC Misses": "misses",
+    "LLC References": "references",
+    "LLC[KB]": "llc",
+    "LLC[%]": "llc_percent",
+    "MBL[MB/s]": "mbl",
+    "MBR[MB/s]": "mbr",
+    "MBT[MB/s]": "mbt",
+    "LLC Misses Read": "misses_read",
+    "LLC Misses Write": "misses_write",
+    "LLC References Read": "references_read",
+    "LLC References Write": "references_write"
+}
+
+## XML node names mapped to column names
+XML_COLUMNS = {
+    "time": "time",
+    "core": "core",
+    "pid": "pid",
+    "channel": "channel",
+    "socket": "socket",
+    "rmid": "rmid",
+    "ipc": "ipc",
+    "llc_misses": "misses",
+    "llc_references": "references",
+    "l3_occupancy_kB": "llc",
+    "l3_occupancy_percent": "llc_percent",
+    "mbm_local_MB": "mbl",
+    "mbm_remote_MB": "mbr",
+    "mbm_total_MB": "mbt",
+    "llc_misses_read": "misses_read",
+    "llc_misses_write": "misses_write",
+    "llc_references_read": "references_read",
+    "llc_references_write": "references_write"
+}
+
+## Columns identifying monitoring group
+GROUP_COLUMNS = ("core", "pid", "channel", "socket", "group")
+
+XML_FIELD_RE = re.compile(r"^\s*<(\w+)>(.*)</\1>\s*$")
+MBT_REGION_RE = re.compile(r"^MBT-r(\d+)\[MB/s\]$")
+
+
+def _column_name_csv(name):
+    name = name.strip()
+    match = MBT_REGION_RE.match(name)
+    if match:
+        return f"mbt_r{match.group(1)}"
+    return CSV_COLUMNS.get(name, name)
+
+
+def _to_array(name, values):
+    if name == "time":
+        return numpy.array([value.replace(" ", "T") if value else "NaT" for value in values],
+                           dtype="datetime64[us]")
+    if name in GROUP_COLUMNS:
+        return numpy.array(values, dtype=str)
+    return numpy.array([float(value) if value else numpy.nan for value in values],
+                       dtype=numpy.float64)
+
+
+class MonitorData:
+    """Columnar monitoring data built from parsed chunks"""
+
+    def __init__(self):
+        self.chunks = []
+        self.columns = None
+
+    def append(self, chunk):
+        if chunk:
+            self.chunks.append(chunk)
+            self.columns = None
+
+    def _merge(self):
+        if self.columns is not None:
+            return self.columns
+
+        names = []
+        for chunk in self.chunks:
+            names += [name for name in chunk if name not in names]
+
+        self.columns = {}
+        for name in names:
+            arrays = []
+            for chunk in self.chunks:
+                if name in chunk:
+                    arrays.append(chunk[name])
+                else:
+                    rows = len(next(iter(chunk.values())))
+                    arrays.append(_to_array(name, [""] * rows))
+            self.columns[name] = numpy.concatenate(arrays)
+
+        # keep single chunk so further appends merge quickly
+        self.chunks = [self.columns] if self.columns else []
+        return self.columns
+
+    def __len__(self):
+        columns = self._merge()
+        if not columns:
+            return 0
+        return len(next(iter(columns.values())))
+
+    def __contains__(self, name):
+        return name in self._merge()
+
+    def __getitem__(self, name):
+        return self._merge()[name]
+
+    def names(self):
+        return list(self._merge())
+
+    def group_column(self):
+        """Returns name of column identifying monitoring group"""
+        columns = self._merge()
+        # pid output contains core column too, pid identifies the group
+        for name in ("pid", "core", "channel", "socket", "group"):
+            if name in columns:
+                return name
+        return None
+
+    def aggregate(self, column, func="mean", by=None):
+        """
+        Aggregates column per monitoring group, ignoring empty values
+
+        Parameters:
+            column: column name e.g. "mbl"
+            func: one of "mean", "sum", "min", "max", "count"
+            by: group column, detected by default
+        Returns:
+            dictionary {group id: aggregated value}
+        """
+        by = by if by else self.group_column()
+        keys, inverse = numpy.unique(self[by], return_inverse=True)
+        values = self[column]
+        valid = ~numpy.isnan(values)
+        inverse = inverse[valid]
+        values = values[valid]
+
+        count = numpy.bincount(inverse, minlength=len(keys))
+        if func == "count":
+            result = count.astype(numpy.float64)
+        elif func in ("sum", "mean"):
+            result = numpy.bincount(inverse, weights=values, minlength=len(keys))
+            if func == "mean":
+                with numpy.errstate(invalid="ignore", divide="ignore"):
+                    result = result / count
+        elif func in ("min", "max"):
+            fill = numpy.inf if func == "min" else -numpy.inf
+            result = numpy.full(len(keys), fill)
+            ufunc = numpy.minimum if func == "min" else numpy.maximum
+            ufunc.at(result, inverse, values)
+            result[count == 0] = numpy.nan
+        else:
+            raise ValueError(f"Unknown aggregation {func}")
+
+        return dict(zip(keys.tolist(), result.tolist()))
+
+
+class CsvParser:
+    """Incremental parser of pqos -u csv output"""
+
+    def __init__(self):
+        self.header = None
+        self.pending = ""
+
+    def feed(self, data):
+        """Parses complete lines from data, returns chunk of columns"""
+        text = self.pending + data
+        lines = text.split("\n")
+        self.pending = lines.pop()
+
+        rows = []
+        for fields in csv.reader(line for line in lines if line.strip()):
+            if self.header is None or fields[0] == "Time":
+                self.header = [_column_name_csv(field) for field in fields]
+                continue
+            rows.append(fields)
+
+        if not rows or self.header is None:
+            return {}
+
+        chunk = {}
+        for i, name in enumerate(self.header):
+            chunk[name] = _to_array(name, [row[i].strip() if i < len(row) else ""
+                                           for row in rows])
+        return chunk
+
+
+class XmlParser:
+    """Incremental parser of pqos -u xml output"""
+
+    def __init__(self):
+        self.pending = ""
+        self.record = None
+
+    def feed(self, data):
+        """Parses complete records from data, returns chunk of columns"""
+        text = self.pending + data
+        lines = text.split("\n")
+        self.pending = lines.pop()
+
+        records = []
+        for line in lines:
+            line = line.strip()
+            if line == "<record>":
+                self.record = {}
+            elif line == "</record>":
+                if self.record is not None:
+                    records.append(self.record)
+                self.record = None
+            elif self.record is not None:
+                match = XML_FIELD_RE.match(line)
+                if match:
+                    name = XML_COLUMNS.get(match.group(1), match.group(1))
+                    self.record[name] = match.group(2)
+
+        if not records:
+            return {}
+
+        names = []
+        for record in records:
+            names += [name for name in record if name not in names]
+
+        return {name: _to_array(name, [record.get(name, "") for record in records])
+                for name in names}
+
+
+def _detect_parser(data):
+    if data.lstrip().startswith("<?xml") or data.lstrip().startswith("<records>"):
+        return XmlParser()
+    return CsvParser()
+
+
+def parse(text):
+    """Parses complete csv or xml output given as string"""
+    data = MonitorData()
+    parser = _detect_parser(text)
+    data.append(parser.feed(text if text.endswith("\n") else text + "\n"))
+    return data
+
+
+def parse_file(path, chunk_size=64 * 1024 * 1024):
+    """
+    Parses csv or xml output file using memory mapping
+
+    File is processed in chunks of chunk_size bytes so memory used for
+    intermediate text stays bounded regardless of the file size.
+    """
+    data = MonitorData()
+    if os.path.getsize(path) == 0:
+        return data
+
+    with open(path, "rb") as fd, mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+        parser = _detect_parser(mem[:256].decode("utf-8", errors="replace"))
+        offset = 0
+        while offset < len(mem):
+            end = min(offset + chunk_size, len(mem))
+            data.append(parser.feed(mem[offset:end].decode("utf-8", errors="replace")))
+            offset = end
+        data.append(parser.feed("\n"))
+
+    return data
+
+
+def tail(path, interval=0.1, timeout=None, stop=None):
+    """
+    Follows output file that is still being written
+
+    Yields MonitorData with all rows parsed so far each time new rows appear.
+
+    Parameters:
+        path: output file
+        interval: polling interval in seconds
+        timeout: stop after timeout seconds without new data, None waits forever
+        stop: optional callable, tailing ends when it returns True
+    """
+    data = MonitorData()
+    parser = None
+    idle_since = time.monotonic()
+
+    with open(path, "rb") as fd:
+        while stop is None or not stop():
+            block = fd.read()
+            if block:
+                text = block.decode("utf-8", errors="replace")
+                if parser is None:
+                    parser = _detect_parser(text)
+                chunk = parser.feed(text)
+                idle_since = time.monotonic()
+                if chunk:
+                    data.append(chunk)
+                    yield data
+                continue
+
+            if timeout is not None and time.monotonic() - idle_since >= timeout:
+                break
+            time.sleep(interval)
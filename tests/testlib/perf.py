@@ -31,13 +31,14 @@
 ################################################################################
 
 import os
+from .fake_resctrl import FakeResctrl
 
 PERF_MON_PATH = "/sys/devices/intel_cqm"
 
 
 class Perf:
     def __init__(self):
-        self.root = PERF_MON_PATH
+        self.root = FakeResctrl.path(PERF_MON_PATH)
 
     def is_mon_event_supported(self, event_name):
         event_path = os.path.join(self.root, "events", event_name)
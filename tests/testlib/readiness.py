@@ -0,0 +1,182 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+import os
+import select
+import time
+import psutil
+
+## Default deadline for readiness probes in seconds
+READY_TIMEOUT = 10
+## Default polling interval in seconds
+READY_INTERVAL = 0.05
+
+
+def wait_until(predicate, timeout=READY_TIMEOUT, interval=READY_INTERVAL):
+    """
+    Polls predicate until it is met or deadline expires
+
+    Parameters:
+        predicate: callable returning True when condition is met
+        timeout: deadline in seconds
+        interval: polling interval in seconds
+    Returns:
+        True if condition was met before the deadline
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def wait_output(stream, marker, timeout=READY_TIMEOUT):
+    """
+    Reads stream line by line until line containing marker appears
+
+    Output is read from the underlying file descriptor, bypassing Python
+    buffering that select() cannot see. Output read past the marker line
+    is not returned to the stream.
+
+    Parameters:
+        stream: readable pipe, e.g. stdout of a subprocess
+        marker: str or bytes to look for, matching stream mode
+        timeout: deadline in seconds
+    Returns:
+        True if marker was found, False on deadline or end of stream
+    """
+    if isinstance(marker, str):
+        marker = marker.encode()
+
+    fd = stream.fileno()
+    pending = b""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            return False
+
+        data = os.read(fd, 4096)
+        if not data:
+            return marker in pending
+
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        if any(marker in line for line in lines):
+            return True
+
+
+def get_rss(pid, children=True):
+    """
+    Returns resident set size of process in bytes
+
+    Parameters:
+        pid: process id
+        children: include all descendants, e.g. workload started by rdtset
+    """
+    try:
+        process = psutil.Process(pid)
+        processes = [process]
+        if children:
+            processes += process.children(recursive=True)
+
+        rss = 0
+        for proc in processes:
+            try:
+                rss += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss
+    except psutil.Error:
+        return 0
+
+
+def wait_rss(pid, min_rss, timeout=READY_TIMEOUT):
+    """
+    Waits until workload resident memory reaches min_rss bytes
+
+    memtester locks its buffer in memory before it starts testing, so the
+    workload is warm once its RSS covers the buffer.
+    """
+    return wait_until(lambda: get_rss(pid) >= min_rss, timeout)
+
+
+def read_mon_counter(group_path, event):
+    """
+    Returns sum of resctrl mon_data event counter over all domains
+
+    Parameters:
+        group_path: path to resctrl control or monitoring group
+        event: mon_data event name e.g. llc_occupancy, mbm_local_bytes
+    """
+    total = 0
+    mon_data = os.path.join(group_path, "mon_data")
+    if not os.path.isdir(mon_data):
+        return 0
+
+    for domain in os.scandir(mon_data):
+        try:
+            # pylint: disable=unspecified-encoding
+            with open(os.path.join(domain.path, event), 'r') as fd:
+                total += int(fd.read().strip())
+        except (OSError, ValueError):
+            pass
+    return total
+
+
+def wait_llc_occupancy(group_path, min_bytes, timeout=READY_TIMEOUT):
+    """Waits until LLC occupancy of resctrl group crosses min_bytes"""
+    return wait_until(lambda: read_mon_counter(group_path, "llc_occupancy") >= min_bytes,
+                      timeout)
+
+
+def wait_bandwidth(group_path, min_bytes_per_sec, event="mbm_local_bytes",
+                   timeout=READY_TIMEOUT, window=0.1):
+    """
+    Waits until memory bandwidth of resctrl group crosses min_bytes_per_sec
+
+    Bandwidth is measured over window seconds between two counter reads.
+    """
+    def bandwidth_ready():
+        start_value = read_mon_counter(group_path, event)
+        start = time.monotonic()
+        time.sleep(window)
+        delta = read_mon_counter(group_path, event) - start_value
+        return delta / (time.monotonic() - start) >= min_bytes_per_sec
+
+    return wait_until(bandwidth_ready, timeout, interval=0)
@@ -33,9 +33,163 @@
 import os
 import re
 import subprocess
-import pexpect
+from .fake_resctrl import FakeResctrl
 
 RESCTRL_ROOT_PATH = "/sys/fs/resctrl"
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+
+## Directories in resctrl root that are not control groups
+RESCTRL_SPECIAL_DIRS = ("info", "mon_data", "mon_groups")
+
+
+def _unescape_mountinfo(field):
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), field)
+
+
+def get_mounts(fstype=None, path=MOUNTINFO_PATH):
+    """
+    Parses mountinfo
+
+    Parameters:
+        fstype: return only mounts of given filesystem type
+        path: mountinfo file
+    Returns:
+        list of dictionaries with mount_point, fstype, source, mount_options
+        and super_options keys, options are stored as lists
+    """
+    mounts = []
+
+    # pylint: disable=unspecified-encoding
+    with open(path, 'r') as mountinfo:
+        for line in mountinfo:
+            fields = line.split()
+            if "-" not in fields:
+                continue
+            separator = fields.index("-")
+            if len(fields) < separator + 3:
+                continue
+
+            mount = {
+                "mount_point": _unescape_mountinfo(fields[4]),
+                "mount_options": fields[5].split(","),
+                "fstype": fields[separator + 1],
+                "source": _unescape_mountinfo(fields[separator + 2]),
+                "super_options": fields[separator + 3].split(",")
+                                 if len(fields) > separator + 3 else []
+            }
+
+            if fstype is None or mount["fstype"] == fstype:
+                mounts.append(mount)
+
+    return mounts
+
+
+def _read_file(path):
+    try:
+        # pylint: disable=unspecified-encoding
+        with open(path, 'r') as fd:
+            return fd.read()
+    except OSError:
+        return None
+
+
+def _read_counter(path):
+    value = _read_file(path)
+    if value is None:
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        # "Unavailable" or "Error" reported by kernel
+        return None
+
+
+def _parse_tasks(data):
+    if data is None:
+        return []
+    return [int(task) for task in data.split()]
+
+
+class ResctrlGroup:
+    """Snapshot of resctrl control or monitoring group"""
+
+    def __init__(self, name, path, ctrl=True):
+        """
+        Reads group state
+
+        Parameters:
+            name: group name, "" for default group
+            path: group directory
+            ctrl: True for control group, False for monitoring group
+        """
+        self.name = name
+        self.path = path
+
+        # None for monitoring groups
+        self.schemata = None
+        if ctrl and os.path.exists(os.path.join(path, "schemata")):
+            self.schemata = ResctrlSchemata(os.path.join(path, "schemata"))
+
+        cpus_list = _read_file(os.path.join(path, "cpus_list"))
+        self.cpus_list = cpus_list.strip() if cpus_list is not None else None
+        self.tasks = _parse_tasks(_read_file(os.path.join(path, "tasks")))
+
+        # {domain directory: {counter: value}}
+        self.mon_data = {}
+        mon_data = os.path.join(path, "mon_data")
+        if os.path.isdir(mon_data):
+            for domain in os.scandir(mon_data):
+                if not domain.is_dir():
+                    continue
+                self.mon_data[domain.name] = {
+                    counter.name: _read_counter(counter.path)
+                    for counter in os.scandir(domain.path) if counter.is_file()
+                }
+
+        # monitoring groups of control group
+        self.mon_groups = {}
+        mon_groups = os.path.join(path, "mon_groups")
+        if ctrl and os.path.isdir(mon_groups):
+            for entry in os.scandir(mon_groups):
+                if entry.is_dir():
+                    self.mon_groups[entry.name] = ResctrlGroup(entry.name, entry.path,
+                                                               ctrl=False)
+
+    def get_counter(self, counter):
+        """Returns sum of counter over all domains, None when unavailable"""
+        values = [domain.get(counter) for domain in self.mon_data.values()]
+        if not values or None in values:
+            return None
+        return sum(values)
+
+
+class ResctrlSnapshot:
+    """State of mounted resctrl filesystem read in one pass"""
+
+    def __init__(self, root):
+        self.root = root
+
+        # {name: ResctrlGroup}, default group is stored as ""
+        self.groups = {}
+
+        if not os.path.isdir(os.path.join(root, "info")):
+            return
+
+        self.groups[""] = ResctrlGroup("", root)
+        for entry in os.scandir(root):
+            if entry.is_dir() and entry.name not in RESCTRL_SPECIAL_DIRS:
+                self.groups[entry.name] = ResctrlGroup(entry.name, entry.path)
+
+    def get_ctrl_group_count(self):
+        return len(self.groups)
+
+    def get_mon_groups(self):
+        """Returns list of all monitoring groups"""
+        mon_groups = []
+        for group in self.groups.values():
+            mon_groups += group.mon_groups.values()
+        return mon_groups
 
 
 class ResctrlSchemata:
@@ -79,7 +233,7 @@ class ResctrlSchemata:
 
 class Resctrl:
     def __init__(self):
-        self.root = RESCTRL_ROOT_PATH
+        self.root = FakeResctrl.path(RESCTRL_ROOT_PATH)
 
     def run_cmd(self, command):
         with subprocess.Popen(command.split(), stdin=subprocess.PIPE,
@@ -94,11 +248,21 @@ class Resctrl:
             return stdout, stderr, child.returncode
 
     def is_mounted(self):
-        command = "mount -t resctrl"
-        output, _, _ = self.run_cmd(command)
-        return "resctrl" in output and self.root in output and "rw" in output
+        fake = FakeResctrl.active()
+        if fake:
+            return fake.is_mounted()
+
+        for mount in get_mounts("resctrl"):
+            if mount["mount_point"] == self.root and "rw" in mount["mount_options"]:
+                return True
+
+        return False
 
     def mount(self, cdp=False, cdpl2=False, mba_mbps=False):
+        fake = FakeResctrl.active()
+        if fake:
+            return fake.mount(cdp=cdp, cdpl2=cdpl2, mba_mbps=mba_mbps)
+
         options_str = ''
         options = []
 
@@ -117,6 +281,10 @@ class Resctrl:
         return self.is_mounted()
 
     def umount(self):
+        fake = FakeResctrl.active()
+        if fake:
+            return fake.umount()
+
         command = "umount -a -t resctrl"
         self.run_cmd(command)
         return not self.is_mounted()
@@ -136,6 +304,40 @@ class Resctrl:
 
         return [line.strip() for line in lines]
 
+    def is_default(self):
+        """
+        Checks if mounted resctrl is in default state: CDP disabled, no
+        control or monitoring groups created and default schemata
+        """
+        for entry in os.scandir(os.path.join(self.root, "info")):
+            if entry.name.endswith("CODE") or entry.name.endswith("DATA"):
+                return False
+
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and entry.name not in ("info", "mon_data", "mon_groups"):
+                return False
+
+        mon_groups = os.path.join(self.root, "mon_groups")
+        if os.path.isdir(mon_groups) and any(os.scandir(mon_groups)):
+            return False
+
+        schemata = self.get_schemata()
+        for label, values in schemata.data.items():
+            if label == "MB":
+                default = 100
+            else:
+                cbm_mask = os.path.join(self.root, "info", label, "cbm_mask")
+                if not os.path.exists(cbm_mask):
+                    continue
+                # pylint: disable=unspecified-encoding
+                with open(cbm_mask, 'r') as mask_file:
+                    default = int(mask_file.read().strip(), 16)
+
+            if any(value != default for value in values):
+                return False
+
+        return True
+
     def get_schemata_path(self, cos=0):
         if cos == 0:
             return os.path.join(self.root, "schemata")
@@ -147,18 +349,17 @@ class Resctrl:
         return ResctrlSchemata(path)
 
 
-    @staticmethod
-    def get_ctrl_group_count():
-        ctrl_group_count = 0
-
-        command = f'bash -c "ls {RESCTRL_ROOT_PATH}"'
-        output, exit_code = pexpect.run(command, withexitstatus=True)
+    def snapshot(self):
+        """
+        Reads schemata, cpus_list, tasks and mon_data counters of all control
+        and monitoring groups
 
-        if exit_code == 0:
-            ctrl_group_count = 1
+        Returns:
+            ResctrlSnapshot, without groups when resctrl is not mounted
+        """
+        return ResctrlSnapshot(self.root)
 
-            command = f'bash -c "ls {RESCTRL_ROOT_PATH} | grep COS | wc -l"'
-            output = pexpect.run(command)
-            ctrl_group_count += int(output)
 
-        return ctrl_group_count
+    @staticmethod
+    def get_ctrl_group_count():
+        return Resctrl().snapshot().get_ctrl_group_count()
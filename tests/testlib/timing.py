@@ -0,0 +1,113 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+"""
+Timing of test phases and tool invocations
+
+Records are collected in the process running the test and attached to pytest
+reports by plugins.pytest_report, so they also reach the report when tests
+are run in forked workers.
+"""
+
+import contextlib
+import os
+import time
+
+
+class Timing:
+    """Collects (kind, name, seconds) records of the running test"""
+
+    ## Records not yet attached to a report
+    records = []
+
+    @staticmethod
+    def record(kind, name, seconds):
+        """
+        Adds timing record
+
+        Parameters:
+            kind: "phase" or "tool"
+            name: phase name or tool command line
+            seconds: wall time
+        """
+        Timing.records.append((kind, name, seconds))
+
+    @staticmethod
+    @contextlib.contextmanager
+    def phase(name):
+        """Measures wall time of the block as test phase"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            Timing.record("phase", name, time.monotonic() - start)
+
+    @staticmethod
+    def tool_name(command):
+        """
+        Returns record name of tool command line
+
+        Values of the options, e.g. core lists and PIDs, differ between runs,
+        so only the tool name and the option names are kept.
+
+        Parameters:
+            command: tool command line
+        Returns:
+            tool basename followed by option names
+        """
+        args = command.split()
+        if not args:
+            return command
+
+        name = [os.path.basename(args[0])]
+        for arg in args[1:]:
+            if arg.startswith("-"):
+                name.append(arg.split("=", 1)[0])
+        return " ".join(name)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def tool(command):
+        """Measures wall time of the block as tool invocation"""
+        name = Timing.tool_name(command)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            Timing.record("tool", name, time.monotonic() - start)
+
+    @staticmethod
+    def drain():
+        """Returns and clears collected records"""
+        records = Timing.records
+        Timing.records = []
+        return records
@@ -0,0 +1,73 @@
+################################################################################
+# BSD LICENSE
+#
+# Copyright(c) 2019-2026 Intel Corporation. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the
+#     distribution.
+#   * Neither the name of Intel Corporation nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+################################################################################
+
+"""
+Serialization of tool runs between forked test workers
+
+libpqos allows only one process to use the library at a time (see lib/lock.c),
+so tests run concurrently by plugins.pytest_rdt must not start pqos or rdtset
+at the same time. Lock is reentrant within a process, so a tool started in
+background may be held while further commands are run.
+"""
+
+import contextlib
+import fcntl
+import os
+import tempfile
+
+
+class ToolLock:
+    """Exclusive lock shared by all test processes"""
+
+    ## Lock file shared by the workers
+    path = os.path.join(tempfile.gettempdir(), "rdt-tests-tool.lock")
+
+    ## Lock file descriptor and nesting depth of the current process
+    fd = None
+    depth = 0
+
+    @staticmethod
+    @contextlib.contextmanager
+    def held():
+        """Holds the lock for the duration of the block"""
+        if ToolLock.depth == 0:
+            ToolLock.fd = os.open(ToolLock.path, os.O_RDWR | os.O_CREAT, 0o666)
+            fcntl.flock(ToolLock.fd, fcntl.LOCK_EX)
+        ToolLock.depth += 1
+        try:
+            yield
+        finally:
+            ToolLock.depth -= 1
+            if ToolLock.depth == 0:
+                fcntl.flock(ToolLock.fd, fcntl.LOCK_UN)
+                os.close(ToolLock.fd)
+                ToolLock.fd = None
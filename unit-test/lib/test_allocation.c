@@ -31,6 +31,9 @@
  */
 
 #include "allocation.h"
+#include "cpu_registers.h"
+#include "machine.h"
+#include "mock_machine.h"
 #include "test.h"
 
 /* ======== pqos_alloc_init ======== */
@@ -57,17 +60,58 @@ test_pqos_alloc_init_os(void **state __attribute__((unused)))
 static void
 test_pqos_alloc_init_msr(void **state __attribute__((unused)))
 {
-        const struct pqos_cpuinfo cpu;
-        const struct pqos_cap cap;
+        struct pqos_cpuinfo cpu;
+        struct pqos_cap cap;
         const struct pqos_config cfg;
         int ret;
 
+        /* no RDT capabilities - associations are not prefetched */
+        memset(&cpu, 0, sizeof(cpu));
+        memset(&cap, 0, sizeof(cap));
+
         will_return(__wrap__pqos_get_inter, PQOS_INTER_MSR);
 
         ret = pqos_alloc_init(&cpu, &cap, &cfg);
         assert_int_equal(ret, PQOS_RETVAL_OK);
 }
 
+static void
+test_pqos_alloc_init_msr_prefetch(void **state __attribute__((unused)))
+{
+        struct pqos_cpuinfo *cpu;
+        struct pqos_cap *cap;
+        const struct pqos_config cfg;
+        unsigned i;
+        int ret;
+
+        cpu = calloc(1, sizeof(*cpu) + 2 * sizeof(cpu->cores[0]));
+        cap = calloc(1, sizeof(*cap) + sizeof(cap->capabilities[0]));
+        assert_non_null(cpu);
+        assert_non_null(cap);
+
+        cpu->num_cores = 2;
+        cpu->cores[0].lcore = 0;
+        cpu->cores[1].lcore = 1;
+        cap->num_cap = 1;
+        cap->capabilities[0].type = PQOS_CAP_TYPE_L3CA;
+
+        will_return(__wrap__pqos_get_inter, PQOS_INTER_MSR);
+
+        /* associations of all cores are read in one batch */
+        for (i = 0; i < cpu->num_cores; i++) {
+                expect_value(__wrap_msr_read, lcore, cpu->cores[i].lcore);
+                expect_value(__wrap_msr_read, reg, PQOS_MSR_ASSOC);
+                will_return(__wrap_msr_read, MACHINE_RETVAL_OK);
+                will_return(__wrap_msr_read, 0);
+        }
+
+        ret = pqos_alloc_init(cpu, cap, &cfg);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        free(cpu);
+        free(cap);
+}
+
 int
 main(void)
 {
@@ -78,6 +122,7 @@ main(void)
             cmocka_unit_test(test_pqos_alloc_init_os),
 #endif
             cmocka_unit_test(test_pqos_alloc_init_msr),
+            cmocka_unit_test(test_pqos_alloc_init_msr_prefetch),
         };
 
         result += cmocka_run_group_tests(tests, NULL, NULL);
@@ -2102,6 +2102,454 @@ test_pqos_mon_stop_param(void **state __attribute__((unused)))
         assert_int_equal(ret, PQOS_RETVAL_PARAM);
 }
 
+/* ======== pqos_mon_start_groups ======== */
+
+static void
+test_pqos_mon_start_groups_init(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores[] = {1};
+        struct pqos_mon_group_spec specs[1];
+        struct pqos_mon_data *groups[DIM(specs)];
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores);
+        specs[0].cores = cores;
+        specs[0].event = PQOS_MON_EVENT_LMEM_BW;
+
+        wrap_check_init(1, PQOS_RETVAL_INIT);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_INIT);
+        assert_null(groups[0]);
+}
+
+static void
+test_pqos_mon_start_groups_param(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores[] = {1};
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data *groups[DIM(specs)];
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores);
+        specs[0].cores = cores;
+        specs[0].event = PQOS_MON_EVENT_LMEM_BW;
+        specs[1] = specs[0];
+
+        ret = pqos_mon_start_groups(0, specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_start_groups(DIM(specs), NULL, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, NULL);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        /* any invalid spec rejects the whole request */
+        specs[1].cores = NULL;
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        specs[1] = specs[0];
+        specs[1].num = 0;
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        specs[1] = specs[0];
+        specs[1].event = PQOS_PERF_EVENT_IPC;
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        specs[1] = specs[0];
+        specs[1].type = PQOS_MON_GROUP_PIDS;
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+}
+
+static void
+test_pqos_mon_start_groups_hw(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores1[] = {1};
+        unsigned cores2[] = {2, 3};
+        enum pqos_mon_event event = PQOS_MON_EVENT_LMEM_BW;
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data *groups[DIM(specs)];
+        unsigned i;
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores1);
+        specs[0].cores = cores1;
+        specs[0].event = event;
+        specs[1].type = PQOS_MON_GROUP_CORES;
+        specs[1].num = DIM(cores2);
+        specs[1].cores = cores2;
+        specs[1].event = event;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+
+        /* all groups are started in one pass */
+        expect_value(__wrap_hw_mon_start_groups, num_specs, DIM(specs));
+        expect_value(__wrap_hw_mon_start_groups, specs, specs);
+        expect_value(__wrap_hw_mon_start_groups, opts, NULL);
+        will_return(__wrap_hw_mon_start_groups, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        for (i = 0; i < DIM(specs); i++) {
+                assert_non_null(groups[i]);
+                free(groups[i]);
+        }
+}
+
+/* Interface rolls back the groups itself when any of them fails to start */
+static void
+test_pqos_mon_start_groups_hw_rollback(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores1[] = {1};
+        unsigned cores2[] = {2};
+        enum pqos_mon_event event = PQOS_MON_EVENT_LMEM_BW;
+        struct pqos_mon_group_spec specs[3];
+        struct pqos_mon_data *groups[DIM(specs)];
+        unsigned i;
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores1);
+        specs[0].cores = cores1;
+        specs[0].event = event;
+        specs[1] = specs[0];
+        specs[1].cores = cores2;
+        specs[2] = specs[0];
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+
+        expect_value(__wrap_hw_mon_start_groups, num_specs, DIM(specs));
+        expect_value(__wrap_hw_mon_start_groups, specs, specs);
+        expect_value(__wrap_hw_mon_start_groups, opts, NULL);
+        will_return(__wrap_hw_mon_start_groups, PQOS_RETVAL_ERROR);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_ERROR);
+
+        for (i = 0; i < DIM(specs); i++)
+                assert_null(groups[i]);
+}
+
+/* Pid groups are not supported by the msr interface */
+static void
+test_pqos_mon_start_groups_hw_pids(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores[] = {1};
+        pid_t pids[] = {1};
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data *groups[DIM(specs)];
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores);
+        specs[0].cores = cores;
+        specs[0].event = PQOS_MON_EVENT_LMEM_BW;
+        specs[1].type = PQOS_MON_GROUP_PIDS;
+        specs[1].num = DIM(pids);
+        specs[1].pids = pids;
+        specs[1].event = PQOS_MON_EVENT_LMEM_BW;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_RESOURCE);
+        assert_null(groups[0]);
+        assert_null(groups[1]);
+}
+
+static void
+test_pqos_mon_start_groups_os(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores[] = {1};
+        pid_t pids[] = {1};
+        enum pqos_mon_event event = PQOS_MON_EVENT_LMEM_BW;
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data *groups[DIM(specs)];
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores);
+        specs[0].cores = cores;
+        specs[0].event = event;
+        specs[1].type = PQOS_MON_GROUP_PIDS;
+        specs[1].num = DIM(pids);
+        specs[1].pids = pids;
+        specs[1].event = event;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+
+        expect_value(__wrap_os_mon_start_cores, num_cores, DIM(cores));
+        expect_value(__wrap_os_mon_start_cores, cores, cores);
+        expect_value(__wrap_os_mon_start_cores, event, event);
+        expect_value(__wrap_os_mon_start_cores, context, NULL);
+        expect_value(__wrap_os_mon_start_cores, mem_regions, NULL);
+        will_return(__wrap_os_mon_start_cores, PQOS_RETVAL_OK);
+
+        expect_value(__wrap_os_mon_start_pids, num_pids, DIM(pids));
+        expect_value(__wrap_os_mon_start_pids, event, event);
+        expect_value(__wrap_os_mon_start_pids, context, NULL);
+        will_return(__wrap_os_mon_start_pids, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        free(groups[0]);
+        free(groups[1]);
+}
+
+/* Started groups are stopped when any of the groups fails to start */
+static void
+test_pqos_mon_start_groups_os_rollback(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned cores[] = {1};
+        pid_t pids[] = {1};
+        enum pqos_mon_event event = PQOS_MON_EVENT_LMEM_BW;
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data *groups[DIM(specs)];
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores);
+        specs[0].cores = cores;
+        specs[0].event = event;
+        specs[1].type = PQOS_MON_GROUP_PIDS;
+        specs[1].num = DIM(pids);
+        specs[1].pids = pids;
+        specs[1].event = event;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+
+        expect_value(__wrap_os_mon_start_cores, num_cores, DIM(cores));
+        expect_value(__wrap_os_mon_start_cores, cores, cores);
+        expect_value(__wrap_os_mon_start_cores, event, event);
+        expect_value(__wrap_os_mon_start_cores, context, NULL);
+        expect_value(__wrap_os_mon_start_cores, mem_regions, NULL);
+        will_return(__wrap_os_mon_start_cores, PQOS_RETVAL_OK);
+
+        expect_value(__wrap_os_mon_start_pids, num_pids, DIM(pids));
+        expect_value(__wrap_os_mon_start_pids, event, event);
+        expect_value(__wrap_os_mon_start_pids, context, NULL);
+        will_return(__wrap_os_mon_start_pids, PQOS_RETVAL_ERROR);
+
+        expect_any(__wrap_os_mon_stop, group);
+        will_return(__wrap_os_mon_stop, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_start_groups(DIM(specs), specs, groups);
+        assert_int_equal(ret, PQOS_RETVAL_ERROR);
+        assert_null(groups[0]);
+        assert_null(groups[1]);
+}
+
+/* ======== pqos_mon_start_rollup ======== */
+
+static void
+test_pqos_mon_start_rollup_param(void **state __attribute__((unused)))
+{
+        int ret;
+        struct pqos_mon_data child1;
+        struct pqos_mon_data child2;
+        struct pqos_mon_data *children[] = {&child1, &child2};
+        struct pqos_mon_data *group = NULL;
+
+        memset(&child1, 0, sizeof(child1));
+        memset(&child2, 0, sizeof(child2));
+        child1.valid = 0x00DEAD00;
+        child1.event = PQOS_MON_EVENT_LMEM_BW;
+        child2.valid = 0x00DEAD00;
+        child2.event = PQOS_MON_EVENT_L3_OCCUP;
+
+        ret = pqos_mon_start_rollup(0, children, NULL, &group);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_start_rollup(DIM(children), NULL, NULL, &group);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_start_rollup(DIM(children), children, NULL, NULL);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        /* no common events */
+        ret = pqos_mon_start_rollup(DIM(children), children, NULL, &group);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        /* duplicated child */
+        children[1] = &child1;
+        ret = pqos_mon_start_rollup(DIM(children), children, NULL, &group);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        /* invalid child */
+        child2.valid = 0;
+        child2.event = PQOS_MON_EVENT_LMEM_BW;
+        children[1] = &child2;
+        ret = pqos_mon_start_rollup(DIM(children), children, NULL, &group);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        assert_null(group);
+}
+
+static void
+test_pqos_mon_start_rollup_hw(void **state __attribute__((unused)))
+{
+        int ret;
+        struct pqos_mon_data child[3];
+        struct pqos_mon_data_internal intl[DIM(child)];
+        struct pqos_mon_data *l3[] = {&child[0], &child[1]};
+        struct pqos_mon_data *socket[2];
+        struct pqos_mon_data *groups[5];
+        struct pqos_mon_data *rollup = NULL;
+        struct pqos_mon_data *top = NULL;
+        unsigned i;
+
+        memset(child, 0, sizeof(child));
+        memset(intl, 0, sizeof(intl));
+        for (i = 0; i < DIM(child); i++) {
+                child[i].valid = 0x00DEAD00;
+                child[i].event =
+                    PQOS_MON_EVENT_LMEM_BW | PQOS_MON_EVENT_L3_OCCUP;
+                child[i].intl = &intl[i];
+        }
+        child[2].event = PQOS_MON_EVENT_LMEM_BW;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_start_rollup(DIM(l3), l3, NULL, &rollup);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_non_null(rollup);
+        assert_int_equal(rollup->event,
+                         PQOS_MON_EVENT_LMEM_BW | PQOS_MON_EVENT_L3_OCCUP);
+
+        socket[0] = rollup;
+        socket[1] = &child[2];
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_start_rollup(DIM(socket), socket, NULL, &top);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_non_null(top);
+        assert_int_equal(top->event, PQOS_MON_EVENT_LMEM_BW);
+
+        /* rollups are computed after children regardless of table order */
+        groups[0] = top;
+        groups[1] = rollup;
+        groups[2] = &child[0];
+        groups[3] = &child[1];
+        groups[4] = &child[2];
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        for (i = 0; i < DIM(child); i++) {
+                child[i].values.llc = 100 * (i + 1);
+                child[i].values.mbm_local_delta = 10 * (i + 1);
+                expect_value(__wrap_pqos_mon_poll_events, group, &child[i]);
+                will_return(__wrap_pqos_mon_poll_events, PQOS_RETVAL_OK);
+        }
+
+        ret = pqos_mon_poll(groups, DIM(groups));
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(rollup->values.llc, 300);
+        assert_int_equal(rollup->values.mbm_local_delta, 30);
+        assert_int_equal(top->values.mbm_local_delta, 60);
+
+        /* children can not be stopped before rollups using them */
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_stop(rollup);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_stop(top);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_stop(rollup);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        for (i = 0; i < DIM(child); i++)
+                assert_int_equal(intl[i].rollup.num_parent, 0);
+}
+
+static void
+test_pqos_mon_poll_rollup_children(void **state __attribute__((unused)))
+{
+        int ret;
+        struct pqos_mon_data child[3];
+        struct pqos_mon_data_internal intl[DIM(child)];
+        struct pqos_mon_data *l3[] = {&child[0], &child[1]};
+        struct pqos_mon_data *socket[2];
+        struct pqos_mon_data *groups[2];
+        struct pqos_mon_data *rollup = NULL;
+        struct pqos_mon_data *top = NULL;
+        unsigned i;
+
+        memset(child, 0, sizeof(child));
+        memset(intl, 0, sizeof(intl));
+        for (i = 0; i < DIM(child); i++) {
+                child[i].valid = 0x00DEAD00;
+                child[i].event = PQOS_MON_EVENT_LMEM_BW;
+                child[i].intl = &intl[i];
+        }
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_start_rollup(DIM(l3), l3, NULL, &rollup);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        socket[0] = rollup;
+        socket[1] = &child[2];
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_start_rollup(DIM(socket), socket, NULL, &top);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        /* descendants missing from the table are polled once */
+        groups[0] = top;
+        groups[1] = &child[0];
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        for (i = 0; i < DIM(child); i++)
+                child[i].values.mbm_local_delta = 10 * (i + 1);
+        expect_value(__wrap_pqos_mon_poll_events, group, &child[0]);
+        will_return(__wrap_pqos_mon_poll_events, PQOS_RETVAL_OK);
+        expect_value(__wrap_pqos_mon_poll_events, group, &child[2]);
+        will_return(__wrap_pqos_mon_poll_events, PQOS_RETVAL_OK);
+        expect_value(__wrap_pqos_mon_poll_events, group, &child[1]);
+        will_return(__wrap_pqos_mon_poll_events, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_poll(groups, DIM(groups));
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(rollup->values.mbm_local_delta, 30);
+        assert_int_equal(top->values.mbm_local_delta, 60);
+        for (i = 0; i < DIM(child); i++)
+                assert_int_equal(intl[i].rollup.mark, 0);
+
+        /* rollup polled alone */
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        expect_value(__wrap_pqos_mon_poll_events, group, &child[0]);
+        will_return(__wrap_pqos_mon_poll_events, PQOS_RETVAL_OK);
+        expect_value(__wrap_pqos_mon_poll_events, group, &child[1]);
+        will_return(__wrap_pqos_mon_poll_events, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_poll(&rollup, 1);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(rollup->values.mbm_local_delta, 30);
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_stop(top);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_stop(rollup);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+}
+
 /* ======== pqos_mon_poll ======== */
 
 static void
@@ -2127,12 +2575,15 @@ test_pqos_mon_poll(void **state __attribute__((unused)))
 {
         int ret;
         struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
         unsigned num_groups = 1;
         struct pqos_mon_data *groups[] = {&group};
 
         memset(&group, 0, sizeof(group));
+        memset(&intl, 0, sizeof(intl));
         group.valid = 0x00DEAD00;
         group.event = PQOS_MON_EVENT_LMEM_BW;
+        group.intl = &intl;
 
         wrap_check_init(1, PQOS_RETVAL_OK);
 
@@ -3381,6 +3832,175 @@ test_pqos_mon_get_ipc(void **state __attribute__((unused)))
         assert_int_equal(value, group.values.ipc);
 }
 
+/* ======== pqos_mon_get_timestamp ======== */
+
+static void
+test_pqos_mon_get_timestamp_init(void **state __attribute__((unused)))
+{
+        int ret;
+        uint64_t timestamp;
+        uint64_t elapsed;
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+
+        memset(&group, 0, sizeof(group));
+        memset(&intl, 0, sizeof(intl));
+        group.valid = 0x00DEAD00;
+        group.intl = &intl;
+
+        wrap_check_init(1, PQOS_RETVAL_INIT);
+
+        ret = pqos_mon_get_timestamp(&group, &timestamp, &elapsed);
+        assert_int_equal(ret, PQOS_RETVAL_INIT);
+}
+
+static void
+test_pqos_mon_get_timestamp_param(void **state __attribute__((unused)))
+{
+        int ret;
+        uint64_t timestamp;
+        uint64_t elapsed;
+        struct pqos_mon_data group;
+
+        ret = pqos_mon_get_timestamp(NULL, &timestamp, &elapsed);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        memset(&group, 0, sizeof(group));
+
+        ret = pqos_mon_get_timestamp(&group, &timestamp, &elapsed);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        group.valid = 0x00DEAD00;
+
+        ret = pqos_mon_get_timestamp(&group, NULL, NULL);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_get_timestamp(&group, &timestamp, &elapsed);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+}
+
+static void
+test_pqos_mon_get_timestamp(void **state __attribute__((unused)))
+{
+        int ret;
+        uint64_t timestamp;
+        uint64_t elapsed;
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+
+        memset(&group, 0, sizeof(group));
+        memset(&intl, 0, sizeof(intl));
+        group.valid = 0x00DEAD00;
+        group.intl = &intl;
+        intl.timestamp.read = 5000;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_get_timestamp(&group, &timestamp, &elapsed);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(timestamp, 5000);
+        assert_int_equal(elapsed, 0);
+
+        intl.timestamp.prev_read = 2000;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_get_timestamp(&group, NULL, &elapsed);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(elapsed, 3000);
+}
+
+/* ======== pqos_mon_get_rate ======== */
+
+static void
+test_pqos_mon_get_rate_init(void **state __attribute__((unused)))
+{
+        int ret;
+        double rate;
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+
+        memset(&group, 0, sizeof(group));
+        memset(&intl, 0, sizeof(intl));
+        group.valid = 0x00DEAD00;
+        group.intl = &intl;
+        group.event = PQOS_MON_EVENT_LMEM_BW;
+
+        wrap_check_init(1, PQOS_RETVAL_INIT);
+
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_LMEM_BW, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_INIT);
+}
+
+static void
+test_pqos_mon_get_rate_param(void **state __attribute__((unused)))
+{
+        int ret;
+        double rate;
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+
+        ret = pqos_mon_get_rate(NULL, PQOS_MON_EVENT_LMEM_BW, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        memset(&group, 0, sizeof(group));
+        memset(&intl, 0, sizeof(intl));
+
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_LMEM_BW, NULL);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_LMEM_BW, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        group.valid = 0x00DEAD00;
+        group.intl = &intl;
+
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_LMEM_BW, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        group.event = (enum pqos_mon_event)(-1);
+
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_L3_OCCUP, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+
+        ret = pqos_mon_get_rate(&group, PQOS_PERF_EVENT_IPC, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+}
+
+static void
+test_pqos_mon_get_rate(void **state __attribute__((unused)))
+{
+        int ret;
+        double rate;
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+
+        memset(&group, 0, sizeof(group));
+        memset(&intl, 0, sizeof(intl));
+        group.valid = 0x00DEAD00;
+        group.intl = &intl;
+        group.event = PQOS_MON_EVENT_LMEM_BW | PQOS_PERF_EVENT_LLC_MISS;
+        group.values.mbm_local_delta = 1000;
+        group.values.llc_misses_delta = 30;
+
+        intl.timestamp.read = 1000000000;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_LMEM_BW, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_true(rate == 0.0);
+
+        intl.timestamp.prev_read = 500000000;
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_get_rate(&group, PQOS_MON_EVENT_LMEM_BW, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_true(rate == 2000.0);
+
+        wrap_check_init(1, PQOS_RETVAL_OK);
+        ret = pqos_mon_get_rate(&group, PQOS_PERF_EVENT_LLC_MISS, &rate);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_true(rate == 60.0);
+}
+
 int
 main(void)
 {
@@ -3417,6 +4037,7 @@ main(void)
             cmocka_unit_test(test_pqos_mon_poll_init),
             cmocka_unit_test(test_pqos_mon_start_pids_init),
             cmocka_unit_test(test_pqos_mon_start_pids2_init),
+            cmocka_unit_test(test_pqos_mon_start_groups_init),
             cmocka_unit_test(test_pqos_mon_add_pids_init),
             cmocka_unit_test(test_pqos_mon_remove_pids_init),
             cmocka_unit_test(test_pqos_alloc_assoc_get_channel_init),
@@ -3426,6 +4047,8 @@ main(void)
             cmocka_unit_test(test_pqos_mon_start_uncore_init),
             cmocka_unit_test(test_pqos_mon_get_value_init),
             cmocka_unit_test(test_pqos_mon_get_ipc_init),
+            cmocka_unit_test(test_pqos_mon_get_timestamp_init),
+            cmocka_unit_test(test_pqos_mon_get_rate_init),
         };
 
         const struct CMUnitTest tests_param[] = {
@@ -3460,6 +4083,8 @@ main(void)
             cmocka_unit_test(test_pqos_mon_poll_param),
             cmocka_unit_test(test_pqos_mon_start_pids_param),
             cmocka_unit_test(test_pqos_mon_start_pids2_param),
+            cmocka_unit_test(test_pqos_mon_start_groups_param),
+            cmocka_unit_test(test_pqos_mon_start_rollup_param),
             cmocka_unit_test(test_pqos_mon_add_pids_param),
             cmocka_unit_test(test_pqos_mon_remove_pids_param),
             cmocka_unit_test(test_pqos_alloc_assoc_get_channel_param),
@@ -3469,6 +4094,8 @@ main(void)
             cmocka_unit_test(test_pqos_mon_start_uncore_param),
             cmocka_unit_test(test_pqos_mon_get_value_param),
             cmocka_unit_test(test_pqos_mon_get_ipc_param),
+            cmocka_unit_test(test_pqos_mon_get_timestamp_param),
+            cmocka_unit_test(test_pqos_mon_get_rate_param),
         };
 
         const struct CMUnitTest tests_hw[] = {
@@ -3503,6 +4130,11 @@ main(void)
             cmocka_unit_test(test_pqos_mon_poll),
             cmocka_unit_test(test_pqos_mon_start_pids_hw),
             cmocka_unit_test(test_pqos_mon_start_pids2_hw),
+            cmocka_unit_test(test_pqos_mon_start_groups_hw),
+            cmocka_unit_test(test_pqos_mon_start_groups_hw_rollback),
+            cmocka_unit_test(test_pqos_mon_start_groups_hw_pids),
+            cmocka_unit_test(test_pqos_mon_start_rollup_hw),
+            cmocka_unit_test(test_pqos_mon_poll_rollup_children),
             cmocka_unit_test(test_pqos_mon_start_pid_hw),
             cmocka_unit_test(test_pqos_mon_add_pids_hw),
             cmocka_unit_test(test_pqos_mon_remove_pids_hw),
@@ -3510,7 +4142,9 @@ main(void)
             cmocka_unit_test(test_pqos_alloc_assoc_set_channel_hw),
             cmocka_unit_test(test_pqos_mon_start_uncore_hw),
             cmocka_unit_test(test_pqos_mon_get_value),
-            cmocka_unit_test(test_pqos_mon_get_ipc)};
+            cmocka_unit_test(test_pqos_mon_get_ipc),
+            cmocka_unit_test(test_pqos_mon_get_timestamp),
+            cmocka_unit_test(test_pqos_mon_get_rate)};
 
 #ifdef __linux__
         const struct CMUnitTest tests_os[] = {
@@ -3544,6 +4178,8 @@ main(void)
             cmocka_unit_test(test_pqos_mon_poll),
             cmocka_unit_test(test_pqos_mon_start_pids_os),
             cmocka_unit_test(test_pqos_mon_start_pids2_os),
+            cmocka_unit_test(test_pqos_mon_start_groups_os),
+            cmocka_unit_test(test_pqos_mon_start_groups_os_rollback),
             cmocka_unit_test(test_pqos_mon_start_pid_os),
             cmocka_unit_test(test_pqos_mon_add_pids_os),
             cmocka_unit_test(test_pqos_mon_remove_pids_os),
@@ -32,20 +32,12 @@
  */
 
 #include "allocation.h"
+#include "machine.h"
+#include "mock_machine.h"
 #include "test.h"
 
 /* ======== mock ======== */
 
-int
-hw_alloc_assoc_write(const unsigned lcore, const unsigned class_id)
-{
-        function_called();
-        check_expected(lcore);
-        check_expected(class_id);
-
-        return mock_type(int);
-}
-
 int
 hw_alloc_assoc_set_channel(const pqos_channel_t channel,
                            const unsigned class_id)
@@ -71,10 +63,19 @@ test_hw_alloc_reset_assoc_cores(void **state)
         for (i = 0; i < data->cpu->num_cores; i++) {
                 unsigned lcore = data->cpu->cores[i].lcore;
 
-                expect_function_call(hw_alloc_assoc_write);
-                expect_value(hw_alloc_assoc_write, lcore, lcore);
-                expect_value(hw_alloc_assoc_write, class_id, 0);
-                will_return(hw_alloc_assoc_write, PQOS_RETVAL_OK);
+                expect_value(__wrap_msr_read, lcore, lcore);
+                expect_value(__wrap_msr_read, reg, PQOS_MSR_ASSOC);
+                will_return(__wrap_msr_read, MACHINE_RETVAL_OK);
+                will_return(__wrap_msr_read,
+                            (3ULL << PQOS_MSR_ASSOC_QECOS_SHIFT) | 5);
+        }
+        for (i = 0; i < data->cpu->num_cores; i++) {
+                unsigned lcore = data->cpu->cores[i].lcore;
+
+                expect_value(__wrap_msr_write, lcore, lcore);
+                expect_value(__wrap_msr_write, reg, PQOS_MSR_ASSOC);
+                expect_value(__wrap_msr_write, value, 5);
+                will_return(__wrap_msr_write, MACHINE_RETVAL_OK);
         }
 
         ret = hw_alloc_reset_assoc_cores();
@@ -93,10 +94,9 @@ test_hw_alloc_reset_assoc_cores_error(void **state)
         for (i = 0; i < data->cpu->num_cores; i++) {
                 unsigned lcore = data->cpu->cores[i].lcore;
 
-                expect_function_call(hw_alloc_assoc_write);
-                expect_value(hw_alloc_assoc_write, lcore, lcore);
-                expect_value(hw_alloc_assoc_write, class_id, 0);
-                will_return(hw_alloc_assoc_write, PQOS_RETVAL_ERROR);
+                expect_value(__wrap_msr_read, lcore, lcore);
+                expect_value(__wrap_msr_read, reg, PQOS_MSR_ASSOC);
+                will_return(__wrap_msr_read, MACHINE_RETVAL_ERROR);
         }
 
         ret = hw_alloc_reset_assoc_cores();
@@ -70,29 +70,16 @@ wrap_fini_mon(void **state)
 
 /* ======== mock ======== */
 
+/** RMIDs associated with cores 0-4, other cores use RMID0 */
+static pqos_rmid_t assoc_rmid[] = {0, 1, 2, 3, 2};
+
 int
 hw_mon_assoc_read(const unsigned lcore, pqos_rmid_t *rmid)
 {
-        switch (lcore) {
-        case 0:
-                *rmid = 0;
-                break;
-        case 1:
-                *rmid = 1;
-                break;
-        case 2:
-                *rmid = 2;
-                break;
-        case 3:
-                *rmid = 3;
-                break;
-        case 4:
-                *rmid = 2;
-                break;
-        default:
+        if (lcore < DIM(assoc_rmid))
+                *rmid = assoc_rmid[lcore];
+        else
                 *rmid = 0;
-                break;
-        }
 
         return mock_type(int);
 }
@@ -211,19 +198,104 @@ test_hw_alloc_assoc_unused_not_found(void **state)
         assert_int_equal(ret, PQOS_RETVAL_ERROR);
 }
 
+static void
+test_hw_alloc_assoc_unused_pool(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        int ret;
+        struct pqos_mon_poll_ctx ctx;
+        struct pqos_mon_options opt;
+
+        memset(&opt, 0, sizeof(opt));
+
+        will_return_maybe(__wrap__pqos_get_cap, data->cap);
+        will_return_maybe(__wrap__pqos_get_cpu, data->cpu);
+        will_return_maybe(__wrap__pqos_get_dev, data->dev);
+
+        /* associations are read only on first allocation in the cluster */
+        will_return_count(hw_mon_assoc_read, PQOS_RETVAL_OK,
+                          data->cpu->num_cores / 2);
+
+        ctx.lcore = 1;
+        ctx.cluster = 0;
+
+        ret = hw_mon_assoc_unused(&ctx, PQOS_MON_EVENT_TMEM_BW, 1, UINT32_MAX,
+                                  &opt);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(ctx.rmid, 4);
+
+        ret = hw_mon_assoc_unused(&ctx, PQOS_MON_EVENT_TMEM_BW, 1, UINT32_MAX,
+                                  &opt);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(ctx.rmid, 5);
+}
+
+static void
+test_hw_alloc_assoc_unused_resync(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        int ret;
+        struct pqos_mon_poll_ctx ctx;
+        struct pqos_mon_options opt;
+
+        memset(&opt, 0, sizeof(opt));
+
+        will_return_maybe(__wrap__pqos_get_cap, data->cap);
+        will_return_maybe(__wrap__pqos_get_cpu, data->cpu);
+        will_return_maybe(__wrap__pqos_get_dev, data->dev);
+
+        will_return_count(hw_mon_assoc_read, PQOS_RETVAL_OK,
+                          data->cpu->num_cores / 2);
+
+        ctx.lcore = 1;
+        ctx.cluster = 0;
+
+        ret = hw_mon_assoc_unused(&ctx, PQOS_MON_EVENT_TMEM_BW, 3, 3, &opt);
+        assert_int_equal(ret, PQOS_RETVAL_ERROR);
+
+        /* RMID released by other process - associations are read again */
+        assoc_rmid[3] = 0;
+        will_return_count(hw_mon_assoc_read, PQOS_RETVAL_OK,
+                          data->cpu->num_cores / 2);
+
+        ret = hw_mon_assoc_unused(&ctx, PQOS_MON_EVENT_TMEM_BW, 3, 3, &opt);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(ctx.rmid, 3);
+
+        /* RMID allocated by this process is kept, even if not associated */
+        will_return_count(hw_mon_assoc_read, PQOS_RETVAL_OK,
+                          data->cpu->num_cores / 2);
+
+        ret = hw_mon_assoc_unused(&ctx, PQOS_MON_EVENT_TMEM_BW, 3, 3, &opt);
+        assert_int_equal(ret, PQOS_RETVAL_ERROR);
+
+        assoc_rmid[3] = 3;
+}
+
 int
 main(void)
 {
         int result = 0;
 
+        /* RMID pools are kept between calls, initialize them for each test */
         const struct CMUnitTest tests[] = {
-            cmocka_unit_test(test_hw_alloc_assoc_unused),
-            cmocka_unit_test(test_hw_alloc_assoc_unused_invalid_cluster),
-            cmocka_unit_test(test_hw_alloc_assoc_unused_range),
-            cmocka_unit_test(test_hw_alloc_assoc_unused_not_found),
+            cmocka_unit_test_setup_teardown(test_hw_alloc_assoc_unused,
+                                            wrap_init_mon, wrap_fini_mon),
+            cmocka_unit_test_setup_teardown(
+                test_hw_alloc_assoc_unused_invalid_cluster, wrap_init_mon,
+                wrap_fini_mon),
+            cmocka_unit_test_setup_teardown(test_hw_alloc_assoc_unused_range,
+                                            wrap_init_mon, wrap_fini_mon),
+            cmocka_unit_test_setup_teardown(
+                test_hw_alloc_assoc_unused_not_found, wrap_init_mon,
+                wrap_fini_mon),
+            cmocka_unit_test_setup_teardown(test_hw_alloc_assoc_unused_pool,
+                                            wrap_init_mon, wrap_fini_mon),
+            cmocka_unit_test_setup_teardown(test_hw_alloc_assoc_unused_resync,
+                                            wrap_init_mon, wrap_fini_mon),
         };
 
-        result += cmocka_run_group_tests(tests, wrap_init_mon, wrap_fini_mon);
+        result += cmocka_run_group_tests(tests, NULL, NULL);
 
         return result;
 }
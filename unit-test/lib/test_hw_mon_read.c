@@ -153,6 +153,91 @@ test_hw_mon_read_error(void **state __attribute__((unused)))
         assert_int_equal(value, 5);
 }
 
+/* ======== hw_mon_read_ctx ======== */
+
+static void
+test_hw_mon_read_ctx(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned event = 3;
+        uint64_t value;
+        struct pqos_mon_poll_ctx ctx[2];
+        unsigned i;
+
+        memset(ctx, 0, sizeof(ctx));
+        ctx[0].lcore = 1;
+        ctx[0].rmid = 2;
+        ctx[1].lcore = 3;
+        ctx[1].rmid = 4;
+
+        for (i = 0; i < 2; i++) {
+                uint64_t evtsel;
+
+                evtsel = ((uint64_t)ctx[i].rmid) &
+                         PQOS_MSR_MON_EVTSEL_RMID_MASK;
+                evtsel <<= PQOS_MSR_MON_EVTSEL_RMID_SHIFT;
+                evtsel |= ((uint64_t)event) & PQOS_MSR_MON_EVTSEL_EVTID_MASK;
+
+                expect_value(__wrap_msr_write, lcore, ctx[i].lcore);
+                expect_value(__wrap_msr_write, reg, PQOS_MSR_MON_EVTSEL);
+                expect_value(__wrap_msr_write, value, evtsel);
+                will_return(__wrap_msr_write, MACHINE_RETVAL_OK);
+
+                expect_value(__wrap_msr_read, lcore, ctx[i].lcore);
+                expect_value(__wrap_msr_read, reg, PQOS_MSR_MON_QMC);
+                will_return(__wrap_msr_read, MACHINE_RETVAL_OK);
+                will_return(__wrap_msr_read, 5 + i);
+        }
+
+        ret = hw_mon_read_ctx(ctx, 2, event, &value, 1LLU << 24);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 11);
+}
+
+static void
+test_hw_mon_read_ctx_unavailable(void **state __attribute__((unused)))
+{
+        int ret;
+        unsigned event = 3;
+        uint64_t value;
+        uint64_t evtsel;
+        struct pqos_mon_poll_ctx ctx;
+
+        memset(&ctx, 0, sizeof(ctx));
+        ctx.lcore = 1;
+        ctx.rmid = 2;
+
+        evtsel = ((uint64_t)ctx.rmid) & PQOS_MSR_MON_EVTSEL_RMID_MASK;
+        evtsel <<= PQOS_MSR_MON_EVTSEL_RMID_SHIFT;
+        evtsel |= ((uint64_t)event) & PQOS_MSR_MON_EVTSEL_EVTID_MASK;
+
+        /* batch */
+        expect_value(__wrap_msr_write, lcore, ctx.lcore);
+        expect_value(__wrap_msr_write, reg, PQOS_MSR_MON_EVTSEL);
+        expect_value(__wrap_msr_write, value, evtsel);
+        will_return(__wrap_msr_write, MACHINE_RETVAL_OK);
+
+        expect_value(__wrap_msr_read, lcore, ctx.lcore);
+        expect_value(__wrap_msr_read, reg, PQOS_MSR_MON_QMC);
+        will_return(__wrap_msr_read, MACHINE_RETVAL_OK);
+        will_return(__wrap_msr_read, PQOS_MSR_MON_QMC_UNAVAILABLE);
+
+        /* fallback to single read */
+        expect_value(__wrap_msr_write, lcore, ctx.lcore);
+        expect_value(__wrap_msr_write, reg, PQOS_MSR_MON_EVTSEL);
+        expect_value(__wrap_msr_write, value, evtsel);
+        will_return(__wrap_msr_write, MACHINE_RETVAL_OK);
+
+        expect_value(__wrap_msr_read, lcore, ctx.lcore);
+        expect_value(__wrap_msr_read, reg, PQOS_MSR_MON_QMC);
+        will_return(__wrap_msr_read, MACHINE_RETVAL_OK);
+        will_return(__wrap_msr_read, 5);
+
+        ret = hw_mon_read_ctx(&ctx, 1, event, &value, 1LLU << 24);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 5);
+}
+
 int
 main(void)
 {
@@ -161,7 +246,9 @@ main(void)
         const struct CMUnitTest tests[] = {
             cmocka_unit_test(test_hw_mon_read),
             cmocka_unit_test(test_hw_mon_read_unavailable),
-            cmocka_unit_test(test_hw_mon_read_error)};
+            cmocka_unit_test(test_hw_mon_read_error),
+            cmocka_unit_test(test_hw_mon_read_ctx),
+            cmocka_unit_test(test_hw_mon_read_ctx_unavailable)};
 
         result += cmocka_run_group_tests(tests, NULL, NULL);
 
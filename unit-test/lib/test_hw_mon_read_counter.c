@@ -197,6 +197,64 @@ test_hw_mon_read_counter_lmem(void **state)
         assert_int_equal(group.values.mbm_local_delta, 5 * pmon->scale_factor);
 }
 
+/* Wrapped MBM counter keeps counting in 64-bit extended value */
+static void
+test_hw_mon_read_counter_tmem_wrap(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        unsigned num_cores = 1;
+        unsigned cores[] = {1};
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+        struct pqos_mon_poll_ctx ctx;
+        enum pqos_mon_event event = PQOS_MON_EVENT_TMEM_BW;
+        const struct pqos_monitor *pmon;
+        uint64_t max_value;
+        int ret;
+
+        pqos_cap_get_event(data->cap, event, &pmon);
+        max_value = 1LLU << pmon->counter_length;
+
+        memset(&group, 0, sizeof(struct pqos_mon_data));
+        group.intl = &intl;
+        group.num_cores = num_cores;
+        group.cores = cores;
+        memset(&intl, 0, sizeof(struct pqos_mon_data_internal));
+        intl.hw.ctx = &ctx;
+        intl.hw.num_ctx = 1;
+        memset(&ctx, 0, sizeof(struct pqos_mon_poll_ctx));
+        ctx.lcore = cores[0];
+        ctx.cluster = 0;
+        ctx.rmid = 2;
+
+        will_return_maybe(__wrap__pqos_get_cap, data->cap);
+        will_return_maybe(__wrap__pqos_get_cpu, data->cpu);
+
+        expect_value(hw_mon_read, lcore, cores[0]);
+        expect_value(hw_mon_read, rmid, ctx.rmid);
+        expect_value(hw_mon_read, event, 2);
+        will_return(hw_mon_read, max_value - 5);
+        will_return(hw_mon_read, PQOS_RETVAL_OK);
+
+        ret = hw_mon_read_counter(&group, event);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(group.values.mbm_total, max_value - 5);
+
+        group.intl->valid_mbm_read = 1;
+
+        expect_value(hw_mon_read, lcore, cores[0]);
+        expect_value(hw_mon_read, rmid, ctx.rmid);
+        expect_value(hw_mon_read, event, 2);
+        will_return(hw_mon_read, 10);
+        will_return(hw_mon_read, PQOS_RETVAL_OK);
+
+        ret = hw_mon_read_counter(&group, event);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(group.values.mbm_total, max_value + 10);
+        assert_int_equal(group.values.mbm_total_delta,
+                         15 * pmon->scale_factor);
+}
+
 static void
 test_hw_mon_read_counter_llc(void **state)
 {
@@ -245,6 +303,7 @@ main(void)
 
         const struct CMUnitTest tests[] = {
             cmocka_unit_test(test_hw_mon_read_counter_tmem),
+            cmocka_unit_test(test_hw_mon_read_counter_tmem_wrap),
             cmocka_unit_test(test_hw_mon_read_counter_lmem),
             cmocka_unit_test(test_hw_mon_read_counter_llc)};
 
@@ -589,6 +589,105 @@ test_hw_mon_start_perf(void **state)
         assert_int_equal(ret, PQOS_RETVAL_OK);
 }
 
+static void
+test_hw_mon_start_groups(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        unsigned cores1[] = {1};
+        unsigned cores2[] = {2};
+        enum pqos_mon_event event = PQOS_MON_EVENT_LMEM_BW;
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data group[DIM(specs)];
+        struct pqos_mon_data_internal intl[DIM(specs)];
+        struct pqos_mon_data *groups[DIM(specs)];
+        unsigned i;
+        int ret;
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores1);
+        specs[0].cores = cores1;
+        specs[0].event = event;
+        specs[1] = specs[0];
+        specs[1].cores = cores2;
+
+        memset(group, 0, sizeof(group));
+        memset(intl, 0, sizeof(intl));
+        for (i = 0; i < DIM(specs); i++) {
+                group[i].intl = &intl[i];
+                groups[i] = &group[i];
+        }
+
+        will_return_maybe(__wrap__pqos_get_cap, data->cap);
+        will_return_maybe(__wrap__pqos_get_cpu, data->cpu);
+        will_return_maybe(__wrap__pqos_get_dev, data->dev);
+
+        for (i = 0; i < DIM(specs); i++) {
+                expect_value(hw_mon_assoc_read, lcore, specs[i].cores[0]);
+                will_return(hw_mon_assoc_read, 0);
+                will_return(hw_mon_assoc_read, PQOS_RETVAL_OK);
+
+                expect_value(hw_mon_start_perf, event, event);
+                will_return(hw_mon_start_perf, PQOS_RETVAL_OK);
+
+                expect_value(hw_mon_start_counter, event, event);
+                will_return(hw_mon_start_counter, PQOS_RETVAL_OK);
+        }
+
+        ret = hw_mon_start_groups(DIM(specs), specs, NULL, groups);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        /* free memory */
+        for (i = 0; i < DIM(specs); i++) {
+                assert_int_equal(group[i].num_cores, 1);
+
+                expect_value(hw_mon_assoc_read, lcore, specs[i].cores[0]);
+                will_return(hw_mon_assoc_read, 1);
+                will_return(hw_mon_assoc_read, PQOS_RETVAL_OK);
+                expect_value(hw_mon_assoc_write, lcore, specs[i].cores[0]);
+                expect_value(hw_mon_assoc_write, rmid, 0);
+                will_return(hw_mon_assoc_write, PQOS_RETVAL_OK);
+                will_return(hw_mon_stop_perf, PQOS_RETVAL_OK);
+
+                ret = hw_mon_stop(&group[i]);
+                assert_int_equal(ret, PQOS_RETVAL_OK);
+        }
+}
+
+/* Core can not be monitored by two groups started together */
+static void
+test_hw_mon_start_groups_shared_core(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        unsigned cores1[] = {1, 2};
+        unsigned cores2[] = {2};
+        struct pqos_mon_group_spec specs[2];
+        struct pqos_mon_data group[DIM(specs)];
+        struct pqos_mon_data *groups[DIM(specs)];
+        int ret;
+
+        memset(specs, 0, sizeof(specs));
+        specs[0].type = PQOS_MON_GROUP_CORES;
+        specs[0].num = DIM(cores1);
+        specs[0].cores = cores1;
+        specs[0].event = PQOS_MON_EVENT_LMEM_BW;
+        specs[1] = specs[0];
+        specs[1].num = DIM(cores2);
+        specs[1].cores = cores2;
+
+        groups[0] = &group[0];
+        groups[1] = &group[1];
+
+        will_return_maybe(__wrap__pqos_get_cpu, data->cpu);
+
+        ret = hw_mon_start_groups(DIM(specs), specs, NULL, groups);
+        assert_int_equal(ret, PQOS_RETVAL_RESOURCE);
+
+        specs[1].type = PQOS_MON_GROUP_PIDS;
+        ret = hw_mon_start_groups(DIM(specs), specs, NULL, groups);
+        assert_int_equal(ret, PQOS_RETVAL_PARAM);
+}
+
 static void
 test_hw_mon_poll(void **state __attribute__((unused)))
 {
@@ -797,6 +896,8 @@ main(void)
             cmocka_unit_test(test_hw_mon_start_param),
             cmocka_unit_test(test_hw_mon_start_mbm),
             cmocka_unit_test(test_hw_mon_start_perf),
+            cmocka_unit_test(test_hw_mon_start_groups),
+            cmocka_unit_test(test_hw_mon_start_groups_shared_core),
             cmocka_unit_test(test_hw_mon_poll),
             cmocka_unit_test(test_mon_reset_iordt_disable),
             cmocka_unit_test(test_mon_reset_iordt_enable),
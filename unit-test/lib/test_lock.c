@@ -82,6 +82,14 @@ __wrap_pthread_mutex_lock(pthread_mutex_t *mutex)
         return mock();
 }
 
+int
+__wrap_pthread_mutex_trylock(pthread_mutex_t *mutex)
+{
+        assert_non_null(mutex);
+        function_called();
+        return mock();
+}
+
 int
 __wrap_pthread_mutex_unlock(pthread_mutex_t *mutex)
 {
@@ -332,6 +340,19 @@ test_lock_get(void **state __attribute__((unused)))
         will_return(__wrap_pthread_mutex_unlock, 0);
         lock_release();
 
+        /* lock_try_get */
+        expect_function_call(__wrap_pthread_mutex_trylock);
+        will_return(__wrap_pthread_mutex_trylock, EBUSY);
+        assert_int_equal(lock_try_get(), -1);
+
+        expect_function_call(__wrap_pthread_mutex_trylock);
+        will_return(__wrap_pthread_mutex_trylock, 0);
+        assert_int_equal(lock_try_get(), 0);
+
+        expect_function_call(__wrap_pthread_mutex_unlock);
+        will_return(__wrap_pthread_mutex_unlock, 0);
+        lock_release();
+
         /* fini ok */
         expect_function_call(__wrap_close);
         expect_value(__wrap_close, fildes, TEST_LOCK_FD2);
@@ -0,0 +1,313 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+#include "mock_monitoring.h"
+#include "perf_monitoring.h"
+#include "test.h"
+
+#include <pthread.h>
+
+/* ======== mock ======== */
+
+/**
+ * Log of group polls, shared by polling workers
+ */
+static struct {
+        pthread_mutex_t mutex;
+        unsigned num;
+        struct {
+                const struct pqos_mon_data *group;
+                enum pqos_mon_event event;
+                pthread_t thread;
+        } entry[16];
+} poll_log = {.mutex = PTHREAD_MUTEX_INITIALIZER};
+
+int __wrap_mmio_mon_poll(struct pqos_mon_data *group,
+                         const enum pqos_mon_event event);
+
+int
+__wrap_mmio_mon_poll(struct pqos_mon_data *group,
+                     const enum pqos_mon_event event)
+{
+        pthread_mutex_lock(&poll_log.mutex);
+        if (poll_log.num < DIM(poll_log.entry)) {
+                poll_log.entry[poll_log.num].group = group;
+                poll_log.entry[poll_log.num].event = event;
+                poll_log.entry[poll_log.num].thread = pthread_self();
+                poll_log.num++;
+        }
+        pthread_mutex_unlock(&poll_log.mutex);
+
+        return PQOS_RETVAL_OK;
+}
+
+/**
+ * @brief Returns index of the group in poll log
+ */
+static unsigned
+poll_log_find(const struct pqos_mon_data *group)
+{
+        unsigned i;
+
+        for (i = 0; i < poll_log.num; i++)
+                if (poll_log.entry[i].group == group)
+                        return i;
+
+        fail_msg("Group not polled");
+        return 0;
+}
+
+/**
+ * @brief Sets up group with precompiled plan and poll contexts on \a lcores
+ */
+static void
+setup_group(struct pqos_mon_data *group,
+            struct pqos_mon_data_internal *intl,
+            struct pqos_mon_poll_ctx *ctx,
+            const unsigned *lcores,
+            const unsigned num_lcores)
+{
+        unsigned i;
+
+        memset(group, 0, sizeof(*group));
+        memset(intl, 0, sizeof(*intl));
+        memset(ctx, 0, sizeof(*ctx) * num_lcores);
+        for (i = 0; i < num_lcores; i++)
+                ctx[i].lcore = lcores[i];
+
+        group->intl = intl;
+        group->event = PQOS_MON_EVENT_L3_OCCUP;
+        intl->hw.event = PQOS_MON_EVENT_L3_OCCUP;
+        intl->hw.ctx = ctx;
+        intl->hw.num_ctx = num_lcores;
+        intl->plan.valid = 1;
+        intl->plan.hw = PQOS_MON_EVENT_L3_OCCUP;
+        intl->plan.num_op = 1;
+        intl->plan.op[0].backend = MON_POLL_MMIO;
+        intl->plan.op[0].event = PQOS_MON_EVENT_L3_OCCUP;
+}
+
+/* ======== pqos_mon_poll_workers ======== */
+
+static void
+test_pqos_mon_poll_workers_disabled(void **state __attribute__((unused)))
+{
+        struct pqos_mon_data group;
+        struct pqos_mon_data *groups[] = {&group};
+        int ret;
+
+        ret = pqos_mon_poll_workers(groups, DIM(groups));
+        assert_int_equal(ret, PQOS_RETVAL_RESOURCE);
+}
+
+static void
+test_pqos_mon_poll_workers_overlap(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        /* L3 domain 0 - cores 0-3, domain 1 - cores 4-7 */
+        const unsigned lcores_span[] = {0, 4};
+        const unsigned lcores_dom0[] = {1};
+        const unsigned lcores_dom1[] = {4};
+        struct pqos_mon_data span, dom0, dom1;
+        struct pqos_mon_data_internal intl_span, intl_dom0, intl_dom1;
+        struct pqos_mon_poll_ctx ctx_span[2], ctx_dom0[1], ctx_dom1[1];
+        struct pqos_mon_data *groups[] = {&span, &dom0, &dom1};
+        unsigned idx_span, idx_dom0, idx_dom1;
+        int ret;
+
+        setup_group(&span, &intl_span, ctx_span, lcores_span,
+                    DIM(lcores_span));
+        setup_group(&dom0, &intl_dom0, ctx_dom0, lcores_dom0,
+                    DIM(lcores_dom0));
+        setup_group(&dom1, &intl_dom1, ctx_dom1, lcores_dom1,
+                    DIM(lcores_dom1));
+        poll_log.num = 0;
+
+        ret = mon_poll_workers_init(data->cpu, 2);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_poll_workers(groups, DIM(groups));
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        mon_poll_workers_fini();
+
+        assert_int_equal(poll_log.num, 3);
+        idx_span = poll_log_find(&span);
+        idx_dom0 = poll_log_find(&dom0);
+        idx_dom1 = poll_log_find(&dom1);
+
+        /* single domain groups are polled by different workers */
+        assert_false(pthread_equal(poll_log.entry[idx_dom0].thread,
+                                   pthread_self()));
+        assert_false(pthread_equal(poll_log.entry[idx_dom1].thread,
+                                   pthread_self()));
+        assert_false(pthread_equal(poll_log.entry[idx_dom0].thread,
+                                   poll_log.entry[idx_dom1].thread));
+
+        /* group spanning both domains is polled after workers finished */
+        assert_true(
+            pthread_equal(poll_log.entry[idx_span].thread, pthread_self()));
+        assert_true(idx_span > idx_dom0);
+        assert_true(idx_span > idx_dom1);
+}
+
+/* ======== pqos_mon_poll_events ======== */
+
+static void
+test_pqos_mon_poll_events_perf_pending(void **state __attribute__((unused)))
+{
+        const unsigned lcores[] = {0};
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+        struct pqos_mon_poll_ctx ctx[1];
+        int ret;
+
+        setup_group(&group, &intl, ctx, lcores, DIM(lcores));
+        poll_log.num = 0;
+
+        /* left over by a poll that failed before reading all members */
+        intl.perf.group = (enum pqos_mon_event)(PQOS_PERF_EVENT_CYCLES |
+                                                PQOS_PERF_EVENT_INSTRUCTIONS);
+        intl.perf.pending = (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS;
+
+        ret = pqos_mon_poll_events(&group);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(poll_log.num, 1);
+        assert_int_equal(intl.perf.pending, 0);
+}
+
+static void
+test_pqos_mon_poll_events_plan_rebuild(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        const unsigned lcores[] = {0};
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+        struct pqos_mon_poll_ctx ctx[1];
+        int ret;
+
+        setup_group(&group, &intl, ctx, lcores, DIM(lcores));
+
+        /* plan invalidated by adding or removing pids */
+        intl.plan.valid = 0;
+        intl.plan.num_op = 0;
+
+        will_return(__wrap__pqos_get_inter, PQOS_INTER_MSR);
+        will_return(__wrap__pqos_get_cap, data->cap);
+        expect_value(__wrap_hw_mon_poll, group, &group);
+        expect_value(__wrap_hw_mon_poll, event, PQOS_MON_EVENT_L3_OCCUP);
+        will_return(__wrap_hw_mon_poll, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_poll_events(&group);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(intl.plan.valid, 1);
+        assert_int_equal(intl.plan.num_op, 1);
+        assert_int_equal(intl.plan.op[0].backend, MON_POLL_HW);
+
+        /* plan is reused while started events do not change */
+        expect_value(__wrap_hw_mon_poll, group, &group);
+        expect_value(__wrap_hw_mon_poll, event, PQOS_MON_EVENT_L3_OCCUP);
+        will_return(__wrap_hw_mon_poll, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_poll_events(&group);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        /* plan is recompiled when started events change */
+        group.event |= PQOS_MON_EVENT_LMEM_BW;
+        intl.hw.event |= PQOS_MON_EVENT_LMEM_BW;
+
+        will_return(__wrap__pqos_get_inter, PQOS_INTER_MSR);
+        will_return(__wrap__pqos_get_cap, data->cap);
+        expect_value(__wrap_hw_mon_poll, group, &group);
+        expect_value(__wrap_hw_mon_poll, event, PQOS_MON_EVENT_L3_OCCUP);
+        will_return(__wrap_hw_mon_poll, PQOS_RETVAL_OK);
+        expect_value(__wrap_hw_mon_poll, group, &group);
+        expect_value(__wrap_hw_mon_poll, event, PQOS_MON_EVENT_LMEM_BW);
+        will_return(__wrap_hw_mon_poll, PQOS_RETVAL_OK);
+
+        ret = pqos_mon_poll_events(&group);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(intl.plan.num_op, 2);
+        assert_int_equal(intl.plan.hw, intl.hw.event);
+}
+
+static void
+test_pqos_mon_poll_events_plan_mmio(void **state)
+{
+        struct test_data *data = (struct test_data *)*state;
+        const unsigned lcores[] = {0};
+        struct pqos_mon_data group;
+        struct pqos_mon_data_internal intl;
+        struct pqos_mon_poll_ctx ctx[1];
+        int ret;
+
+        setup_group(&group, &intl, ctx, lcores, DIM(lcores));
+        intl.plan.valid = 0;
+        intl.plan.num_op = 0;
+        intl.hw.event |= PQOS_PERF_EVENT_LLC_MISS_PCIE_READ |
+                         PQOS_PERF_EVENT_LLC_MISS_PCIE_WRITE |
+                         PQOS_PERF_EVENT_LLC_REF_PCIE_READ |
+                         PQOS_PERF_EVENT_LLC_REF_PCIE_WRITE;
+        group.event = intl.hw.event;
+        poll_log.num = 0;
+
+        will_return(__wrap__pqos_get_inter, PQOS_INTER_MMIO);
+        will_return(__wrap__pqos_get_cap, data->cap);
+
+        ret = pqos_mon_poll_events(&group);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        /* PCIe events are not polled through MMIO */
+        assert_int_equal(intl.plan.num_op, 1);
+        assert_int_equal(intl.plan.op[0].backend, MON_POLL_MMIO);
+        assert_int_equal(intl.plan.op[0].event, PQOS_MON_EVENT_L3_OCCUP);
+        assert_int_equal(poll_log.num, 1);
+        assert_int_equal(poll_log.entry[0].event, PQOS_MON_EVENT_L3_OCCUP);
+}
+
+int
+main(void)
+{
+        int result = 0;
+
+        const struct CMUnitTest tests[] = {
+            cmocka_unit_test(test_pqos_mon_poll_workers_disabled),
+            cmocka_unit_test(test_pqos_mon_poll_workers_overlap),
+            cmocka_unit_test(test_pqos_mon_poll_events_perf_pending),
+            cmocka_unit_test(test_pqos_mon_poll_events_plan_rebuild),
+            cmocka_unit_test(test_pqos_mon_poll_events_plan_mmio)};
+
+        result += cmocka_run_group_tests(tests, test_init_mon, test_fini);
+
+        return result;
+}
@@ -514,10 +514,13 @@ test_os_mon_add_pids(void **state)
                 unsigned num_pids = 1;
                 pid_t pids[] = {2};
 
+                intl.plan.valid = 1;
+
                 ret = os_mon_add_pids(num_pids, pids, &group);
                 assert_int_equal(ret, PQOS_RETVAL_OK);
                 assert_int_equal(group.num_pids, 2);
                 assert_int_equal(group.tid_nr, 2);
+                assert_int_equal(intl.plan.valid, 0);
         }
 
         /* add error */
@@ -525,6 +528,8 @@ test_os_mon_add_pids(void **state)
                 unsigned num_pids = 1;
                 pid_t pids[] = {3};
 
+                intl.plan.valid = 1;
+
                 expect_any(os_mon_start_events, group);
                 will_return(os_mon_start_events, PQOS_RETVAL_ERROR);
 
@@ -532,6 +537,7 @@ test_os_mon_add_pids(void **state)
                 assert_int_equal(ret, PQOS_RETVAL_ERROR);
                 assert_int_equal(group.num_pids, 2);
                 assert_int_equal(group.tid_nr, 2);
+                assert_int_equal(intl.plan.valid, 1);
         }
 
         /* stop monitoring */
@@ -582,6 +588,8 @@ test_os_mon_remove_pids(void **state)
                 unsigned num_pids = 1;
                 pid_t pids[] = {1};
 
+                intl.plan.valid = 1;
+
                 expect_any(os_mon_stop_events, group);
                 will_return(os_mon_stop_events, PQOS_RETVAL_OK);
 
@@ -589,6 +597,7 @@ test_os_mon_remove_pids(void **state)
                 assert_int_equal(ret, PQOS_RETVAL_OK);
                 assert_int_equal(group.num_pids, 1);
                 assert_int_equal(group.tid_nr, 1);
+                assert_int_equal(intl.plan.valid, 0);
         }
 
         /* remove non-existent */
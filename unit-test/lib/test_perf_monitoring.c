@@ -201,6 +201,24 @@ __wrap_perf_read_counter(int counter_fd, uint64_t *value)
         return ret;
 }
 
+int
+__wrap_perf_read_group(int leader_fd, const unsigned num, uint64_t *values)
+{
+        int ret;
+        unsigned i;
+
+        check_expected(leader_fd);
+        check_expected(num);
+        assert_non_null(values);
+
+        ret = mock_type(int);
+        if (ret == PQOS_RETVAL_OK)
+                for (i = 0; i < num; i++)
+                        values[i] = mock_type(uint64_t);
+
+        return ret;
+}
+
 static int
 _perf_mon_init(void **state __attribute__((unused)))
 {
@@ -594,6 +612,126 @@ test_perf_mon_start_pid_param(void **state __attribute__((unused)))
         assert_int_equal(ret, PQOS_RETVAL_ERROR);
 }
 
+static void
+test_perf_mon_start_group(void **state __attribute__((unused)))
+{
+        int ret;
+        struct pqos_mon_data grp;
+        struct pqos_mon_data_internal intl;
+        unsigned cores[] = {1, 2};
+        const unsigned cores_num = DIM(cores);
+        struct pqos_mon_perf_ctx ctx[cores_num];
+        unsigned i;
+
+        memset(&grp, 0, sizeof(grp));
+        memset(&intl, 0, sizeof(intl));
+        memset(ctx, 0, sizeof(struct pqos_mon_perf_ctx) * cores_num);
+        grp.intl = &intl;
+        grp.num_cores = cores_num;
+        grp.cores = cores;
+        grp.intl->perf.ctx = ctx;
+
+        /* first event becomes the group leader */
+        for (i = 0; i < cores_num; i++) {
+                expect_not_value(__wrap_perf_setup_counter, attr, 0);
+                expect_value(__wrap_perf_setup_counter, pid, -1);
+                expect_value(__wrap_perf_setup_counter, cpu, cores[i]);
+                expect_value(__wrap_perf_setup_counter, group_fd, -1);
+                expect_value(__wrap_perf_setup_counter, flags, 0);
+                will_return(__wrap_perf_setup_counter, PQOS_RETVAL_OK);
+                will_return(__wrap_perf_setup_counter, 0x100 + i);
+        }
+        ret = perf_mon_start(&grp, PQOS_PERF_EVENT_LLC_MISS);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        /* second event is opened in the leader's group */
+        for (i = 0; i < cores_num; i++) {
+                expect_not_value(__wrap_perf_setup_counter, attr, 0);
+                expect_value(__wrap_perf_setup_counter, pid, -1);
+                expect_value(__wrap_perf_setup_counter, cpu, cores[i]);
+                expect_value(__wrap_perf_setup_counter, group_fd, 0x100 + i);
+                expect_value(__wrap_perf_setup_counter, flags, 0);
+                will_return(__wrap_perf_setup_counter, PQOS_RETVAL_OK);
+                will_return(__wrap_perf_setup_counter, 0x200 + i);
+        }
+        ret = perf_mon_start(&grp, PQOS_PERF_EVENT_LLC_REF);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        /* RDT events are not grouped */
+        for (i = 0; i < cores_num; i++) {
+                expect_not_value(__wrap_perf_setup_counter, attr, 0);
+                expect_value(__wrap_perf_setup_counter, pid, -1);
+                expect_value(__wrap_perf_setup_counter, cpu, cores[i]);
+                expect_value(__wrap_perf_setup_counter, group_fd, -1);
+                expect_value(__wrap_perf_setup_counter, flags, 0);
+                will_return(__wrap_perf_setup_counter, PQOS_RETVAL_OK);
+                will_return(__wrap_perf_setup_counter, 0x300 + i);
+        }
+        ret = perf_mon_start(&grp, PQOS_MON_EVENT_L3_OCCUP);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        assert_int_equal(intl.perf.group_num, 2);
+        assert_int_equal(intl.perf.group_evt[0], PQOS_PERF_EVENT_LLC_MISS);
+        assert_int_equal(intl.perf.group_evt[1], PQOS_PERF_EVENT_LLC_REF);
+        assert_int_equal(intl.perf.group,
+                         PQOS_PERF_EVENT_LLC_MISS | PQOS_PERF_EVENT_LLC_REF);
+
+        for (i = 0; i < cores_num; i++) {
+                expect_value(__wrap_perf_shutdown_counter, counter_fd,
+                             0x100 + i);
+                will_return(__wrap_perf_shutdown_counter, PQOS_RETVAL_OK);
+        }
+        ret = perf_mon_stop(&grp, PQOS_PERF_EVENT_LLC_MISS);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(intl.perf.group_num, 0);
+        assert_int_equal(intl.perf.group, 0);
+}
+
+static void
+test_perf_mon_start_group_fallback(void **state __attribute__((unused)))
+{
+        int ret;
+        struct pqos_mon_data grp;
+        struct pqos_mon_data_internal intl;
+        unsigned cores[] = {1};
+        struct pqos_mon_perf_ctx ctx;
+
+        memset(&grp, 0, sizeof(grp));
+        memset(&intl, 0, sizeof(intl));
+        memset(&ctx, 0, sizeof(ctx));
+        grp.intl = &intl;
+        grp.num_cores = DIM(cores);
+        grp.cores = cores;
+        grp.intl->perf.ctx = &ctx;
+
+        intl.perf.group = PQOS_PERF_EVENT_LLC_MISS;
+        intl.perf.group_evt[0] = PQOS_PERF_EVENT_LLC_MISS;
+        intl.perf.group_num = 1;
+        ctx.fd_llc_misses = 0x100;
+
+        /* member cannot be added to the group */
+        expect_not_value(__wrap_perf_setup_counter, attr, 0);
+        expect_value(__wrap_perf_setup_counter, pid, -1);
+        expect_value(__wrap_perf_setup_counter, cpu, cores[0]);
+        expect_value(__wrap_perf_setup_counter, group_fd, 0x100);
+        expect_value(__wrap_perf_setup_counter, flags, 0);
+        will_return(__wrap_perf_setup_counter, PQOS_RETVAL_ERROR);
+
+        expect_not_value(__wrap_perf_setup_counter, attr, 0);
+        expect_value(__wrap_perf_setup_counter, pid, -1);
+        expect_value(__wrap_perf_setup_counter, cpu, cores[0]);
+        expect_value(__wrap_perf_setup_counter, group_fd, -1);
+        expect_value(__wrap_perf_setup_counter, flags, 0);
+        will_return(__wrap_perf_setup_counter, PQOS_RETVAL_OK);
+        will_return(__wrap_perf_setup_counter, 0x200);
+
+        ret = perf_mon_start(&grp, PQOS_PERF_EVENT_LLC_REF);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(ctx.fd_llc_references, 0x200);
+        assert_int_equal(intl.perf.group_num, 1);
+        assert_int_equal(intl.perf.group, PQOS_PERF_EVENT_LLC_MISS);
+}
+
 /* ======== perf_mon_stop ======== */
 
 static void
@@ -732,6 +870,75 @@ test_perf_mon_poll_core(void **state __attribute__((unused)))
         test_perf_mon_poll_core_event(PQOS_MON_EVENT_TMEM_BW);
 }
 
+static void
+test_perf_mon_poll_group(void **state __attribute__((unused)))
+{
+        int ret;
+        struct pqos_mon_data grp;
+        struct pqos_mon_data_internal intl;
+        unsigned cores[] = {1, 2};
+        const unsigned cores_num = DIM(cores);
+        struct pqos_mon_perf_ctx ctx[cores_num];
+
+        memset(&grp, 0, sizeof(grp));
+        memset(&intl, 0, sizeof(intl));
+        memset(ctx, 0, sizeof(struct pqos_mon_perf_ctx) * cores_num);
+        grp.intl = &intl;
+        grp.num_cores = cores_num;
+        grp.cores = cores;
+        grp.intl->perf.ctx = ctx;
+
+        intl.perf.group = (enum pqos_mon_event)(PQOS_PERF_EVENT_CYCLES |
+                                                PQOS_PERF_EVENT_INSTRUCTIONS);
+        intl.perf.group_evt[0] = (enum pqos_mon_event)PQOS_PERF_EVENT_CYCLES;
+        intl.perf.group_evt[1] =
+            (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS;
+        intl.perf.group_num = 2;
+        ctx[0].fd_cyc = 0x100;
+        ctx[1].fd_cyc = 0x101;
+
+        /* one read per core returns both events */
+        expect_value(__wrap_perf_read_group, leader_fd, 0x100);
+        expect_value(__wrap_perf_read_group, num, 2);
+        will_return(__wrap_perf_read_group, PQOS_RETVAL_OK);
+        will_return(__wrap_perf_read_group, 1000);
+        will_return(__wrap_perf_read_group, 500);
+        expect_value(__wrap_perf_read_group, leader_fd, 0x101);
+        expect_value(__wrap_perf_read_group, num, 2);
+        will_return(__wrap_perf_read_group, PQOS_RETVAL_OK);
+        will_return(__wrap_perf_read_group, 3000);
+        will_return(__wrap_perf_read_group, 1500);
+
+        ret = perf_mon_poll(&grp, (enum pqos_mon_event)PQOS_PERF_EVENT_CYCLES);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(grp.values.ipc_unhalted, 4000);
+        assert_int_equal(grp.values.ipc_retired, 2000);
+
+        /* value already read with the group */
+        ret = perf_mon_poll(&grp,
+                            (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(intl.perf.pending, 0);
+
+        /* next poll reads the group again */
+        expect_value(__wrap_perf_read_group, leader_fd, 0x100);
+        expect_value(__wrap_perf_read_group, num, 2);
+        will_return(__wrap_perf_read_group, PQOS_RETVAL_OK);
+        will_return(__wrap_perf_read_group, 2000);
+        will_return(__wrap_perf_read_group, 1000);
+        expect_value(__wrap_perf_read_group, leader_fd, 0x101);
+        expect_value(__wrap_perf_read_group, num, 2);
+        will_return(__wrap_perf_read_group, PQOS_RETVAL_OK);
+        will_return(__wrap_perf_read_group, 4000);
+        will_return(__wrap_perf_read_group, 2000);
+
+        ret = perf_mon_poll(&grp,
+                            (enum pqos_mon_event)PQOS_PERF_EVENT_INSTRUCTIONS);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(grp.values.ipc_unhalted_delta, 2000);
+        assert_int_equal(grp.values.ipc_retired_delta, 1000);
+}
+
 static void
 test_perf_mon_poll_param(void **state __attribute__((unused)))
 {
@@ -791,8 +998,11 @@ main(void)
             cmocka_unit_test(test_perf_mon_start_param),
             cmocka_unit_test(test_perf_mon_start_core),
             cmocka_unit_test(test_perf_mon_start_core_param),
+            cmocka_unit_test(test_perf_mon_start_group),
+            cmocka_unit_test(test_perf_mon_start_group_fallback),
             cmocka_unit_test(test_perf_mon_stop_param),
             cmocka_unit_test(test_perf_mon_poll_core),
+            cmocka_unit_test(test_perf_mon_poll_group),
             cmocka_unit_test(test_perf_mon_poll_param),
         };
 
@@ -105,11 +105,10 @@ test_resctrl_mon_read_counter(void **state __attribute__((unused)))
         uint64_t value;
 
         /* llc */
-        expect_string(__wrap_pqos_fopen, name,
+        expect_string(__wrap_pqos_open, pathname,
                       "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
                       "llc_occupancy");
-        expect_string(__wrap_pqos_fopen, mode, "r");
-        will_return(__wrap_pqos_fopen, "1");
+        will_return(__wrap_pqos_open, "1");
 
         ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
                                        &value);
@@ -117,11 +116,10 @@ test_resctrl_mon_read_counter(void **state __attribute__((unused)))
         assert_int_equal(value, 1);
 
         /* lmem */
-        expect_string(__wrap_pqos_fopen, name,
+        expect_string(__wrap_pqos_open, pathname,
                       "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
                       "mbm_local_bytes");
-        expect_string(__wrap_pqos_fopen, mode, "r");
-        will_return(__wrap_pqos_fopen, "2");
+        will_return(__wrap_pqos_open, "2");
 
         ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_LMEM_BW,
                                        &value);
@@ -129,16 +127,111 @@ test_resctrl_mon_read_counter(void **state __attribute__((unused)))
         assert_int_equal(value, 2);
 
         /* tmem */
-        expect_string(__wrap_pqos_fopen, name,
+        expect_string(__wrap_pqos_open, pathname,
                       "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
                       "mbm_total_bytes");
-        expect_string(__wrap_pqos_fopen, mode, "r");
-        will_return(__wrap_pqos_fopen, "3");
+        will_return(__wrap_pqos_open, "3");
 
         ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_TMEM_BW,
                                        &value);
         assert_int_equal(ret, PQOS_RETVAL_OK);
         assert_int_equal(value, 3);
+
+        resctrl_mon_fini();
+}
+
+static void
+test_resctrl_mon_read_counter_cached(void **state __attribute__((unused)))
+{
+        int ret;
+        uint64_t value;
+
+        expect_string(__wrap_pqos_open, pathname,
+                      "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
+                      "llc_occupancy");
+        will_return(__wrap_pqos_open, "1");
+
+        ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 1);
+
+        /* file is not opened again */
+        ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 1);
+
+        /* cache invalidated by group removal */
+        expect_string(__wrap_rmdir, path, RESCTRL_PATH "/COS1/mon_groups/test");
+        will_return(__wrap_rmdir, 0);
+
+        ret = resctrl_mon_rmdir(1, "test");
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        expect_string(__wrap_pqos_open, pathname,
+                      "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
+                      "llc_occupancy");
+        will_return(__wrap_pqos_open, "2");
+
+        ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 2);
+
+        resctrl_mon_fini();
+}
+
+static void
+test_resctrl_mon_read_counter_cached_group(void **state
+                                           __attribute__((unused)))
+{
+        int ret;
+        uint64_t value;
+
+        expect_string(__wrap_pqos_open, pathname,
+                      "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
+                      "llc_occupancy");
+        will_return(__wrap_pqos_open, "1");
+
+        ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 1);
+
+        expect_string(__wrap_pqos_open, pathname,
+                      "/sys/fs/resctrl/COS1/mon_groups/other/mon_data/"
+                      "mon_L3_00/llc_occupancy");
+        will_return(__wrap_pqos_open, "2");
+
+        ret = resctrl_mon_read_counter(1, "other", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 2);
+
+        /* removal of one group keeps files of the other group */
+        expect_string(__wrap_rmdir, path, RESCTRL_PATH "/COS1/mon_groups/test");
+        will_return(__wrap_rmdir, 0);
+
+        ret = resctrl_mon_rmdir(1, "test");
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+
+        ret = resctrl_mon_read_counter(1, "other", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 2);
+
+        expect_string(__wrap_pqos_open, pathname,
+                      "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
+                      "llc_occupancy");
+        will_return(__wrap_pqos_open, "3");
+
+        ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
+                                       &value);
+        assert_int_equal(ret, PQOS_RETVAL_OK);
+        assert_int_equal(value, 3);
+
+        resctrl_mon_fini();
 }
 
 static void
@@ -148,27 +241,27 @@ test_resctrl_mon_read_counter_error(void **state __attribute__((unused)))
         uint64_t value = 0;
 
         /* file doesn't exists*/
-        expect_string(__wrap_pqos_fopen, name,
+        expect_string(__wrap_pqos_open, pathname,
                       "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
                       "llc_occupancy");
-        expect_string(__wrap_pqos_fopen, mode, "r");
-        will_return(__wrap_pqos_fopen, NULL);
+        will_return(__wrap_pqos_open, NULL);
 
         ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
                                        &value);
         assert_int_equal(ret, PQOS_RETVAL_ERROR);
 
         /* invalid value */
-        expect_string(__wrap_pqos_fopen, name,
+        expect_string(__wrap_pqos_open, pathname,
                       "/sys/fs/resctrl/COS1/mon_groups/test/mon_data/mon_L3_00/"
                       "llc_occupancy");
-        expect_string(__wrap_pqos_fopen, mode, "r");
-        will_return(__wrap_pqos_fopen, ";invalid");
+        will_return(__wrap_pqos_open, ";invalid");
 
         ret = resctrl_mon_read_counter(1, "test", 0, PQOS_MON_EVENT_L3_OCCUP,
                                        &value);
         assert_int_equal(ret, PQOS_RETVAL_OK);
         assert_int_equal(value, 0);
+
+        resctrl_mon_fini();
 }
 
 int
@@ -178,6 +271,8 @@ main(void)
             cmocka_unit_test(test_resctrl_mon_mkdir),
             cmocka_unit_test(test_resctrl_mon_rmdir),
             cmocka_unit_test(test_resctrl_mon_read_counter),
+            cmocka_unit_test(test_resctrl_mon_read_counter_cached),
+            cmocka_unit_test(test_resctrl_mon_read_counter_cached_group),
             cmocka_unit_test(test_resctrl_mon_read_counter_error),
         };
 
@@ -36,6 +36,7 @@
 #include "pqos.h"
 
 #include <string.h>
+#include <unistd.h>
 
 FILE *
 __wrap_pqos_fopen(const char *name, const char *mode)
@@ -63,6 +64,34 @@ __wrap_pqos_fopen(const char *name, const char *mode)
         return mock_ptr_type(FILE *);
 }
 
+/**
+ * Opens temporary file with mocked content, returns -1 if content is NULL
+ */
+int
+__wrap_pqos_open(const char *pathname, int flags __attribute__((unused)))
+{
+        const char *data;
+        FILE *fd;
+        int ret;
+
+        check_expected(pathname);
+
+        data = mock_ptr_type(const char *);
+        if (data == NULL)
+                return -1;
+
+        fd = tmpfile();
+        assert_non_null(fd);
+
+        fprintf(fd, "%s", data);
+        fflush(fd);
+
+        ret = dup(fileno(fd));
+        fclose(fd);
+
+        return ret;
+}
+
 int
 __wrap_pqos_fclose(FILE *fd)
 {
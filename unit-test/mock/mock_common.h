@@ -38,6 +38,7 @@
 FILE *__wrap_pqos_fopen(const char *name, const char *mode);
 int __wrap_pqos_fclose(FILE *fd);
 int __real_pqos_fclose(FILE *fd);
+int __wrap_pqos_open(const char *pathname, int flags);
 int __wrap_pqos_fread_uint(const char *path, unsigned *value);
 int __wrap_pqos_fread_uint64(const char *fname, unsigned base, uint64_t *value);
 int __wrap_pqos_file_exists(const char *path);
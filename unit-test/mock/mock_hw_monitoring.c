@@ -86,6 +86,20 @@ __wrap_hw_mon_start_cores(const unsigned num_cores,
         return mock_type(int);
 }
 
+int
+__wrap_hw_mon_start_groups(const unsigned num_specs,
+                           const struct pqos_mon_group_spec *specs,
+                           const struct pqos_mon_options *opts,
+                           struct pqos_mon_data **groups)
+{
+        check_expected(num_specs);
+        check_expected_ptr(specs);
+        check_expected_ptr(opts);
+        assert_non_null(groups);
+
+        return mock_type(int);
+}
+
 int
 __wrap_hw_mon_start_channels(const unsigned num_channels,
                              const pqos_channel_t *channels,
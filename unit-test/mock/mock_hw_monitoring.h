@@ -47,6 +47,10 @@ int __wrap_hw_mon_start_cores(const unsigned num_cores,
                               struct pqos_mon_mem_region *mem_regions,
                               struct pqos_mon_data *group,
                               const struct pqos_mon_options *opt);
+int __wrap_hw_mon_start_groups(const unsigned num_specs,
+                               const struct pqos_mon_group_spec *specs,
+                               const struct pqos_mon_options *opts,
+                               struct pqos_mon_data **groups);
 int __wrap_hw_mon_start_channels(const unsigned num_channels,
                                  const pqos_channel_t *channels,
                                  const enum pqos_mon_event event,
@@ -75,3 +75,49 @@ __wrap_msr_write(const unsigned lcore, const uint32_t reg, const uint64_t value)
 
         return mock_type(int);
 }
+
+/**
+ * Batch operations are mocked as a sequence of single MSR operations
+ */
+int
+__wrap_msr_batch(struct msr_op *ops, const unsigned num)
+{
+        int ret = MACHINE_RETVAL_OK;
+        unsigned i;
+
+        for (i = 0; i < num; i++) {
+                if (ops[i].write)
+                        ops[i].retval = __wrap_msr_write(
+                            ops[i].lcore, ops[i].reg, ops[i].value);
+                else
+                        ops[i].retval = __wrap_msr_read(
+                            ops[i].lcore, ops[i].reg, &ops[i].value);
+
+                if (ops[i].retval != MACHINE_RETVAL_OK)
+                        ret = MACHINE_RETVAL_ERROR;
+        }
+
+        return ret;
+}
+
+int
+__wrap_msr_read_batch(struct msr_op *ops, const unsigned num)
+{
+        unsigned i;
+
+        for (i = 0; i < num; i++)
+                ops[i].write = 0;
+
+        return __wrap_msr_batch(ops, num);
+}
+
+int
+__wrap_msr_write_batch(struct msr_op *ops, const unsigned num)
+{
+        unsigned i;
+
+        for (i = 0; i < num; i++)
+                ops[i].write = 1;
+
+        return __wrap_msr_batch(ops, num);
+}
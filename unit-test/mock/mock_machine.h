@@ -34,11 +34,17 @@
 #define MOCK_MACHINE_H_
 
 #include <stdint.h>
+
+struct msr_op;
+
 int __wrap_machine_init(const unsigned max_core_id);
 int __wrap_machine_fini(void);
 int __wrap_msr_read(const unsigned lcore, const uint32_t reg, uint64_t *value);
 int __wrap_msr_write(const unsigned lcore,
                      const uint32_t reg,
                      const uint64_t value);
+int __wrap_msr_batch(struct msr_op *ops, const unsigned num);
+int __wrap_msr_read_batch(struct msr_op *ops, const unsigned num);
+int __wrap_msr_write_batch(struct msr_op *ops, const unsigned num);
 
 #endif /* MOCK_MACHINE_H_ */
@@ -42,4 +42,9 @@ int __wrap_pqos_mon_fini(void);
 int __wrap_pqos_mon_poll_events(struct pqos_mon_data *group);
 int __wrap_resctrl_mon_active(unsigned *monitoring_status);
 
+/* ======== headers for static functions ======== */
+int mon_poll_workers_init(const struct pqos_cpuinfo *cpu,
+                          const unsigned max_workers);
+void mon_poll_workers_fini(void);
+
 #endif MOCK_MONITORING_H_
@@ -0,0 +1,341 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+#include <setjmp.h>
+#include <stdarg.h>
+#include <stddef.h>
+#include <stdlib.h>
+#include <sys/stat.h>
+#include <unistd.h>
+/* clang-format off */
+#include <cmocka.h>
+#include "monitor_bin.c"
+/* clang-format on */
+
+#define TEST_NUM_GROUPS 2
+#define TEST_TIME_NS    1700000000000000000ull
+#define TEST_EVENTS                                                            \
+        (PQOS_MON_EVENT_L3_OCCUP | PQOS_MON_EVENT_LMEM_BW |                    \
+         PQOS_PERF_EVENT_LLC_MISS)
+#define TEST_CSV_HEADER "Time,Group,LLC Misses,LLC[KB],MBL[MB/s]\n"
+
+static char bin_file[64];
+static struct pqos_mon_data groups[TEST_NUM_GROUPS];
+static char labels[TEST_NUM_GROUPS][8] = {"0-3", "4-7"};
+
+/* ======== mock ======== */
+
+enum pqos_mon_event __wrap_monitor_get_events(void);
+uint64_t __wrap_monitor_get_interval_us(void);
+
+enum pqos_mon_event
+__wrap_monitor_get_events(void)
+{
+        return (enum pqos_mon_event)TEST_EVENTS;
+}
+
+uint64_t
+__wrap_monitor_get_interval_us(void)
+{
+        return 1000000;
+}
+
+/* ======== helpers ======== */
+
+static int
+setup_file(void **state __attribute__((unused)))
+{
+        int fd;
+
+        strcpy(bin_file, "/tmp/test_monitor_bin.XXXXXX");
+        fd = mkstemp(bin_file);
+        if (fd < 0)
+                return -1;
+        close(fd);
+
+        return 0;
+}
+
+static int
+teardown_file(void **state __attribute__((unused)))
+{
+        unlink(bin_file);
+
+        return 0;
+}
+
+/**
+ * @brief LLC occupancy of group \a g in sample \a s, goes up and down
+ */
+static uint64_t
+test_llc(const unsigned s, const unsigned g)
+{
+        return (uint64_t)((s * 7 + g * 3) % 13) * 1024;
+}
+
+/**
+ * @brief Writes \a num_samples samples of all groups to the binary file
+ */
+static void
+encode_samples(const unsigned num_samples, const int compress)
+{
+        FILE *fp;
+        unsigned s, g;
+
+        fp = fopen(bin_file, "wb");
+        assert_non_null(fp);
+
+        memset(groups, 0, sizeof(groups));
+        for (g = 0; g < TEST_NUM_GROUPS; g++) {
+                groups[g].event = (enum pqos_mon_event)TEST_EVENTS;
+                groups[g].context = labels[g];
+        }
+
+        if (compress)
+                monitor_binz_begin(fp, 0, NULL);
+        else
+                monitor_bin_begin(fp, 0, NULL);
+
+        for (s = 0; s < num_samples; s++) {
+                char timestamp[64];
+
+                bin_format_time(TEST_TIME_NS + s * 1000000000ull, timestamp,
+                                sizeof(timestamp));
+                monitor_bin_header(fp, timestamp, 0, NULL);
+                for (g = 0; g < TEST_NUM_GROUPS; g++) {
+                        groups[g].values.llc = test_llc(s, g);
+                        groups[g].values.mbm_local =
+                            (uint64_t)(g + 1) * s * 1024 * 1024;
+                        groups[g].values.llc_misses =
+                            (uint64_t)(g + 1) * s * 100;
+                        monitor_bin_row(fp, timestamp, &groups[g]);
+                }
+                monitor_bin_footer(fp);
+        }
+
+        monitor_bin_end(fp);
+        fclose(fp);
+}
+
+/**
+ * @brief Counts data blocks in the binary file
+ *
+ * @param [out] last offset of the last complete block
+ *
+ * @return number of complete blocks
+ */
+static unsigned
+count_blocks(long *last)
+{
+        struct bin_file file;
+        FILE *fp;
+        unsigned blocks = 0;
+        uint8_t *raw;
+        size_t raw_size;
+        unsigned num_samples;
+
+        fp = fopen(bin_file, "rb");
+        assert_non_null(fp);
+        assert_int_equal(bin_read_header(fp, &file), 0);
+        assert_int_equal(file.num_groups, TEST_NUM_GROUPS);
+        assert_int_equal(file.num_columns, 3);
+
+        *last = ftell(fp);
+        for (;;) {
+                const long pos = ftell(fp);
+
+                if (bin_read_block(fp, &raw, &raw_size, &num_samples) != 0)
+                        break;
+                free(raw);
+                *last = pos;
+                blocks++;
+        }
+
+        bin_file_free(&file);
+        fclose(fp);
+
+        return blocks;
+}
+
+/**
+ * @brief Decodes the binary file and checks each CSV row
+ *
+ * @param [out] num_rows number of decoded rows
+ *
+ * @return monitor_bin_decode status
+ */
+static int
+decode_samples(unsigned *num_rows)
+{
+        FILE *out;
+        char line[256];
+        char expected[256];
+        unsigned rows = 0;
+        int ret;
+
+        out = tmpfile();
+        assert_non_null(out);
+
+        ret = monitor_bin_decode(bin_file, out);
+        rewind(out);
+
+        assert_non_null(fgets(line, sizeof(line), out));
+        assert_string_equal(line, TEST_CSV_HEADER);
+
+        while (fgets(line, sizeof(line), out) != NULL) {
+                /* first sample has no rates */
+                const unsigned s = rows / TEST_NUM_GROUPS + 1;
+                const unsigned g = rows % TEST_NUM_GROUPS;
+                char timestamp[64];
+
+                bin_format_time(TEST_TIME_NS + s * 1000000000ull, timestamp,
+                                sizeof(timestamp));
+                snprintf(expected, sizeof(expected),
+                         "%s,\"%s\",%u,%.1f,%.1f\n", timestamp, labels[g],
+                         (g + 1) * 100, (double)test_llc(s, g) / 1024.0,
+                         (double)(g + 1));
+                assert_string_equal(line, expected);
+                rows++;
+        }
+
+        fclose(out);
+        *num_rows = rows;
+
+        return ret;
+}
+
+/* ======== monitor_bin_decode ======== */
+
+static void
+test_monitor_bin_single_block(void **state __attribute__((unused)))
+{
+        unsigned rows;
+        long last;
+
+        encode_samples(10, 0);
+        assert_int_equal(count_blocks(&last), 1);
+
+        assert_int_equal(decode_samples(&rows), 0);
+        assert_int_equal(rows, 9 * TEST_NUM_GROUPS);
+}
+
+static void
+test_monitor_bin_multi_block(void **state __attribute__((unused)))
+{
+        const unsigned num_samples = 2 * MONITOR_BIN_BLOCK_SAMPLES + 10;
+        unsigned rows;
+        long last;
+
+        encode_samples(num_samples, 0);
+        assert_int_equal(count_blocks(&last), 3);
+
+        assert_int_equal(decode_samples(&rows), 0);
+        assert_int_equal(rows, (num_samples - 1) * TEST_NUM_GROUPS);
+}
+
+static void
+test_monitor_bin_compressed(void **state __attribute__((unused)))
+{
+        const unsigned num_samples = 2 * MONITOR_BIN_BLOCK_SAMPLES + 10;
+        struct stat raw, compressed;
+        unsigned rows;
+        long last;
+
+        encode_samples(num_samples, 0);
+        assert_int_equal(stat(bin_file, &raw), 0);
+
+        encode_samples(num_samples, 1);
+        assert_int_equal(stat(bin_file, &compressed), 0);
+        assert_int_equal(count_blocks(&last), 3);
+        if (monitor_bin_compress_supported())
+                assert_true(compressed.st_size < raw.st_size);
+
+        assert_int_equal(decode_samples(&rows), 0);
+        assert_int_equal(rows, (num_samples - 1) * TEST_NUM_GROUPS);
+}
+
+static void
+test_monitor_bin_truncated_payload(void **state __attribute__((unused)))
+{
+        const unsigned num_samples = 2 * MONITOR_BIN_BLOCK_SAMPLES + 10;
+        struct stat st;
+        unsigned rows;
+        long last;
+
+        encode_samples(num_samples, 0);
+        assert_int_equal(stat(bin_file, &st), 0);
+        assert_int_equal(truncate(bin_file, st.st_size - 5), 0);
+        assert_int_equal(count_blocks(&last), 2);
+
+        /* samples of complete blocks are decoded */
+        assert_int_equal(decode_samples(&rows), -1);
+        assert_int_equal(rows, (2 * MONITOR_BIN_BLOCK_SAMPLES - 1) *
+                                   TEST_NUM_GROUPS);
+}
+
+static void
+test_monitor_bin_truncated_header(void **state __attribute__((unused)))
+{
+        const unsigned num_samples = 2 * MONITOR_BIN_BLOCK_SAMPLES + 10;
+        unsigned rows;
+        long last;
+
+        encode_samples(num_samples, 0);
+        assert_int_equal(count_blocks(&last), 3);
+
+        /* cut last block in the middle of its header */
+        assert_int_equal(truncate(bin_file, last + 6), 0);
+        assert_int_equal(count_blocks(&last), 2);
+
+        assert_int_equal(decode_samples(&rows), -1);
+        assert_int_equal(rows, (2 * MONITOR_BIN_BLOCK_SAMPLES - 1) *
+                                   TEST_NUM_GROUPS);
+}
+
+int
+main(void)
+{
+        const struct CMUnitTest tests[] = {
+            cmocka_unit_test_setup_teardown(test_monitor_bin_single_block,
+                                            setup_file, teardown_file),
+            cmocka_unit_test_setup_teardown(test_monitor_bin_multi_block,
+                                            setup_file, teardown_file),
+            cmocka_unit_test_setup_teardown(test_monitor_bin_compressed,
+                                            setup_file, teardown_file),
+            cmocka_unit_test_setup_teardown(test_monitor_bin_truncated_payload,
+                                            setup_file, teardown_file),
+            cmocka_unit_test_setup_teardown(test_monitor_bin_truncated_header,
+                                            setup_file, teardown_file)};
+
+        return cmocka_run_group_tests(tests, NULL, NULL);
+}
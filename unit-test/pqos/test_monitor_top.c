@@ -0,0 +1,170 @@
+/*
+ * BSD LICENSE
+ *
+ * Copyright(c) 2026 Intel Corporation. All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ *   * Redistributions of source code must retain the above copyright
+ *     notice, this list of conditions and the following disclaimer.
+ *   * Redistributions in binary form must reproduce the above copyright
+ *     notice, this list of conditions and the following disclaimer in
+ *     the documentation and/or other materials provided with the
+ *     distribution.
+ *   * Neither the name of Intel Corporation nor the names of its
+ *     contributors may be used to endorse or promote products derived
+ *     from this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *
+ */
+
+#include <setjmp.h>
+#include <stdarg.h>
+#include <stddef.h>
+#include <stdlib.h>
+/* clang-format off */
+#include <cmocka.h>
+#include "monitor_top.c"
+/* clang-format on */
+
+#define TEST_NUM_GROUPS 32
+
+static struct pqos_mon_data groups[TEST_NUM_GROUPS];
+static struct pqos_mon_data *mon_data[TEST_NUM_GROUPS];
+
+static int
+setup_groups(void **state __attribute__((unused)))
+{
+        unsigned i;
+
+        memset(groups, 0, sizeof(groups));
+        for (i = 0; i < TEST_NUM_GROUPS; i++) {
+                /* distinct values in shuffled order */
+                groups[i].values.llc = (i * 7) % TEST_NUM_GROUPS;
+                groups[i].values.mbm_local_delta = i % 4;
+                groups[i].values.ipc = (double)(i % 3);
+                mon_data[i] = &groups[i];
+        }
+
+        return monitor_top_set_sort("llc");
+}
+
+static void
+assert_ranked_llc(const unsigned k)
+{
+        unsigned i;
+
+        for (i = 0; i < k; i++)
+                assert_int_equal(mon_data[i]->values.llc,
+                                 TEST_NUM_GROUPS - 1 - i);
+}
+
+static void
+assert_permutation(void)
+{
+        unsigned i, j;
+
+        for (i = 0; i < TEST_NUM_GROUPS; i++) {
+                for (j = 0; j < TEST_NUM_GROUPS; j++)
+                        if (mon_data[j] == &groups[i])
+                                break;
+                assert_true(j < TEST_NUM_GROUPS);
+        }
+}
+
+static void
+test_monitor_top_set_sort(void **state __attribute__((unused)))
+{
+        assert_int_equal(monitor_top_set_sort("llc"), 0);
+        assert_int_equal(monitor_top_set_sort("MBL,mbr,mbt,misses"), 0);
+        assert_int_equal(monitor_top_set_sort("references,ipc"), 0);
+
+        assert_int_equal(monitor_top_set_sort(NULL), -1);
+        assert_int_equal(monitor_top_set_sort(""), -1);
+        assert_int_equal(monitor_top_set_sort("mb"), -1);
+        assert_int_equal(monitor_top_set_sort("llc,"), -1);
+        assert_int_equal(monitor_top_set_sort("llc,,mbl"), -1);
+        assert_int_equal(
+            monitor_top_set_sort("llc,llc,llc,llc,llc,llc,llc,llc,llc"), -1);
+}
+
+static void
+test_monitor_top_rank_heap(void **state __attribute__((unused)))
+{
+        monitor_top_rank(mon_data, TEST_NUM_GROUPS, 5, 0);
+        assert_ranked_llc(5);
+        assert_permutation();
+}
+
+static void
+test_monitor_top_rank_all(void **state __attribute__((unused)))
+{
+        monitor_top_rank(mon_data, TEST_NUM_GROUPS, TEST_NUM_GROUPS + 1, 0);
+        assert_ranked_llc(TEST_NUM_GROUPS);
+        assert_permutation();
+}
+
+static void
+test_monitor_top_rank_incremental(void **state __attribute__((unused)))
+{
+        unsigned i;
+
+        monitor_top_rank(mon_data, TEST_NUM_GROUPS, 5, 1);
+        assert_ranked_llc(5);
+        assert_permutation();
+
+        /* next sample, lower ranked groups overtake the previous top */
+        for (i = 0; i < TEST_NUM_GROUPS; i++)
+                groups[i].values.llc = (groups[i].values.llc + 3) %
+                                       TEST_NUM_GROUPS;
+
+        monitor_top_rank(mon_data, TEST_NUM_GROUPS, 5, 1);
+        assert_ranked_llc(5);
+        assert_permutation();
+}
+
+static void
+test_monitor_top_rank_multi_key(void **state __attribute__((unused)))
+{
+        unsigned i;
+
+        assert_int_equal(monitor_top_set_sort("mbl,ipc,llc"), 0);
+
+        monitor_top_rank(mon_data, TEST_NUM_GROUPS, 10, 0);
+        assert_permutation();
+
+        for (i = 1; i < 10; i++)
+                assert_true(top_cmp(mon_data[i - 1], mon_data[i]) > 0);
+        for (i = 10; i < TEST_NUM_GROUPS; i++)
+                assert_true(top_cmp(mon_data[9], mon_data[i]) >= 0);
+        assert_int_equal(mon_data[0]->values.mbm_local_delta, 3);
+        assert_true(mon_data[0]->values.ipc == 2.0);
+}
+
+int
+main(void)
+{
+        const struct CMUnitTest tests[] = {
+            cmocka_unit_test(test_monitor_top_set_sort),
+            cmocka_unit_test_setup(test_monitor_top_rank_heap, setup_groups),
+            cmocka_unit_test_setup(test_monitor_top_rank_all, setup_groups),
+            cmocka_unit_test_setup(test_monitor_top_rank_incremental,
+                                   setup_groups),
+            cmocka_unit_test_setup(test_monitor_top_rank_multi_key,
+                                   setup_groups)};
+
+        return cmocka_run_group_tests(tests, NULL, NULL);
+}